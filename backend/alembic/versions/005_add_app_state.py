@@ -0,0 +1,34 @@
+"""Add app_state table for shared job state
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('app_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('key', sa.String(length=100), nullable=False),
+    sa.Column('value', sa.Text(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_app_state_id'), 'app_state', ['id'], unique=False)
+    op.create_index(op.f('ix_app_state_key'), 'app_state', ['key'], unique=True)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_app_state_key'), table_name='app_state')
+    op.drop_index(op.f('ix_app_state_id'), table_name='app_state')
+    op.drop_table('app_state')
@@ -0,0 +1,34 @@
+"""Add indexes for the user directory
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+# Prefix search runs lower(column) LIKE 'term%'
+SEARCH_COLUMNS = ['username', 'full_name', 'email']
+
+
+def upgrade():
+    for column in SEARCH_COLUMNS:
+        # text_pattern_ops lets LIKE prefixes use the index under any collation
+        op.execute(f'CREATE INDEX ix_users_{column}_lower ON users (lower({column}) text_pattern_ops)')
+
+    # Role and tool filters probe the association tables by role/tool
+    op.create_index('ix_user_roles_role_id', 'user_roles', ['role_id'], unique=False)
+    op.create_index('ix_user_tools_tool_id', 'user_tools', ['tool_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_user_tools_tool_id', table_name='user_tools')
+    op.drop_index('ix_user_roles_role_id', table_name='user_roles')
+    for column in reversed(SEARCH_COLUMNS):
+        op.drop_index(f'ix_users_{column}_lower', table_name='users')
@@ -0,0 +1,71 @@
+"""Add preventive maintenance schedules
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('maintenance_schedules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('equipment_name', sa.String(length=255), nullable=False),
+    sa.Column('location', sa.String(length=255), nullable=True),
+    sa.Column('cycle_days', sa.Integer(), nullable=False),
+    sa.Column('last_maintenance_date', sa.DateTime(), nullable=True),
+    sa.Column('next_due_at', sa.DateTime(), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('open_request_id', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['open_request_id'], ['maintenance_requests.id'], name='fk_maintenance_schedules_open_request_id', ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('equipment_name')
+    )
+    op.create_index(op.f('ix_maintenance_schedules_id'), 'maintenance_schedules', ['id'], unique=False)
+    op.create_index(op.f('ix_maintenance_schedules_next_due_at'), 'maintenance_schedules', ['next_due_at'], unique=False)
+    # The scheduler reads only the due slice
+    op.create_index('ix_maintenance_schedules_due', 'maintenance_schedules', ['next_due_at'], unique=False,
+                    postgresql_where=sa.text('is_active AND open_request_id IS NULL'))
+
+    op.add_column('maintenance_requests', sa.Column('schedule_id', sa.Integer(), nullable=True))
+    op.add_column('maintenance_requests', sa.Column('scheduled_due_at', sa.DateTime(), nullable=True))
+    op.create_foreign_key('fk_maintenance_requests_schedule_id', 'maintenance_requests', 'maintenance_schedules',
+                          ['schedule_id'], ['id'], ondelete='SET NULL')
+    op.create_unique_constraint('uq_maintenance_requests_schedule_due', 'maintenance_requests',
+                                ['schedule_id', 'scheduled_due_at'])
+
+    # One schedule per equipment, from its most recent request with a cycle
+    op.execute("""
+        INSERT INTO maintenance_schedules
+            (equipment_name, location, cycle_days, last_maintenance_date, next_due_at, owner_id, is_active, updated_at, created_at)
+        SELECT DISTINCT ON (equipment_name)
+            equipment_name, location, maintenance_cycle_days, last_maintenance_date,
+            COALESCE(last_maintenance_date, created_at) + maintenance_cycle_days * INTERVAL '1 day',
+            submitter_id, TRUE, NOW(), NOW()
+        FROM maintenance_requests
+        WHERE equipment_name IS NOT NULL AND maintenance_cycle_days > 0
+        ORDER BY equipment_name, created_at DESC
+    """)
+
+
+def downgrade():
+    op.drop_constraint('uq_maintenance_requests_schedule_due', 'maintenance_requests', type_='unique')
+    op.drop_constraint('fk_maintenance_requests_schedule_id', 'maintenance_requests', type_='foreignkey')
+    op.drop_column('maintenance_requests', 'scheduled_due_at')
+    op.drop_column('maintenance_requests', 'schedule_id')
+    op.drop_index('ix_maintenance_schedules_due', table_name='maintenance_schedules')
+    op.drop_index(op.f('ix_maintenance_schedules_next_due_at'), table_name='maintenance_schedules')
+    op.drop_index(op.f('ix_maintenance_schedules_id'), table_name='maintenance_schedules')
+    op.drop_table('maintenance_schedules')
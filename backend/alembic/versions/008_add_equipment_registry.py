@@ -0,0 +1,257 @@
+"""Add the equipment registry and cluster free-text equipment names into it
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from collections import Counter, defaultdict
+import re
+from typing import List, Optional
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('locations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('parent_id', sa.Integer(), nullable=True),
+    sa.Column('path', sa.String(length=1024), nullable=False),
+    sa.Column('path_key', sa.String(length=1024), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['parent_id'], ['locations.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('path_key')
+    )
+    op.create_index(op.f('ix_locations_id'), 'locations', ['id'], unique=False)
+    op.create_index(op.f('ix_locations_parent_id'), 'locations', ['parent_id'], unique=False)
+
+    op.create_table('equipment',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('asset_tag', sa.String(length=50), nullable=True),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('search_key', sa.String(length=255), nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=True),
+    sa.Column('warranty_status', postgresql.ENUM('ACTIVE', 'EXPIRED', 'NOT_APPLICABLE', name='warrantystatus', create_type=False), nullable=False),
+    sa.Column('warranty_expiry_date', sa.DateTime(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('asset_tag')
+    )
+    op.create_index(op.f('ix_equipment_id'), 'equipment', ['id'], unique=False)
+    op.create_index(op.f('ix_equipment_location_id'), 'equipment', ['location_id'], unique=False)
+    # text_pattern_ops lets autocomplete's LIKE 'prefix%' use the index under any collation
+    op.execute('CREATE UNIQUE INDEX ix_equipment_search_key ON equipment (search_key text_pattern_ops)')
+
+    op.add_column('maintenance_requests', sa.Column('equipment_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('fk_maintenance_requests_equipment_id', 'maintenance_requests', 'equipment',
+                          ['equipment_id'], ['id'])
+
+    # PM schedules belong to the asset, not to a spelling of its name
+    op.add_column('maintenance_schedules', sa.Column('equipment_id', sa.Integer(), nullable=True))
+
+    _cluster_existing_equipment()
+
+    op.create_foreign_key('fk_maintenance_schedules_equipment_id', 'maintenance_schedules', 'equipment',
+                          ['equipment_id'], ['id'])
+    op.create_unique_constraint('uq_maintenance_schedules_equipment_id', 'maintenance_schedules', ['equipment_id'])
+    op.drop_constraint('maintenance_schedules_equipment_name_key', 'maintenance_schedules', type_='unique')
+
+    # Created after the backfill so the UPDATE does not maintain it row by row
+    op.create_index('ix_maintenance_requests_equipment_created', 'maintenance_requests',
+                    ['equipment_id', 'created_at'], unique=False)
+
+
+def _cluster_existing_equipment():
+    """
+    Register one asset per distinct normalized equipment name and link requests to it
+
+    Spellings that normalize to the same key ("CNC-01", "cnc 1") become one
+    asset named after the most used spelling, located at the location it
+    is most often reported at. Request rows keep their text, rewritten to
+    the canonical spelling.
+    """
+    bind = op.get_bind()
+    variants = bind.execute(sa.text("""
+        SELECT equipment_name, location, COUNT(*)
+        FROM maintenance_requests
+        WHERE equipment_name IS NOT NULL
+        GROUP BY equipment_name, location
+    """)).all()
+
+    spellings = defaultdict(Counter)
+    locations = defaultdict(Counter)
+    for name, location, count in variants:
+        key = equipment_key(name)
+        if not key:
+            continue
+        spellings[key][" ".join(name.split())] += count
+        if location_levels(location):
+            locations[key][location] += count
+
+    # Location tree, outermost levels first so parents exist
+    location_ids = {}
+    for location in sorted({location for counter in locations.values() for location in counter}):
+        levels = location_levels(location)
+        parent_id = None
+        for depth in range(1, len(levels) + 1):
+            path_key = location_key(levels[:depth])
+            if path_key not in location_ids:
+                location_ids[path_key] = bind.execute(sa.text("""
+                    INSERT INTO locations (name, parent_id, path, path_key, created_at)
+                    VALUES (:name, :parent_id, :path, :path_key, NOW())
+                    RETURNING id
+                """), {
+                    "name": levels[depth - 1],
+                    "parent_id": parent_id,
+                    "path": " / ".join(levels[:depth]),
+                    "path_key": path_key
+                }).scalar()
+            parent_id = location_ids[path_key]
+
+    equipment_rows = []
+    for key, counter in spellings.items():
+        location_id = None
+        if locations[key]:
+            location_id = location_ids[location_key(location_levels(pick_canonical(locations[key])))]
+        equipment_rows.append({"name": pick_canonical(counter), "search_key": key, "location_id": location_id})
+    if not equipment_rows:
+        return
+
+    bind.execute(sa.text("""
+        INSERT INTO equipment (name, search_key, location_id, warranty_status, is_active, updated_at, created_at)
+        VALUES (:name, :search_key, :location_id, 'NOT_APPLICABLE', TRUE, NOW(), NOW())
+    """), equipment_rows)
+    op.execute("UPDATE equipment SET asset_tag = 'EQ-' || LPAD(id::text, 6, '0')")
+
+    # Original spelling -> asset, applied to all requests in one set-based UPDATE
+    equipment_ids = dict(bind.execute(sa.text("SELECT search_key, id FROM equipment")).all())
+    op.execute("CREATE TEMPORARY TABLE equipment_name_map (equipment_name VARCHAR(255) PRIMARY KEY, equipment_id INTEGER NOT NULL, canonical_name VARCHAR(255) NOT NULL) ON COMMIT DROP")
+    canonical = {row["search_key"]: row["name"] for row in equipment_rows}
+    bind.execute(sa.text("INSERT INTO equipment_name_map VALUES (:equipment_name, :equipment_id, :canonical_name)"), [
+        {"equipment_name": name, "equipment_id": equipment_ids[equipment_key(name)], "canonical_name": canonical[equipment_key(name)]}
+        for name in {name for name, _, _ in variants if equipment_key(name)}
+    ])
+    op.execute("""
+        UPDATE maintenance_requests mr
+        SET equipment_id = m.equipment_id, equipment_name = m.canonical_name
+        FROM equipment_name_map m
+        WHERE mr.equipment_name = m.equipment_name
+    """)
+
+    # Warranty details from each asset's most recent request that has them
+    op.execute("""
+        UPDATE equipment e
+        SET warranty_status = w.warranty_status, warranty_expiry_date = w.warranty_expiry_date
+        FROM (
+            SELECT DISTINCT ON (equipment_id) equipment_id, warranty_status, warranty_expiry_date
+            FROM maintenance_requests
+            WHERE equipment_id IS NOT NULL AND warranty_status <> 'NOT_APPLICABLE'
+            ORDER BY equipment_id, created_at DESC
+        ) w
+        WHERE e.id = w.equipment_id
+    """)
+
+    # PM schedules move to their asset (variants of one asset collapse to the earliest due)
+    op.execute("""
+        DELETE FROM maintenance_schedules s
+        USING equipment_name_map m, maintenance_schedules keep, equipment_name_map km
+        WHERE s.equipment_name = m.equipment_name
+          AND keep.equipment_name = km.equipment_name
+          AND km.equipment_id = m.equipment_id
+          AND keep.id <> s.id
+          AND (keep.next_due_at, keep.id) < (s.next_due_at, s.id)
+    """)
+    op.execute("""
+        UPDATE maintenance_schedules s
+        SET equipment_id = m.equipment_id, equipment_name = m.canonical_name
+        FROM equipment_name_map m
+        WHERE s.equipment_name = m.equipment_name
+    """)
+
+
+# Frozen copy of app.utils.equipment_names as of this revision, so later
+# changes to the live normalization do not change how this migration clusters
+_TOKEN = re.compile(r"[a-z]+|\d+")
+
+# Separators between levels of a free-text location ("Building A - Line 3", "Building A / Line 3")
+_LOCATION_LEVEL_SEPARATOR = re.compile(r"\s*(?:/|>|\||,|;|\s-\s)\s*")
+
+
+def equipment_key(name: Optional[str]) -> str:
+    """
+    Canonical search key of an equipment name
+
+    Lowercases, drops punctuation and leading zeros, so "CNC-01",
+    "cnc 1" and "CNC #1" share the key "cnc 1". Autocomplete matches
+    prefixes of this key.
+
+    Args:
+        name: Free-text name
+
+    Returns:
+        Key (empty if the name has no letters or digits)
+    """
+    if not name:
+        return ""
+    return " ".join(str(int(token)) if token.isdigit() else token for token in _TOKEN.findall(name.lower()))
+
+
+def location_levels(location: Optional[str]) -> List[str]:
+    """
+    Split a free-text location into hierarchy levels, outermost first
+
+    Args:
+        location: Free-text location such as "Building A - Line 3"
+
+    Returns:
+        Cleaned level names (empty if there is no location)
+    """
+    if not location:
+        return []
+    levels = [" ".join(level.split()) for level in _LOCATION_LEVEL_SEPARATOR.split(location.strip())]
+    return [level for level in levels if equipment_key(level)]
+
+
+def location_key(levels: List[str]) -> str:
+    """Canonical key of a location path"""
+    return " / ".join(equipment_key(level) for level in levels)
+
+
+def pick_canonical(spellings: Counter) -> str:
+    """
+    Choose the display name of a cluster of spellings
+
+    The most used spelling wins; ties go to the one with the most
+    capitals and then alphabetically, so the choice is deterministic.
+    """
+    return min(spellings, key=lambda name: (-spellings[name], -sum(c.isupper() for c in name), name))
+
+
+def downgrade():
+    op.create_unique_constraint('maintenance_schedules_equipment_name_key', 'maintenance_schedules', ['equipment_name'])
+    op.drop_constraint('uq_maintenance_schedules_equipment_id', 'maintenance_schedules', type_='unique')
+    op.drop_constraint('fk_maintenance_schedules_equipment_id', 'maintenance_schedules', type_='foreignkey')
+    op.drop_column('maintenance_schedules', 'equipment_id')
+    op.drop_index('ix_maintenance_requests_equipment_created', table_name='maintenance_requests')
+    op.drop_constraint('fk_maintenance_requests_equipment_id', 'maintenance_requests', type_='foreignkey')
+    op.drop_column('maintenance_requests', 'equipment_id')
+    op.drop_index('ix_equipment_search_key', table_name='equipment')
+    op.drop_index(op.f('ix_equipment_location_id'), table_name='equipment')
+    op.drop_index(op.f('ix_equipment_id'), table_name='equipment')
+    op.drop_table('equipment')
+    op.drop_index(op.f('ix_locations_parent_id'), table_name='locations')
+    op.drop_index(op.f('ix_locations_id'), table_name='locations')
+    op.drop_table('locations')
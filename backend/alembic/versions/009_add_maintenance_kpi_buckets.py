@@ -0,0 +1,70 @@
+"""Add pre-aggregated maintenance KPI buckets
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('maintenance_kpi_buckets',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('equipment_id', sa.Integer(), nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=False),
+    sa.Column('priority', postgresql.ENUM('LOW', 'MEDIUM', 'HIGH', 'URGENT', name='prioritylevel', create_type=False), nullable=False),
+    sa.Column('created_count', sa.Integer(), nullable=False),
+    sa.Column('open_count', sa.Integer(), nullable=False),
+    sa.Column('cancelled_count', sa.Integer(), nullable=False),
+    sa.Column('completed_count', sa.Integer(), nullable=False),
+    sa.Column('repair_seconds', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day', 'equipment_id', 'location_id', 'priority', name='uq_maintenance_kpi_buckets_key')
+    )
+    op.create_index(op.f('ix_maintenance_kpi_buckets_id'), 'maintenance_kpi_buckets', ['id'], unique=False)
+
+    # Backfill from existing requests; the kpi_reconcile job keeps correcting drift afterwards
+    op.execute("""
+        INSERT INTO maintenance_kpi_buckets
+            (day, equipment_id, location_id, priority, created_count, open_count, cancelled_count,
+             completed_count, repair_seconds, created_at)
+        SELECT mr.created_at::date, COALESCE(mr.equipment_id, 0), COALESCE(e.location_id, 0), mr.priority,
+               COUNT(*),
+               COUNT(*) FILTER (WHERE mr.status IN ('PENDING', 'IN_PROGRESS')),
+               COUNT(*) FILTER (WHERE mr.status = 'CANCELLED'),
+               0, 0, NOW()
+        FROM maintenance_requests mr
+        LEFT JOIN equipment e ON e.id = mr.equipment_id
+        GROUP BY 1, 2, 3, 4
+    """)
+    op.execute("""
+        INSERT INTO maintenance_kpi_buckets
+            (day, equipment_id, location_id, priority, created_count, open_count, cancelled_count,
+             completed_count, repair_seconds, created_at)
+        SELECT mr.completed_at::date, COALESCE(mr.equipment_id, 0), COALESCE(e.location_id, 0), mr.priority,
+               0, 0, 0, COUNT(*),
+               SUM(GREATEST(EXTRACT(EPOCH FROM mr.completed_at - mr.created_at), 0))::bigint,
+               NOW()
+        FROM maintenance_requests mr
+        LEFT JOIN equipment e ON e.id = mr.equipment_id
+        WHERE mr.status = 'COMPLETED' AND mr.completed_at IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+        ON CONFLICT ON CONSTRAINT uq_maintenance_kpi_buckets_key DO UPDATE
+        SET completed_count = EXCLUDED.completed_count, repair_seconds = EXCLUDED.repair_seconds
+    """)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_maintenance_kpi_buckets_id'), table_name='maintenance_kpi_buckets')
+    op.drop_table('maintenance_kpi_buckets')
@@ -0,0 +1,75 @@
+"""Add the append-only maintenance request event log
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('maintenance_request_events',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('request_id', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.String(length=30), nullable=False),
+    sa.Column('actor_id', sa.Integer(), nullable=True),
+    sa.Column('from_status', postgresql.ENUM('PENDING', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED', name='requeststatus', create_type=False), nullable=True),
+    sa.Column('to_status', postgresql.ENUM('PENDING', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED', name='requeststatus', create_type=False), nullable=True),
+    sa.Column('changes', sa.Text(), nullable=True),
+    sa.Column('at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    # What is known of existing requests: creation and their current status (reached at
+    # completed_at for completed requests; other transitions were never recorded)
+    op.execute("""
+        INSERT INTO maintenance_request_events (request_id, event_type, actor_id, to_status, changes, at)
+        SELECT id, 'created', submitter_id, 'PENDING', '{"backfilled": true}', created_at
+        FROM maintenance_requests
+        ORDER BY created_at, id
+    """)
+    op.execute("""
+        INSERT INTO maintenance_request_events (request_id, event_type, actor_id, to_status, changes, at)
+        SELECT id, 'status_changed',
+               CASE WHEN status = 'COMPLETED' THEN completed_by_id END,
+               status, '{"backfilled": true}',
+               CASE WHEN status = 'COMPLETED' THEN COALESCE(completed_at, created_at) ELSE created_at END
+        FROM maintenance_requests
+        WHERE status <> 'PENDING'
+        ORDER BY 5, id
+    """)
+
+    # Created after the backfill so the inserts do not maintain them row by row
+    op.create_index('ix_maintenance_request_events_request_at', 'maintenance_request_events', ['request_id', 'at'], unique=False)
+    op.create_index('ix_maintenance_request_events_at', 'maintenance_request_events', ['at'], unique=False)
+
+    # Append-only: reject updates and deletes
+    op.execute("""
+        CREATE FUNCTION maintenance_request_events_append_only() RETURNS trigger AS $$
+        BEGIN
+            RAISE EXCEPTION 'maintenance_request_events is append-only';
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER maintenance_request_events_append_only
+        BEFORE UPDATE OR DELETE ON maintenance_request_events
+        FOR EACH STATEMENT EXECUTE FUNCTION maintenance_request_events_append_only()
+    """)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER maintenance_request_events_append_only ON maintenance_request_events")
+    op.execute("DROP FUNCTION maintenance_request_events_append_only()")
+    op.drop_index('ix_maintenance_request_events_at', table_name='maintenance_request_events')
+    op.drop_index('ix_maintenance_request_events_request_at', table_name='maintenance_request_events')
+    op.drop_table('maintenance_request_events')
@@ -0,0 +1,45 @@
+"""Add work queue claims to maintenance requests
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('maintenance_requests', sa.Column('assigned_to_id', sa.Integer(), nullable=True))
+    op.add_column('maintenance_requests', sa.Column('claimed_at', sa.DateTime(), nullable=True))
+    op.add_column('maintenance_requests', sa.Column('claim_expires_at', sa.DateTime(), nullable=True))
+    op.create_foreign_key('fk_maintenance_requests_assigned_to_id', 'maintenance_requests', 'users',
+                          ['assigned_to_id'], ['id'], ondelete='SET NULL')
+
+    # Claim order: most urgent (last enum value) first, then requested completion date, then age
+    op.execute("""
+        CREATE INDEX ix_maintenance_requests_claim_queue
+        ON maintenance_requests (priority DESC, requested_completion_date, created_at, id)
+        WHERE status = 'PENDING' AND assigned_to_id IS NULL
+    """)
+    op.execute("""
+        CREATE INDEX ix_maintenance_requests_claim_expires
+        ON maintenance_requests (claim_expires_at)
+        WHERE status = 'IN_PROGRESS'
+    """)
+    # Requests already in progress have no known assignee; they stay unclaimed and never expire
+
+
+def downgrade():
+    op.drop_index('ix_maintenance_requests_claim_expires', table_name='maintenance_requests')
+    op.drop_index('ix_maintenance_requests_claim_queue', table_name='maintenance_requests')
+    op.drop_constraint('fk_maintenance_requests_assigned_to_id', 'maintenance_requests', type_='foreignkey')
+    op.drop_column('maintenance_requests', 'claim_expires_at')
+    op.drop_column('maintenance_requests', 'claimed_at')
+    op.drop_column('maintenance_requests', 'assigned_to_id')
@@ -0,0 +1,74 @@
+"""Add SLA due dates and breaches to maintenance requests
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def _hours_case(hours):
+    """CASE expression giving the default target interval of a request's priority"""
+    whens = " ".join(f"WHEN '{priority}' THEN INTERVAL '{value} hours'" for priority, value in hours.items())
+    return f"CASE priority {whens} END"
+
+
+def upgrade():
+    op.add_column('maintenance_requests', sa.Column('response_due_at', sa.DateTime(), nullable=True))
+    op.add_column('maintenance_requests', sa.Column('resolution_due_at', sa.DateTime(), nullable=True))
+    op.add_column('maintenance_requests', sa.Column('sla_breached_at', sa.DateTime(), nullable=True))
+    op.add_column('maintenance_requests', sa.Column('sla_breach', sa.String(length=20), nullable=True))
+    op.add_column('maintenance_requests', sa.Column('sla_notified_at', sa.DateTime(), nullable=True))
+
+    # Backfill due dates with the default targets (SLA_RESPONSE_HOURS / SLA_RESOLUTION_HOURS)
+    response = _hours_case({'URGENT': 1, 'HIGH': 4, 'MEDIUM': 24, 'LOW': 72})
+    resolution = _hours_case({'URGENT': 8, 'HIGH': 48, 'MEDIUM': 120, 'LOW': 336})
+    op.execute(f"""
+        UPDATE maintenance_requests
+        SET response_due_at = created_at + {response},
+            resolution_due_at = LEAST(
+                created_at + {resolution},
+                GREATEST(COALESCE(requested_completion_date, created_at + {resolution}), created_at)
+            )
+    """)
+
+    # Mark open requests already past due, as notified so the first evaluator run sends no backlog digest
+    op.execute("""
+        UPDATE maintenance_requests
+        SET sla_breached_at = response_due_at, sla_breach = 'response', sla_notified_at = NOW()
+        WHERE status = 'PENDING' AND response_due_at <= NOW()
+    """)
+    op.execute("""
+        UPDATE maintenance_requests
+        SET sla_breached_at = resolution_due_at, sla_breach = 'resolution', sla_notified_at = NOW()
+        WHERE status IN ('PENDING', 'IN_PROGRESS') AND sla_breached_at IS NULL AND resolution_due_at <= NOW()
+    """)
+
+    op.execute("""
+        CREATE INDEX ix_maintenance_requests_sla_open
+        ON maintenance_requests (sla_breached_at, resolution_due_at)
+        WHERE status IN ('PENDING', 'IN_PROGRESS')
+    """)
+    op.execute("""
+        CREATE INDEX ix_maintenance_requests_sla_response
+        ON maintenance_requests (response_due_at)
+        WHERE status = 'PENDING' AND sla_breached_at IS NULL
+    """)
+
+
+def downgrade():
+    op.drop_index('ix_maintenance_requests_sla_response', table_name='maintenance_requests')
+    op.drop_index('ix_maintenance_requests_sla_open', table_name='maintenance_requests')
+    op.drop_column('maintenance_requests', 'sla_notified_at')
+    op.drop_column('maintenance_requests', 'sla_breach')
+    op.drop_column('maintenance_requests', 'sla_breached_at')
+    op.drop_column('maintenance_requests', 'resolution_due_at')
+    op.drop_column('maintenance_requests', 'response_due_at')
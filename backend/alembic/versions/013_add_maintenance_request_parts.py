@@ -0,0 +1,304 @@
+"""Add structured maintenance request parts parsed from part_order_list
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+import json
+import re
+from typing import List, NamedTuple, Optional
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Parts of closed requests were used or dropped along with the request
+_BACKFILL_STATUS = {'COMPLETED': 'RECEIVED', 'CANCELLED': 'CANCELLED'}
+
+
+def upgrade():
+    op.create_table('maintenance_request_parts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('request_id', sa.Integer(), nullable=False),
+    sa.Column('line_no', sa.Integer(), nullable=False),
+    sa.Column('part_number', sa.String(length=100), nullable=False),
+    sa.Column('part_key', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('vendor', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.Enum('NEEDED', 'ORDERED', 'RECEIVED', 'CANCELLED', name='partstatus'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['request_id'], ['maintenance_requests.id'], name='fk_maintenance_request_parts_request_id', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('request_id', 'line_no', name='uq_maintenance_request_parts_line')
+    )
+    op.create_index(op.f('ix_maintenance_request_parts_id'), 'maintenance_request_parts', ['id'], unique=False)
+
+    _backfill_parts()
+
+    # Created after the backfill so the inserts do not maintain it row by row
+    op.execute("""
+        CREATE INDEX ix_maintenance_request_parts_demand
+        ON maintenance_request_parts (part_key text_pattern_ops, request_id)
+        INCLUDE (quantity, status)
+        WHERE status IN ('NEEDED', 'ORDERED')
+    """)
+
+    # The part_key normalization in SQL (same as app.utils.parts_parser.part_key), so other
+    # tools such as Kosh can index their own part numbers by it and join on equal keys
+    op.execute("""
+        CREATE FUNCTION maintenance_part_key(part_number TEXT) RETURNS VARCHAR(100) AS $$
+            SELECT LEFT(REGEXP_REPLACE(UPPER(part_number), '[^0-9A-Z]+', '', 'g'), 100)
+        $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE
+    """)
+
+    # Outstanding demand per part; a join on part_key is pushed down to the demand index
+    op.execute("""
+        CREATE VIEW maintenance_part_demand AS
+        SELECT p.part_key,
+               MIN(p.part_number) AS part_number,
+               SUM(CASE WHEN p.status = 'NEEDED' THEN p.quantity ELSE 0 END) AS needed_quantity,
+               SUM(CASE WHEN p.status = 'ORDERED' THEN p.quantity ELSE 0 END) AS ordered_quantity,
+               COUNT(DISTINCT p.request_id) AS request_count,
+               MIN(r.created_at) AS oldest_request_at
+        FROM maintenance_request_parts p
+        JOIN maintenance_requests r ON r.id = p.request_id
+        WHERE p.status IN ('NEEDED', 'ORDERED')
+          AND r.status IN ('PENDING', 'IN_PROGRESS')
+        GROUP BY p.part_key
+    """)
+
+
+def _backfill_parts():
+    """Parse the part_order_list of every existing request into part lines"""
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(sa.text("""
+            SELECT id, status, part_order_list
+            FROM maintenance_requests
+            WHERE id > :last_id AND part_order_list IS NOT NULL AND part_order_list <> ''
+            ORDER BY id
+            LIMIT :limit
+        """), {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE}).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+
+        lines = [{
+            "request_id": row.id,
+            "line_no": line_no,
+            "part_number": part.part_number,
+            "part_key": part_key(part.part_number),
+            "description": part.description,
+            "quantity": part.quantity,
+            "vendor": part.vendor,
+            "status": _BACKFILL_STATUS.get(row.status, 'NEEDED')
+        } for row in rows for line_no, part in enumerate(parse_part_list(row.part_order_list), start=1)]
+        if lines:
+            bind.execute(sa.text("""
+                INSERT INTO maintenance_request_parts
+                    (request_id, line_no, part_number, part_key, description, quantity, vendor, status, updated_at, created_at)
+                VALUES
+                    (:request_id, :line_no, :part_number, :part_key, :description, :quantity, :vendor,
+                     CAST(:status AS partstatus), NOW(), NOW())
+            """), lines)
+
+
+# Frozen copy of app.utils.parts_parser as of this revision, so later changes
+# to the live parser do not change what this migration backfills
+# Longest stored part number / vendor, and the largest quantity a part line accepts
+PART_NUMBER_MAX = 100
+VENDOR_MAX = 255
+QUANTITY_MAX = 1000000
+
+# One item per line, semicolon or comma (a comma inside a number such as "1,000" is kept)
+_ITEM_SEPARATOR = re.compile(r"[\r\n;]+|,(?!\d{3}\b)")
+_BULLET = re.compile(r"^\s*(?:[-*•]+|\d+[.)])\s+")
+
+# "from McMaster", "@ Digikey", "vendor: Grainger", "(supplier Mouser)"
+_VENDOR = re.compile(
+    r"\s*(?:\(\s*(?:vendor|supplier)\s*:?\s*([^)]+)\)|(?:\bfrom\b|@|\bvendor\s*:|\bsupplier\s*:)\s*(.+))\s*$",
+    re.IGNORECASE
+)
+
+# "2x", "2 x", "2 pcs", "qty 2", or a bare count of up to three digits or with thousands
+# separators ("2 drive belts", "1,000 screws"); other bare numbers are more likely part
+# numbers ("6204 bearing")
+_QTY_PREFIX = re.compile(
+    r"^\s*(?:qty\s*:?\s*(\d[\d,]*)\s*(?:x\b)?|(\d[\d,]*)\s*(?:x\b|x(?=\S)|pcs?\b|pieces?\b|ea\b|units?\b)|(\d{1,3}(?:,\d{3})*)(?=\s))\s*",
+    re.IGNORECASE
+)
+# "x2", "qty 2", "(2)", "(qty: 2)", "2 pcs"
+_QTY_SUFFIX = re.compile(
+    r"\s*(?:[-:,]\s*)?(?:\(\s*(?:qty\s*:?\s*)?(\d[\d,]*)\s*(?:pcs?|ea|units?)?\s*\)|x\s*(\d[\d,]*)|qty\s*:?\s*(\d[\d,]*)|(\d[\d,]*)\s*(?:pcs?|pieces?|ea|units?))\s*$",
+    re.IGNORECASE
+)
+
+_KEY_STRIP = re.compile(r"[^0-9A-Z]+")
+
+
+class ParsedPart(NamedTuple):
+    """One line of a parts list"""
+    part_number: str
+    quantity: int = 1
+    vendor: Optional[str] = None
+    description: Optional[str] = None
+
+
+def part_key(part_number: Optional[str]) -> str:
+    """
+    Canonical key of a part number
+
+    Uppercases and drops everything but letters and digits, so "abc-123",
+    "ABC 123" and "ABC123" share the key "ABC123". Inventory lookups join
+    on this key.
+
+    Args:
+        part_number: Part number as entered
+
+    Returns:
+        Key (empty if the part number has no letters or digits)
+    """
+    if not part_number:
+        return ""
+    return _KEY_STRIP.sub("", part_number.upper())[:PART_NUMBER_MAX]
+
+
+def _quantity(text: Optional[str]) -> int:
+    """Parse a quantity, clamped to 1..QUANTITY_MAX"""
+    try:
+        return min(QUANTITY_MAX, max(1, int(str(text).replace(",", ""))))
+    except (TypeError, ValueError):
+        return 1
+
+
+def _clip(value: Optional[str], limit: int) -> Optional[str]:
+    """Collapse whitespace and truncate; None if nothing is left"""
+    if value is None:
+        return None
+    value = " ".join(str(value).split()).strip(" -:,")
+    return value[:limit] or None
+
+
+def parse_part_item(item: str) -> Optional[ParsedPart]:
+    """
+    Parse one free-text parts list entry
+
+    The quantity may lead or trail ("2x 6204-2RS", "6204-2RS x2",
+    "6204-2RS (qty 2)"), a vendor may trail ("from McMaster"). The first
+    word containing a digit is taken as the part number and the other
+    words as its description; an entry without one ("drive belt") is
+    kept whole as the part number.
+
+    Args:
+        item: One entry of the list
+
+    Returns:
+        Parsed part, or None for an empty entry
+    """
+    text = _BULLET.sub("", item).strip()
+    if not part_key(text):
+        return None
+
+    vendor = None
+    match = _VENDOR.search(text)
+    if match and match.start() > 0:
+        vendor = match.group(1) or match.group(2)
+        text = text[:match.start()]
+
+    quantity = None
+    match = _QTY_PREFIX.match(text)
+    # A leading number is only a quantity if something is left to be the part
+    if match and part_key(text[match.end():]):
+        quantity = _quantity(next(group for group in match.groups() if group))
+        text = text[match.end():]
+    else:
+        match = _QTY_SUFFIX.search(text)
+        if match and match.start() > 0 and part_key(text[:match.start()]):
+            quantity = _quantity(next(group for group in match.groups() if group))
+            text = text[:match.start()]
+
+    words = text.split()
+    numbered = [word for word in words if any(char.isdigit() for char in word)]
+    if numbered:
+        part_number = numbered[0].strip("()[],:")
+        description = " ".join(word for word in words if word is not numbered[0])
+    else:
+        part_number, description = text, None
+
+    part_number = _clip(part_number, PART_NUMBER_MAX)
+    if not part_key(part_number):
+        return None
+    return ParsedPart(part_number, quantity or 1, _clip(vendor, VENDOR_MAX), _clip(description, 255))
+
+
+def _parse_json_item(item) -> Optional[ParsedPart]:
+    """Parse one element of a JSON parts list (a string or an object)"""
+    if isinstance(item, str):
+        return parse_part_item(item)
+    if not isinstance(item, dict):
+        return None
+
+    fields = {str(name).lower(): value for name, value in item.items()}
+    part_number = next((fields[name] for name in ("part_number", "part", "pn", "number", "sku", "name") if fields.get(name)), None)
+    if part_number is None or not part_key(str(part_number)):
+        return None
+    description = fields.get("description")
+    if description is None and part_number is not fields.get("name"):
+        description = fields.get("name")
+    return ParsedPart(
+        _clip(str(part_number), PART_NUMBER_MAX),
+        _quantity(fields.get("quantity", fields.get("qty"))),
+        _clip(fields.get("vendor") or fields.get("supplier"), VENDOR_MAX),
+        _clip(description, 255)
+    )
+
+
+def parse_part_list(text: Optional[str]) -> List[ParsedPart]:
+    """
+    Parse a request's part_order_list
+
+    Accepts what the field has held over time: a JSON array of strings or
+    of objects with part_number/qty/vendor keys, or free text with one
+    part per line, semicolon or comma. Unparseable entries are skipped.
+
+    Args:
+        text: part_order_list value
+
+    Returns:
+        Parts in list order
+    """
+    if not text or not text.strip():
+        return []
+
+    stripped = text.strip()
+    if stripped[0] in "[{":
+        try:
+            data = json.loads(stripped)
+        except (json.JSONDecodeError, TypeError, ValueError):
+            data = None
+        if isinstance(data, dict):
+            data = [data]
+        if isinstance(data, list):
+            return [part for part in map(_parse_json_item, data) if part]
+
+    return [part for part in map(parse_part_item, _ITEM_SEPARATOR.split(text)) if part]
+
+
+def downgrade():
+    op.execute("DROP VIEW maintenance_part_demand")
+    op.execute("DROP FUNCTION maintenance_part_key(TEXT)")
+    op.drop_index('ix_maintenance_request_parts_demand', table_name='maintenance_request_parts')
+    op.drop_index(op.f('ix_maintenance_request_parts_id'), table_name='maintenance_request_parts')
+    op.drop_table('maintenance_request_parts')
+    sa.Enum(name='partstatus').drop(op.get_bind(), checkfirst=True)
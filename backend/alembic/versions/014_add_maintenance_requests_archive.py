@@ -0,0 +1,51 @@
+"""Add the maintenance request archive for old closed requests
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Same columns and NOT NULL constraints as the hot table, without defaults, keys or indexes.
+    # Later migrations adding a column to maintenance_requests must add it here as well.
+    op.execute("CREATE TABLE maintenance_requests_archive (LIKE maintenance_requests)")
+    op.execute("ALTER TABLE maintenance_requests_archive ADD PRIMARY KEY (id)")
+    op.add_column('maintenance_requests_archive', sa.Column('parts_json', sa.Text(), nullable=True))
+    op.add_column('maintenance_requests_archive', sa.Column('archived_at', sa.DateTime(), nullable=False))
+
+    op.create_index('ix_maintenance_requests_archive_created_at', 'maintenance_requests_archive', ['created_at'], unique=False)
+    op.create_index('ix_maintenance_requests_archive_submitter_created', 'maintenance_requests_archive',
+                    ['submitter_id', 'created_at'], unique=False)
+    op.create_index('ix_maintenance_requests_archive_equipment_created', 'maintenance_requests_archive',
+                    ['equipment_id', 'created_at'], unique=False)
+
+    # The mover's scan: closed requests, oldest first. Existing history is moved by the
+    # request_archiver job in batches rather than in this migration's transaction.
+    op.execute("""
+        CREATE INDEX ix_maintenance_requests_archivable
+        ON maintenance_requests (created_at)
+        WHERE status IN ('COMPLETED', 'CANCELLED')
+    """)
+
+
+def downgrade():
+    # Archived requests return to the hot table (without their part lines)
+    columns = ", ".join(name for (name,) in op.get_bind().execute(sa.text("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_name = 'maintenance_requests' AND table_schema = current_schema()
+        ORDER BY ordinal_position
+    """)))
+    op.execute(f"INSERT INTO maintenance_requests ({columns}) SELECT {columns} FROM maintenance_requests_archive")
+    op.execute("DELETE FROM app_state WHERE key LIKE 'maintenance_archive.count.%'")
+    op.drop_index('ix_maintenance_requests_archivable', table_name='maintenance_requests')
+    op.drop_table('maintenance_requests_archive')
@@ -0,0 +1,30 @@
+"""Record the writing transaction of maintenance request events
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '016'
+down_revision = '015'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing events are all committed and sort first. The constant default fills them
+    # without rewriting rows (so the append-only trigger is not involved); new events
+    # then take the id of the transaction that writes them.
+    op.add_column('maintenance_request_events',
+                  sa.Column('txid', sa.BigInteger(), nullable=False, server_default=sa.text('0')))
+    op.alter_column('maintenance_request_events', 'txid', server_default=sa.text('txid_current()'))
+    op.create_index('ix_maintenance_request_events_txid_id', 'maintenance_request_events', ['txid', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_maintenance_request_events_txid_id', table_name='maintenance_request_events')
+    op.drop_column('maintenance_request_events', 'txid')
@@ -0,0 +1,23 @@
+"""Record what the first request of an idempotency key created
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '017'
+down_revision = '016'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('idempotency_keys', sa.Column('resource_id', sa.Text(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('idempotency_keys', 'resource_id')
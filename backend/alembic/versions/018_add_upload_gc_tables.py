@@ -0,0 +1,92 @@
+"""Move upload GC orphans out of app_state and add the sweep reference snapshot
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from datetime import datetime
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '018'
+down_revision = '017'
+branch_labels = None
+depends_on = None
+
+
+def _read_gc_state(bind):
+    value = bind.execute(sa.text("SELECT value FROM app_state WHERE key = 'upload_gc'")).scalar()
+    return json.loads(value) if value else None
+
+
+def _write_gc_state(bind, state):
+    bind.execute(
+        sa.text("UPDATE app_state SET value = :value, updated_at = :now WHERE key = 'upload_gc'"),
+        {"value": json.dumps(state), "now": datetime.utcnow()}
+    )
+
+
+def upgrade():
+    upload_orphans = op.create_table('upload_orphans',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('orphaned_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('filename')
+    )
+    op.create_index(op.f('ix_upload_orphans_id'), 'upload_orphans', ['id'], unique=False)
+    op.create_index(op.f('ix_upload_orphans_orphaned_at'), 'upload_orphans', ['orphaned_at'], unique=False)
+
+    op.create_table('upload_gc_references',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('shard', sa.String(length=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_upload_gc_references_id'), 'upload_gc_references', ['id'], unique=False)
+    op.create_index(op.f('ix_upload_gc_references_shard'), 'upload_gc_references', ['shard'], unique=False)
+
+    # Orphans were a filename -> epoch seconds map inside the GC state. The
+    # sweep in progress restarts, as it has no reference snapshot yet.
+    bind = op.get_bind()
+    state = _read_gc_state(bind)
+    if state is None:
+        return
+    now = datetime.utcnow()
+    orphans = state.pop("orphans", None) or {}
+    if orphans:
+        op.bulk_insert(upload_orphans, [
+            {"filename": filename, "orphaned_at": datetime.utcfromtimestamp(orphaned_at), "created_at": now}
+            for filename, orphaned_at in orphans.items()
+        ])
+    state["next_shard"] = 0
+    _write_gc_state(bind, state)
+
+
+def downgrade():
+    bind = op.get_bind()
+    state = _read_gc_state(bind)
+    if state is not None:
+        rows = bind.execute(sa.text("SELECT filename, orphaned_at FROM upload_orphans").columns(
+            filename=sa.String, orphaned_at=sa.DateTime
+        ))
+        state["orphans"] = {
+            filename: (orphaned_at - datetime(1970, 1, 1)).total_seconds()
+            for filename, orphaned_at in rows
+        }
+        state.pop("references_taken_at", None)
+        state["next_shard"] = 0
+        _write_gc_state(bind, state)
+
+    op.drop_index(op.f('ix_upload_gc_references_shard'), table_name='upload_gc_references')
+    op.drop_index(op.f('ix_upload_gc_references_id'), table_name='upload_gc_references')
+    op.drop_table('upload_gc_references')
+    op.drop_index(op.f('ix_upload_orphans_orphaned_at'), table_name='upload_orphans')
+    op.drop_index(op.f('ix_upload_orphans_id'), table_name='upload_orphans')
+    op.drop_table('upload_orphans')
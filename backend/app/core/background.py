@@ -0,0 +1,87 @@
+"""
+Periodic background jobs
+Runs registered maintenance tasks on an interval inside the API process
+"""
+
+import asyncio
+import logging
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.db.base import engine, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PeriodicJob:
+    """A job function taking a database session, run every interval_seconds"""
+    name: str
+    interval_seconds: float
+    func: Callable[[Session], object]
+
+_jobs: Dict[str, PeriodicJob] = {}
+_tasks: List[asyncio.Task] = []
+
+def register_job(name: str, interval_seconds: float, func: Callable[[Session], object]) -> None:
+    """Register a periodic job"""
+    _jobs[name] = PeriodicJob(name=name, interval_seconds=interval_seconds, func=func)
+
+def get_jobs() -> Dict[str, PeriodicJob]:
+    """Get all registered jobs by name"""
+    return dict(_jobs)
+
+def run_job_once(job: PeriodicJob):
+    """
+    Run a job in its own session
+
+    On PostgreSQL an advisory lock keeps several workers from running the
+    same job at the same time; a worker that cannot get the lock skips the run.
+    The session is bound to one connection so the lock outlives the job's commits.
+    """
+    lock_key = zlib.crc32(job.name.encode())
+    try:
+        with engine.connect() as connection:
+            use_lock = connection.dialect.name == "postgresql"
+            if use_lock:
+                acquired = connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": lock_key}).scalar()
+                connection.commit()
+                if not acquired:
+                    logger.info(f"Background job {job.name} is running elsewhere, skipping")
+                    return None
+
+            db = SessionLocal(bind=connection)
+            try:
+                return job.func(db)
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+                if use_lock:
+                    connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": lock_key})
+                    connection.commit()
+    except Exception as e:
+        logger.error(f"Background job {job.name} failed: {e}", exc_info=True)
+        return None
+
+async def _run_periodically(job: PeriodicJob):
+    """Run a job forever, waiting interval_seconds between runs"""
+    while True:
+        await asyncio.sleep(job.interval_seconds)
+        await run_in_threadpool(run_job_once, job)
+
+def start_background_jobs() -> None:
+    """Start all registered jobs on the running event loop"""
+    for job in _jobs.values():
+        _tasks.append(asyncio.create_task(_run_periodically(job), name=f"job:{job.name}"))
+        logger.info(f"Background job {job.name} scheduled every {job.interval_seconds}s")
+
+async def stop_background_jobs() -> None:
+    """Cancel all running job loops"""
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
@@ -4,10 +4,19 @@ Handles environment variables and application settings
 """
 
 import os
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
 
+def _parse_hours(value: str) -> Dict[str, float]:
+    """Parse "key:hours,key:hours" into a dict"""
+    hours = {}
+    for item in value.split(","):
+        key, _, number = item.partition(":")
+        if key.strip() and number.strip():
+            hours[key.strip().lower()] = float(number)
+    return hours
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables"""
 
@@ -49,6 +58,78 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD", "")
     FROM_EMAIL: str = os.getenv("FROM_EMAIL", "")
     FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://acidashboard.aci.local:2005")
+
+    # Background jobs (periodic maintenance tasks run inside the API process)
+    BACKGROUND_JOBS_ENABLED: bool = os.getenv("BACKGROUND_JOBS_ENABLED", "true").lower() == "true"
+
+    # Upload storage garbage collection
+    UPLOAD_GC_INTERVAL_SECONDS: int = int(os.getenv("UPLOAD_GC_INTERVAL_SECONDS", "300"))
+    UPLOAD_GC_GRACE_HOURS: float = float(os.getenv("UPLOAD_GC_GRACE_HOURS", "24"))
+    UPLOAD_GC_SHARDS_PER_RUN: int = int(os.getenv("UPLOAD_GC_SHARDS_PER_RUN", "16"))
+    UPLOAD_GC_SWEEP_HOURS: float = float(os.getenv("UPLOAD_GC_SWEEP_HOURS", "6"))  # Reconciliation of never-referenced uploads
+
+    # Seconds a worker trusts its cached tool catalog before re-checking the version
+    TOOL_CATALOG_CHECK_SECONDS: float = float(os.getenv("TOOL_CATALOG_CHECK_SECONDS", "5"))
+
+    # Bulk user import (0 workers = one per CPU)
+    USER_IMPORT_MAX_ROWS: int = int(os.getenv("USER_IMPORT_MAX_ROWS", "10000"))
+    USER_IMPORT_HASH_WORKERS: int = int(os.getenv("USER_IMPORT_HASH_WORKERS", "0"))
+
+    # Preventive maintenance scheduler (generates PM requests due within the lookahead)
+    PM_SCHEDULER_INTERVAL_SECONDS: int = int(os.getenv("PM_SCHEDULER_INTERVAL_SECONDS", "900"))
+    PM_LOOKAHEAD_DAYS: float = float(os.getenv("PM_LOOKAHEAD_DAYS", "7"))
+    PM_BATCH_SIZE: int = int(os.getenv("PM_BATCH_SIZE", "500"))
+    PM_MAX_BATCHES_PER_RUN: int = int(os.getenv("PM_MAX_BATCHES_PER_RUN", "200"))
+
+    # Maintenance KPI buckets are updated incrementally; this pass corrects any drift
+    KPI_RECONCILE_INTERVAL_SECONDS: int = int(os.getenv("KPI_RECONCILE_INTERVAL_SECONDS", "86400"))
+
+    # Work queue: claims lapse back to pending unless renewed within WORK_QUEUE_CLAIM_MINUTES
+    WORK_QUEUE_CLAIM_MINUTES: float = float(os.getenv("WORK_QUEUE_CLAIM_MINUTES", "120"))
+    WORK_QUEUE_MAX_CLAIMS_PER_USER: int = int(os.getenv("WORK_QUEUE_MAX_CLAIMS_PER_USER", "5"))
+    CLAIM_EXPIRY_INTERVAL_SECONDS: int = int(os.getenv("CLAIM_EXPIRY_INTERVAL_SECONDS", "60"))
+
+    # SLA targets per priority in hours ("priority:hours,..."): response until work
+    # starts, resolution until completed (or the requested completion date if earlier)
+    SLA_RESPONSE_HOURS: str = os.getenv("SLA_RESPONSE_HOURS", "urgent:1,high:4,medium:24,low:72")
+    SLA_RESOLUTION_HOURS: str = os.getenv("SLA_RESOLUTION_HOURS", "urgent:8,high:48,medium:120,low:336")
+    SLA_EVALUATOR_INTERVAL_SECONDS: int = int(os.getenv("SLA_EVALUATOR_INTERVAL_SECONDS", "300"))
+    SLA_DIGEST_MAX_ITEMS: int = int(os.getenv("SLA_DIGEST_MAX_ITEMS", "200"))
+
+    @property
+    def sla_response_hours(self) -> Dict[str, float]:
+        """Parse SLA_RESPONSE_HOURS into {priority: hours}"""
+        return _parse_hours(self.SLA_RESPONSE_HOURS)
+
+    @property
+    def sla_resolution_hours(self) -> Dict[str, float]:
+        """Parse SLA_RESOLUTION_HOURS into {priority: hours}"""
+        return _parse_hours(self.SLA_RESOLUTION_HOURS)
+
+    # Archive: completed and cancelled requests older than this move to maintenance_requests_archive
+    MAINTENANCE_ARCHIVE_AFTER_DAYS: float = float(os.getenv("MAINTENANCE_ARCHIVE_AFTER_DAYS", "365"))
+    MAINTENANCE_ARCHIVE_INTERVAL_SECONDS: int = int(os.getenv("MAINTENANCE_ARCHIVE_INTERVAL_SECONDS", "3600"))
+    MAINTENANCE_ARCHIVE_BATCH_SIZE: int = int(os.getenv("MAINTENANCE_ARCHIVE_BATCH_SIZE", "500"))
+    MAINTENANCE_ARCHIVE_MAX_BATCHES_PER_RUN: int = int(os.getenv("MAINTENANCE_ARCHIVE_MAX_BATCHES_PER_RUN", "20"))
+
+    # Live event streams (events fan out through Redis pub/sub when REDIS_URL is set)
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
+    EVENT_STREAM_HEARTBEAT_SECONDS: float = float(os.getenv("EVENT_STREAM_HEARTBEAT_SECONDS", "15"))
+    EVENT_STREAM_QUEUE_SIZE: int = int(os.getenv("EVENT_STREAM_QUEUE_SIZE", "256"))
+    EVENT_STREAM_REPLAY_LIMIT: int = int(os.getenv("EVENT_STREAM_REPLAY_LIMIT", "1000"))
+    EVENT_STREAM_MAX_CLIENTS: int = int(os.getenv("EVENT_STREAM_MAX_CLIENTS", "500"))
+    EVENT_STREAM_TICKET_SECONDS: int = int(os.getenv("EVENT_STREAM_TICKET_SECONDS", "60"))  # Lifetime of a stream ticket (to connect, not to stay connected)
+
+    # Idempotency-Key responses are kept in Redis (or idempotency_keys without it) for IDEMPOTENCY_TTL_HOURS;
+    # a first request still running after IDEMPOTENCY_LOCK_SECONDS is presumed dead and may be retried
+    IDEMPOTENCY_TTL_HOURS: float = float(os.getenv("IDEMPOTENCY_TTL_HOURS", "24"))
+    IDEMPOTENCY_LOCK_SECONDS: int = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "120"))
+    IDEMPOTENCY_GC_INTERVAL_SECONDS: int = int(os.getenv("IDEMPOTENCY_GC_INTERVAL_SECONDS", "3600"))
+
+    # /api/batch: sub-requests per batch, how many run at once, and how long each may take
+    BATCH_MAX_REQUESTS: int = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "6"))
+    BATCH_SUBREQUEST_TIMEOUT_SECONDS: float = float(os.getenv("BATCH_SUBREQUEST_TIMEOUT_SECONDS", "30"))
     
     class Config:
         case_sensitive = True
@@ -3,7 +3,7 @@ Dependencies for authentication and authorization
 """
 
 from typing import Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.db.session import get_db
@@ -13,6 +13,7 @@ from app.models.user import User
 
 # OAuth2 security scheme
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -41,6 +42,29 @@ def get_current_active_user(current_user: User = Depends(get_current_user)) -> U
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
+def get_stream_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    ticket: Optional[str] = Query(None, description="Stream ticket, for clients that cannot send headers (EventSource)"),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Get the active user of a streaming request
+
+    From the Authorization header or a stream ticket. Tickets expire within a
+    minute and open nothing but streams, so one left in an access log is stale.
+    """
+    if credentials:
+        user = AuthService.get_user_from_token(db, credentials.credentials, "access")
+    else:
+        user = AuthService.get_user_from_token(db, ticket, "stream") if ticket else None
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
 def require_role(role_name: str):
     """Dependency factory for role-based access control"""
     def role_checker(current_user: User = Depends(get_current_active_user)) -> User:
@@ -82,6 +106,19 @@ def require_maintenance_or_superuser(current_user: User = Depends(get_current_ac
         )
     return current_user
 
+def require_maintenance_or_inventory(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+) -> User:
+    """Require maintenance or superuser role, or access to the Kosh (aci_inventory) tool"""
+    has_access = any(role.name in ["superuser", "maintenance"] for role in current_user.roles)
+    if not has_access and not UserService.has_tool_access(current_user, "aci_inventory", db):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied. Required role: superuser or maintenance, or tool access: aci_inventory"
+        )
+    return current_user
+
 # Tool access dependencies
 require_compare_tool = require_tool_access("compare_tool")
 require_aci_excel_migration = require_tool_access("aci_excel_migration")
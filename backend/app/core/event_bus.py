@@ -0,0 +1,163 @@
+"""
+Event fan-out
+Delivers committed maintenance request events to live streams in every worker
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable, List, Optional, Set
+import orjson
+from app.core.config import settings
+from app.core.responses import ORJSON_OPTIONS
+
+try:
+    import redis
+    import redis.asyncio as redis_asyncio
+except ImportError:  # pragma: no cover - redis is in requirements.txt
+    redis = None
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+# Seconds to stop trying Redis after it failed, so commits do not wait on timeouts
+REDIS_RETRY_SECONDS = 30
+
+
+class Subscription:
+    """
+    One live stream's bounded queue of events
+
+    A stream that cannot keep up is not allowed to grow its queue: on
+    overflow the queue is dropped and the stream marked lagged, and it
+    catches up from the event log instead. None in the queue wakes it.
+    """
+
+    def __init__(self, accepts: Callable[[dict], bool], max_queue: int):
+        self.accepts = accepts
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.lagged = False
+
+    def offer(self, payload: dict) -> None:
+        """Queue an event if the stream may see it"""
+        if self.lagged or not self.accepts(payload):
+            return
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.mark_lagged()
+
+    def mark_lagged(self) -> None:
+        """Drop queued events and make the stream replay from the event log"""
+        self.lagged = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class EventBus:
+    """
+    Publish/subscribe for maintenance request events
+
+    With REDIS_URL set, events are published to a Redis channel and each
+    worker runs one listener that hands them to its local subscriptions,
+    so a change made in any worker reaches streams in all of them. Without
+    Redis, or while it is unreachable, events are delivered to the local
+    worker only.
+    """
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self._subscriptions: Set[Subscription] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._publisher = None
+        self._redis_retry_at = 0.0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def publish(self, payloads: List[dict]) -> None:
+        """
+        Publish committed events; called from request threads after commit
+
+        Args:
+            payloads: Serialized events, each with the request's submitter_id
+        """
+        if not payloads:
+            return
+
+        if settings.REDIS_URL and redis is not None and time.monotonic() >= self._redis_retry_at:
+            try:
+                if self._publisher is None:
+                    self._publisher = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=1, socket_connect_timeout=1)
+                self._publisher.publish(self.channel, orjson.dumps(payloads, option=ORJSON_OPTIONS))
+                return
+            except redis.RedisError as e:
+                self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+                logger.warning(f"Event publish to Redis failed, delivering locally: {e}")
+
+        self._dispatch_threadsafe(payloads)
+
+    async def subscribe(self, accepts: Callable[[dict], bool]) -> Subscription:
+        """
+        Open a subscription on the running event loop
+
+        Args:
+            accepts: Whether a stream may see an event
+
+        Returns:
+            Subscription to read and later unsubscribe
+        """
+        self._loop = asyncio.get_running_loop()
+        if settings.REDIS_URL and redis_asyncio is not None and (self._listener is None or self._listener.done()):
+            self._listener = asyncio.create_task(self._listen(), name=f"event-bus:{self.channel}")
+
+        subscription = Subscription(accepts, settings.EVENT_STREAM_QUEUE_SIZE)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Close a subscription"""
+        self._subscriptions.discard(subscription)
+
+    def _dispatch_threadsafe(self, payloads: List[dict]) -> None:
+        """Hand events to local subscriptions from any thread"""
+        if self._loop is None or not self._subscriptions or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._dispatch, payloads)
+
+    def _dispatch(self, payloads: List[dict]) -> None:
+        """Hand events to local subscriptions (event loop thread)"""
+        for subscription in list(self._subscriptions):
+            for payload in payloads:
+                subscription.offer(payload)
+
+    async def _listen(self) -> None:
+        """Relay the Redis channel to local subscriptions until cancelled"""
+        delay = 1
+        while True:
+            client = redis_asyncio.Redis.from_url(settings.REDIS_URL)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    delay = 1
+                    async for message in pubsub.listen():
+                        if message.get("type") == "message":
+                            self._dispatch(orjson.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Event bus listener lost Redis, retrying in {delay}s: {e}")
+            finally:
+                await client.aclose()
+
+            # Events published meanwhile were missed; streams catch up from the log
+            for subscription in list(self._subscriptions):
+                subscription.mark_lagged()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+
+
+maintenance_event_bus = EventBus("maintenance_request_events")
@@ -0,0 +1,74 @@
+"""
+JSON response classes
+orjson-backed responses used as the application default
+"""
+
+from typing import Any, Optional
+import hashlib
+import orjson
+from pydantic import TypeAdapter
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+# OPT_UTC_Z writes UTC offsets as "Z" like Pydantic does; OPT_NON_STR_KEYS
+# turns int keys into strings like the stdlib encoder
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson
+
+    Output is byte-identical to the stdlib JSONResponse for the values the
+    API returns (compact separators, UTF-8 without escaping); datetimes,
+    enums and UUIDs are encoded natively instead of raising.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def adapter_response(adapter: TypeAdapter, value: Any, status_code: int = 200) -> Response:
+    """
+    Serialize an already validated value with a cached TypeAdapter
+
+    Skips FastAPI's response_model pass, which would validate the value
+    again and walk it through jsonable_encoder before encoding.
+
+    Args:
+        adapter: TypeAdapter for the response type
+        value: Validated value of that type
+        status_code: Response status code
+
+    Returns:
+        JSON response
+    """
+    return Response(content=adapter.dump_json(value), status_code=status_code, media_type="application/json")
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a weak ETag from the values a response is derived from"""
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    Answer a conditional GET
+
+    Args:
+        request: Incoming request
+        etag: Current ETag of the resource
+
+    Returns:
+        304 response if If-None-Match matches the ETag, otherwise None
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+
+    # Weak comparison, as required for If-None-Match
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in candidates or etag.removeprefix("W/") in candidates:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+    return None
@@ -51,10 +51,16 @@ def create_refresh_token(
     encoded_jwt = jwt.encode(to_encode, settings.JWT_REFRESH_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
+def create_stream_ticket(subject: Union[str, Any]) -> str:
+    """Create a short-lived JWT that only opens event streams (it travels in URLs, unlike access tokens)"""
+    expire = datetime.now(timezone.utc) + timedelta(seconds=settings.EVENT_STREAM_TICKET_SECONDS)
+    to_encode = {"exp": expire, "sub": str(subject), "type": "stream"}
+    return jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+
 def verify_token(token: str, token_type: str = "access") -> Optional[str]:
     """Verify and decode JWT token"""
     try:
-        secret_key = settings.JWT_SECRET_KEY if token_type == "access" else settings.JWT_REFRESH_SECRET_KEY
+        secret_key = settings.JWT_REFRESH_SECRET_KEY if token_type == "refresh" else settings.JWT_SECRET_KEY
         payload = jwt.decode(token, secret_key, algorithms=[settings.JWT_ALGORITHM])
         
         # Verify token type
@@ -0,0 +1,92 @@
+"""
+Request coalescing
+Concurrent identical reads in a worker share one in-flight computation
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Hashable, Tuple, TypeVar
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_flights: Dict[str, "SingleFlight"] = {}
+
+
+def flight_key(scope: str, **params: Any) -> Tuple:
+    """
+    Key of a read: the permission scope it was authorized for and its normalized parameters
+
+    Parameters left at None are dropped and the rest sorted, so equal reads
+    get equal keys however they were spelled.
+    """
+    return (scope, tuple(sorted((name, value) for name, value in params.items() if value is not None)))
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls of one endpoint
+
+    The first caller for a key starts the computation in the threadpool;
+    callers arriving with the same key before it finishes await the same
+    result (or exception) instead of running it again. Nothing is cached:
+    once the computation finishes the next caller starts a new one. The
+    shared result must not be mutated by callers. A caller that is
+    cancelled does not cancel the computation for the others. The function
+    must open its own database session, since it outlives any one request,
+    and callers should release their request session before waiting:
+    otherwise a crowd of waiters can hold every pooled connection while
+    the computation waits for one.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.executions = 0
+        self.coalesced = 0
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        _flights[name] = self
+
+    async def run(self, key: Hashable, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run func(*args), or join the run already in flight for key
+
+        Args:
+            key: Identity of the read, see flight_key
+            func: Blocking function computing the result
+            *args: Arguments of func
+
+        Returns:
+            Result of the shared computation
+        """
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(run_in_threadpool(func, *args))
+            self._in_flight[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(future)
+
+    def _finish(self, key: Hashable, future: asyncio.Future) -> None:
+        """Drop a finished computation so the next caller starts afresh"""
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        # Retrieve the exception even if every caller went away
+        if not future.cancelled() and future.exception() is not None:
+            logger.debug(f"Coalesced {self.name} call failed: {future.exception()}")
+
+    def stats(self) -> dict:
+        """Counters of this endpoint"""
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight)
+        }
+
+
+def singleflight_stats() -> Dict[str, dict]:
+    """Counters of every coalesced endpoint in this worker; coalesced is the number of executions saved"""
+    return {name: flight.stats() for name, flight in sorted(_flights.items())}
@@ -0,0 +1,33 @@
+"""
+Dialect-specific INSERT for ON CONFLICT clauses
+"""
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+
+
+def conflict_insert(db: Session, table: Table):
+    """
+    INSERT for the session's database that supports on_conflict_do_nothing/on_conflict_do_update
+
+    Args:
+        db: Database session
+        table: Table to insert into
+
+    Returns:
+        Dialect insert construct
+
+    Raises:
+        HTTPException: If the database has no ON CONFLICT support
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(table)
+    if dialect == "sqlite":
+        return sqlite.insert(table)
+    raise HTTPException(
+        status_code=status.HTTP_501_NOT_IMPLEMENTED,
+        detail=f"Bulk inserts are not supported on {dialect}"
+    )
@@ -0,0 +1,22 @@
+"""
+Background job registrations
+Imported by the API on startup and by scripts/run_background_job.py
+"""
+
+from app.core.background import register_job
+from app.core.config import settings
+from app.services.idempotency import IdempotencyService
+from app.services.maintenance_archive import MaintenanceArchiveService
+from app.services.maintenance_kpi import MaintenanceKpiService
+from app.services.maintenance_schedule import MaintenanceScheduleService
+from app.services.sla import SlaService
+from app.services.upload_storage import UploadStorageService
+from app.services.work_queue import WorkQueueService
+
+register_job("upload_gc", settings.UPLOAD_GC_INTERVAL_SECONDS, UploadStorageService.run_gc_pass)
+register_job("pm_scheduler", settings.PM_SCHEDULER_INTERVAL_SECONDS, MaintenanceScheduleService.generate_due_requests)
+register_job("kpi_reconcile", settings.KPI_RECONCILE_INTERVAL_SECONDS, MaintenanceKpiService.reconcile)
+register_job("claim_expiry", settings.CLAIM_EXPIRY_INTERVAL_SECONDS, WorkQueueService.release_expired_claims)
+register_job("sla_evaluator", settings.SLA_EVALUATOR_INTERVAL_SECONDS, SlaService.evaluate)
+register_job("request_archiver", settings.MAINTENANCE_ARCHIVE_INTERVAL_SECONDS, MaintenanceArchiveService.archive_closed)
+register_job("idempotency_gc", settings.IDEMPOTENCY_GC_INTERVAL_SECONDS, IdempotencyService.purge_expired)
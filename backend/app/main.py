@@ -9,7 +9,10 @@ from fastapi.responses import JSONResponse
 from pydantic import ValidationError, BaseModel
 from sqlalchemy.orm import Session
 from app.core.config import settings
-from app.routers import auth_router, admin_router, tools_router, users_router, maintenance_requests_router
+from app.core.responses import FastJSONResponse
+from app.core.background import start_background_jobs, stop_background_jobs
+from app.core.singleflight import SingleFlight, flight_key
+from app.routers import auth_router, admin_router, tools_router, users_router, maintenance_requests_router, equipment_router, dashboard_router, batch_router
 
 # Create FastAPI application
 # Disable OpenAPI docs in production for security
@@ -23,7 +26,8 @@ app = FastAPI(
     description=settings.DESCRIPTION,
     openapi_url=openapi_url,
     docs_url=docs_url,
-    redoc_url=redoc_url
+    redoc_url=redoc_url,
+    default_response_class=FastJSONResponse
 )
 
 # Add CORS middleware
@@ -50,12 +54,26 @@ async def value_error_handler(request: Request, exc: ValueError):
         content={"detail": str(exc), "message": "Invalid value provided"}
     )
 
+# Periodic background jobs
+@app.on_event("startup")
+async def start_jobs():
+    if settings.BACKGROUND_JOBS_ENABLED:
+        import app.jobs  # noqa: F401 - registers the jobs
+        start_background_jobs()
+
+@app.on_event("shutdown")
+async def stop_jobs():
+    await stop_background_jobs()
+
 # Include routers
 app.include_router(auth_router)
 app.include_router(admin_router)
 app.include_router(tools_router)
 app.include_router(users_router)
 app.include_router(maintenance_requests_router)
+app.include_router(equipment_router)
+app.include_router(dashboard_router)
+app.include_router(batch_router)
 
 # Root endpoint
 @app.get("/")
@@ -106,9 +124,10 @@ class ResetPasswordResponse(BaseModel):
     message: str
 
 # Roles endpoint for user management UI
-@app.get("/api/roles")
-async def get_roles_for_ui():
-    """Get all roles for user management UI"""
+roles_flight = SingleFlight("roles")
+
+def _load_roles():
+    """All roles from a short-lived session"""
     from app.db.session import get_db
     from app.models.role import Role
 
@@ -126,6 +145,11 @@ async def get_roles_for_ui():
     finally:
         db.close()
 
+@app.get("/api/roles")
+async def get_roles_for_ui():
+    """Get all roles for user management UI (concurrent calls share one query)"""
+    return await roles_flight.run(flight_key("public"), _load_roles)
+
 # Reset Password Endpoint
 @app.post("/api/auth/reset-password", response_model=ResetPasswordResponse)
 async def reset_user_password(request: ResetPasswordRequest):
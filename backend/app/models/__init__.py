@@ -6,5 +6,21 @@ from .user import User
 from .role import Role
 from .tool import Tool
 from .maintenance_request import MaintenanceRequest, PriorityLevel, RequestStatus, WarrantyStatus
+from .upload_session import UploadSession, UploadSessionStatus
+from .app_state import AppState
+from .maintenance_schedule import MaintenanceSchedule
+from .equipment import Equipment, Location
+from .maintenance_kpi import MaintenanceKpiBucket
+from .maintenance_request_event import MaintenanceRequestEvent, RequestEventType
+from .maintenance_request_part import MaintenanceRequestPart, PartStatus
+from .maintenance_request_archive import ArchivedMaintenanceRequest
+from .idempotency_key import IdempotencyKey
+from .upload_gc import UploadOrphan, UploadGcReference
 
-__all__ = ["User", "Role", "Tool", "MaintenanceRequest", "PriorityLevel", "RequestStatus", "WarrantyStatus"]
\ No newline at end of file
+__all__ = [
+    "User", "Role", "Tool", "MaintenanceRequest", "PriorityLevel", "RequestStatus", "WarrantyStatus",
+    "UploadSession", "UploadSessionStatus", "AppState", "MaintenanceSchedule",
+    "Equipment", "Location", "MaintenanceKpiBucket",
+    "MaintenanceRequestEvent", "RequestEventType", "MaintenanceRequestPart", "PartStatus",
+    "ArchivedMaintenanceRequest", "IdempotencyKey", "UploadOrphan", "UploadGcReference"
+]
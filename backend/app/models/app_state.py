@@ -0,0 +1,16 @@
+"""
+Application state model
+Small key/value store for state shared between workers, such as job cursors
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, String, Text, DateTime
+from .base import BaseModel
+
+class AppState(BaseModel):
+    """Key/value state persisted in the database"""
+    __tablename__ = "app_state"
+
+    key = Column(String(100), unique=True, index=True, nullable=False)
+    value = Column(Text)  # JSON document
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
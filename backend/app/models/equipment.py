@@ -0,0 +1,64 @@
+"""
+Equipment Models
+Registry of maintained assets and the locations they are installed at
+"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Enum, Index
+from sqlalchemy.orm import relationship
+from app.models.base import BaseModel
+from app.models.maintenance_request import WarrantyStatus
+
+
+class Location(BaseModel):
+    """
+    Location Model
+    One level of the site hierarchy (building, line, cell, ...)
+    """
+    __tablename__ = "locations"
+
+    name = Column(String(255), nullable=False)
+    parent_id = Column(Integer, ForeignKey("locations.id"), index=True)
+    parent = relationship("Location", remote_side="Location.id")
+
+    # Full display path ("Building A / Line 3") and its canonical key
+    path = Column(String(1024), nullable=False)
+    path_key = Column(String(1024), unique=True, nullable=False)
+
+    def __repr__(self):
+        return f"<Location(path='{self.path}')>"
+
+
+class Equipment(BaseModel):
+    """
+    Equipment Model
+    A maintained asset; maintenance requests reference it by equipment_id.
+    search_key is the normalized name, unique per asset and prefix-indexed
+    for autocomplete.
+    """
+    __tablename__ = "equipment"
+
+    asset_tag = Column(String(50), unique=True)
+    name = Column(String(255), nullable=False)
+    search_key = Column(String(255), nullable=False)
+
+    location_id = Column(Integer, ForeignKey("locations.id"), index=True)
+    location = relationship("Location", lazy="joined")
+
+    warranty_status = Column(Enum(WarrantyStatus), default=WarrantyStatus.NOT_APPLICABLE, nullable=False)
+    warranty_expiry_date = Column(DateTime)
+
+    is_active = Column(Boolean, default=True, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # text_pattern_ops lets LIKE 'prefix%' use the index under any collation
+        Index("ix_equipment_search_key", "search_key", unique=True, postgresql_ops={"search_key": "text_pattern_ops"}),
+    )
+
+    @property
+    def location_path(self):
+        """Display path of the equipment's location"""
+        return self.location.path if self.location else None
+
+    def __repr__(self):
+        return f"<Equipment(asset_tag='{self.asset_tag}', name='{self.name}')>"
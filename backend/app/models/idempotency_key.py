@@ -0,0 +1,37 @@
+"""
+Idempotency Key Model
+Stored outcome of a POST sent with an Idempotency-Key header (used when Redis is unavailable)
+"""
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
+from app.models.base import BaseModel
+
+
+class IdempotencyKey(BaseModel):
+    """
+    Idempotency Key Model
+    One row per user, endpoint and client key. status_code stays empty while
+    the first request runs; afterwards the row holds the response to replay.
+    resource_id is set once the first request committed what it created, so
+    a retry rebuilds the response from it if the first request failed later.
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("user_id", "scope", "key", name="uq_idempotency_keys_user_scope_key"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    scope = Column(String(100), nullable=False)  # Endpoint the key was used on
+    key = Column(String(255), nullable=False)
+    fingerprint = Column(String(64), nullable=False)  # SHA-256 of the request payload
+
+    # Response of the first request
+    status_code = Column(Integer)
+    media_type = Column(String(100))
+    response_body = Column(Text)
+    resource_id = Column(Text)  # JSON id(s) of what the first request created
+
+    locked_until = Column(DateTime)  # A running first request is presumed dead after this
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey(scope='{self.scope}', user_id={self.user_id}, status_code={self.status_code})>"
@@ -0,0 +1,42 @@
+"""
+Maintenance KPI Model
+Pre-aggregated daily buckets behind the maintenance KPI endpoints
+"""
+from sqlalchemy import Column, Integer, BigInteger, Date, Enum, UniqueConstraint
+from app.models.base import BaseModel
+from app.models.maintenance_request import PriorityLevel
+
+# Metric columns, all additive so changes are applied as deltas
+KPI_METRICS = ("created_count", "open_count", "cancelled_count", "completed_count", "repair_seconds")
+
+
+class MaintenanceKpiBucket(BaseModel):
+    """
+    Maintenance KPI Bucket Model
+    Request counts for one day, equipment, location and priority.
+
+    created_count, open_count and cancelled_count are bucketed by the day
+    a request was created (open_count is what is still pending or in
+    progress, which gives the backlog age); completed_count and
+    repair_seconds (created_at to completed_at) by the day it was completed.
+    Requests without equipment or location use 0 for those dimensions.
+    """
+    __tablename__ = "maintenance_kpi_buckets"
+
+    day = Column(Date, nullable=False)
+    equipment_id = Column(Integer, nullable=False, default=0)
+    location_id = Column(Integer, nullable=False, default=0)
+    priority = Column(Enum(PriorityLevel), nullable=False)
+
+    created_count = Column(Integer, nullable=False, default=0)
+    open_count = Column(Integer, nullable=False, default=0)
+    cancelled_count = Column(Integer, nullable=False, default=0)
+    completed_count = Column(Integer, nullable=False, default=0)
+    repair_seconds = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("day", "equipment_id", "location_id", "priority", name="uq_maintenance_kpi_buckets_key"),
+    )
+
+    def __repr__(self):
+        return f"<MaintenanceKpiBucket(day='{self.day}', equipment_id={self.equipment_id}, priority='{self.priority}')>"
@@ -2,7 +2,7 @@
 Maintenance Request Model
 Handles maintenance request submissions and tracking
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index, UniqueConstraint, literal_column, text
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 import enum
@@ -31,7 +31,31 @@ class WarrantyStatus(str, enum.Enum):
     NOT_APPLICABLE = "not_applicable"
 
 
-class MaintenanceRequest(BaseModel):
+class RequestPeopleMixin:
+    """
+    Submitter/completer/assignee details as flat attributes, matching the
+    labelled columns of projected queries so both map to the same response
+    (the class needs submitter, completed_by and assigned_to relationships)
+    """
+
+    @property
+    def submitter_email(self):
+        return self.submitter.email if self.submitter else None
+
+    @property
+    def submitter_name(self):
+        return self.submitter.full_name if self.submitter else None
+
+    @property
+    def completed_by_name(self):
+        return self.completed_by.full_name if self.completed_by else None
+
+    @property
+    def assigned_to_name(self):
+        return self.assigned_to.full_name if self.assigned_to else None
+
+
+class MaintenanceRequest(RequestPeopleMixin, BaseModel):
     """
     Maintenance Request Model
     Stores all maintenance request information including equipment details,
@@ -47,7 +71,8 @@ class MaintenanceRequest(BaseModel):
     priority = Column(Enum(PriorityLevel), default=PriorityLevel.MEDIUM, nullable=False, index=True)
     status = Column(Enum(RequestStatus), default=RequestStatus.PENDING, nullable=False, index=True)
 
-    # Equipment details
+    # Equipment details (name and location are kept as entered, in canonical form)
+    equipment_id = Column(Integer, ForeignKey("equipment.id", name="fk_maintenance_requests_equipment_id"))
     equipment_name = Column(String(255))
     location = Column(String(255))
 
@@ -60,8 +85,13 @@ class MaintenanceRequest(BaseModel):
     warranty_status = Column(Enum(WarrantyStatus), default=WarrantyStatus.NOT_APPLICABLE, nullable=False)
     warranty_expiry_date = Column(DateTime)
 
-    # Parts and tracking
+    # Parts and tracking: the list as entered, and its parsed lines
     part_order_list = Column(Text)  # Can store comma-separated or JSON string
+    parts = relationship(
+        "MaintenanceRequestPart",
+        order_by="MaintenanceRequestPart.line_no",
+        cascade="all, delete-orphan"
+    )
 
     # File attachments (store as JSON array of filenames)
     attachments = Column(Text)  # JSON array: ["file1.jpg", "file2.pdf"]
@@ -75,5 +105,66 @@ class MaintenanceRequest(BaseModel):
     completed_by_id = Column(Integer, ForeignKey("users.id"))
     completed_by = relationship("User", foreign_keys=[completed_by_id])
 
+    # Work queue claim: the technician working on the request and until when
+    # the claim holds before the request returns to the queue
+    assigned_to_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL", name="fk_maintenance_requests_assigned_to_id"))
+    assigned_to = relationship("User", foreign_keys=[assigned_to_id])
+    claimed_at = Column(DateTime)
+    claim_expires_at = Column(DateTime)
+
+    # SLA: due times from the priority's targets, and the target missed (set by
+    # the SLA evaluator; a resolution breach replaces a response breach) with
+    # sla_notified_at once it was in an escalation digest
+    response_due_at = Column(DateTime)
+    resolution_due_at = Column(DateTime)
+    sla_breached_at = Column(DateTime)
+    sla_breach = Column(String(20))  # "response" or "resolution"
+    sla_notified_at = Column(DateTime)
+
+    # Preventive maintenance requests generated from a schedule; one per due date
+    schedule_id = Column(Integer, ForeignKey("maintenance_schedules.id", ondelete="SET NULL", name="fk_maintenance_requests_schedule_id"))
+    scheduled_due_at = Column(DateTime)
+
+    __table_args__ = (
+        UniqueConstraint("schedule_id", "scheduled_due_at", name="uq_maintenance_requests_schedule_due"),
+        # Per-asset history, newest first
+        Index("ix_maintenance_requests_equipment_created", "equipment_id", "created_at"),
+        # Claimable requests in claim order (enum order makes priority DESC most urgent first)
+        Index(
+            "ix_maintenance_requests_claim_queue",
+            literal_column("priority").desc(), "requested_completion_date", "created_at", "id",
+            postgresql_where=text("status = 'PENDING' AND assigned_to_id IS NULL"),
+            sqlite_where=text("status = 'PENDING' AND assigned_to_id IS NULL")
+        ),
+        # Open requests: overdue filter (breached) and the evaluator's resolution pass (not breached yet)
+        Index(
+            "ix_maintenance_requests_sla_open",
+            "sla_breached_at", "resolution_due_at",
+            postgresql_where=text("status IN ('PENDING', 'IN_PROGRESS')"),
+            sqlite_where=text("status IN ('PENDING', 'IN_PROGRESS')")
+        ),
+        # The evaluator's response pass
+        Index(
+            "ix_maintenance_requests_sla_response",
+            "response_due_at",
+            postgresql_where=text("status = 'PENDING' AND sla_breached_at IS NULL"),
+            sqlite_where=text("status = 'PENDING' AND sla_breached_at IS NULL")
+        ),
+        # Closed requests for the archive mover, oldest first
+        Index(
+            "ix_maintenance_requests_archivable",
+            "created_at",
+            postgresql_where=text("status IN ('COMPLETED', 'CANCELLED')"),
+            sqlite_where=text("status IN ('COMPLETED', 'CANCELLED')")
+        ),
+        # Claims for the expiry sweep
+        Index(
+            "ix_maintenance_requests_claim_expires",
+            "claim_expires_at",
+            postgresql_where=text("status = 'IN_PROGRESS'"),
+            sqlite_where=text("status = 'IN_PROGRESS'")
+        ),
+    )
+
     def __repr__(self):
         return f"<MaintenanceRequest(id={self.id}, title='{self.title}', status='{self.status}')>"
@@ -0,0 +1,51 @@
+"""
+Archived Maintenance Request Model
+Cold storage for closed maintenance requests, moved out of the hot table by age
+"""
+import json
+from sqlalchemy import Column, DateTime, Index, Table, Text
+from sqlalchemy.orm import relationship
+from app.db.base import Base
+from app.models.maintenance_request import MaintenanceRequest, RequestPeopleMixin
+
+# Same columns as maintenance_requests, without foreign keys: archived rows
+# outlive the users, equipment and schedules they mention. A migration that
+# adds a column to maintenance_requests must add it to the archive too.
+maintenance_requests_archive = Table(
+    "maintenance_requests_archive",
+    Base.metadata,
+    *[
+        Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable, autoincrement=False)
+        for column in MaintenanceRequest.__table__.columns
+    ],
+    Column("parts_json", Text),  # Part lines when archived (JSON array)
+    Column("archived_at", DateTime, nullable=False),
+    Index("ix_maintenance_requests_archive_created_at", "created_at"),
+    Index("ix_maintenance_requests_archive_submitter_created", "submitter_id", "created_at"),
+    Index("ix_maintenance_requests_archive_equipment_created", "equipment_id", "created_at"),
+)
+
+
+class ArchivedMaintenanceRequest(RequestPeopleMixin, Base):
+    """
+    Archived Maintenance Request Model
+    A completed or cancelled request older than MAINTENANCE_ARCHIVE_AFTER_DAYS.
+    Read-only; attributes match MaintenanceRequest so both serialize alike.
+    """
+    __table__ = maintenance_requests_archive
+
+    submitter = relationship("User", primaryjoin="foreign(ArchivedMaintenanceRequest.submitter_id) == User.id", viewonly=True)
+    completed_by = relationship("User", primaryjoin="foreign(ArchivedMaintenanceRequest.completed_by_id) == User.id", viewonly=True)
+    assigned_to = relationship("User", primaryjoin="foreign(ArchivedMaintenanceRequest.assigned_to_id) == User.id", viewonly=True)
+
+    @property
+    def parts(self):
+        """Part lines as they were when the request was archived"""
+        try:
+            parts = json.loads(self.parts_json) if self.parts_json else []
+        except (json.JSONDecodeError, TypeError, ValueError):
+            return []
+        return parts if isinstance(parts, list) else []
+
+    def __repr__(self):
+        return f"<ArchivedMaintenanceRequest(id={self.id}, title='{self.title}', status='{self.status}')>"
@@ -0,0 +1,53 @@
+"""
+Maintenance Request Event Model
+Append-only history of changes to maintenance requests
+"""
+from datetime import datetime
+import enum
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Enum, Index, FetchedValue
+from app.db.base import Base
+from app.models.maintenance_request import RequestStatus
+
+
+class RequestEventType(str, enum.Enum):
+    """Kinds of maintenance request events"""
+    CREATED = "created"
+    UPDATED = "updated"
+    STATUS_CHANGED = "status_changed"
+    ATTACHMENTS_ADDED = "attachments_added"
+    SLA_BREACHED = "sla_breached"
+    ARCHIVED = "archived"
+    DELETED = "deleted"
+
+
+class MaintenanceRequestEvent(Base):
+    """
+    Maintenance Request Event Model
+    One row per change, written in the same transaction as the change and
+    never updated. On Postgres txid is the id of the writing transaction;
+    consumers page through the log in (txid, id) order, which follows
+    commit order for every event they can see (see read_since).
+
+    request_id and actor_id are plain columns rather than foreign keys so the
+    history outlives deleted requests and users.
+    """
+    __tablename__ = "maintenance_request_events"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    request_id = Column(Integer, nullable=False)
+    event_type = Column(String(30), nullable=False)
+    actor_id = Column(Integer)  # None for system changes (e.g. generated PM requests)
+    from_status = Column(Enum(RequestStatus))
+    to_status = Column(Enum(RequestStatus))
+    changes = Column(Text)  # JSON document: {"field": [old, new]} or event details
+    at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    txid = Column(BigInteger, server_default=FetchedValue())  # txid_current() on Postgres, NULL elsewhere
+
+    __table_args__ = (
+        Index("ix_maintenance_request_events_request_at", "request_id", "at"),
+        Index("ix_maintenance_request_events_at", "at"),
+        Index("ix_maintenance_request_events_txid_id", "txid", "id"),
+    )
+
+    def __repr__(self):
+        return f"<MaintenanceRequestEvent(id={self.id}, request_id={self.request_id}, event_type='{self.event_type}')>"
@@ -0,0 +1,64 @@
+"""
+Maintenance Request Part Model
+Structured lines of a maintenance request's parts list
+"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Index, UniqueConstraint, text
+from app.models.base import BaseModel
+import enum
+
+
+class PartStatus(str, enum.Enum):
+    """Procurement status of a part line"""
+    NEEDED = "needed"
+    ORDERED = "ordered"
+    RECEIVED = "received"
+    CANCELLED = "cancelled"
+
+
+# Part lines that count as demand while their request is open
+DEMAND_STATUSES = (PartStatus.NEEDED, PartStatus.ORDERED)
+
+
+class MaintenanceRequestPart(BaseModel):
+    """
+    Maintenance Request Part Model
+    One part of a request's parts list. part_key is the normalized part
+    number (see app.utils.parts_parser.part_key) that inventory lookups
+    join on; lines still needed or on order are indexed by it.
+    """
+    __tablename__ = "maintenance_request_parts"
+
+    request_id = Column(
+        Integer,
+        ForeignKey("maintenance_requests.id", ondelete="CASCADE", name="fk_maintenance_request_parts_request_id"),
+        nullable=False
+    )
+    line_no = Column(Integer, nullable=False)
+
+    part_number = Column(String(100), nullable=False)
+    part_key = Column(String(100), nullable=False)
+    description = Column(String(255))
+    quantity = Column(Integer, nullable=False, default=1)
+    vendor = Column(String(255))
+    status = Column(Enum(PartStatus), default=PartStatus.NEEDED, nullable=False)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # A request's lines in order
+        UniqueConstraint("request_id", "line_no", name="uq_maintenance_request_parts_line"),
+        # Outstanding demand per part; covers quantity so demand sums read the index only,
+        # text_pattern_ops serves part number prefix searches
+        Index(
+            "ix_maintenance_request_parts_demand",
+            "part_key", "request_id",
+            postgresql_ops={"part_key": "text_pattern_ops"},
+            postgresql_include=["quantity", "status"],
+            postgresql_where=text("status IN ('NEEDED', 'ORDERED')"),
+            sqlite_where=text("status IN ('NEEDED', 'ORDERED')")
+        ),
+    )
+
+    def __repr__(self):
+        return f"<MaintenanceRequestPart(request_id={self.request_id}, part_number='{self.part_number}', quantity={self.quantity})>"
@@ -0,0 +1,56 @@
+"""
+Maintenance Schedule Model
+Preventive maintenance cycle of one piece of equipment
+"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index, text
+from sqlalchemy.orm import relationship
+from app.models.base import BaseModel
+
+
+class MaintenanceSchedule(BaseModel):
+    """
+    Maintenance Schedule Model
+    Keeps the next due date of each equipment's preventive maintenance cycle,
+    derived from maintenance_cycle_days and last_maintenance_date of its requests.
+    One schedule per registered equipment; equipment_name follows its current name.
+    While a generated PM request is open the schedule is not due again.
+    """
+    __tablename__ = "maintenance_schedules"
+
+    equipment_id = Column(Integer, ForeignKey("equipment.id", name="fk_maintenance_schedules_equipment_id"), unique=True)
+    equipment = relationship("Equipment")
+    equipment_name = Column(String(255), nullable=False)
+    location = Column(String(255))
+
+    cycle_days = Column(Integer, nullable=False)
+    last_maintenance_date = Column(DateTime)
+    next_due_at = Column(DateTime, nullable=False, index=True)
+
+    # Submitter of generated PM requests (who set up the cycle)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    owner = relationship("User")
+
+    # Generated PM request that has not been completed or cancelled yet
+    open_request_id = Column(Integer, ForeignKey(
+        "maintenance_requests.id",
+        ondelete="SET NULL",
+        use_alter=True,
+        name="fk_maintenance_schedules_open_request_id"
+    ))
+
+    is_active = Column(Boolean, default=True, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # The scheduler only reads the due slice: active schedules without an open PM request
+        Index(
+            "ix_maintenance_schedules_due",
+            "next_due_at",
+            postgresql_where=text("is_active AND open_request_id IS NULL"),
+            sqlite_where=text("is_active AND open_request_id IS NULL")
+        ),
+    )
+
+    def __repr__(self):
+        return f"<MaintenanceSchedule(equipment_name='{self.equipment_name}', next_due_at='{self.next_due_at}')>"
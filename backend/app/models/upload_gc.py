@@ -0,0 +1,38 @@
+"""
+Upload garbage collector models
+Orphaned uploads awaiting deletion and the per-sweep snapshot of referenced uploads
+"""
+
+from sqlalchemy import Column, String, DateTime
+from .base import BaseModel
+
+
+class UploadOrphan(BaseModel):
+    """
+    Upload Orphan Model
+    One row per stored file that no request references, deleted together
+    with the file once the grace period after orphaned_at has passed.
+    """
+    __tablename__ = "upload_orphans"
+
+    filename = Column(String(255), unique=True, nullable=False)
+    orphaned_at = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<UploadOrphan(filename='{self.filename}', orphaned_at={self.orphaned_at})>"
+
+
+class UploadGcReference(BaseModel):
+    """
+    Upload GC Reference Model
+    Attachment filenames referenced by requests (hot or archived), rebuilt
+    from one scan of both tables at the start of every reconciliation
+    sweep, so each sweep pass looks up its shards by index.
+    """
+    __tablename__ = "upload_gc_references"
+
+    filename = Column(String(255), nullable=False)
+    shard = Column(String(2), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<UploadGcReference(filename='{self.filename}')>"
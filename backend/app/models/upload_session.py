@@ -0,0 +1,48 @@
+"""
+Upload Session Model
+Tracks resumable (chunked) attachment uploads for maintenance requests
+"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Enum
+from sqlalchemy.orm import relationship
+from app.models.base import BaseModel
+import enum
+
+
+class UploadSessionStatus(str, enum.Enum):
+    """Status of a resumable upload session"""
+    ACTIVE = "active"
+    COMPLETED = "completed"
+    ABORTED = "aborted"
+
+
+class UploadSession(BaseModel):
+    """
+    Upload Session Model
+    Persists the progress of a resumable upload so any worker can continue it.
+    The received bytes live in a partial file named after the session token.
+    """
+    __tablename__ = "upload_sessions"
+
+    token = Column(String(36), unique=True, index=True, nullable=False)
+
+    request_id = Column(Integer, ForeignKey("maintenance_requests.id", ondelete="CASCADE"), nullable=False, index=True)
+    request = relationship("MaintenanceRequest")
+
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    # Declared file metadata (validated again when the upload completes)
+    original_filename = Column(String(255), nullable=False)
+    content_type = Column(String(255), nullable=False)
+    total_size = Column(BigInteger, nullable=False)
+
+    # Progress
+    bytes_received = Column(BigInteger, nullable=False, default=0)
+    status = Column(Enum(UploadSessionStatus), default=UploadSessionStatus.ACTIVE, nullable=False, index=True)
+    stored_filename = Column(String(255))  # Attachment filename once completed
+
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<UploadSession(token='{self.token}', request_id={self.request_id}, status='{self.status}')>"
@@ -7,5 +7,8 @@ from .users import router as users_router
 from .admin import router as admin_router
 from .tools import router as tools_router
 from .maintenance_requests import router as maintenance_requests_router
+from .equipment import router as equipment_router
+from .dashboard import router as dashboard_router
+from .batch import router as batch_router
 
-__all__ = ["auth_router", "users_router", "admin_router", "tools_router", "maintenance_requests_router"]
\ No newline at end of file
+__all__ = ["auth_router", "users_router", "admin_router", "tools_router", "maintenance_requests_router", "equipment_router", "dashboard_router", "batch_router"]
\ No newline at end of file
@@ -2,18 +2,24 @@
 Admin routes - SuperUser only
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File
 from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.core.deps import require_superuser
 from app.models.user import User
-from app.schemas.user import User as UserSchema, UserCreate, UserUpdate
-from app.schemas.role import Role as RoleSchema, RoleCreate, RoleUpdate
-from app.schemas.tool import Tool as ToolSchema, ToolCreate, ToolUpdate
+from app.core.responses import adapter_response
+from app.core.singleflight import singleflight_stats
+from app.schemas.user import User as UserSchema, UserCreate, UserUpdate, UserDirectoryPage, USER_LIST_ADAPTER
+from app.schemas.role import Role as RoleSchema, RoleCreate, RoleUpdate, ROLE_LIST_ADAPTER
+from app.schemas.tool import Tool as ToolSchema, ToolCreate, ToolUpdate, TOOL_LIST_ADAPTER
+from app.schemas.assignment import BulkToolAssignment, BulkRoleAssignment, BulkAssignmentResult
+from app.schemas.user_import import UserImportReport
 from app.services.user import UserService
 from app.services.role import RoleService
 from app.services.tool import ToolService
+from app.services.assignment import AssignmentService
+from app.services.user_import import UserImportService
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -36,7 +42,46 @@ async def get_all_users(
         user_schema.tools = user_tools
         user_schemas.append(user_schema)
     
-    return user_schemas
+    return adapter_response(USER_LIST_ADAPTER, user_schemas)
+
+@router.get("/users/directory", response_model=UserDirectoryPage)
+async def get_user_directory(
+    search: Optional[str] = Query(None, max_length=100, description="Prefix of username, full name or email"),
+    role: Optional[str] = Query(None, description="Role name"),
+    tool: Optional[str] = Query(None, description="Tool name"),
+    is_active: Optional[bool] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_superuser)
+):
+    """
+    Search the user directory (SuperUser only)
+
+    Cursor-paginated by username. The first page also carries the total and
+    per-role counts for the current filters.
+    """
+    users, next_cursor = UserService.search_directory(
+        db,
+        search=search,
+        role=role,
+        tool=tool,
+        is_active=is_active,
+        cursor=cursor,
+        limit=limit
+    )
+
+    user_schemas = []
+    for user in users:
+        user_schema = UserSchema.model_validate(user)
+        user_schema.tools = UserService.get_user_tools(user, db)
+        user_schemas.append(user_schema)
+
+    total = role_counts = None
+    if not cursor:
+        total, role_counts = UserService.count_directory(db, search=search, role=role, tool=tool, is_active=is_active)
+
+    return UserDirectoryPage(users=user_schemas, next_cursor=next_cursor, total=total, role_counts=role_counts)
 
 @router.get("/users/{user_id}", response_model=UserSchema)
 async def get_user(
@@ -75,6 +120,30 @@ async def create_user(
     
     return user_schema
 
+@router.post("/users/import", response_model=UserImportReport)
+def import_users(
+    file: UploadFile = File(...),
+    dry_run: bool = Query(True, description="Only validate and report; set to false to write"),
+    update_existing: bool = Query(True, description="Update users whose username already exists"),
+    update_passwords: bool = Query(False, description="Also reset passwords of existing users"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_superuser)
+):
+    """
+    Import users from a CSV, XLSX or JSON file (SuperUser only)
+
+    Columns: full_name, username, email, password, is_active, roles, tools
+    (role and tool names separated by commas). Dry-run by default.
+    """
+    rows = UserImportService.parse_file(file.file.read(), file.filename)
+    return UserImportService.run_import(
+        db,
+        rows,
+        dry_run=dry_run,
+        update_existing=update_existing,
+        update_passwords=update_passwords
+    )
+
 @router.put("/users/{user_id}", response_model=UserSchema)
 async def update_user(
     user_id: int,
@@ -120,6 +189,55 @@ async def delete_user(
     
     return {"message": "User deleted successfully"}
 
+# Bulk Assignment
+@router.post("/assignments/tools/grant", response_model=BulkAssignmentResult)
+async def bulk_grant_tools(
+    assignment: BulkToolAssignment,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_superuser)
+):
+    """Grant tools to a set of users or to every member of a role (SuperUser only)"""
+    affected = AssignmentService.grant_tools(
+        db, assignment.tool_ids, user_ids=assignment.user_ids, member_of_role_id=assignment.member_of_role_id
+    )
+    return BulkAssignmentResult(affected=affected)
+
+@router.post("/assignments/tools/revoke", response_model=BulkAssignmentResult)
+async def bulk_revoke_tools(
+    assignment: BulkToolAssignment,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_superuser)
+):
+    """Revoke tools from a set of users or from every member of a role (SuperUser only)"""
+    affected = AssignmentService.revoke_tools(
+        db, assignment.tool_ids, user_ids=assignment.user_ids, member_of_role_id=assignment.member_of_role_id
+    )
+    return BulkAssignmentResult(affected=affected)
+
+@router.post("/assignments/roles/grant", response_model=BulkAssignmentResult)
+async def bulk_grant_roles(
+    assignment: BulkRoleAssignment,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_superuser)
+):
+    """Grant roles to a set of users or to every member of a role (SuperUser only)"""
+    affected = AssignmentService.grant_roles(
+        db, assignment.role_ids, user_ids=assignment.user_ids, member_of_role_id=assignment.member_of_role_id
+    )
+    return BulkAssignmentResult(affected=affected)
+
+@router.post("/assignments/roles/revoke", response_model=BulkAssignmentResult)
+async def bulk_revoke_roles(
+    assignment: BulkRoleAssignment,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_superuser)
+):
+    """Revoke roles from a set of users or from every member of a role (SuperUser only)"""
+    affected = AssignmentService.revoke_roles(
+        db, assignment.role_ids, current_user, user_ids=assignment.user_ids, member_of_role_id=assignment.member_of_role_id
+    )
+    return BulkAssignmentResult(affected=affected)
+
 # Role Management
 @router.get("/roles", response_model=List[RoleSchema])
 async def get_all_roles(
@@ -129,7 +247,8 @@ async def get_all_roles(
     current_user: User = Depends(require_superuser)
 ):
     """Get all roles (SuperUser only)"""
-    return RoleService.get_roles(db, skip=skip, limit=limit)
+    roles = RoleService.get_roles(db, skip=skip, limit=limit)
+    return adapter_response(ROLE_LIST_ADAPTER, ROLE_LIST_ADAPTER.validate_python(roles, from_attributes=True))
 
 @router.post("/roles", response_model=RoleSchema)
 async def create_role(
@@ -180,7 +299,8 @@ async def get_all_tools(
     current_user: User = Depends(require_superuser)
 ):
     """Get all tools (SuperUser only)"""
-    return ToolService.get_tools(db, skip=skip, limit=limit)
+    tools = ToolService.get_tools(db, skip=skip, limit=limit)
+    return adapter_response(TOOL_LIST_ADAPTER, TOOL_LIST_ADAPTER.validate_python(tools, from_attributes=True))
 
 @router.post("/tools", response_model=ToolSchema)
 async def create_tool(
@@ -290,4 +410,12 @@ async def send_credentials_to_user(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to send credentials: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+# Metrics
+@router.get("/metrics/singleflight")
+async def get_singleflight_metrics(
+    current_user: User = Depends(require_superuser)
+):
+    """Coalesced read endpoints of this worker: executions run and executions saved (coalesced)"""
+    return singleflight_stats()
@@ -0,0 +1,213 @@
+"""
+Batch routes
+Several API calls in one round trip, dispatched in-process through the application
+"""
+
+import asyncio
+import logging
+import re
+from typing import List, Optional
+from urllib.parse import urlsplit
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.deps import get_current_active_user
+from app.core.responses import FastJSONResponse
+from app.models.user import User
+from app.schemas.batch import BatchRequest, BatchResponse, BatchSubRequest
+from app.security import SecurityConfig, rate_limiter
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["batch"])
+
+BATCH_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE"}
+READ_METHODS = {"GET"}
+
+# Headers of the batch request every sub-request carries: the credentials and the client's identity
+FORWARDED_HEADERS = {b"authorization", b"user-agent", b"x-forwarded-for", b"x-real-ip", b"accept-language"}
+
+# Headers a sub-request may not set itself
+RESERVED_HEADERS = {"authorization", "content-length", "content-type", "host", "transfer-encoding"}
+
+# Streamed responses (event streams, exports, file downloads): an event stream never
+# ends, and the others are buffered whole when all they should be is fetched directly
+STREAMING_PATHS = re.compile(
+    r"^/api/maintenance-requests/(?:stream|export|attachments\.zip|[^/]+/attachments(?:\.zip|/[^/]+))/?$"
+)
+
+
+def _client_ip(request: Request) -> str:
+    """Client IP as the rate limiter identifies it"""
+    forwarded_for = request.headers.get("x-forwarded-for")
+    if forwarded_for:
+        return forwarded_for.split(",")[0].strip()
+    return request.headers.get("x-real-ip") or (request.client.host if request.client else "unknown")
+
+
+def _error(sub: BatchSubRequest, status_code: int, detail: str) -> dict:
+    """Result of a sub-request that was not dispatched"""
+    return {"id": sub.id, "status": status_code, "headers": {}, "body": {"detail": detail}}
+
+
+def _check_sub_request(sub: BatchSubRequest) -> Optional[dict]:
+    """Error result for a sub-request that may not run in a batch, or None"""
+    if sub.method.upper() not in BATCH_METHODS:
+        return _error(sub, status.HTTP_405_METHOD_NOT_ALLOWED, f"Method {sub.method} is not allowed in a batch")
+    path = urlsplit(sub.path).path
+    if not path.startswith("/api/") or path.rstrip("/") == "/api/batch":
+        return _error(sub, status.HTTP_400_BAD_REQUEST, "Only /api/ paths other than /api/batch can be batched")
+    if STREAMING_PATHS.match(path):
+        return _error(sub, status.HTTP_400_BAD_REQUEST, "Streaming endpoints cannot be batched")
+    return None
+
+
+async def _dispatch(request: Request, sub: BatchSubRequest) -> dict:
+    """Run one sub-request through the ASGI application and collect its response"""
+    url = urlsplit(sub.path)
+    body = orjson.dumps(sub.body) if sub.body is not None else b""
+
+    headers = [(name, value) for name, value in request.scope["headers"] if name in FORWARDED_HEADERS]
+    for name, value in (sub.headers or {}).items():
+        if name.lower() not in RESERVED_HEADERS:
+            headers.append((name.lower().encode("latin-1"), value.encode("latin-1")))
+    if body:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": sub.method.upper(),
+        "scheme": request.scope.get("scheme", "http"),
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "headers": headers,
+    }
+
+    finished = asyncio.Event()
+    body_sent = False
+    response = {"status": 500, "headers": [], "body": bytearray()}
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Like a client that stays connected until the response is complete
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+            if not message.get("more_body", False):
+                finished.set()
+
+    try:
+        await request.app(scope, receive, send)
+    finally:
+        finished.set()
+
+    response_headers = {
+        name.decode("latin-1"): value.decode("latin-1")
+        for name, value in response["headers"] if name.lower() != b"content-length"
+    }
+    content = bytes(response["body"])
+    if not content:
+        response_body = None
+    elif response_headers.get("content-type", "").startswith("application/json"):
+        response_body = orjson.loads(content)
+    else:
+        response_body = content.decode("utf-8", errors="replace")
+
+    return {"id": sub.id, "status": response["status"], "headers": response_headers, "body": response_body}
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def run_batch(
+    request: Request,
+    batch: BatchRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Run several API calls in one round trip
+
+    Each sub-request (method, path with query string, JSON body, optional
+    headers) is dispatched in-process through the application with the
+    batch's credentials, so it is authorized and validated exactly like a
+    direct call. GETs run concurrently; a write waits for the calls before
+    it, and the calls after it wait for the write, so the batch behaves
+    like the calls made in order. The batch and every sub-request count
+    against the client's rate limit. Responses come back in request order;
+    a failing sub-request does not fail the batch, but a write that timed
+    out may still complete, so the calls after it are skipped (424).
+    Streaming endpoints cannot be batched.
+    """
+    if len(batch.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch may contain at most {settings.BATCH_MAX_REQUESTS} requests"
+        )
+
+    client_ip = _client_ip(request)
+    if await run_in_threadpool(
+        rate_limiter.is_rate_limited, client_ip, SecurityConfig.MAX_REQUESTS_PER_MINUTE, 60
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded"
+        )
+
+    semaphore = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+    results: List[Optional[dict]] = [None] * len(batch.requests)
+    write_timed_out = False
+
+    async def run(index: int, sub: BatchSubRequest) -> None:
+        nonlocal write_timed_out
+        limited = await run_in_threadpool(
+            rate_limiter.is_rate_limited, client_ip, SecurityConfig.MAX_REQUESTS_PER_MINUTE, 60
+        )
+        if limited:
+            results[index] = _error(sub, status.HTTP_429_TOO_MANY_REQUESTS, "Rate limit exceeded")
+            return
+        async with semaphore:
+            try:
+                results[index] = await asyncio.wait_for(
+                    _dispatch(request, sub), timeout=settings.BATCH_SUBREQUEST_TIMEOUT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                if sub.method.upper() in READ_METHODS:
+                    results[index] = _error(sub, status.HTTP_504_GATEWAY_TIMEOUT, "Request timed out")
+                else:
+                    # Its work goes on in the threadpool and may still commit
+                    write_timed_out = True
+                    results[index] = _error(sub, status.HTTP_504_GATEWAY_TIMEOUT, "Request timed out and may still complete")
+            except Exception as e:
+                logger.error(f"Batched {sub.method} {sub.path} failed: {e}", exc_info=True)
+                results[index] = _error(sub, status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal server error")
+
+    reads = []
+    for index, sub in enumerate(batch.requests):
+        error = _check_sub_request(sub)
+        if write_timed_out:
+            results[index] = _error(sub, status.HTTP_424_FAILED_DEPENDENCY, "Skipped after an earlier write timed out")
+        elif error:
+            results[index] = error
+        elif sub.method.upper() in READ_METHODS:
+            reads.append(asyncio.create_task(run(index, sub)))
+        else:
+            await asyncio.gather(*reads)
+            reads = []
+            await run(index, sub)
+    await asyncio.gather(*reads)
+
+    return FastJSONResponse(content={"responses": results})
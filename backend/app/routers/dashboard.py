@@ -0,0 +1,107 @@
+"""
+Dashboard routes
+One round trip for the data the landing page needs after login
+"""
+
+import asyncio
+from typing import Optional
+import orjson
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.deps import get_current_active_user
+from app.core.responses import FastJSONResponse, ORJSON_OPTIONS, make_etag, not_modified
+from app.db.base import SessionLocal
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.dashboard import DashboardBootstrap
+from app.services.maintenance_request import MaintenanceRequestService
+from app.services.user import UserService
+from app.utils.request_serializer import map_request, parse_fields
+from app.routers.maintenance_requests import coalesced_statistics
+from app.routers.users import profile_content, roles_content, tools_content
+
+router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
+
+
+def _principal_sections(current_user: User, db: Session) -> dict:
+    """Profile, tools and roles, from the already authenticated user"""
+    return {
+        "me": profile_content(current_user, db).model_dump(mode="json"),
+        "tools": tools_content(current_user, UserService.get_user_tools(current_user, db)),
+        "roles": roles_content(current_user)
+    }
+
+
+def _my_requests_section(user_id: int, limit: int, fields) -> dict:
+    """First page of the user's requests, as returned by /my-requests, from a short-lived session"""
+    db = SessionLocal()
+    try:
+        rows, total = MaintenanceRequestService.get_user_requests(
+            db, user_id=user_id, skip=0, limit=limit, fields=fields
+        )
+        return {
+            "requests": [map_request(row, fields) for row in rows],
+            "total": total,
+            "page": 1,
+            "page_size": limit
+        }
+    finally:
+        db.close()
+
+
+@router.get("/bootstrap", response_model=DashboardBootstrap)
+async def get_dashboard_bootstrap(
+    request: Request,
+    requests_limit: int = Query(100, ge=1, le=1000, description="Page size of my_requests"),
+    fields: Optional[str] = Query(None, description="Comma-separated my_requests fields (sparse fieldset)"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get /users/me, /users/me/tools, /users/me/roles, /maintenance-requests/my-requests
+    and, for maintenance and superusers, /maintenance-requests/statistics in one response
+
+    The user is authenticated once and the sections are loaded concurrently,
+    the request sections each on their own session. Every section carries
+    an ETag; send the ETags you hold in If-None-Match and unchanged sections
+    come back as {"etag", "not_modified": true} without data (304 if none changed).
+    """
+    selected_fields = parse_fields(fields)
+    with_statistics = UserService.has_role(current_user, "maintenance") or UserService.has_role(current_user, "superuser")
+
+    loads = [
+        run_in_threadpool(_principal_sections, current_user, db),
+        run_in_threadpool(_my_requests_section, current_user.id, requests_limit, selected_fields)
+    ]
+    if with_statistics:
+        loads.append(coalesced_statistics())
+    principal, my_requests, *statistics = await asyncio.gather(*loads)
+
+    sections = dict(principal, my_requests=my_requests)
+    if statistics:
+        sections["statistics"] = statistics[0]
+
+    etags = {
+        name: make_etag("dashboard", name, orjson.dumps(data, option=ORJSON_OPTIONS))
+        for name, data in sections.items()
+    }
+    etag = make_etag("dashboard", sorted(etags.items()))
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    content = {}
+    for name, data in sections.items():
+        if not_modified(request, etags[name]):
+            content[name] = {"etag": etags[name], "not_modified": True, "data": None}
+        else:
+            content[name] = {"etag": etags[name], "not_modified": False, "data": data}
+
+    if all(section["not_modified"] for section in content.values()):
+        return Response(status_code=304, headers=headers)
+
+    return FastJSONResponse(content=content, headers=headers)
@@ -0,0 +1,112 @@
+"""
+Equipment Router
+API endpoints for the equipment registry
+"""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.core.deps import get_current_active_user, require_maintenance_or_superuser
+from app.models.user import User
+from app.schemas.equipment import EquipmentCreate, EquipmentUpdate, EquipmentResponse, EquipmentSuggestion
+from app.schemas.maintenance_request import MaintenanceRequestListResponse
+from app.services.equipment import EquipmentService
+from app.services.maintenance_request import MaintenanceRequestService
+from app.utils.request_serializer import parse_fields, request_list_response
+
+router = APIRouter(prefix="/api/equipment", tags=["equipment"])
+
+
+def _get_equipment_or_404(db: Session, equipment_id: int):
+    """Load equipment or raise 404"""
+    equipment = EquipmentService.get_equipment(db, equipment_id)
+    if not equipment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Equipment not found"
+        )
+    return equipment
+
+
+@router.get("/autocomplete", response_model=List[EquipmentSuggestion])
+def autocomplete_equipment(
+    q: str = Query(..., min_length=1, max_length=255, description="Name or asset tag prefix"),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Suggest registered equipment by name or asset tag prefix
+
+    Spelling differences are ignored ("cnc-01" finds "CNC 1")
+    """
+    return EquipmentService.autocomplete(db, q, limit)
+
+
+@router.post("", response_model=EquipmentResponse, status_code=status.HTTP_201_CREATED)
+def create_equipment(
+    equipment_data: EquipmentCreate,
+    current_user: User = Depends(require_maintenance_or_superuser),
+    db: Session = Depends(get_db)
+):
+    """
+    Register equipment (requires maintenance or superuser role)
+
+    The location path is split into its levels ("Building A / Line 3")
+    """
+    return EquipmentService.create_equipment(db, equipment_data)
+
+
+@router.get("/{equipment_id}", response_model=EquipmentResponse)
+def get_equipment(
+    equipment_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get registered equipment by ID"""
+    return _get_equipment_or_404(db, equipment_id)
+
+
+@router.put("/{equipment_id}", response_model=EquipmentResponse)
+def update_equipment(
+    equipment_id: int,
+    equipment_data: EquipmentUpdate,
+    current_user: User = Depends(require_maintenance_or_superuser),
+    db: Session = Depends(get_db)
+):
+    """Update registered equipment (requires maintenance or superuser role)"""
+    equipment = _get_equipment_or_404(db, equipment_id)
+    return EquipmentService.update_equipment(db, equipment, equipment_data)
+
+
+@router.get("/{equipment_id}/requests", response_model=MaintenanceRequestListResponse)
+def get_equipment_requests(
+    equipment_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    status_filter: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated response fields (sparse fieldset)"),
+    current_user: User = Depends(require_maintenance_or_superuser),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the maintenance history of one piece of equipment (requires maintenance or superuser role)
+
+    Newest first, read through the equipment_id index
+    """
+    _get_equipment_or_404(db, equipment_id)
+    selected_fields = parse_fields(fields)
+
+    rows, total = MaintenanceRequestService.get_all_requests(
+        db,
+        skip=skip,
+        limit=limit,
+        status_filter=status_filter,
+        fields=selected_fields,
+        equipment_id=equipment_id
+    )
+
+    page = skip // limit + 1 if limit > 0 else 1
+
+    return request_list_response(rows, total, page, limit, selected_fields)
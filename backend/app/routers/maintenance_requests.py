@@ -3,30 +3,64 @@ Maintenance Request Router
 API endpoints for maintenance request management
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File, Request, Response, Header
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
-import json
+from starlette.concurrency import run_in_threadpool
+from datetime import date, datetime, timedelta
+from collections import deque
+from itertools import groupby
+import asyncio
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
+from app.core.event_bus import maintenance_event_bus
+from app.core.responses import FastJSONResponse, ORJSON_OPTIONS
+from app.core.singleflight import SingleFlight, flight_key
+from app.db.base import SessionLocal
 from app.db.session import get_db
+from app.core.config import settings
+from app.core.security import create_stream_ticket
 from app.core.deps import (
     get_current_active_user,
+    get_stream_user,
+    require_maintenance_or_inventory,
     require_maintenance_or_superuser,
     require_superuser
 )
 from app.models.user import User
 from app.models.maintenance_request import MaintenanceRequest
+from app.models.maintenance_request_part import PartStatus
 from app.schemas.maintenance_request import (
     MaintenanceRequestCreate,
     MaintenanceRequestUpdate,
     MaintenanceRequestResponse,
     MaintenanceRequestListResponse,
-    StatusUpdate
+    StatusUpdate,
+    BulkStatusUpdate,
+    BulkStatusUpdateResponse,
+    AttachmentBundleRequest
 )
+from app.schemas.upload_session import UploadSessionCreate, UploadSessionResponse
+from app.schemas.maintenance_schedule import MaintenanceDueCalendar
+from app.schemas.maintenance_kpi import MaintenanceKpiResponse
+from app.schemas.maintenance_request_event import MaintenanceRequestEventFeed, MaintenanceRequestTimeline, StreamTicket
+from app.schemas.maintenance_request_part import (
+    MaintenanceRequestPartList,
+    MaintenanceRequestPartsUpdate,
+    PartDemandResponse
+)
+from app.services.idempotency import IdempotencyService
+from app.services.maintenance_kpi import MaintenanceKpiService
 from app.services.maintenance_request import MaintenanceRequestService
+from app.services.maintenance_request_event import MaintenanceRequestEventService
+from app.services.maintenance_request_part import MaintenanceRequestPartService
+from app.services.maintenance_schedule import MaintenanceScheduleService
+from app.services.upload_session import UploadSessionService
+from app.services.work_queue import WorkQueueService
+from app.services.upload_storage import UploadStorageService
 from app.services.user import UserService
 from app.services.email import email_service
 from app.utils.file_upload import (
@@ -34,8 +68,19 @@ from app.utils.file_upload import (
     save_multiple_files,
     get_file_path,
     get_file_info,
+    get_chunk_upload_path,
+    write_upload_chunk,
+    delete_chunk_upload,
     init_upload_directory
 )
+from app.utils.zip_stream import stream_zip
+from app.utils.request_export import EXPORT_FIELDS, ensure_xlsx_support, stream_csv, stream_xlsx
+from app.utils.request_serializer import (
+    parse_fields,
+    request_response,
+    request_list_response,
+    safe_json_list
+)
 
 router = APIRouter(prefix="/api/maintenance-requests", tags=["maintenance-requests"])
 
@@ -43,90 +88,122 @@ router = APIRouter(prefix="/api/maintenance-requests", tags=["maintenance-reques
 init_upload_directory()
 
 
-def _safe_json_loads(json_str: Optional[str]) -> list:
-    """Safely parse JSON string, returning empty list on error"""
-    if not json_str:
-        return []
+async def _run_idempotent(
+    db: Session,
+    current_user: User,
+    scope: str,
+    idempotency_key: Optional[str],
+    payload,
+    handler,
+    rebuild
+) -> Response:
+    """
+    Run a POST handler at most once per Idempotency-Key
+
+    A retry with the same key gets the first response back without the
+    handler running again; without a key the handler simply runs. The
+    handler is passed a callback to report what it created as soon as that
+    is committed. A failed handler releases the key so the client can
+    retry, unless it had created something: then a retry gets the response
+    from rebuild(resource_id) instead of creating it again.
+    """
+    if idempotency_key is None:
+        return await handler(lambda resource_id: None)
+
+    claim = IdempotencyService.begin(
+        db, current_user.id, scope, idempotency_key, IdempotencyService.fingerprint(payload)
+    )
+    if claim.replay is not None:
+        return claim.replay
+    if claim.resource_id is not None:
+        response = await rebuild(claim.resource_id)
+        IdempotencyService.complete(db, claim, response)
+        return response
+
+    def created(resource_id) -> None:
+        nonlocal claim
+        claim = IdempotencyService.record_resource(db, claim, resource_id)
+
     try:
-        result = json.loads(json_str)
-        return result if isinstance(result, list) else []
-    except (json.JSONDecodeError, TypeError, ValueError):
-        return []
+        response = await handler(created)
+    except BaseException:
+        IdempotencyService.release(db, claim)
+        raise
+    IdempotencyService.complete(db, claim, response)
+    return response
 
 
 @router.post("", response_model=MaintenanceRequestResponse, status_code=status.HTTP_201_CREATED)
 async def create_maintenance_request(
     request_data: MaintenanceRequestCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", min_length=1, max_length=255),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
     Create a new maintenance request
 
-    Any authenticated user can submit a maintenance request
+    Any authenticated user can submit a maintenance request. With an
+    Idempotency-Key header, retries return the request created first.
     """
-    try:
-        # Create the request
-        new_request = MaintenanceRequestService.create_request(db, request_data, current_user)
-
-        # Send email notification to all superusers (non-blocking)
+    async def create(created):
         try:
-            superusers = db.query(User).join(User.roles).filter(
-                User.roles.any(name="superuser")
-            ).all()
-
-            if superusers:
-                superuser_emails = [user.email for user in superusers]
-
-                email_data = {
-                    "title": new_request.title,
-                    "priority": new_request.priority.value,
-                    "description": new_request.description,
-                    "submitter_name": current_user.full_name,
-                    "submitter_email": current_user.email,
-                    "equipment_name": new_request.equipment_name,
-                    "location": new_request.location,
-                    "created_at": new_request.created_at.strftime("%Y-%m-%d %H:%M:%S") if new_request.created_at else "N/A"
-                }
-
-                # Try to send email but don't let it block the response
-                email_service.send_maintenance_request_notification(superuser_emails, email_data)
-        except Exception as email_error:
-            # Log email error but don't fail the request
-            logger.warning(f"Failed to send email notification: {email_error}", exc_info=True)
-
-        # Format response
-        response = MaintenanceRequestResponse(
-            id=new_request.id,
-            title=new_request.title,
-            description=new_request.description,
-            priority=new_request.priority,
-            status=new_request.status,
-            equipment_name=new_request.equipment_name,
-            location=new_request.location,
-            requested_completion_date=new_request.requested_completion_date,
-            last_maintenance_date=new_request.last_maintenance_date,
-            maintenance_cycle_days=new_request.maintenance_cycle_days,
-            warranty_status=new_request.warranty_status,
-            warranty_expiry_date=new_request.warranty_expiry_date,
-            part_order_list=new_request.part_order_list,
-            attachments=_safe_json_loads(new_request.attachments),
-            submitter_id=new_request.submitter_id,
-            submitter_email=new_request.submitter.email if new_request.submitter else None,
-            submitter_name=new_request.submitter.full_name if new_request.submitter else None,
-            created_at=new_request.created_at,
-            updated_at=None,
-            completed_at=new_request.completed_at,
-            completed_by_id=new_request.completed_by_id
-        )
-
-        return response
-
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to create maintenance request: {str(e)}"
-        )
+            # Create the request
+            new_request = MaintenanceRequestService.create_request(db, request_data, current_user)
+            created(new_request.id)
+
+            # Send email notification to all superusers (non-blocking)
+            try:
+                superusers = db.query(User).join(User.roles).filter(
+                    User.roles.any(name="superuser")
+                ).all()
+
+                if superusers:
+                    superuser_emails = [user.email for user in superusers]
+
+                    email_data = {
+                        "title": new_request.title,
+                        "priority": new_request.priority.value,
+                        "description": new_request.description,
+                        "submitter_name": current_user.full_name,
+                        "submitter_email": current_user.email,
+                        "equipment_name": new_request.equipment_name,
+                        "location": new_request.location,
+                        "created_at": new_request.created_at.strftime("%Y-%m-%d %H:%M:%S") if new_request.created_at else "N/A"
+                    }
+
+                    # Try to send email but don't let it block the response
+                    email_service.send_maintenance_request_notification(superuser_emails, email_data)
+            except Exception as email_error:
+                # Log email error but don't fail the request
+                logger.warning(f"Failed to send email notification: {email_error}", exc_info=True)
+
+            # Format response
+            response = request_response(new_request, status_code=status.HTTP_201_CREATED)
+
+            return response
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to create maintenance request: {str(e)}"
+            )
+
+    async def rebuild(request_id):
+        created_request = MaintenanceRequestService.get_request(db, request_id)
+        if not created_request:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Maintenance request not found"
+            )
+        return request_response(created_request, status_code=status.HTTP_201_CREATED)
+
+    return await _run_idempotent(
+        db, current_user, "maintenance_requests.create", idempotency_key,
+        request_data.model_dump(mode="json"), create, rebuild
+    )
 
 
 @router.get("", response_model=MaintenanceRequestListResponse)
@@ -136,65 +213,87 @@ def get_all_maintenance_requests(
     status_filter: Optional[str] = None,
     priority_filter: Optional[str] = None,
     search: Optional[str] = None,
+    equipment_id: Optional[int] = None,
+    overdue: bool = Query(False, description="Only open requests past their SLA"),
+    include_archived: bool = Query(False, description="Also search archived (old closed) requests"),
+    fields: Optional[str] = Query(None, description="Comma-separated response fields (sparse fieldset)"),
     current_user: User = Depends(require_maintenance_or_superuser),
     db: Session = Depends(get_db)
 ):
     """
     Get all maintenance requests (requires maintenance or superuser role)
 
-    Supports filtering by status, priority, and search term
+    Supports filtering by status, priority, equipment, SLA breach and search term.
+    Use fields (e.g. fields=id,title,status,priority) to skip heavy text columns.
+    Closed requests older than MAINTENANCE_ARCHIVE_AFTER_DAYS are only
+    listed with include_archived.
     """
-    requests, total = MaintenanceRequestService.get_all_requests(
+    selected_fields = parse_fields(fields)
+
+    rows, total = MaintenanceRequestService.get_all_requests(
         db,
         skip=skip,
         limit=limit,
         status_filter=status_filter,
         priority_filter=priority_filter,
-        search=search
+        search=search,
+        fields=selected_fields,
+        equipment_id=equipment_id,
+        overdue=overdue,
+        include_archived=include_archived
     )
 
-    # Format responses
-    formatted_requests = []
-    for req in requests:
-        formatted_requests.append(MaintenanceRequestResponse(
-            id=req.id,
-            title=req.title,
-            description=req.description,
-            priority=req.priority,
-            status=req.status,
-            equipment_name=req.equipment_name,
-            location=req.location,
-            requested_completion_date=req.requested_completion_date,
-            last_maintenance_date=req.last_maintenance_date,
-            maintenance_cycle_days=req.maintenance_cycle_days,
-            warranty_status=req.warranty_status,
-            warranty_expiry_date=req.warranty_expiry_date,
-            part_order_list=req.part_order_list,
-            attachments=_safe_json_loads(req.attachments),
-            submitter_id=req.submitter_id,
-            submitter_email=req.submitter.email if req.submitter else None,
-            submitter_name=req.submitter.full_name if req.submitter else None,
-            created_at=req.created_at,
-            updated_at=None,
-            completed_at=req.completed_at,
-            completed_by_id=req.completed_by_id,
-            completed_by_name=req.completed_by.full_name if req.completed_by else None
-        ))
-
     page = skip // limit + 1 if limit > 0 else 1
 
-    return MaintenanceRequestListResponse(
-        requests=formatted_requests,
-        total=total,
-        page=page,
-        page_size=limit
+    return request_list_response(rows, total, page, limit, selected_fields)
+
+
+@router.post("/claim", response_model=MaintenanceRequestResponse, responses={204: {"description": "No open requests"}})
+def claim_next_request(
+    current_user: User = Depends(require_maintenance_or_superuser),
+    db: Session = Depends(get_db)
+):
+    """
+    Claim the next job from the work queue (requires maintenance or superuser role)
+
+    Assigns the most urgent unclaimed pending request to the caller and moves
+    it to in_progress. Concurrent callers always get different requests.
+    The claim lapses after WORK_QUEUE_CLAIM_MINUTES unless renewed; returns
+    204 when there is nothing to claim.
+    """
+    claimed = WorkQueueService.claim_next(db, current_user)
+    if claimed is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return request_response(claimed)
+
+
+@router.post("/bulk/status", response_model=BulkStatusUpdateResponse)
+def bulk_update_request_status(
+    bulk_update: BulkStatusUpdate,
+    current_user: User = Depends(require_maintenance_or_superuser),
+    db: Session = Depends(get_db)
+):
+    """
+    Move several requests to a status at once (requires maintenance or superuser role)
+
+    Applied in one transaction; each request gets its own result (updated,
+    unchanged, not_found or conflict) instead of failing the whole call.
+    """
+    results = MaintenanceRequestService.bulk_update_status(
+        db, bulk_update.request_ids, bulk_update.status, current_user
     )
+    return {
+        "results": results,
+        "updated": sum(1 for result in results if result["result"] == "updated")
+    }
 
 
 @router.get("/my-requests", response_model=MaintenanceRequestListResponse)
 def get_my_maintenance_requests(
     skip: int = 0,
     limit: int = 100,
+    include_archived: bool = Query(False, description="Also include archived (old closed) requests"),
+    fields: Optional[str] = Query(None, description="Comma-separated response fields (sparse fieldset)"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -203,62 +302,397 @@ def get_my_maintenance_requests(
 
     Any authenticated user can view their own requests
     """
-    requests, total = MaintenanceRequestService.get_user_requests(
+    selected_fields = parse_fields(fields)
+
+    rows, total = MaintenanceRequestService.get_user_requests(
         db,
         user_id=current_user.id,
         skip=skip,
-        limit=limit
+        limit=limit,
+        fields=selected_fields,
+        include_archived=include_archived
     )
 
-    # Format responses
-    formatted_requests = []
-    for req in requests:
-        formatted_requests.append(MaintenanceRequestResponse(
-            id=req.id,
-            title=req.title,
-            description=req.description,
-            priority=req.priority,
-            status=req.status,
-            equipment_name=req.equipment_name,
-            location=req.location,
-            requested_completion_date=req.requested_completion_date,
-            last_maintenance_date=req.last_maintenance_date,
-            maintenance_cycle_days=req.maintenance_cycle_days,
-            warranty_status=req.warranty_status,
-            warranty_expiry_date=req.warranty_expiry_date,
-            part_order_list=req.part_order_list,
-            attachments=_safe_json_loads(req.attachments),
-            submitter_id=req.submitter_id,
-            submitter_email=req.submitter.email if req.submitter else None,
-            submitter_name=req.submitter.full_name if req.submitter else None,
-            created_at=req.created_at,
-            updated_at=None,
-            completed_at=req.completed_at,
-            completed_by_id=req.completed_by_id,
-            completed_by_name=req.completed_by.full_name if req.completed_by else None
-        ))
-
     page = skip // limit + 1 if limit > 0 else 1
 
-    return MaintenanceRequestListResponse(
-        requests=formatted_requests,
-        total=total,
-        page=page,
-        page_size=limit
-    )
+    return request_list_response(rows, total, page, limit, selected_fields)
+
+
+statistics_flight = SingleFlight("maintenance_statistics")
+
+
+def _load_statistics() -> dict:
+    """Request statistics from a short-lived session"""
+    db = SessionLocal()
+    try:
+        return MaintenanceRequestService.get_statistics(db)
+    finally:
+        db.close()
+
+
+async def coalesced_statistics() -> dict:
+    """Request statistics, shared with concurrent callers (maintenance and superuser scope)"""
+    return await statistics_flight.run(flight_key("maintenance_or_superuser"), _load_statistics)
 
 
 @router.get("/statistics")
-def get_maintenance_statistics(
+async def get_maintenance_statistics(
     current_user: User = Depends(require_maintenance_or_superuser),
     db: Session = Depends(get_db)
 ):
     """
     Get maintenance request statistics
 
-    Returns counts of total, pending, in progress, completed, and urgent requests
+    Returns counts of total, pending, in progress, completed, and urgent requests.
+    Concurrent calls share one computation.
+    """
+    # Return the authentication connection to the pool, so waiting callers do not starve the computation
+    db.close()
+    return await coalesced_statistics()
+
+
+@router.get("/kpis", response_model=MaintenanceKpiResponse)
+def get_maintenance_kpis(
+    date_from: Optional[date] = Query(None, description="First day (defaults to 30 days ago)"),
+    date_to: Optional[date] = Query(None, description="Last day, inclusive (defaults to today)"),
+    group_by: Optional[str] = Query(None, pattern="^(equipment|location|priority)$"),
+    interval: str = Query("day", pattern="^(day|week)$"),
+    current_user: User = Depends(require_maintenance_or_superuser),
+    db: Session = Depends(get_db)
+):
+    """
+    Get maintenance KPIs (requires maintenance or superuser role)
+
+    Throughput (created/completed/cancelled per day or week), mean time to
+    repair and the age of the open backlog, optionally per equipment,
+    location or priority. Served from pre-aggregated daily buckets, so the
+    cost does not grow with the number of requests.
+    """
+    date_to = date_to or datetime.utcnow().date()
+    date_from = date_from or date_to - timedelta(days=29)
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_from must not be after date_to"
+        )
+    if (date_to - date_from).days > 3660:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Date range must not exceed 10 years"
+        )
+
+    return MaintenanceKpiService.get_kpis(db, date_from, date_to, group_by, interval)
+
+
+@router.get("/events", response_model=MaintenanceRequestEventFeed)
+def get_maintenance_request_events(
+    cursor: Optional[str] = Query(None, max_length=50, description="next_cursor of the previous page"),
+    limit: int = Query(500, ge=1, le=5000),
+    current_user: User = Depends(require_maintenance_or_superuser),
+    db: Session = Depends(get_db)
+):
+    """
+    Read the request event log incrementally (requires maintenance or superuser role)
+
+    Pass the returned next_cursor on the next call to receive only newer
+    events, including those of deleted requests. Events are returned in
+    commit order, so none is skipped when a slow writer commits late.
+    """
+    events, next_cursor = MaintenanceRequestEventService.read_since(db, cursor, limit)
+
+    actor_ids = {event.actor_id for event in events if event.actor_id}
+    actor_names = dict(db.query(User.id, User.full_name).filter(User.id.in_(actor_ids)).all()) if actor_ids else {}
+
+    return {
+        "events": [
+            MaintenanceRequestEventService.serialize(event, actor_names.get(event.actor_id))
+            for event in events
+        ],
+        "next_cursor": next_cursor
+    }
+
+
+@router.get("/parts/demand", response_model=PartDemandResponse)
+def get_parts_demand(
+    search: Optional[str] = Query(None, max_length=100, description="Part number prefix"),
+    part_status: Optional[PartStatus] = Query(None, alias="status", description="Only needed or only ordered lines"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: User = Depends(require_maintenance_or_inventory),
+    db: Session = Depends(get_db)
+):
+    """
+    Get outstanding parts demand (requires maintenance or superuser role, or Kosh access)
+
+    Quantities still needed or on order per part across pending and
+    in-progress requests, largest first. Part numbers are matched by their
+    normalized key, so "abc-123" and "ABC123" are one part.
+    """
+    if part_status not in (None, PartStatus.NEEDED, PartStatus.ORDERED):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="status must be needed or ordered"
+        )
+
+    parts, total = MaintenanceRequestPartService.get_demand(db, search, part_status, skip, limit)
+    return {"parts": parts, "total": total}
+
+
+def _sse_message(event_id: int, event_name: str, data: dict) -> bytes:
+    """Encode one Server-Sent Events message"""
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event_id, event_name.encode(), orjson.dumps(data, option=ORJSON_OPTIONS))
+
+
+def _load_events(after_id: Optional[int], submitter_id: Optional[int]):
+    """Replay events after an id from a short-lived session (None: only the newest id)"""
+    db = SessionLocal()
+    try:
+        if after_id is None:
+            return MaintenanceRequestEventService.latest_id(db)
+        return MaintenanceRequestEventService.replay(db, after_id, submitter_id, settings.EVENT_STREAM_REPLAY_LIMIT + 1)
+    finally:
+        db.close()
+
+
+async def _event_stream(submitter_id: Optional[int], last_event_id: Optional[int]):
+    """
+    Generate the Server-Sent Events of one client
+
+    Live events come from the event bus; the event log fills the gaps after
+    a reconnect (Last-Event-ID) or when the client fell behind and its
+    queue was dropped. Events are deduplicated by id, and a comment line
+    is sent when nothing happened for a heartbeat interval.
+    """
+    subscription = await maintenance_event_bus.subscribe(
+        lambda payload: submitter_id is None or payload.get("submitter_id") == submitter_id
+    )
+    recent_ids = deque(maxlen=4 * settings.EVENT_STREAM_QUEUE_SIZE)
+
+    def message(payload: dict) -> bytes:
+        recent_ids.append(payload["id"])
+        data = {key: value for key, value in payload.items() if key != "submitter_id"}
+        return _sse_message(payload["id"], payload["event_type"], data)
+
+    try:
+        yield b"retry: 3000\n\n"
+        last_id = last_event_id
+        if last_id is None:
+            last_id = await run_in_threadpool(_load_events, None, submitter_id)
+            yield _sse_message(last_id, "ready", {"last_event_id": last_id})
+            catch_up = False
+        else:
+            catch_up = True
+
+        while True:
+            if catch_up or subscription.lagged:
+                subscription.lagged = False
+                replayed = await run_in_threadpool(_load_events, last_id, submitter_id)
+                if len(replayed) > settings.EVENT_STREAM_REPLAY_LIMIT:
+                    # Too far behind to replay; the client reloads its data instead
+                    last_id = await run_in_threadpool(_load_events, None, submitter_id)
+                    yield _sse_message(last_id, "reset", {"last_event_id": last_id})
+                else:
+                    for payload in replayed:
+                        if payload["id"] not in recent_ids:
+                            last_id = max(last_id, payload["id"])
+                            yield message(payload)
+                catch_up = False
+
+            try:
+                payload = await asyncio.wait_for(subscription.queue.get(), settings.EVENT_STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": heartbeat\n\n"
+                continue
+
+            if payload is not None and payload["id"] not in recent_ids:
+                last_id = max(last_id, payload["id"])
+                yield message(payload)
+    finally:
+        maintenance_event_bus.unsubscribe(subscription)
+
+
+@router.post("/stream/ticket", response_model=StreamTicket)
+def create_stream_ticket_for_user(
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get a ticket to open the event stream with
+
+    EventSource cannot send headers, so the ticket goes in the stream URL
+    as ?ticket=. It is valid for EVENT_STREAM_TICKET_SECONDS and only opens
+    streams, unlike the access token, which must never be put in a URL.
+    """
+    return StreamTicket(
+        ticket=create_stream_ticket(current_user.username),
+        expires_in=settings.EVENT_STREAM_TICKET_SECONDS
+    )
+
+
+@router.get("/stream")
+async def stream_maintenance_events(
+    last_event_id: Optional[int] = Query(None, ge=0, description="Resume after this event id"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: User = Depends(get_stream_user)
+):
+    """
+    Stream request changes as Server-Sent Events
+
+    Sends created, updated, status_changed, attachments_added and deleted
+    events for the requests the user can view (all of them with the
+    maintenance or superuser role, otherwise their own). The id of each
+    message is its event id: EventSource resends it as Last-Event-ID when
+    reconnecting and the missed events are replayed. A reset event means
+    too much was missed and the client should reload. Clients that cannot
+    send headers (EventSource) pass a ticket from POST /stream/ticket instead.
+    """
+    if maintenance_event_bus.subscriber_count >= settings.EVENT_STREAM_MAX_CLIENTS:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many open event streams, try again later",
+            headers={"Retry-After": "30"}
+        )
+
+    if last_event_id is None and last_event_id_header and last_event_id_header.isdigit():
+        last_event_id = int(last_event_id_header)
+
+    submitter_id = None if MaintenanceRequestService.has_maintenance_access(current_user) else current_user.id
+
+    return StreamingResponse(
+        _event_stream(submitter_id, last_event_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-store",
+            # Tell nginx not to buffer the stream
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+@router.get("/storage")
+def get_storage_usage(
+    current_user: User = Depends(require_superuser),
+    db: Session = Depends(get_db)
+):
+    """
+    Get attachment storage usage (superuser only)
+
+    Figures are maintained by the upload garbage collector and lag by at most one sweep
     """
-    return MaintenanceRequestService.get_statistics(db)
+    return UploadStorageService.get_storage_usage(db)
+
+
+@router.get("/due", response_model=MaintenanceDueCalendar)
+def get_due_maintenance(
+    days: int = Query(30, ge=1, le=366, description="Days ahead to include"),
+    include_overdue: bool = Query(True, description="Include maintenance that is already overdue"),
+    limit: int = Query(1000, ge=1, le=5000),
+    current_user: User = Depends(require_maintenance_or_superuser),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the preventive maintenance calendar (requires maintenance or superuser role)
+
+    Lists equipment whose maintenance cycle comes due in the next days,
+    grouped by due date, with the generated PM request if there is one
+    """
+    now = datetime.utcnow()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    start = None if include_overdue else today
+    end = today + timedelta(days=days + 1)
+
+    schedules, total = MaintenanceScheduleService.get_due(db, start, end, limit)
+
+    calendar_days = []
+    for day, day_schedules in groupby(schedules, key=lambda schedule: schedule.next_due_at.date()):
+        calendar_days.append({
+            "date": day,
+            "items": [{
+                "schedule_id": schedule.id,
+                "equipment_id": schedule.equipment_id,
+                "equipment_name": schedule.equipment_name,
+                "location": schedule.location,
+                "cycle_days": schedule.cycle_days,
+                "last_maintenance_date": schedule.last_maintenance_date,
+                "next_due_at": schedule.next_due_at,
+                "open_request_id": schedule.open_request_id,
+                "overdue": schedule.next_due_at < now
+            } for schedule in day_schedules]
+        })
+
+    return {"start": start, "end": end, "total": total, "days": calendar_days}
+
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+}
+
+
+def _export_chunks(export_format: str, fields, **filters):
+    """
+    Generate export chunks from a session owned by the generator
+
+    The request-scoped session is closed before a streaming body is sent,
+    so the export opens its own and closes it when the stream ends.
+    """
+    db = SessionLocal()
+    try:
+        rows = MaintenanceRequestService.iter_export_rows(db, fields, **filters)
+        writer = stream_xlsx if export_format == "xlsx" else stream_csv
+        yield from writer(rows, fields)
+    finally:
+        db.close()
+
+
+@router.get("/export")
+def export_maintenance_requests(
+    format: str = Query("csv", description="Export format: csv or xlsx"),
+    status_filter: Optional[str] = None,
+    priority_filter: Optional[str] = None,
+    search: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    equipment_id: Optional[int] = None,
+    overdue: bool = Query(False, description="Only open requests past their SLA"),
+    include_archived: bool = Query(False, description="Also export archived (old closed) requests"),
+    fields: Optional[str] = Query(None, description="Comma-separated export columns"),
+    current_user: User = Depends(require_maintenance_or_superuser)
+):
+    """
+    Export maintenance requests as CSV or XLSX (requires maintenance or superuser role)
+
+    Accepts the same filters as the list endpoint plus a created_at range.
+    Rows are streamed from a server-side cursor, so exports of any size
+    use flat memory.
+    """
+    export_format = format.lower()
+    if export_format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Export format must be csv or xlsx"
+        )
+    if export_format == "xlsx":
+        ensure_xlsx_support()
+
+    selected_fields = sorted(parse_fields(fields), key=lambda name: name != "id") if fields else list(EXPORT_FIELDS)
+    filename = f"maintenance-requests-{datetime.utcnow():%Y%m%d-%H%M%S}.{export_format}"
+
+    return StreamingResponse(
+        _export_chunks(
+            export_format,
+            selected_fields,
+            status_filter=status_filter,
+            priority_filter=priority_filter,
+            search=search,
+            created_from=created_from,
+            created_to=created_to,
+            equipment_id=equipment_id,
+            overdue=overdue,
+            include_archived=include_archived
+        ),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 
 @router.get("/{request_id}", response_model=MaintenanceRequestResponse)
@@ -272,7 +706,7 @@ def get_maintenance_request(
 
     Users can view their own requests or if they have maintenance/superuser role
     """
-    request = MaintenanceRequestService.get_request(db, request_id)
+    request = MaintenanceRequestService.get_request(db, request_id, include_archived=True)
 
     if not request:
         raise HTTPException(
@@ -287,30 +721,100 @@ def get_maintenance_request(
             detail="You do not have permission to view this request"
         )
 
-    return MaintenanceRequestResponse(
-        id=request.id,
-        title=request.title,
-        description=request.description,
-        priority=request.priority,
-        status=request.status,
-        equipment_name=request.equipment_name,
-        location=request.location,
-        requested_completion_date=request.requested_completion_date,
-        last_maintenance_date=request.last_maintenance_date,
-        maintenance_cycle_days=request.maintenance_cycle_days,
-        warranty_status=request.warranty_status,
-        warranty_expiry_date=request.warranty_expiry_date,
-        part_order_list=request.part_order_list,
-        attachments=_safe_json_loads(request.attachments),
-        submitter_id=request.submitter_id,
-        submitter_email=request.submitter.email if request.submitter else None,
-        submitter_name=request.submitter.full_name if request.submitter else None,
-        created_at=request.created_at,
-        updated_at=None,
-        completed_at=request.completed_at,
-        completed_by_id=request.completed_by_id,
-        completed_by_name=request.completed_by.full_name if request.completed_by else None
-    )
+    return request_response(request)
+
+
+@router.get("/{request_id}/timeline", response_model=MaintenanceRequestTimeline)
+def get_maintenance_request_timeline(
+    request_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the change history of a request and the time it spent in each status
+
+    Users can view their own requests or if they have maintenance/superuser role
+    """
+    request = MaintenanceRequestService.get_request(db, request_id, include_archived=True)
+
+    if not request:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Maintenance request not found"
+        )
+
+    if not MaintenanceRequestService.can_view_request(current_user, request):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to view this request"
+        )
+
+    timeline = MaintenanceRequestEventService.get_timeline(db, request_id)
+
+    return {
+        "request_id": request_id,
+        "events": [MaintenanceRequestEventService.serialize(event, actor_name) for event, actor_name in timeline],
+        "time_in_status": MaintenanceRequestEventService.time_in_status([event for event, _ in timeline])
+    }
+
+
+@router.get("/{request_id}/parts", response_model=MaintenanceRequestPartList)
+def get_maintenance_request_parts(
+    request_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the parsed parts list of a request
+
+    Users can view their own requests or if they have maintenance/superuser role
+    """
+    request = MaintenanceRequestService.get_request(db, request_id, include_archived=True)
+
+    if not request:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Maintenance request not found"
+        )
+
+    if not MaintenanceRequestService.can_view_request(current_user, request):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to view this request"
+        )
+
+    return {"request_id": request.id, "part_order_list": request.part_order_list, "parts": request.parts}
+
+
+@router.put("/{request_id}/parts", response_model=MaintenanceRequestPartList)
+def replace_maintenance_request_parts(
+    request_id: int,
+    parts_data: MaintenanceRequestPartsUpdate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Replace the parts list of a request with structured lines
+
+    The free-text part_order_list is rewritten to match. Users can update
+    their own requests or if they have maintenance/superuser role
+    """
+    request = MaintenanceRequestService.get_request(db, request_id)
+
+    if not request:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Maintenance request not found"
+        )
+
+    if not MaintenanceRequestService.can_edit_request(current_user, request):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to edit this request"
+        )
+
+    request = MaintenanceRequestPartService.replace_parts(db, request, parts_data.parts, current_user)
+    return {"request_id": request.id, "part_order_list": request.part_order_list, "parts": request.parts}
 
 
 @router.put("/{request_id}", response_model=MaintenanceRequestResponse)
@@ -342,30 +846,7 @@ def update_maintenance_request(
 
     updated_request = MaintenanceRequestService.update_request(db, request_id, update_data, current_user)
 
-    return MaintenanceRequestResponse(
-        id=updated_request.id,
-        title=updated_request.title,
-        description=updated_request.description,
-        priority=updated_request.priority,
-        status=updated_request.status,
-        equipment_name=updated_request.equipment_name,
-        location=updated_request.location,
-        requested_completion_date=updated_request.requested_completion_date,
-        last_maintenance_date=updated_request.last_maintenance_date,
-        maintenance_cycle_days=updated_request.maintenance_cycle_days,
-        warranty_status=updated_request.warranty_status,
-        warranty_expiry_date=updated_request.warranty_expiry_date,
-        part_order_list=updated_request.part_order_list,
-        attachments=_safe_json_loads(updated_request.attachments),
-        submitter_id=updated_request.submitter_id,
-        submitter_email=updated_request.submitter.email if updated_request.submitter else None,
-        submitter_name=updated_request.submitter.full_name if updated_request.submitter else None,
-        created_at=updated_request.created_at,
-        updated_at=None,
-        completed_at=updated_request.completed_at,
-        completed_by_id=updated_request.completed_by_id,
-        completed_by_name=updated_request.completed_by.full_name if updated_request.completed_by else None
-    )
+    return request_response(updated_request)
 
 
 @router.patch("/{request_id}/status", response_model=MaintenanceRequestResponse)
@@ -387,30 +868,33 @@ def update_request_status(
         current_user
     )
 
-    return MaintenanceRequestResponse(
-        id=updated_request.id,
-        title=updated_request.title,
-        description=updated_request.description,
-        priority=updated_request.priority,
-        status=updated_request.status,
-        equipment_name=updated_request.equipment_name,
-        location=updated_request.location,
-        requested_completion_date=updated_request.requested_completion_date,
-        last_maintenance_date=updated_request.last_maintenance_date,
-        maintenance_cycle_days=updated_request.maintenance_cycle_days,
-        warranty_status=updated_request.warranty_status,
-        warranty_expiry_date=updated_request.warranty_expiry_date,
-        part_order_list=updated_request.part_order_list,
-        attachments=_safe_json_loads(updated_request.attachments),
-        submitter_id=updated_request.submitter_id,
-        submitter_email=updated_request.submitter.email if updated_request.submitter else None,
-        submitter_name=updated_request.submitter.full_name if updated_request.submitter else None,
-        created_at=updated_request.created_at,
-        updated_at=None,
-        completed_at=updated_request.completed_at,
-        completed_by_id=updated_request.completed_by_id,
-        completed_by_name=updated_request.completed_by.full_name if updated_request.completed_by else None
-    )
+    return request_response(updated_request)
+
+
+@router.post("/{request_id}/claim/renew", response_model=MaintenanceRequestResponse)
+def renew_request_claim(
+    request_id: int,
+    current_user: User = Depends(require_maintenance_or_superuser),
+    db: Session = Depends(get_db)
+):
+    """
+    Extend your claim on a request so it does not return to the queue
+    """
+    return request_response(WorkQueueService.renew_claim(db, request_id, current_user))
+
+
+@router.post("/{request_id}/release", response_model=MaintenanceRequestResponse)
+def release_request_claim(
+    request_id: int,
+    current_user: User = Depends(require_maintenance_or_superuser),
+    db: Session = Depends(get_db)
+):
+    """
+    Return a claimed request to the work queue
+
+    The technician holding the claim or a superuser can release it
+    """
+    return request_response(WorkQueueService.release_claim(db, request_id, current_user))
 
 
 @router.delete("/{request_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -442,20 +926,123 @@ def delete_maintenance_request(
             detail="You do not have permission to delete this request"
         )
 
-    MaintenanceRequestService.delete_request(db, request_id)
+    MaintenanceRequestService.delete_request(db, request_id, current_user)
 
 
 @router.post("/{request_id}/upload")
 async def upload_attachment(
     request_id: int,
     files: List[UploadFile] = File(...),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", min_length=1, max_length=255),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
     Upload attachments to a maintenance request
 
-    Users can upload to their own requests or if they have maintenance/superuser role
+    Users can upload to their own requests or if they have maintenance/superuser role.
+    With an Idempotency-Key header, retries return the first upload's result
+    without storing the files again.
+    """
+    def upload_response(updated_request, filenames):
+        return FastJSONResponse({
+            "message": "Files uploaded successfully",
+            "filenames": filenames,
+            "total_attachments": len(safe_json_list(updated_request.attachments))
+        })
+
+    async def upload(created):
+        request = MaintenanceRequestService.get_request(db, request_id)
+
+        if not request:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Maintenance request not found"
+            )
+
+        # Check permissions
+        if not MaintenanceRequestService.can_edit_request(current_user, request):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You do not have permission to upload to this request"
+            )
+
+        try:
+            # Save files
+            filenames = await save_multiple_files(files)
+
+            # Add to request
+            updated_request = MaintenanceRequestService.add_attachments(db, request_id, filenames, current_user)
+            created(filenames)
+
+            return upload_response(updated_request, filenames)
+
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to upload files: {str(e)}"
+            )
+
+    async def rebuild(filenames):
+        request = MaintenanceRequestService.get_request(db, request_id)
+        if not request:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Maintenance request not found"
+            )
+        return upload_response(request, filenames)
+
+    # Multipart bodies differ by boundary; the files are compared by name, type and size
+    payload = {
+        "request_id": request_id,
+        "files": [[file.filename, file.content_type, file.size] for file in files]
+    }
+    return await _run_idempotent(
+        db, current_user, "maintenance_requests.upload", idempotency_key, payload, upload, rebuild
+    )
+
+
+def _upload_session_headers(upload_session) -> dict:
+    """Progress headers for a resumable upload session"""
+    return {
+        "Upload-Offset": str(upload_session.bytes_received),
+        "Upload-Length": str(upload_session.total_size),
+        "Cache-Control": "no-store"
+    }
+
+
+def _get_owned_upload_session(db: Session, request_id: int, upload_id: str, current_user: User):
+    """Load an upload session and check it belongs to the current user"""
+    upload_session = UploadSessionService.get_session(db, request_id, upload_id)
+
+    if not upload_session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found"
+        )
+
+    if upload_session.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to access this upload"
+        )
+
+    return upload_session
+
+
+@router.post("/{request_id}/uploads", response_model=UploadSessionResponse, status_code=status.HTTP_201_CREATED)
+def create_upload_session(
+    request_id: int,
+    session_data: UploadSessionCreate,
+    response: Response,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Start a resumable upload for a maintenance request
+
+    Send the file afterwards in one or more PATCH requests to the returned
+    upload URL. Same permissions as the regular upload endpoint.
     """
     request = MaintenanceRequestService.get_request(db, request_id)
 
@@ -472,25 +1059,138 @@ async def upload_attachment(
             detail="You do not have permission to upload to this request"
         )
 
+    upload_session = UploadSessionService.create_session(db, request, current_user, session_data)
+
+    response.headers.update(_upload_session_headers(upload_session))
+    response.headers["Location"] = f"{router.prefix}/{request_id}/uploads/{upload_session.token}"
+
+    return UploadSessionService.to_response(upload_session)
+
+
+@router.get("/{request_id}/uploads/{upload_id}", response_model=UploadSessionResponse)
+def get_upload_session(
+    request_id: int,
+    upload_id: str,
+    response: Response,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the state of a resumable upload
+
+    The offset tells the client where to continue after a dropped connection
+    """
+    upload_session = _get_owned_upload_session(db, request_id, upload_id, current_user)
+
+    response.headers.update(_upload_session_headers(upload_session))
+
+    return UploadSessionService.to_response(upload_session)
+
+
+@router.patch("/{request_id}/uploads/{upload_id}", response_model=UploadSessionResponse)
+async def upload_chunk(
+    request_id: int,
+    upload_id: str,
+    http_request: Request,
+    response: Response,
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Append a chunk to a resumable upload
+
+    The raw request body is buffered, then written at the position given by
+    the Upload-Offset header, which must match the current offset of the upload.
+    Once all bytes are received the file is validated and attached.
+    """
+    upload_session = _get_owned_upload_session(db, request_id, upload_id, current_user)
+    UploadSessionService.ensure_active(upload_session)
+
+    if upload_offset != upload_session.bytes_received:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Upload-Offset does not match the current offset",
+            headers=_upload_session_headers(upload_session)
+        )
+
+    remaining = upload_session.total_size - upload_session.bytes_received
+    content_length = http_request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > remaining:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Chunk exceeds the declared upload length"
+        )
+
+    # Buffer the body in a file of its own; it only reaches the partial file
+    # once the offset is confirmed under the session row lock
+    chunk_path = get_chunk_upload_path(upload_session.token)
     try:
-        # Save files
-        filenames = await save_multiple_files(files)
+        bytes_written, _ = await write_upload_chunk(chunk_path, http_request.stream(), remaining)
+        appended = UploadSessionService.record_progress(
+            db, upload_session, upload_offset, chunk_path, bytes_written
+        )
+    finally:
+        delete_chunk_upload(chunk_path)
+
+    if not appended:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Upload was modified concurrently, query the current offset and retry",
+            headers=_upload_session_headers(upload_session)
+        )
 
-        # Add to request
-        updated_request = MaintenanceRequestService.add_attachments(db, request_id, filenames)
+    # Complete even if the client dropped after the last byte; it will see the
+    # final state on its next offset query
+    if upload_session.bytes_received == upload_session.total_size:
+        upload_session = UploadSessionService.complete_session(db, upload_session)
 
-        return {
-            "message": "Files uploaded successfully",
-            "filenames": filenames,
-            "total_attachments": len(_safe_json_loads(updated_request.attachments))
-        }
+    response.headers.update(_upload_session_headers(upload_session))
 
-    except Exception as e:
+    return UploadSessionService.to_response(upload_session)
+
+
+@router.delete("/{request_id}/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+def abort_upload_session(
+    request_id: int,
+    upload_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Abort a resumable upload and discard the received bytes
+    """
+    upload_session = _get_owned_upload_session(db, request_id, upload_id, current_user)
+    UploadSessionService.ensure_active(upload_session)
+
+    UploadSessionService.abort_session(db, upload_session)
+
+
+@router.get("/{request_id}/storage")
+def get_request_storage(
+    request_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the storage used by a request's attachments
+    """
+    request = MaintenanceRequestService.get_request(db, request_id, include_archived=True)
+
+    if not request:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to upload files: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Maintenance request not found"
         )
 
+    if not MaintenanceRequestService.can_view_request(current_user, request):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to view this request"
+        )
+
+    return UploadStorageService.get_request_storage(request)
+
 
 @router.get("/{request_id}/attachments/{filename}")
 async def download_attachment(
@@ -504,7 +1204,7 @@ async def download_attachment(
 
     Users can download from requests they have access to view
     """
-    request = MaintenanceRequestService.get_request(db, request_id)
+    request = MaintenanceRequestService.get_request(db, request_id, include_archived=True)
 
     if not request:
         raise HTTPException(
@@ -520,7 +1220,7 @@ async def download_attachment(
         )
 
     # Verify filename is in request attachments
-    attachments = _safe_json_loads(request.attachments)
+    attachments = safe_json_list(request.attachments)
     if filename not in attachments:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -539,3 +1239,87 @@ async def download_attachment(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"File not found: {str(e)}"
         )
+
+
+def _attachment_zip_entries(requests: List[MaintenanceRequest], per_request_folders: bool):
+    """Yield (archive name, path) pairs for the stored attachments of requests"""
+    for request in requests:
+        for filename in safe_json_list(request.attachments):
+            try:
+                file_path = get_file_path(filename)
+            except HTTPException:
+                logger.warning(f"Attachment {filename} of request {request.id} is missing on disk")
+                continue
+
+            arcname = f"{request.id}/{filename}" if per_request_folders else filename
+            yield arcname, file_path
+
+
+@router.post("/attachments.zip")
+def download_attachment_bundle(
+    bundle_request: AttachmentBundleRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Download the attachments of several maintenance requests as one ZIP
+
+    Accepts the request IDs of a (filtered) list view. Each request gets its
+    own folder in the archive. Users need view access to every request.
+    """
+    request_ids = list(dict.fromkeys(bundle_request.request_ids))
+    requests = MaintenanceRequestService.get_requests_by_ids(db, request_ids, include_archived=True)
+
+    found_ids = {request.id for request in requests}
+    missing_ids = [request_id for request_id in request_ids if request_id not in found_ids]
+    if missing_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Maintenance requests not found: {missing_ids}"
+        )
+
+    # Check permissions
+    if not all(MaintenanceRequestService.can_view_request(current_user, request) for request in requests):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to access attachments of all requested requests"
+        )
+
+    return StreamingResponse(
+        stream_zip(_attachment_zip_entries(requests, per_request_folders=True)),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="maintenance-request-attachments.zip"'}
+    )
+
+
+@router.get("/{request_id}/attachments.zip")
+def download_attachments_zip(
+    request_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Download all attachments of a maintenance request as one ZIP
+
+    The archive is streamed; already-compressed formats are stored as-is
+    """
+    request = MaintenanceRequestService.get_request(db, request_id, include_archived=True)
+
+    if not request:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Maintenance request not found"
+        )
+
+    # Check permissions
+    if not MaintenanceRequestService.can_view_request(current_user, request):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to access this request's attachments"
+        )
+
+    return StreamingResponse(
+        stream_zip(_attachment_zip_entries([request], per_request_folders=False)),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="maintenance-request-{request_id}-attachments.zip"'}
+    )
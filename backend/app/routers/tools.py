@@ -3,8 +3,9 @@ Tool access routes
 """
 
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
+from app.db.base import SessionLocal
 from app.db.session import get_db
 from app.core.deps import (
     get_current_active_user,
@@ -14,20 +15,33 @@ from app.core.deps import (
     require_aci_chat
 )
 from app.models.user import User
-from app.schemas.tool import Tool as ToolSchema
+from app.core.responses import adapter_response, make_etag, not_modified
+from app.core.singleflight import SingleFlight, flight_key
+from app.schemas.tool import Tool as ToolSchema, TOOL_LIST_ADAPTER
 from app.services.user import UserService
 from app.services.tool import ToolService
+from app.services.tool_catalog import tool_catalog
 
 router = APIRouter(prefix="/api/tools", tags=["tools"])
 
 @router.get("/", response_model=List[ToolSchema])
 async def get_user_tools(
+    request: Request,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Get tools assigned to current user"""
+    """Get tools assigned to current user (supports If-None-Match)"""
     tools = UserService.get_user_tools(current_user, db)
-    return tools
+
+    etag = make_etag("tools", tool_catalog.refresh(db), [tool.id for tool in tools])
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    response = adapter_response(TOOL_LIST_ADAPTER, tools)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
 
 @router.get("/{tool_id}", response_model=ToolSchema)
 async def get_tool(
@@ -45,7 +59,7 @@ async def get_tool(
     
     # Check if user has access to this tool
     user_tools = UserService.get_user_tools(current_user, db)
-    if tool not in user_tools:
+    if tool.id not in {user_tool.id for user_tool in user_tools}:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to this tool"
@@ -156,12 +170,22 @@ async def execute_aci_chat(
     }
 
 # Admin endpoints for tools
+admin_tools_flight = SingleFlight("admin_tools")
+
+def _load_all_tools() -> List[ToolSchema]:
+    """All tools from a short-lived session"""
+    db = SessionLocal()
+    try:
+        return TOOL_LIST_ADAPTER.validate_python(ToolService.get_tools(db), from_attributes=True)
+    finally:
+        db.close()
+
 @router.get("/admin/all", response_model=List[ToolSchema])
 async def get_all_tools_admin(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Get all tools (SuperUser only)"""
+    """Get all tools (SuperUser only; concurrent calls share one query)"""
     # Check if user is superuser
     if not any(role.name == 'superuser' for role in current_user.roles):
         raise HTTPException(
@@ -169,5 +193,7 @@ async def get_all_tools_admin(
             detail="Access denied. SuperUser required."
         )
     
-    tools = ToolService.get_tools(db)
-    return tools
\ No newline at end of file
+    # Return the authentication connection to the pool, so waiting callers do not starve the query
+    db.close()
+    tools = await admin_tools_flight.run(flight_key("superuser"), _load_all_tools)
+    return adapter_response(TOOL_LIST_ADAPTER, tools)
\ No newline at end of file
@@ -2,24 +2,22 @@
 User-related routes for authenticated users
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.core.deps import get_current_active_user
+from app.core.responses import FastJSONResponse, make_etag, not_modified
 from app.models.user import User
 from app.schemas.user import User as UserSchema
 from app.schemas.auth import ResetPasswordWithCurrentRequest, PasswordResetResponse, LoginRequest
 from app.services.user import UserService
+from app.services.tool_catalog import tool_catalog
 from app.services.auth import AuthService
 
 router = APIRouter(prefix="/api/users", tags=["users"])
 
-@router.get("/me", response_model=UserSchema)
-async def get_current_user_profile(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    """Get current user profile"""
+def profile_content(current_user: User, db: Session) -> UserSchema:
+    """Profile of the current user with their tools"""
     # Get user tools
     user_tools = UserService.get_user_tools(current_user, db)
 
@@ -29,23 +27,15 @@ async def get_current_user_profile(
 
     return user_schema
 
-@router.get("/me/roles")
-async def get_current_user_roles(
-    current_user: User = Depends(get_current_active_user)
-):
-    """Get current user's roles"""
+def roles_content(current_user: User) -> dict:
+    """Role names of the current user"""
     return {
         "user": current_user.username,
         "roles": [role.name for role in current_user.roles]
     }
 
-@router.get("/me/tools")
-async def get_current_user_tools(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    """Get current user's available tools"""
-    tools = UserService.get_user_tools(current_user, db)
+def tools_content(current_user: User, tools) -> dict:
+    """Tools of the current user, as returned by /me/tools"""
     return {
         "user": current_user.username,
         "tools": [
@@ -61,6 +51,40 @@ async def get_current_user_tools(
         ]
     }
 
+@router.get("/me", response_model=UserSchema)
+async def get_current_user_profile(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get current user profile"""
+    return profile_content(current_user, db)
+
+@router.get("/me/roles")
+async def get_current_user_roles(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get current user's roles"""
+    return roles_content(current_user)
+
+@router.get("/me/tools")
+async def get_current_user_tools(
+    request: Request,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get current user's available tools (supports If-None-Match)"""
+    tools = UserService.get_user_tools(current_user, db)
+
+    etag = make_etag("me-tools", tool_catalog.refresh(db), current_user.username, [tool.id for tool in tools])
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    return FastJSONResponse(
+        content=tools_content(current_user, tools),
+        headers={"ETag": etag, "Cache-Control": "private, no-cache"}
+    )
+
 # Shared function for getting all users
 async def _get_all_users_logic(current_user: User, db: Session):
     """Get all users logic (SuperUser only)"""
@@ -72,7 +96,7 @@ async def _get_all_users_logic(current_user: User, db: Session):
         )
 
     from app.services.user import UserService
-    users = UserService.get_users(db)
+    users = UserService.get_users(db, limit=None)
 
     # Add tools for each user
     user_list = []
@@ -90,7 +114,7 @@ async def _get_all_users_logic(current_user: User, db: Session):
         }
         user_list.append(user_dict)
 
-    return user_list
+    return FastJSONResponse(content=user_list)
 
 # Admin endpoints - handle both with and without trailing slash
 @router.get("/", response_model=list)
@@ -275,7 +299,7 @@ async def send_credentials_to_all_users(
     
     try:
         from app.services.user import UserService
-        users = UserService.get_users(db)
+        users = UserService.get_users(db, limit=None)
         successful_sends = 0
         failed_sends = 0
         
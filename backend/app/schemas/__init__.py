@@ -2,7 +2,7 @@
 Pydantic schemas for API serialization
 """
 
-from .user import User, UserCreate, UserUpdate, UserInDB
+from .user import User, UserCreate, UserUpdate, UserInDB, UserDirectoryPage
 from .role import Role, RoleCreate
 from .tool import Tool, ToolCreate, ToolUpdate
 from .auth import Token, TokenData, LoginRequest, RefreshRequest
@@ -13,13 +13,19 @@ from .maintenance_request import (
     MaintenanceRequestListResponse,
     StatusUpdate
 )
+from .upload_session import UploadSessionCreate, UploadSessionResponse
+from .assignment import BulkToolAssignment, BulkRoleAssignment, BulkAssignmentResult
+from .user_import import UserImportReport, UserImportRowError
 
 __all__ = [
-    "User", "UserCreate", "UserUpdate", "UserInDB",
+    "User", "UserCreate", "UserUpdate", "UserInDB", "UserDirectoryPage",
     "Role", "RoleCreate",
     "Tool", "ToolCreate", "ToolUpdate",
     "Token", "TokenData", "LoginRequest", "RefreshRequest",
     "MaintenanceRequestCreate", "MaintenanceRequestUpdate",
     "MaintenanceRequestResponse", "MaintenanceRequestListResponse",
-    "StatusUpdate"
+    "StatusUpdate",
+    "UploadSessionCreate", "UploadSessionResponse",
+    "BulkToolAssignment", "BulkRoleAssignment", "BulkAssignmentResult",
+    "UserImportReport", "UserImportRowError"
 ]
\ No newline at end of file
@@ -0,0 +1,29 @@
+"""
+Bulk role/tool assignment schemas
+"""
+
+from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+
+class BulkAssignmentTarget(BaseModel):
+    """Users an assignment applies to: explicit IDs or every member of a role"""
+    user_ids: Optional[List[int]] = Field(None, min_length=1, max_length=5000)
+    member_of_role_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if (self.user_ids is None) == (self.member_of_role_id is None):
+            raise ValueError("Specify exactly one of user_ids or member_of_role_id")
+        return self
+
+class BulkToolAssignment(BulkAssignmentTarget):
+    """Schema for granting or revoking tools in bulk"""
+    tool_ids: List[int] = Field(..., min_length=1, max_length=100)
+
+class BulkRoleAssignment(BulkAssignmentTarget):
+    """Schema for granting or revoking roles in bulk"""
+    role_ids: List[int] = Field(..., min_length=1, max_length=100)
+
+class BulkAssignmentResult(BaseModel):
+    """Result of a bulk assignment"""
+    affected: int  # Assignment rows inserted or deleted
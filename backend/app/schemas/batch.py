@@ -0,0 +1,32 @@
+"""
+Pydantic schemas for batched API calls
+"""
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+
+class BatchSubRequest(BaseModel):
+    """One API call inside a batch"""
+    id: Optional[str] = Field(None, max_length=100, description="Client reference echoed in the response")
+    method: str = Field(..., description="GET, POST, PUT, PATCH or DELETE")
+    path: str = Field(..., min_length=1, max_length=2000, description="API path with query string, e.g. /api/maintenance-requests/1")
+    headers: Optional[Dict[str, str]] = Field(None, description="Extra headers such as If-None-Match or Idempotency-Key")
+    body: Optional[Any] = Field(None, description="JSON body")
+
+
+class BatchRequest(BaseModel):
+    """Schema for a batch of API calls"""
+    requests: List[BatchSubRequest] = Field(..., min_length=1)
+
+
+class BatchSubResponse(BaseModel):
+    """Result of one API call inside a batch"""
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str]
+    body: Optional[Any] = None
+
+
+class BatchResponse(BaseModel):
+    """Schema for batch results, in request order"""
+    responses: List[BatchSubResponse]
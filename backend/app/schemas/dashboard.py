@@ -0,0 +1,21 @@
+"""
+Pydantic schemas for the dashboard bootstrap payload
+"""
+from pydantic import BaseModel
+from typing import Any, Optional
+
+
+class DashboardSection(BaseModel):
+    """One section of the bootstrap payload; data is left out when the client's ETag still matches"""
+    etag: str
+    not_modified: bool = False
+    data: Optional[Any] = None
+
+
+class DashboardBootstrap(BaseModel):
+    """Schema for everything the landing page loads after login"""
+    me: DashboardSection
+    tools: DashboardSection
+    roles: DashboardSection
+    my_requests: DashboardSection
+    statistics: Optional[DashboardSection] = None  # Maintenance and superusers only
@@ -0,0 +1,56 @@
+"""
+Pydantic schemas for the equipment registry
+"""
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional
+from datetime import datetime
+from app.models.maintenance_request import WarrantyStatus
+
+
+class EquipmentBase(BaseModel):
+    """Base schema for equipment"""
+    name: str = Field(..., min_length=1, max_length=255, description="Equipment name")
+    location: Optional[str] = Field(None, max_length=1024, description="Location path, e.g. 'Building A / Line 3'")
+    warranty_status: WarrantyStatus = Field(default=WarrantyStatus.NOT_APPLICABLE, description="Warranty status")
+    warranty_expiry_date: Optional[datetime] = Field(None, description="Warranty expiration date")
+
+
+class EquipmentCreate(EquipmentBase):
+    """Schema for registering equipment"""
+    asset_tag: Optional[str] = Field(None, min_length=1, max_length=50, description="Asset tag (generated if omitted)")
+
+
+class EquipmentUpdate(BaseModel):
+    """Schema for updating equipment"""
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    asset_tag: Optional[str] = Field(None, min_length=1, max_length=50)
+    location: Optional[str] = Field(None, max_length=1024)
+    warranty_status: Optional[WarrantyStatus] = None
+    warranty_expiry_date: Optional[datetime] = None
+    is_active: Optional[bool] = None
+
+
+class EquipmentResponse(BaseModel):
+    """Schema for equipment response"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    asset_tag: Optional[str] = None
+    name: str
+    location_id: Optional[int] = None
+    location_path: Optional[str] = None
+    warranty_status: WarrantyStatus
+    warranty_expiry_date: Optional[datetime] = None
+    is_active: bool
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+class EquipmentSuggestion(BaseModel):
+    """Schema for an autocomplete suggestion"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    asset_tag: Optional[str] = None
+    name: str
+    location_path: Optional[str] = None
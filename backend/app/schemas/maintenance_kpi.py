@@ -0,0 +1,42 @@
+"""
+Pydantic schemas for maintenance KPIs
+"""
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import date
+
+
+class MaintenanceKpiTotals(BaseModel):
+    """Schema for KPI totals over the requested range"""
+    created: int
+    completed: int
+    cancelled: int
+    mttr_hours: Optional[float] = None
+
+
+class MaintenanceKpiPeriod(BaseModel):
+    """Schema for throughput and MTTR of one day or week (and group)"""
+    period: date
+    group: Optional[str] = None
+    created: int
+    completed: int
+    cancelled: int
+    mttr_hours: Optional[float] = None
+
+
+class MaintenanceKpiBacklog(BaseModel):
+    """Schema for open requests by age"""
+    group: Optional[str] = None
+    open: int
+    aging: Dict[str, int]
+
+
+class MaintenanceKpiResponse(BaseModel):
+    """Schema for the maintenance KPI report"""
+    start: date
+    end: date
+    group_by: Optional[str] = None
+    interval: str
+    totals: MaintenanceKpiTotals
+    series: List[MaintenanceKpiPeriod]
+    backlog: List[MaintenanceKpiBacklog]
@@ -26,6 +26,7 @@ class MaintenanceRequestBase(BaseModel):
 
 class MaintenanceRequestCreate(MaintenanceRequestBase):
     """Schema for creating a maintenance request"""
+    equipment_id: Optional[int] = Field(None, description="Registered equipment (takes precedence over equipment_name)")
     attachments: Optional[List[str]] = Field(default_factory=list, description="List of attachment filenames")
 
 
@@ -37,6 +38,7 @@ class MaintenanceRequestUpdate(BaseModel):
     team: Optional[str] = Field(None, max_length=255)
     priority: Optional[PriorityLevel] = None
     status: Optional[RequestStatus] = None
+    equipment_id: Optional[int] = None
     equipment_name: Optional[str] = Field(None, max_length=255)
     location: Optional[str] = Field(None, max_length=255)
     requested_completion_date: Optional[datetime] = None
@@ -54,12 +56,33 @@ class StatusUpdate(BaseModel):
     status: RequestStatus
 
 
+class BulkStatusUpdate(BaseModel):
+    """Schema for moving several requests to a status"""
+    request_ids: List[int] = Field(..., min_length=1, max_length=500, description="IDs of the requests to update")
+    status: RequestStatus
+
+
+class BulkStatusResult(BaseModel):
+    """Outcome for one request of a bulk status update"""
+    id: int
+    result: str = Field(..., description="updated, unchanged, not_found or conflict")
+    status: Optional[RequestStatus] = None
+    detail: Optional[str] = None
+
+
+class BulkStatusUpdateResponse(BaseModel):
+    """Schema for bulk status update results, in request order"""
+    results: List[BulkStatusResult]
+    updated: int
+
+
 class MaintenanceRequestResponse(MaintenanceRequestBase):
     """Schema for maintenance request response"""
     model_config = ConfigDict(from_attributes=True)
 
     id: int
     status: RequestStatus
+    equipment_id: Optional[int] = None
     attachments: Optional[List[str]] = Field(default_factory=list)
     submitter_id: int
     submitter_email: Optional[str] = None
@@ -69,6 +92,17 @@ class MaintenanceRequestResponse(MaintenanceRequestBase):
     completed_at: Optional[datetime] = None
     completed_by_id: Optional[int] = None
     completed_by_name: Optional[str] = None
+    assigned_to_id: Optional[int] = None
+    assigned_to_name: Optional[str] = None
+    claimed_at: Optional[datetime] = None
+    claim_expires_at: Optional[datetime] = None
+    response_due_at: Optional[datetime] = None
+    resolution_due_at: Optional[datetime] = None
+    sla_breached_at: Optional[datetime] = None
+    sla_breach: Optional[str] = None
+    schedule_id: Optional[int] = None
+    scheduled_due_at: Optional[datetime] = None
+    archived_at: Optional[datetime] = None
 
 
 class MaintenanceRequestListResponse(BaseModel):
@@ -77,3 +111,8 @@ class MaintenanceRequestListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+
+
+class AttachmentBundleRequest(BaseModel):
+    """Schema for downloading attachments of several requests as one ZIP"""
+    request_ids: List[int] = Field(..., min_length=1, max_length=500, description="IDs of the requests to bundle")
@@ -0,0 +1,39 @@
+"""
+Pydantic schemas for maintenance request events
+"""
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from app.models.maintenance_request import RequestStatus
+
+
+class MaintenanceRequestEventResponse(BaseModel):
+    """Schema for one request event"""
+    id: int
+    request_id: int
+    event_type: str
+    actor_id: Optional[int] = None
+    actor_name: Optional[str] = None
+    from_status: Optional[RequestStatus] = None
+    to_status: Optional[RequestStatus] = None
+    changes: Optional[Dict[str, Any]] = None
+    at: datetime
+
+
+class MaintenanceRequestTimeline(BaseModel):
+    """Schema for the history of one request"""
+    request_id: int
+    events: List[MaintenanceRequestEventResponse]
+    time_in_status: Dict[str, float]
+
+
+class MaintenanceRequestEventFeed(BaseModel):
+    """Schema for a page of the event feed"""
+    events: List[MaintenanceRequestEventResponse]
+    next_cursor: str
+
+
+class StreamTicket(BaseModel):
+    """Schema for a ticket that opens an event stream"""
+    ticket: str
+    expires_in: int  # Seconds left to connect with it
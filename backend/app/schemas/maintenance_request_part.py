@@ -0,0 +1,55 @@
+"""
+Pydantic schemas for maintenance request parts
+"""
+from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Optional
+from datetime import datetime
+from app.models.maintenance_request_part import PartStatus
+
+
+class MaintenanceRequestPartBase(BaseModel):
+    """Base schema for a part line"""
+    part_number: str = Field(..., min_length=1, max_length=100, description="Part number as used by the vendor or inventory")
+    description: Optional[str] = Field(None, max_length=255, description="What the part is")
+    quantity: int = Field(default=1, ge=1, le=1000000, description="Quantity needed")
+    vendor: Optional[str] = Field(None, max_length=255, description="Vendor the part is ordered from")
+    status: PartStatus = Field(default=PartStatus.NEEDED, description="Procurement status")
+
+
+class MaintenanceRequestPartsUpdate(BaseModel):
+    """Schema for replacing a request's parts list"""
+    parts: List[MaintenanceRequestPartBase] = Field(..., max_length=500)
+
+
+class MaintenanceRequestPartResponse(MaintenanceRequestPartBase):
+    """Schema for a part line response"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    request_id: int
+    line_no: int
+    part_key: str
+    updated_at: datetime
+
+
+class MaintenanceRequestPartList(BaseModel):
+    """Schema for the parts of one request"""
+    request_id: int
+    part_order_list: Optional[str] = None
+    parts: List[MaintenanceRequestPartResponse]
+
+
+class PartDemand(BaseModel):
+    """Schema for the outstanding demand of one part"""
+    part_key: str
+    part_number: str
+    needed_quantity: int
+    ordered_quantity: int
+    request_count: int
+    oldest_request_at: datetime
+
+
+class PartDemandResponse(BaseModel):
+    """Schema for aggregated parts demand"""
+    parts: List[PartDemand]
+    total: int
@@ -0,0 +1,35 @@
+"""
+Pydantic schemas for preventive maintenance schedules
+"""
+from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+from datetime import date, datetime
+
+
+class MaintenanceDueItem(BaseModel):
+    """Schema for one scheduled preventive maintenance"""
+    model_config = ConfigDict(from_attributes=True)
+
+    schedule_id: int
+    equipment_id: Optional[int] = None
+    equipment_name: str
+    location: Optional[str] = None
+    cycle_days: int
+    last_maintenance_date: Optional[datetime] = None
+    next_due_at: datetime
+    open_request_id: Optional[int] = None
+    overdue: bool
+
+
+class MaintenanceDueDay(BaseModel):
+    """Schema for the scheduled maintenance of one day"""
+    date: date
+    items: List[MaintenanceDueItem]
+
+
+class MaintenanceDueCalendar(BaseModel):
+    """Schema for the preventive maintenance calendar"""
+    start: Optional[datetime] = None
+    end: datetime
+    total: int
+    days: List[MaintenanceDueDay]
@@ -2,8 +2,8 @@
 Role schemas
 """
 
-from typing import Optional
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, TypeAdapter
 from .base import BaseSchema
 
 class RoleBase(BaseModel):
@@ -22,4 +22,7 @@ class RoleUpdate(BaseModel):
 
 class Role(BaseSchema, RoleBase):
     """Role response schema"""
-    pass
\ No newline at end of file
+    pass
+
+# Cached adapter for list responses
+ROLE_LIST_ADAPTER = TypeAdapter(List[Role])
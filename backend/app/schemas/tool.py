@@ -2,8 +2,8 @@
 Tool schemas
 """
 
-from typing import Optional
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, TypeAdapter
 from .base import BaseSchema
 
 class ToolBase(BaseModel):
@@ -30,4 +30,7 @@ class ToolUpdate(BaseModel):
 
 class Tool(BaseSchema, ToolBase):
     """Tool response schema"""
-    pass
\ No newline at end of file
+    pass
+
+# Cached adapter for list responses
+TOOL_LIST_ADAPTER = TypeAdapter(List[Tool])
@@ -0,0 +1,29 @@
+"""
+Pydantic schemas for resumable upload sessions
+"""
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional
+from datetime import datetime
+from app.models.upload_session import UploadSessionStatus
+
+
+class UploadSessionCreate(BaseModel):
+    """Schema for starting a resumable upload"""
+    filename: str = Field(..., min_length=1, max_length=255, description="Original filename")
+    content_type: str = Field(..., min_length=1, max_length=255, description="MIME type of the file")
+    size: int = Field(..., gt=0, description="Total size of the file in bytes")
+
+
+class UploadSessionResponse(BaseModel):
+    """Schema for upload session state"""
+    model_config = ConfigDict(from_attributes=True)
+
+    upload_id: str
+    request_id: int
+    filename: str
+    content_type: str
+    size: int
+    offset: int
+    status: UploadSessionStatus
+    expires_at: datetime
+    attachment: Optional[str] = None
@@ -2,8 +2,8 @@
 User schemas
 """
 
-from typing import Optional, List
-from pydantic import BaseModel, EmailStr, validator
+from typing import Dict, Optional, List
+from pydantic import BaseModel, EmailStr, TypeAdapter, validator
 import re
 from .base import BaseSchema
 from .role import Role
@@ -79,6 +79,16 @@ class User(BaseSchema, UserBase):
     roles: List[Role] = []
     tools: List[Tool] = []
 
+class UserDirectoryPage(BaseModel):
+    """One page of the user directory"""
+    users: List[User]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None  # Only on the first page
+    role_counts: Optional[Dict[str, int]] = None  # Only on the first page
+
 class UserInDB(User):
     """User schema with hashed password"""
-    password_hash: str
\ No newline at end of file
+    password_hash: str
+
+# Cached adapter for list responses
+USER_LIST_ADAPTER = TypeAdapter(List[User])
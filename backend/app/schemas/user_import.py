@@ -0,0 +1,24 @@
+"""
+User import schemas
+"""
+
+from typing import List, Optional
+from pydantic import BaseModel
+
+class UserImportRowError(BaseModel):
+    """Validation or conflict errors of one input row"""
+    row: int  # 1-based data row number (header excluded)
+    username: Optional[str] = None
+    errors: List[str]
+
+class UserImportReport(BaseModel):
+    """Outcome of a user import"""
+    dry_run: bool
+    total_rows: int
+    valid_rows: int
+    created: int
+    updated: int
+    failed: int
+    role_links_added: int = 0
+    tool_links_added: int = 0
+    errors: List[UserImportRowError] = []
@@ -83,18 +83,24 @@ class SecurityViolation(Exception):
 class RateLimiter:
     """Advanced rate limiting with multiple strategies"""
     
+    # Seconds to count in memory after Redis failed, so requests do not wait on timeouts
+    REDIS_RETRY_SECONDS = 30
+    
     def __init__(self, redis_client=None):
-        self.redis_client = redis_client or redis.Redis(host='localhost', port=6379, db=0)
+        # Shared counts in Redis when REDIS_URL is set, otherwise per-process counts in memory
+        if redis_client is None and settings.REDIS_URL:
+            redis_client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=1, socket_connect_timeout=1)
+        self.redis_client = redis_client
         self.memory_cache = defaultdict(deque)
         self.blocked_ips = set()
+        self._redis_retry_at = 0.0
     
     def is_rate_limited(self, identifier: str, limit: int, window: int) -> bool:
-        """Check if identifier is rate limited"""
-        try:
-            key = f"rate_limit:{identifier}"
-            
-            if self.redis_client:
+        """Check if identifier is rate limited, counting this request"""
+        if self.redis_client and time.monotonic() >= self._redis_retry_at:
+            try:
                 # Use Redis for distributed rate limiting
+                key = f"rate_limit:{identifier}"
                 pipe = self.redis_client.pipeline()
                 pipe.zremrangebyscore(key, 0, time.time() - window)
                 pipe.zcard(key)
@@ -104,26 +110,26 @@ class RateLimiter:
                 
                 current_count = results[1]
                 return current_count >= limit
-            else:
-                # Fallback to memory-based rate limiting
-                now = time.time()
-                window_start = now - window
-                
-                # Clean old entries
-                while self.memory_cache[identifier] and self.memory_cache[identifier][0] < window_start:
-                    self.memory_cache[identifier].popleft()
-                
-                # Check current count
-                if len(self.memory_cache[identifier]) >= limit:
-                    return True
-                
-                # Add current request
-                self.memory_cache[identifier].append(now)
-                return False
-                
-        except Exception as e:
-            logger.error(f"Rate limiting error: {e}")
-            return False
+            except Exception as e:
+                # Keep limiting in memory rather than letting everything through
+                self._redis_retry_at = time.monotonic() + self.REDIS_RETRY_SECONDS
+                logger.error(f"Rate limiting in Redis failed, counting in memory: {e}")
+        
+        # Memory-based rate limiting
+        now = time.time()
+        window_start = now - window
+        
+        # Clean old entries
+        while self.memory_cache[identifier] and self.memory_cache[identifier][0] < window_start:
+            self.memory_cache[identifier].popleft()
+        
+        # Check current count
+        if len(self.memory_cache[identifier]) >= limit:
+            return True
+        
+        # Add current request
+        self.memory_cache[identifier].append(now)
+        return False
     
     def block_ip(self, ip_address: str, duration: int = 3600):
         """Block an IP address for a specified duration"""
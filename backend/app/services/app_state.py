@@ -0,0 +1,49 @@
+"""
+Application state service
+"""
+
+import json
+from datetime import datetime
+from typing import Any
+from sqlalchemy.orm import Session
+from app.models.app_state import AppState
+
+class AppStateService:
+    """Service for persisted key/value state"""
+
+    @staticmethod
+    def get_value(db: Session, key: str, default: Any = None) -> Any:
+        """Get a decoded state value"""
+        state = db.query(AppState).filter(AppState.key == key).first()
+        if not state or state.value is None:
+            return default
+        try:
+            return json.loads(state.value)
+        except (json.JSONDecodeError, TypeError, ValueError):
+            return default
+
+    @staticmethod
+    def set_value(db: Session, key: str, value: Any) -> AppState:
+        """Store a state value (caller commits)"""
+        state = db.query(AppState).filter(AppState.key == key).first()
+        if not state:
+            state = AppState(key=key)
+            db.add(state)
+        state.value = json.dumps(value)
+        state.updated_at = datetime.utcnow()
+        return state
+
+    @staticmethod
+    def increment_counter(db: Session, key: str, amount: int = 1) -> int:
+        """Increment an integer state value under a row lock (caller commits)"""
+        state = db.query(AppState).filter(AppState.key == key).with_for_update().first()
+        if not state:
+            state = AppState(key=key, value="0")
+            db.add(state)
+        try:
+            value = int(json.loads(state.value)) + amount
+        except (json.JSONDecodeError, TypeError, ValueError):
+            value = amount
+        state.value = json.dumps(value)
+        state.updated_at = datetime.utcnow()
+        return value
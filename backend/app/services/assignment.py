@@ -0,0 +1,156 @@
+"""
+Assignment service
+Set-based role and tool assignment for many users at once
+"""
+
+from typing import List, Optional
+from sqlalchemy import delete, exists, select, and_, true
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from app.db.upsert import conflict_insert
+from app.models.user import User, user_roles, user_tools
+from app.models.role import Role
+from app.models.tool import Tool
+
+class AssignmentService:
+    """Bulk role/tool assignment service"""
+
+    @staticmethod
+    def _target_users(user_ids: Optional[List[int]], member_of_role_id: Optional[int]):
+        """Select the IDs of the targeted users"""
+        if user_ids is not None:
+            return select(User.id).where(User.id.in_(user_ids))
+        return select(user_roles.c.user_id).where(user_roles.c.role_id == member_of_role_id)
+
+    @staticmethod
+    def _check_ids(db: Session, model, ids: List[int], label: str) -> None:
+        """Raise 404 if any of the IDs does not exist"""
+        found = {row[0] for row in db.query(model.id).filter(model.id.in_(ids)).all()}
+        missing = sorted(set(ids) - found)
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"{label} not found: {', '.join(str(i) for i in missing)}"
+            )
+
+    @staticmethod
+    def _validate_target(db: Session, member_of_role_id: Optional[int]) -> None:
+        """Check that a member_of_role_id target exists"""
+        if member_of_role_id is not None:
+            AssignmentService._check_ids(db, Role, [member_of_role_id], "Role")
+
+    @staticmethod
+    def grant_tools(
+        db: Session,
+        tool_ids: List[int],
+        user_ids: Optional[List[int]] = None,
+        member_of_role_id: Optional[int] = None
+    ) -> int:
+        """
+        Grant tools to many users in one statement
+
+        Superusers are skipped: they get every tool through their role and
+        keep no tool assignments.
+
+        Returns:
+            Number of assignments created
+        """
+        AssignmentService._check_ids(db, Tool, tool_ids, "Tools")
+        AssignmentService._validate_target(db, member_of_role_id)
+
+        targets = AssignmentService._target_users(user_ids, member_of_role_id).subquery()
+        is_superuser = exists().where(and_(
+            user_roles.c.user_id == targets.c[0],
+            user_roles.c.role_id == Role.id,
+            Role.name == "superuser"
+        ))
+        # Every targeted user x every tool
+        pairs = select(targets.c[0], Tool.id).select_from(targets.join(Tool, true())).where(
+            Tool.id.in_(tool_ids), ~is_superuser
+        )
+
+        statement = conflict_insert(db, user_tools).from_select(
+            ["user_id", "tool_id"], pairs
+        ).on_conflict_do_nothing()
+        result = db.execute(statement)
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def revoke_tools(
+        db: Session,
+        tool_ids: List[int],
+        user_ids: Optional[List[int]] = None,
+        member_of_role_id: Optional[int] = None
+    ) -> int:
+        """
+        Revoke tools from many users in one statement
+
+        Returns:
+            Number of assignments removed
+        """
+        AssignmentService._validate_target(db, member_of_role_id)
+
+        targets = AssignmentService._target_users(user_ids, member_of_role_id)
+        result = db.execute(delete(user_tools).where(
+            user_tools.c.tool_id.in_(tool_ids),
+            user_tools.c.user_id.in_(targets)
+        ))
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def grant_roles(
+        db: Session,
+        role_ids: List[int],
+        user_ids: Optional[List[int]] = None,
+        member_of_role_id: Optional[int] = None
+    ) -> int:
+        """
+        Grant roles to many users in one statement
+
+        Returns:
+            Number of assignments created
+        """
+        AssignmentService._check_ids(db, Role, role_ids, "Roles")
+        AssignmentService._validate_target(db, member_of_role_id)
+
+        targets = AssignmentService._target_users(user_ids, member_of_role_id).subquery()
+        # Every targeted user x every role
+        pairs = select(targets.c[0], Role.id).select_from(targets.join(Role, true())).where(Role.id.in_(role_ids))
+
+        statement = conflict_insert(db, user_roles).from_select(
+            ["user_id", "role_id"], pairs
+        ).on_conflict_do_nothing()
+        result = db.execute(statement)
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def revoke_roles(
+        db: Session,
+        role_ids: List[int],
+        current_user: User,
+        user_ids: Optional[List[int]] = None,
+        member_of_role_id: Optional[int] = None
+    ) -> int:
+        """
+        Revoke roles from many users in one statement
+
+        The current user's own superuser role is never revoked, so an admin
+        cannot lock themselves out.
+
+        Returns:
+            Number of assignments removed
+        """
+        AssignmentService._validate_target(db, member_of_role_id)
+
+        targets = AssignmentService._target_users(user_ids, member_of_role_id)
+        superuser_role = select(Role.id).where(Role.name == "superuser").scalar_subquery()
+        result = db.execute(delete(user_roles).where(
+            user_roles.c.role_id.in_(role_ids),
+            user_roles.c.user_id.in_(targets),
+            ~and_(user_roles.c.user_id == current_user.id, user_roles.c.role_id == superuser_role)
+        ))
+        db.commit()
+        return result.rowcount
@@ -2,6 +2,7 @@
 Email service for sending password reset and other emails
 """
 
+import html
 import smtplib
 import ssl
 import email.mime.text
@@ -606,6 +607,103 @@ class EmailService:
             logger.error(f"Error sending maintenance request notification: {e}", exc_info=True)
             return False
 
+    def send_sla_breach_digest(self, to_emails: list, breaches: list) -> bool:
+        """
+        Send maintenance staff one digest of requests that missed their SLA
+
+        Args:
+            to_emails: List of email addresses to notify
+            breaches: Dictionaries describing the breached requests
+
+        Returns:
+            True if sent to at least one recipient, False otherwise
+        """
+        try:
+            request_url = f"{settings.FRONTEND_URL}/dashboard/maintenance/all-requests"
+            subject = f"⏰ {len(breaches)} maintenance request{'s' if len(breaches) != 1 else ''} past SLA"
+
+            rows = "".join(f"""
+                                <tr>
+                                    <td style="padding: 6px; border-bottom: 1px solid #e5e7eb;">#{item['id']}</td>
+                                    <td style="padding: 6px; border-bottom: 1px solid #e5e7eb;">{html.escape(item['title'] or '')}</td>
+                                    <td style="padding: 6px; border-bottom: 1px solid #e5e7eb; text-transform: uppercase;">{item['priority']}</td>
+                                    <td style="padding: 6px; border-bottom: 1px solid #e5e7eb;">{item['sla_breach']} due {item['due_at']}</td>
+                                    <td style="padding: 6px; border-bottom: 1px solid #e5e7eb;">{html.escape(item['assigned_to_name'] or 'Unassigned')}</td>
+                                </tr>""" for item in breaches)
+
+            html_body = f"""
+            <html>
+                <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+                    <div style="max-width: 700px; margin: 0 auto; padding: 20px;">
+                        <div style="text-align: center; margin-bottom: 30px;">
+                            <h1 style="color: #2563eb;">ACI Portal</h1>
+                        </div>
+
+                        <div style="background: #f8fafc; padding: 20px; border-radius: 8px; margin-bottom: 20px; border-left: 4px solid #ef4444;">
+                            <h2 style="color: #1e40af; margin-top: 0;">⏰ Maintenance Requests Past SLA</h2>
+                            <p>These open requests missed their response or resolution target:</p>
+
+                            <table style="width: 100%; border-collapse: collapse; background: white; font-size: 14px;">
+                                <tr style="text-align: left; background: #e0f2fe;">
+                                    <th style="padding: 6px;">ID</th>
+                                    <th style="padding: 6px;">Title</th>
+                                    <th style="padding: 6px;">Priority</th>
+                                    <th style="padding: 6px;">Missed</th>
+                                    <th style="padding: 6px;">Assigned to</th>
+                                </tr>{rows}
+                            </table>
+
+                            <div style="text-align: center; margin: 30px 0;">
+                                <a href="{request_url}"
+                                   style="background: #2563eb; color: white; padding: 12px 24px;
+                                          text-decoration: none; border-radius: 6px; display: inline-block;
+                                          font-weight: bold;">
+                                    View All Maintenance Requests
+                                </a>
+                            </div>
+                        </div>
+
+                        <hr style="border: none; border-top: 1px solid #e5e7eb; margin: 30px 0;">
+
+                        <div style="text-align: center; color: #6b7280; font-size: 12px;">
+                            <p>This is an automated notification from ACI Portal. Please do not reply to this email.</p>
+                            <p>&copy; 2024 ACI Portal. All rights reserved.</p>
+                        </div>
+                    </div>
+                </body>
+            </html>
+            """
+
+            lines = "\n".join(
+                f"            #{item['id']} [{item['priority'].upper()}] {item['title']} - "
+                f"{item['sla_breach']} due {item['due_at']} - {item['assigned_to_name'] or 'Unassigned'}"
+                for item in breaches
+            )
+            text_body = f"""
+            ACI Portal - Maintenance Requests Past SLA
+
+            These open requests missed their response or resolution target:
+
+{lines}
+
+            View all maintenance requests at: {request_url}
+
+            This is an automated notification from ACI Portal. Please do not reply to this email.
+
+            © 2024 ACI Portal. All rights reserved.
+            """
+
+            success_count = 0
+            for email in to_emails:
+                if self._send_email(email, subject, html_body, text_body):
+                    success_count += 1
+
+            return success_count > 0
+
+        except Exception as e:
+            logger.error(f"Error sending SLA breach digest: {e}", exc_info=True)
+            return False
+
     def _generate_equipment_section(self, request_data: dict) -> str:
         """Generate HTML section for equipment details"""
         equipment_name = request_data.get('equipment_name')
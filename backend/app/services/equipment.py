@@ -0,0 +1,255 @@
+"""
+Equipment Service
+Business logic for the equipment registry
+"""
+from typing import List, Optional
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from datetime import datetime
+
+from app.models.equipment import Equipment, Location
+from app.models.maintenance_request import WarrantyStatus
+from app.schemas.equipment import EquipmentCreate, EquipmentUpdate
+from app.services.maintenance_kpi import MaintenanceKpiService
+from app.services.maintenance_schedule import MaintenanceScheduleService
+from app.utils.equipment_names import equipment_key, equipment_key_prefix, location_key, location_levels
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards in a user-supplied prefix"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class EquipmentService:
+    """Service for equipment registry operations"""
+
+    @staticmethod
+    def resolve_location(db: Session, location: Optional[str]) -> Optional[Location]:
+        """
+        Get or create the location node of a free-text location path
+
+        Every level of the path is created as needed, so "Building A - Line 3"
+        yields "Building A" with child "Line 3". Does not commit.
+
+        Args:
+            db: Database session
+            location: Free-text location
+
+        Returns:
+            Innermost location, or None if the text has no levels
+        """
+        levels = location_levels(location)
+        parent = None
+        for depth in range(1, len(levels) + 1):
+            path_key = location_key(levels[:depth])
+            node = db.query(Location).filter(Location.path_key == path_key).first()
+            if not node:
+                node = Location(
+                    name=levels[depth - 1],
+                    parent_id=parent.id if parent else None,
+                    path=" / ".join(levels[:depth]),
+                    path_key=path_key
+                )
+                try:
+                    with db.begin_nested():
+                        db.add(node)
+                except IntegrityError:
+                    # Created concurrently by another request
+                    node = db.query(Location).filter(Location.path_key == path_key).one()
+            parent = node
+        return parent
+
+    @staticmethod
+    def resolve(
+        db: Session,
+        name: Optional[str],
+        location: Optional[str] = None,
+        warranty_status: Optional[WarrantyStatus] = None,
+        warranty_expiry_date: Optional[datetime] = None
+    ) -> Optional[Equipment]:
+        """
+        Get or create the equipment a free-text name refers to
+
+        Names are matched by their normalized key, so different spellings of
+        the same asset resolve to one row. New equipment takes the location
+        and warranty details it was first mentioned with. Does not commit.
+
+        Args:
+            db: Database session
+            name: Free-text equipment name
+            location: Free-text location
+            warranty_status: Warranty status given with the name
+            warranty_expiry_date: Warranty expiry given with the name
+
+        Returns:
+            Equipment, or None if the name is empty
+        """
+        search_key = equipment_key(name)
+        if not search_key:
+            return None
+
+        equipment = db.query(Equipment).filter(Equipment.search_key == search_key).first()
+        if equipment:
+            if equipment.location_id is None and location:
+                EquipmentService._move(db, equipment, EquipmentService.resolve_location(db, location))
+            return equipment
+
+        equipment = Equipment(
+            name=" ".join(name.split()),
+            search_key=search_key,
+            location=EquipmentService.resolve_location(db, location),
+            warranty_status=warranty_status or WarrantyStatus.NOT_APPLICABLE,
+            warranty_expiry_date=warranty_expiry_date
+        )
+        try:
+            with db.begin_nested():
+                db.add(equipment)
+                db.flush()
+                equipment.asset_tag = f"EQ-{equipment.id:06d}"
+        except IntegrityError:
+            # Registered concurrently by another request
+            equipment = db.query(Equipment).filter(Equipment.search_key == search_key).one()
+        return equipment
+
+    @staticmethod
+    def get_equipment(db: Session, equipment_id: int) -> Optional[Equipment]:
+        """
+        Get equipment by ID
+
+        Args:
+            db: Database session
+            equipment_id: Equipment ID
+
+        Returns:
+            Equipment or None
+        """
+        return db.query(Equipment).filter(Equipment.id == equipment_id).first()
+
+    @staticmethod
+    def autocomplete(db: Session, query: str, limit: int = 10) -> List[Equipment]:
+        """
+        Suggest equipment whose name or asset tag starts with the query
+
+        The query is normalized like names are, so "cnc-0" finds "CNC 01";
+        both conditions are prefix matches on indexed columns.
+
+        Args:
+            db: Database session
+            query: Typed prefix
+            limit: Maximum number of suggestions
+
+        Returns:
+            Active equipment ordered by name key
+        """
+        search_key = equipment_key_prefix(query)
+        tag_prefix = query.strip().upper()
+        if not search_key and not tag_prefix:
+            return []
+
+        conditions = [Equipment.asset_tag.like(f"{_escape_like(tag_prefix)}%", escape="\\")]
+        if search_key:
+            conditions.append(Equipment.search_key.like(f"{_escape_like(search_key)}%", escape="\\"))
+
+        return db.query(Equipment).filter(
+            Equipment.is_active == True,
+            or_(*conditions)
+        ).order_by(Equipment.search_key).limit(limit).all()
+
+    @staticmethod
+    def create_equipment(db: Session, equipment_data: EquipmentCreate) -> Equipment:
+        """
+        Register equipment
+
+        Args:
+            db: Database session
+            equipment_data: Equipment data
+
+        Returns:
+            Created equipment
+
+        Raises:
+            HTTPException: If the name or asset tag is already registered
+        """
+        search_key = equipment_key(equipment_data.name)
+        EquipmentService._check_unique(db, search_key, equipment_data.asset_tag)
+
+        equipment = Equipment(
+            asset_tag=equipment_data.asset_tag,
+            name=equipment_data.name.strip(),
+            search_key=search_key,
+            location=EquipmentService.resolve_location(db, equipment_data.location),
+            warranty_status=equipment_data.warranty_status,
+            warranty_expiry_date=equipment_data.warranty_expiry_date
+        )
+        db.add(equipment)
+        db.flush()
+        if not equipment.asset_tag:
+            equipment.asset_tag = f"EQ-{equipment.id:06d}"
+        db.commit()
+        db.refresh(equipment)
+        return equipment
+
+    @staticmethod
+    def update_equipment(db: Session, equipment: Equipment, equipment_data: EquipmentUpdate) -> Equipment:
+        """
+        Update equipment
+
+        Args:
+            db: Database session
+            equipment: Equipment to update
+            equipment_data: Fields to change
+
+        Returns:
+            Updated equipment
+
+        Raises:
+            HTTPException: If the new name or asset tag is already registered
+        """
+        update_dict = equipment_data.model_dump(exclude_unset=True)
+
+        search_key = equipment_key(update_dict["name"]) if update_dict.get("name") else None
+        EquipmentService._check_unique(db, search_key, update_dict.get("asset_tag"), exclude_id=equipment.id)
+
+        if "location" in update_dict:
+            EquipmentService._move(db, equipment, EquipmentService.resolve_location(db, update_dict.pop("location")))
+        if search_key:
+            equipment.search_key = search_key
+            update_dict["name"] = update_dict["name"].strip()
+            MaintenanceScheduleService.rename_equipment(db, equipment.id, update_dict["name"])
+        for field, value in update_dict.items():
+            setattr(equipment, field, value)
+        equipment.updated_at = datetime.utcnow()
+
+        db.commit()
+        db.refresh(equipment)
+        return equipment
+
+    @staticmethod
+    def _move(db: Session, equipment: Equipment, location: Optional[Location]) -> None:
+        """Set equipment's location, moving its KPI buckets along (does not commit)"""
+        location_id = location.id if location else None
+        if location_id != equipment.location_id:
+            MaintenanceKpiService.move_equipment(db, equipment.id, location_id)
+        equipment.location = location
+
+    @staticmethod
+    def _check_unique(db: Session, search_key: Optional[str], asset_tag: Optional[str], exclude_id: Optional[int] = None) -> None:
+        """Raise 400 if the name key or asset tag belongs to other equipment"""
+        if search_key is not None and not search_key:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Equipment name must contain letters or digits"
+            )
+        for column, value, label in ((Equipment.search_key, search_key, "name"), (Equipment.asset_tag, asset_tag, "asset tag")):
+            if not value:
+                continue
+            query = db.query(Equipment.id).filter(column == value)
+            if exclude_id is not None:
+                query = query.filter(Equipment.id != exclude_id)
+            if query.first():
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Equipment with this {label} is already registered"
+                )
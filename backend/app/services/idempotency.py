@@ -0,0 +1,354 @@
+"""
+Idempotency Service
+Replays the stored response when a client retries a POST with the same Idempotency-Key
+"""
+from typing import Any, NamedTuple, Optional
+from fastapi import HTTPException, status
+from fastapi.responses import Response
+from sqlalchemy import and_, delete, or_, update
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+import hashlib
+import logging
+import time
+import orjson
+
+from app.core.config import settings
+from app.core.responses import ORJSON_OPTIONS
+from app.db.upsert import conflict_insert
+from app.models.idempotency_key import IdempotencyKey
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis is in requirements.txt
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Seconds to stop trying Redis after it failed, so requests do not wait on timeouts
+REDIS_RETRY_SECONDS = 30
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+_redis_client = None
+_redis_retry_at = 0.0
+
+
+class IdempotencyClaim(NamedTuple):
+    """
+    Outcome of claiming a key: a response to replay, a created resource to
+    rebuild the response from, or the right to run the request
+    """
+    user_id: int
+    scope: str
+    key: str
+    fingerprint: str
+    in_redis: bool
+    replay: Optional[Response] = None
+    resource_id: Any = None
+
+
+def _redis():
+    """Shared Redis client, or None without REDIS_URL or while Redis is failing"""
+    global _redis_client
+    if not settings.REDIS_URL or redis is None or time.monotonic() < _redis_retry_at:
+        return None
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=1, socket_connect_timeout=1)
+    return _redis_client
+
+
+def _redis_failed(e: Exception) -> None:
+    """Stop using Redis for a while after an error"""
+    global _redis_retry_at
+    _redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+    logger.warning(f"Idempotency store in Redis failed, using the database: {e}")
+
+
+def _redis_key(user_id: int, scope: str, key: str) -> str:
+    # Client keys may be long; hashing bounds the Redis key size
+    return f"idempotency:{scope}:{user_id}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+def _in_progress() -> HTTPException:
+    """Error for a retry while the first request with its key still runs"""
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="A request with this Idempotency-Key is still being processed",
+        headers={"Retry-After": "1"}
+    )
+
+
+def _check_stored(claim: IdempotencyClaim, stored_fingerprint: str, status_code: Optional[int],
+                  media_type: Optional[str], body: Optional[str], resource_id: Optional[str]) -> IdempotencyClaim:
+    """Claim for a key that was already used (with what to replay), or the error for misusing it"""
+    if stored_fingerprint != claim.fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used with a different request"
+        )
+    if status_code is None:
+        if resource_id is not None:
+            return claim._replace(resource_id=orjson.loads(resource_id))
+        raise _in_progress()
+    return claim._replace(replay=Response(
+        content=body or b"",
+        status_code=status_code,
+        media_type=media_type,
+        headers={REPLAYED_HEADER: "true"}
+    ))
+
+
+class IdempotencyService:
+    """Service for Idempotency-Key handling"""
+
+    @staticmethod
+    def fingerprint(payload: Any) -> str:
+        """
+        Hash of a request payload, to tell a retry from a different request reusing a key
+
+        Args:
+            payload: JSON-serializable request data
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        return hashlib.sha256(
+            orjson.dumps(payload, option=ORJSON_OPTIONS | orjson.OPT_SORT_KEYS)
+        ).hexdigest()
+
+    @staticmethod
+    def begin(db: Session, user_id: int, scope: str, key: str, fingerprint: str) -> IdempotencyClaim:
+        """
+        Claim an idempotency key before running a request
+
+        The first request with a key claims it and runs. A retry after it
+        finished gets its stored response (with Idempotent-Replayed: true);
+        a retry while it is still running gets 409, and reusing the key for
+        a different payload gets 422. A retry after the first request created
+        its resource but failed to respond gets the resource's id instead.
+        Keys are kept in Redis when REDIS_URL is set and reachable, otherwise
+        in idempotency_keys.
+
+        Args:
+            db: Database session
+            user_id: User sending the request (keys are per user)
+            scope: Endpoint name (keys are per endpoint)
+            key: Idempotency-Key header value
+            fingerprint: Fingerprint of the request payload
+
+        Returns:
+            Claim; replay is set if the stored response should be returned instead,
+            resource_id if the response should be rebuilt from that resource
+        """
+        client = _redis()
+        if client is not None:
+            try:
+                return IdempotencyService._begin_redis(client, user_id, scope, key, fingerprint)
+            except redis.RedisError as e:
+                _redis_failed(e)
+        return IdempotencyService._begin_db(db, user_id, scope, key, fingerprint)
+
+    @staticmethod
+    def _begin_redis(client, user_id: int, scope: str, key: str, fingerprint: str) -> IdempotencyClaim:
+        """Claim a key with SET NX, whose expiry doubles as the lock timeout"""
+        redis_key = _redis_key(user_id, scope, key)
+        claim = IdempotencyClaim(user_id, scope, key, fingerprint, in_redis=True)
+        pending = orjson.dumps({"fingerprint": fingerprint})
+
+        # A second attempt covers a record that expired between SET and GET
+        for _ in range(2):
+            if client.set(redis_key, pending, nx=True, ex=settings.IDEMPOTENCY_LOCK_SECONDS):
+                return claim
+            stored = client.get(redis_key)
+            if stored is not None:
+                record = orjson.loads(stored)
+                return _check_stored(
+                    claim, record["fingerprint"], record.get("status_code"),
+                    record.get("media_type"), record.get("body"), record.get("resource_id")
+                )
+        # The key keeps changing hands; never run the request unclaimed
+        raise _in_progress()
+
+    @staticmethod
+    def _begin_db(db: Session, user_id: int, scope: str, key: str, fingerprint: str) -> IdempotencyClaim:
+        """Claim a key with an insert that ignores conflicts, taking over expired or abandoned rows"""
+        now = datetime.utcnow()
+        claim = IdempotencyClaim(user_id, scope, key, fingerprint, in_redis=False)
+        values = {
+            "fingerprint": fingerprint,
+            "status_code": None,
+            "media_type": None,
+            "response_body": None,
+            "locked_until": now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS),
+            "expires_at": now + timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS),
+        }
+
+        result = db.execute(
+            conflict_insert(db, IdempotencyKey.__table__).values(
+                user_id=user_id, scope=scope, key=key, created_at=now, **values
+            ).on_conflict_do_nothing()
+        )
+        db.commit()
+        if result.rowcount:
+            return claim
+
+        row = db.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.scope == scope,
+            IdempotencyKey.key == key
+        ).first()
+        if row is None:
+            # Purged since the insert; the next retry claims it
+            raise _in_progress()
+
+        taken_over = db.execute(
+            update(IdempotencyKey).where(
+                IdempotencyKey.id == row.id,
+                or_(
+                    IdempotencyKey.expires_at <= now,
+                    and_(IdempotencyKey.status_code.is_(None), IdempotencyKey.locked_until <= now)
+                )
+            ).values(created_at=now, resource_id=None, **values)
+        )
+        db.commit()
+        if taken_over.rowcount:
+            return claim
+
+        db.refresh(row)
+        return _check_stored(
+            claim, row.fingerprint, row.status_code, row.media_type, row.response_body, row.resource_id
+        )
+
+    @staticmethod
+    def record_resource(db: Session, claim: IdempotencyClaim, resource_id: Any) -> IdempotencyClaim:
+        """
+        Remember what a request created as soon as it is committed
+
+        From then on the key is no longer released when the request fails:
+        a retry gets the resource id back and rebuilds the response from it
+        instead of creating the resource again. The claim's lock no longer
+        expires either.
+
+        Args:
+            db: Database session
+            claim: Claim returned by begin
+            resource_id: JSON-serializable id(s) of the created resource
+
+        Returns:
+            Claim with resource_id set
+        """
+        claim = claim._replace(resource_id=resource_id)
+        stored = orjson.dumps(resource_id).decode()
+        if claim.in_redis:
+            client = _redis()
+            if client is not None:
+                try:
+                    client.set(_redis_key(claim.user_id, claim.scope, claim.key), orjson.dumps({
+                        "fingerprint": claim.fingerprint,
+                        "resource_id": stored
+                    }), ex=int(settings.IDEMPOTENCY_TTL_HOURS * 3600))
+                except redis.RedisError as e:
+                    _redis_failed(e)
+            return claim
+
+        db.execute(
+            update(IdempotencyKey).where(
+                IdempotencyKey.user_id == claim.user_id,
+                IdempotencyKey.scope == claim.scope,
+                IdempotencyKey.key == claim.key
+            ).values(resource_id=stored, locked_until=None)
+        )
+        db.commit()
+        return claim
+
+    @staticmethod
+    def complete(db: Session, claim: IdempotencyClaim, response: Response) -> None:
+        """
+        Store the response of a request that ran under a claim
+
+        Args:
+            db: Database session
+            claim: Claim returned by begin
+            response: Response to replay on retries
+        """
+        body = response.body.decode()
+        if claim.in_redis:
+            client = _redis()
+            if client is not None:
+                try:
+                    client.set(_redis_key(claim.user_id, claim.scope, claim.key), orjson.dumps({
+                        "fingerprint": claim.fingerprint,
+                        "status_code": response.status_code,
+                        "media_type": response.media_type,
+                        "body": body
+                    }), ex=int(settings.IDEMPOTENCY_TTL_HOURS * 3600))
+                except redis.RedisError as e:
+                    _redis_failed(e)
+            return
+
+        db.execute(
+            update(IdempotencyKey).where(
+                IdempotencyKey.user_id == claim.user_id,
+                IdempotencyKey.scope == claim.scope,
+                IdempotencyKey.key == claim.key
+            ).values(
+                status_code=response.status_code,
+                media_type=response.media_type,
+                response_body=body,
+                locked_until=None
+            )
+        )
+        db.commit()
+
+    @staticmethod
+    def release(db: Session, claim: IdempotencyClaim) -> None:
+        """
+        Give up a claim after the request failed, so a retry runs it again
+
+        A claim whose resource was recorded is kept, so a retry does not
+        create it again.
+
+        Args:
+            db: Database session
+            claim: Claim returned by begin
+        """
+        if claim.resource_id is not None:
+            return
+        if claim.in_redis:
+            client = _redis()
+            if client is not None:
+                try:
+                    client.delete(_redis_key(claim.user_id, claim.scope, claim.key))
+                except redis.RedisError as e:
+                    _redis_failed(e)
+            return
+
+        db.rollback()
+        db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.user_id == claim.user_id,
+                IdempotencyKey.scope == claim.scope,
+                IdempotencyKey.key == claim.key,
+                IdempotencyKey.status_code.is_(None),
+                IdempotencyKey.resource_id.is_(None)
+            )
+        )
+        db.commit()
+
+    @staticmethod
+    def purge_expired(db: Session) -> dict:
+        """
+        Delete expired idempotency keys from the database (background job)
+
+        Redis entries expire on their own.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Summary of the run
+        """
+        result = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.utcnow()))
+        db.commit()
+        return {"purged": result.rowcount}
@@ -0,0 +1,132 @@
+"""
+Maintenance Archive Service
+Moves closed maintenance requests out of the hot table once they are old
+"""
+from collections import Counter, defaultdict
+from sqlalchemy import DateTime, bindparam, delete, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+import json
+import logging
+
+from app.core.config import settings
+from app.models.maintenance_request import MaintenanceRequest, RequestStatus
+from app.models.maintenance_request_archive import maintenance_requests_archive
+from app.models.maintenance_request_event import RequestEventType
+from app.models.maintenance_request_part import MaintenanceRequestPart
+from app.models.upload_session import UploadSession
+from app.schemas.maintenance_request_part import MaintenanceRequestPartResponse
+from app.services.app_state import AppStateService
+from app.services.maintenance_request_event import MaintenanceRequestEventService
+
+logger = logging.getLogger(__name__)
+
+CLOSED_STATUSES = (RequestStatus.COMPLETED, RequestStatus.CANCELLED)
+
+# AppState counters of archived requests per status, so statistics need not count the archive
+ARCHIVED_COUNTER_PREFIX = "maintenance_archive.count."
+
+
+class MaintenanceArchiveService:
+    """Service for archiving closed maintenance requests"""
+
+    @staticmethod
+    def archive_closed(db: Session) -> dict:
+        """
+        Move closed requests older than MAINTENANCE_ARCHIVE_AFTER_DAYS to the archive (background job)
+
+        Works in batches, each one transaction: the batch is locked with
+        FOR UPDATE SKIP LOCKED so a request being edited is left for the
+        next run, copied with INSERT ... SELECT together with a snapshot
+        of its part lines, and deleted from the hot table. KPI buckets
+        are unaffected: a move changes no request.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Summary of the run
+        """
+        cutoff = datetime.utcnow() - timedelta(days=settings.MAINTENANCE_ARCHIVE_AFTER_DAYS)
+        hot = MaintenanceRequest.__table__
+        column_names = [column.name for column in hot.columns]
+
+        archived = Counter()
+        for _ in range(settings.MAINTENANCE_ARCHIVE_MAX_BATCHES_PER_RUN):
+            batch = db.query(MaintenanceRequest.id, MaintenanceRequest.submitter_id, MaintenanceRequest.status).filter(
+                MaintenanceRequest.status.in_(CLOSED_STATUSES),
+                MaintenanceRequest.created_at < cutoff,
+                func.coalesce(MaintenanceRequest.completed_at, MaintenanceRequest.created_at) < cutoff
+            ).order_by(MaintenanceRequest.created_at).limit(
+                settings.MAINTENANCE_ARCHIVE_BATCH_SIZE
+            ).with_for_update(skip_locked=True).all()
+
+            if not batch:
+                db.rollback()
+                break
+
+            request_ids = [request_id for request_id, _, _ in batch]
+            now = datetime.utcnow()
+
+            db.execute(insert(maintenance_requests_archive).from_select(
+                column_names + ["archived_at"],
+                select(*hot.columns, literal(now, DateTime)).where(hot.c.id.in_(request_ids))
+            ))
+            MaintenanceArchiveService._snapshot_parts(db, request_ids)
+
+            # Dependent rows go explicitly rather than by ON DELETE CASCADE, which SQLite does not enforce
+            db.execute(delete(MaintenanceRequestPart).where(MaintenanceRequestPart.request_id.in_(request_ids)))
+            db.execute(delete(UploadSession).where(UploadSession.request_id.in_(request_ids)))
+            db.execute(delete(hot).where(hot.c.id.in_(request_ids)))
+
+            MaintenanceRequestEventService.record_bulk(
+                db, [(request_id, submitter_id) for request_id, submitter_id, _ in batch], RequestEventType.ARCHIVED, now
+            )
+            counts = Counter(request_status for _, _, request_status in batch)
+            for request_status, count in counts.items():
+                AppStateService.increment_counter(db, ARCHIVED_COUNTER_PREFIX + request_status.value, count)
+            db.commit()
+
+            archived.update(counts)
+            if len(batch) < settings.MAINTENANCE_ARCHIVE_BATCH_SIZE:
+                break
+
+        total = sum(archived.values())
+        if total:
+            logger.info(f"Archived {total} closed maintenance requests")
+
+        return {"archived": total}
+
+    @staticmethod
+    def _snapshot_parts(db: Session, request_ids: list) -> None:
+        """Store the part lines of archived requests on their archive rows"""
+        lines = defaultdict(list)
+        for part in db.query(MaintenanceRequestPart).filter(
+            MaintenanceRequestPart.request_id.in_(request_ids)
+        ).order_by(MaintenanceRequestPart.request_id, MaintenanceRequestPart.line_no):
+            lines[part.request_id].append(MaintenanceRequestPartResponse.model_validate(part).model_dump(mode="json"))
+        if not lines:
+            return
+
+        db.execute(
+            update(maintenance_requests_archive)
+            .where(maintenance_requests_archive.c.id == bindparam("archived_id"))
+            .values(parts_json=bindparam("archived_parts")),
+            [{"archived_id": request_id, "archived_parts": json.dumps(parts)} for request_id, parts in lines.items()]
+        )
+
+    @staticmethod
+    def archived_counts(db: Session) -> dict:
+        """
+        Number of archived requests per status, from the archive counters
+
+        Args:
+            db: Database session
+
+        Returns:
+            {status value: count}
+        """
+        return {
+            request_status.value: AppStateService.get_value(db, ARCHIVED_COUNTER_PREFIX + request_status.value, 0)
+            for request_status in CLOSED_STATUSES
+        }
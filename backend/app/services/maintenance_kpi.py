@@ -0,0 +1,415 @@
+"""
+Maintenance KPI Service
+Incrementally maintained MTTR, backlog age and throughput rollups
+"""
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+from datetime import date, datetime, timedelta
+import logging
+
+from app.db.upsert import conflict_insert
+from app.models.equipment import Equipment, Location
+from app.models.maintenance_kpi import KPI_METRICS, MaintenanceKpiBucket
+from app.models.maintenance_request import MaintenanceRequest, PriorityLevel, RequestStatus
+from app.models.maintenance_request_archive import ArchivedMaintenanceRequest
+from app.utils.dates import naive_utc
+
+logger = logging.getLogger(__name__)
+
+# (day, equipment_id, location_id, priority)
+BucketKey = Tuple[date, int, int, PriorityLevel]
+
+OPEN_STATUSES = (RequestStatus.PENDING, RequestStatus.IN_PROGRESS)
+
+# Buckets upserted per statement when equipment moves
+MOVE_BATCH = 1000
+
+# Backlog age buckets: (label, minimum age in days)
+BACKLOG_AGE_BUCKETS = [("0-2d", 0), ("3-7d", 3), ("8-30d", 8), ("31-90d", 31), ("90d+", 91)]
+
+GROUP_COLUMNS = {
+    "equipment": MaintenanceKpiBucket.equipment_id,
+    "location": MaintenanceKpiBucket.location_id,
+    "priority": MaintenanceKpiBucket.priority
+}
+
+
+class KpiState(NamedTuple):
+    """The request fields KPI buckets depend on"""
+    created_at: datetime
+    completed_at: Optional[datetime]
+    status: RequestStatus
+    priority: PriorityLevel
+    equipment_id: int
+    location_id: int
+
+
+def _contributions(state: Optional[KpiState]) -> Dict[BucketKey, Counter]:
+    """Metrics one request adds to the buckets"""
+    contributions = defaultdict(Counter)
+    if state is None or state.created_at is None:
+        return contributions
+
+    created_key = (state.created_at.date(), state.equipment_id, state.location_id, state.priority)
+    contributions[created_key]["created_count"] += 1
+    if state.status in OPEN_STATUSES:
+        contributions[created_key]["open_count"] += 1
+    elif state.status == RequestStatus.CANCELLED:
+        contributions[created_key]["cancelled_count"] += 1
+    elif state.status == RequestStatus.COMPLETED and state.completed_at:
+        completed_key = (state.completed_at.date(), state.equipment_id, state.location_id, state.priority)
+        contributions[completed_key]["completed_count"] += 1
+        contributions[completed_key]["repair_seconds"] += max(0, int((state.completed_at - state.created_at).total_seconds()))
+
+    return contributions
+
+
+class MaintenanceKpiService:
+    """Service for maintenance KPI rollups"""
+
+    @staticmethod
+    def snapshot(db: Session, request: Optional[MaintenanceRequest]) -> Optional[KpiState]:
+        """
+        Capture the KPI-relevant state of a request
+
+        Take one before and one after a change and pass both to apply_change.
+
+        Args:
+            db: Database session
+            request: Maintenance request (None for "does not exist")
+
+        Returns:
+            State, or None
+        """
+        if request is None:
+            return None
+
+        location_id = 0
+        if request.equipment_id:
+            location_id = db.query(Equipment.location_id).filter(Equipment.id == request.equipment_id).scalar() or 0
+
+        return KpiState(
+            created_at=naive_utc(request.created_at) or datetime.utcnow(),
+            completed_at=naive_utc(request.completed_at),
+            status=request.status or RequestStatus.PENDING,
+            priority=request.priority or PriorityLevel.MEDIUM,
+            equipment_id=request.equipment_id or 0,
+            location_id=location_id
+        )
+
+    @staticmethod
+    def apply_change(db: Session, before: Optional[KpiState], after: Optional[KpiState]) -> None:
+        """
+        Apply the difference between two states of a request to the buckets
+
+        Covers creation (before is None), deletion (after is None) and any
+        update, including priority or equipment changes that move the
+        request between buckets. Does not commit.
+
+        Args:
+            db: Database session
+            before: State before the change
+            after: State after the change
+        """
+        MaintenanceKpiService.apply_changes(db, [(before, after)])
+
+    @staticmethod
+    def apply_changes(db: Session, changes: Iterable[Tuple[Optional[KpiState], Optional[KpiState]]]) -> None:
+        """
+        Apply the changes of many requests with one upsert (for bulk updates)
+
+        Does not commit.
+
+        Args:
+            db: Database session
+            changes: (before, after) state pairs, as for apply_change
+        """
+        deltas = defaultdict(Counter)
+        for before, after in changes:
+            for key, metrics in _contributions(after).items():
+                deltas[key].update(metrics)
+            for key, metrics in _contributions(before).items():
+                deltas[key].subtract(metrics)
+        MaintenanceKpiService._apply_deltas(db, deltas)
+
+    @staticmethod
+    def apply_for_requests(db: Session, request_ids: List[int]) -> None:
+        """
+        Count newly inserted requests (for bulk inserts that bypass the ORM)
+
+        Does not commit.
+
+        Args:
+            db: Database session
+            request_ids: IDs of the inserted requests
+        """
+        if not request_ids:
+            return
+        deltas = defaultdict(Counter)
+        for state in MaintenanceKpiService._states(db, [MaintenanceRequest.id.in_(request_ids)]):
+            for key, metrics in _contributions(state).items():
+                deltas[key].update(metrics)
+        MaintenanceKpiService._apply_deltas(db, deltas)
+
+    @staticmethod
+    def move_equipment(db: Session, equipment_id: int, location_id: Optional[int]) -> None:
+        """
+        Move an equipment's buckets to the location it moved to
+
+        Buckets are keyed by the equipment's current location, so its history
+        has to move with it; otherwise the next change to one of its requests
+        would be subtracted from a bucket it was never added to. Call in the
+        transaction that changes the location. Does not commit.
+
+        Args:
+            db: Database session
+            equipment_id: Equipment that moved
+            location_id: Its new location (None for none)
+        """
+        location_id = location_id or 0
+        moved = db.query(MaintenanceKpiBucket).filter(
+            MaintenanceKpiBucket.equipment_id == equipment_id,
+            MaintenanceKpiBucket.location_id != location_id
+        ).with_for_update().all()
+        if not moved:
+            return
+
+        deltas = defaultdict(Counter)
+        for bucket in moved:
+            deltas[(bucket.day, equipment_id, location_id, bucket.priority)].update(
+                {metric: getattr(bucket, metric) for metric in KPI_METRICS}
+            )
+        db.query(MaintenanceKpiBucket).filter(
+            MaintenanceKpiBucket.id.in_([bucket.id for bucket in moved])
+        ).delete(synchronize_session=False)
+
+        keys = list(deltas)
+        for i in range(0, len(keys), MOVE_BATCH):
+            MaintenanceKpiService._apply_deltas(db, {key: deltas[key] for key in keys[i:i + MOVE_BATCH]})
+
+    @staticmethod
+    def _states(db: Session, filters: list, model=MaintenanceRequest) -> Iterable[KpiState]:
+        """Stream KPI states of the requests matching filters, from the hot table or the archive"""
+        rows = db.query(
+            model.created_at,
+            model.completed_at,
+            model.status,
+            model.priority,
+            model.equipment_id,
+            Equipment.location_id
+        ).outerjoin(Equipment, model.equipment_id == Equipment.id).filter(*filters).execution_options(yield_per=1000)
+
+        for created_at, completed_at, request_status, priority, equipment_id, location_id in rows:
+            yield KpiState(created_at, completed_at, request_status, priority, equipment_id or 0, location_id or 0)
+
+    @staticmethod
+    def _apply_deltas(db: Session, deltas: Dict[BucketKey, Counter]) -> None:
+        """Add metric deltas to their buckets with one upsert"""
+        rows = []
+        for (day, equipment_id, location_id, priority), metrics in deltas.items():
+            if not any(metrics.values()):
+                continue
+            row = {"day": day, "equipment_id": equipment_id, "location_id": location_id, "priority": priority}
+            row.update({metric: metrics.get(metric, 0) for metric in KPI_METRICS})
+            rows.append(row)
+        if not rows:
+            return
+
+        table = MaintenanceKpiBucket.__table__
+        stmt = conflict_insert(db, table).values(rows)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["day", "equipment_id", "location_id", "priority"],
+            set_={metric: table.c[metric] + stmt.excluded[metric] for metric in KPI_METRICS}
+        ))
+
+    @staticmethod
+    def reconcile(db: Session) -> dict:
+        """
+        Recompute the buckets from the requests and correct any drift
+
+        Runs month by month: the requests created or completed in the month
+        are streamed, their contributions summed and compared with the stored
+        buckets of that month, and only differences are written. Each month
+        is committed on its own, and buckets left empty are dropped.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Summary of the pass
+        """
+        firsts = [db.query(func.min(model.created_at)).scalar() for model in (MaintenanceRequest, ArchivedMaintenanceRequest)]
+        firsts.append(db.query(func.min(MaintenanceKpiBucket.day)).scalar())
+        if all(value is None for value in firsts):
+            return {"months": 0, "corrected_buckets": 0}
+
+        starts = [value.date() if isinstance(value, datetime) else value for value in firsts if value]
+        month = min(starts).replace(day=1)
+        today = datetime.utcnow().date()
+
+        months = 0
+        corrected = 0
+        while month <= today:
+            next_month = (month + timedelta(days=32)).replace(day=1)
+            window_start = datetime.combine(month, datetime.min.time())
+            window_end = datetime.combine(next_month, datetime.min.time())
+
+            # Archived requests still count towards their months
+            computed = defaultdict(Counter)
+            for model in (MaintenanceRequest, ArchivedMaintenanceRequest):
+                for state in MaintenanceKpiService._states(db, [or_(
+                    model.created_at.between(window_start, window_end),
+                    model.completed_at.between(window_start, window_end)
+                )], model):
+                    for key, metrics in _contributions(state).items():
+                        if month <= key[0] < next_month:
+                            computed[key].update(metrics)
+
+            deltas = defaultdict(Counter, {key: Counter(metrics) for key, metrics in computed.items()})
+            for bucket in db.query(MaintenanceKpiBucket).filter(
+                MaintenanceKpiBucket.day >= month,
+                MaintenanceKpiBucket.day < next_month
+            ):
+                key = (bucket.day, bucket.equipment_id, bucket.location_id, bucket.priority)
+                deltas[key].subtract({metric: getattr(bucket, metric) for metric in KPI_METRICS})
+
+            drifted = {key: metrics for key, metrics in deltas.items() if any(metrics.values())}
+            if drifted:
+                MaintenanceKpiService._apply_deltas(db, drifted)
+                corrected += len(drifted)
+
+            # Buckets emptied by moves and deletions
+            db.query(MaintenanceKpiBucket).filter(
+                MaintenanceKpiBucket.day >= month,
+                MaintenanceKpiBucket.day < next_month,
+                *[getattr(MaintenanceKpiBucket, metric) == 0 for metric in KPI_METRICS]
+            ).delete(synchronize_session=False)
+            db.commit()
+
+            months += 1
+            month = next_month
+
+        if corrected:
+            logger.info(f"KPI reconciliation corrected {corrected} buckets")
+
+        return {"months": months, "corrected_buckets": corrected}
+
+    @staticmethod
+    def get_kpis(
+        db: Session,
+        start: date,
+        end: date,
+        group_by: Optional[str] = None,
+        interval: str = "day"
+    ) -> dict:
+        """
+        Read KPIs from the pre-aggregated buckets
+
+        Args:
+            db: Database session
+            start: First day of the throughput/MTTR range
+            end: Last day of the range (inclusive)
+            group_by: equipment, location, priority or None
+            interval: day or week
+
+        Returns:
+            Totals, per-period series and current backlog aging
+        """
+        group_column = GROUP_COLUMNS.get(group_by)
+        group_columns = [group_column] if group_column is not None else []
+
+        series_rows = db.query(
+            MaintenanceKpiBucket.day,
+            *group_columns,
+            func.sum(MaintenanceKpiBucket.created_count),
+            func.sum(MaintenanceKpiBucket.completed_count),
+            func.sum(MaintenanceKpiBucket.cancelled_count),
+            func.sum(MaintenanceKpiBucket.repair_seconds)
+        ).filter(
+            MaintenanceKpiBucket.day >= start,
+            MaintenanceKpiBucket.day <= end
+        ).group_by(MaintenanceKpiBucket.day, *group_columns).all()
+
+        backlog_rows = db.query(
+            MaintenanceKpiBucket.day,
+            *group_columns,
+            func.sum(MaintenanceKpiBucket.open_count)
+        ).filter(
+            MaintenanceKpiBucket.open_count != 0
+        ).group_by(MaintenanceKpiBucket.day, *group_columns).all()
+
+        labels = MaintenanceKpiService._group_labels(
+            db, group_by, {row[1] for row in series_rows + backlog_rows} if group_columns else set()
+        )
+
+        def group_of(row):
+            return labels.get(row[1], str(row[1])) if group_columns else None
+
+        periods = defaultdict(Counter)
+        totals = Counter()
+        for row in series_rows:
+            day = row[0] if isinstance(row[0], date) else date.fromisoformat(str(row[0]))
+            period = day - timedelta(days=day.weekday()) if interval == "week" else day
+            created, completed, cancelled, repair_seconds = (value or 0 for value in row[-4:])
+            if not (created or completed or cancelled):
+                continue
+            metrics = {"created": created, "completed": completed, "cancelled": cancelled, "repair_seconds": repair_seconds}
+            periods[(period, group_of(row))].update(metrics)
+            totals.update(metrics)
+
+        today = datetime.utcnow().date()
+        aging = defaultdict(Counter)
+        for row in backlog_rows:
+            day = row[0] if isinstance(row[0], date) else date.fromisoformat(str(row[0]))
+            age = (today - day).days
+            label = [name for name, minimum in BACKLOG_AGE_BUCKETS if age >= minimum][-1]
+            aging[group_of(row)][label] += row[-1] or 0
+
+        return {
+            "start": start,
+            "end": end,
+            "group_by": group_by,
+            "interval": interval,
+            "totals": {
+                "created": totals["created"],
+                "completed": totals["completed"],
+                "cancelled": totals["cancelled"],
+                "mttr_hours": _mttr_hours(totals)
+            },
+            "series": [{
+                "period": period,
+                "group": group,
+                "created": metrics["created"],
+                "completed": metrics["completed"],
+                "cancelled": metrics["cancelled"],
+                "mttr_hours": _mttr_hours(metrics)
+            } for (period, group), metrics in sorted(periods.items(), key=lambda item: (item[0][0], str(item[0][1])))],
+            "backlog": [{
+                "group": group,
+                "open": sum(counts.values()),
+                "aging": {name: counts[name] for name, _ in BACKLOG_AGE_BUCKETS}
+            } for group, counts in sorted(aging.items(), key=lambda item: str(item[0]))]
+        }
+
+    @staticmethod
+    def _group_labels(db: Session, group_by: Optional[str], values: set) -> dict:
+        """Display names of group values"""
+        if group_by == "priority":
+            return {value: value.value for value in values if value is not None}
+        if group_by == "equipment":
+            labels = dict(db.query(Equipment.id, Equipment.name).filter(Equipment.id.in_(values)).all())
+        elif group_by == "location":
+            labels = dict(db.query(Location.id, Location.path).filter(Location.id.in_(values)).all())
+        else:
+            return {}
+        labels[0] = "(none)"
+        return labels
+
+
+def _mttr_hours(metrics: Counter) -> Optional[float]:
+    """Mean time to repair in hours, or None without completions"""
+    if not metrics["completed"]:
+        return None
+    return round(metrics["repair_seconds"] / metrics["completed"] / 3600, 2)
@@ -2,16 +2,31 @@
 Maintenance Request Service
 Business logic for maintenance request operations
 """
-from typing import List, Optional
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, and_, desc
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional, Sequence
+from sqlalchemy.orm import Session, joinedload, aliased
+from sqlalchemy import Row, or_, and_, desc, func, null, select, type_coerce, union_all, update
 from fastapi import HTTPException, status
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import json
 
-from app.models.maintenance_request import MaintenanceRequest, RequestStatus
+from app.core.config import settings
+from app.models.equipment import Equipment
+from app.models.maintenance_request import MaintenanceRequest, PriorityLevel, RequestStatus
+from app.models.maintenance_request_archive import ArchivedMaintenanceRequest
+from app.models.maintenance_request_event import RequestEventType
 from app.models.user import User
 from app.schemas.maintenance_request import MaintenanceRequestCreate, MaintenanceRequestUpdate
+from app.services.equipment import EquipmentService
+from app.services.maintenance_archive import MaintenanceArchiveService
+from app.services.maintenance_kpi import KpiState, MaintenanceKpiService
+from app.services.maintenance_request_event import MaintenanceRequestEventService
+from app.services.maintenance_request_part import MaintenanceRequestPartService
+from app.services.maintenance_schedule import MaintenanceScheduleService
+from app.services.sla import SlaService
+from app.utils.dates import naive_utc
+from app.utils.request_serializer import REQUEST_FIELDS, safe_json_list
 
 
 class MaintenanceRequestService:
@@ -34,16 +49,58 @@ class MaintenanceRequestService:
         Returns:
             Created maintenance request
         """
+        db_request = MaintenanceRequestService.add_request(db, request_data, submitter.id, submitter)
+        db.commit()
+        db.refresh(db_request)
+
+        return db_request
+
+    @staticmethod
+    def add_request(
+        db: Session,
+        request_data: MaintenanceRequestCreate,
+        submitter_id: int,
+        actor: Optional[User],
+        schedule_id: Optional[int] = None,
+        scheduled_due_at: Optional[datetime] = None
+    ) -> MaintenanceRequest:
+        """
+        Add a request with its equipment, parts, schedule, SLA targets, KPIs and creation event
+
+        Shared by create_request and the preventive maintenance scheduler.
+        Does not commit.
+
+        Args:
+            db: Database session
+            request_data: Request data
+            submitter_id: Owner of the request
+            actor: User the creation is recorded for (None for system-created requests)
+            schedule_id: Schedule a generated PM request belongs to
+            scheduled_due_at: Due date of the schedule the PM request was generated for
+
+        Returns:
+            Added maintenance request
+        """
         # Convert attachments list to JSON string
         attachments_json = json.dumps(request_data.attachments) if request_data.attachments else "[]"
 
+        equipment = MaintenanceRequestService._resolve_equipment(
+            db,
+            request_data.equipment_id,
+            request_data.equipment_name,
+            request_data.location,
+            request_data.warranty_status,
+            request_data.warranty_expiry_date
+        )
+
         # Create request object
         db_request = MaintenanceRequest(
             title=request_data.title,
             description=request_data.description,
             priority=request_data.priority,
-            equipment_name=request_data.equipment_name,
-            location=request_data.location,
+            equipment_id=equipment.id if equipment else None,
+            equipment_name=equipment.name if equipment else request_data.equipment_name,
+            location=request_data.location or (equipment.location_path if equipment else None),
             requested_completion_date=request_data.requested_completion_date,
             last_maintenance_date=request_data.last_maintenance_date,
             maintenance_cycle_days=request_data.maintenance_cycle_days,
@@ -51,32 +108,98 @@ class MaintenanceRequestService:
             warranty_expiry_date=request_data.warranty_expiry_date,
             part_order_list=request_data.part_order_list,
             attachments=attachments_json,
-            submitter_id=submitter.id,
+            submitter_id=submitter_id,
+            schedule_id=schedule_id,
+            scheduled_due_at=scheduled_due_at,
             status=RequestStatus.PENDING
         )
 
         db.add(db_request)
-        db.commit()
-        db.refresh(db_request)
+        db.flush()
+        SlaService.apply_targets(db_request)
+        if db_request.part_order_list:
+            MaintenanceRequestPartService.sync_from_text(db, db_request)
+        MaintenanceScheduleService.sync_from_request(db, db_request)
+        MaintenanceKpiService.apply_change(db, None, MaintenanceKpiService.snapshot(db, db_request))
+        MaintenanceRequestEventService.record(
+            db, db_request, RequestEventType.CREATED, actor, to_status=db_request.status
+        )
 
         return db_request
 
     @staticmethod
-    def get_request(db: Session, request_id: int) -> Optional[MaintenanceRequest]:
+    def _resolve_equipment(
+        db: Session,
+        equipment_id: Optional[int],
+        equipment_name: Optional[str],
+        location: Optional[str],
+        warranty_status=None,
+        warranty_expiry_date=None
+    ):
+        """
+        Find the registered equipment of a request
+
+        An explicit equipment_id must exist; otherwise the free-text name is
+        resolved (and registered if new) by its normalized key.
+
+        Raises:
+            HTTPException: If equipment_id does not exist
+        """
+        if equipment_id is not None:
+            equipment = EquipmentService.get_equipment(db, equipment_id)
+            if not equipment:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Equipment not found"
+                )
+            return equipment
+        return EquipmentService.resolve(db, equipment_name, location, warranty_status, warranty_expiry_date)
+
+    @staticmethod
+    def get_request(db: Session, request_id: int, include_archived: bool = False) -> Optional[MaintenanceRequest]:
         """
         Get a single maintenance request by ID
 
         Args:
             db: Database session
             request_id: Request ID
+            include_archived: Fall back to the archive (read-only callers)
+
+        Returns:
+            Maintenance request, ArchivedMaintenanceRequest or None
+        """
+        for model in MaintenanceRequestService._models(include_archived):
+            request = db.query(model).options(
+                joinedload(model.submitter),
+                joinedload(model.completed_by),
+                joinedload(model.assigned_to)
+            ).filter(model.id == request_id).first()
+            if request:
+                return request
+        return None
+
+    @staticmethod
+    def get_requests_by_ids(db: Session, request_ids: List[int], include_archived: bool = False) -> List[MaintenanceRequest]:
+        """
+        Get several maintenance requests in one query
+
+        Args:
+            db: Database session
+            request_ids: Request IDs
+            include_archived: Also look in the archive (read-only callers)
 
         Returns:
-            Maintenance request or None
+            Found requests ordered by ID
         """
-        return db.query(MaintenanceRequest).options(
-            joinedload(MaintenanceRequest.submitter),
-            joinedload(MaintenanceRequest.completed_by)
-        ).filter(MaintenanceRequest.id == request_id).first()
+        requests = []
+        for model in MaintenanceRequestService._models(include_archived):
+            requests.extend(db.query(model).filter(model.id.in_(request_ids)).all())
+        return sorted(requests, key=lambda request: request.id)
+
+    @staticmethod
+    def _models(include_archived: bool) -> tuple:
+        """Request tables to read: the hot table, and the archive if history is requested"""
+        return (MaintenanceRequest, ArchivedMaintenanceRequest) if include_archived else (MaintenanceRequest,)
 
     @staticmethod
     def get_all_requests(
@@ -85,8 +208,12 @@ class MaintenanceRequestService:
         limit: int = 100,
         status_filter: Optional[str] = None,
         priority_filter: Optional[str] = None,
-        search: Optional[str] = None
-    ) -> tuple[List[MaintenanceRequest], int]:
+        search: Optional[str] = None,
+        fields: Sequence[str] = REQUEST_FIELDS,
+        equipment_id: Optional[int] = None,
+        overdue: bool = False,
+        include_archived: bool = False
+    ) -> tuple[List[Row], int]:
         """
         Get all maintenance requests with filters
 
@@ -97,50 +224,31 @@ class MaintenanceRequestService:
             status_filter: Filter by status
             priority_filter: Filter by priority
             search: Search term for title, description, equipment
+            fields: Response fields to select
+            equipment_id: Only requests for this equipment
+            overdue: Only open requests past their SLA
+            include_archived: Also search archived requests
 
         Returns:
-            Tuple of (requests list, total count)
+            Tuple of (projected rows, total count)
         """
-        query = db.query(MaintenanceRequest).options(
-            joinedload(MaintenanceRequest.submitter)
-        )
-
-        # Apply filters
-        filters = []
-
-        if status_filter:
-            filters.append(MaintenanceRequest.status == status_filter)
-
-        if priority_filter:
-            filters.append(MaintenanceRequest.priority == priority_filter)
-
-        if search:
-            search_term = f"%{search}%"
-            filters.append(or_(
-                MaintenanceRequest.title.ilike(search_term),
-                MaintenanceRequest.description.ilike(search_term),
-                MaintenanceRequest.equipment_name.ilike(search_term),
-                MaintenanceRequest.location.ilike(search_term)
-            ))
-
-        if filters:
-            query = query.filter(and_(*filters))
-
-        # Get total count
-        total = query.count()
-
-        # Apply pagination and ordering
-        requests = query.order_by(desc(MaintenanceRequest.created_at)).offset(skip).limit(limit).all()
+        # Archived requests are closed, so never overdue
+        filters = {
+            model: MaintenanceRequestService._list_filters(status_filter, priority_filter, search, equipment_id, overdue, model)
+            for model in MaintenanceRequestService._models(include_archived and not overdue)
+        }
 
-        return requests, total
+        return MaintenanceRequestService._get_request_rows(db, filters, skip, limit, fields)
 
     @staticmethod
     def get_user_requests(
         db: Session,
         user_id: int,
         skip: int = 0,
-        limit: int = 100
-    ) -> tuple[List[MaintenanceRequest], int]:
+        limit: int = 100,
+        fields: Sequence[str] = REQUEST_FIELDS,
+        include_archived: bool = False
+    ) -> tuple[List[Row], int]:
         """
         Get maintenance requests submitted by a specific user
 
@@ -149,26 +257,209 @@ class MaintenanceRequestService:
             user_id: User ID
             skip: Number of records to skip
             limit: Maximum number of records to return
+            fields: Response fields to select
+            include_archived: Also include archived requests
 
         Returns:
-            Tuple of (requests list, total count)
+            Tuple of (projected rows, total count)
         """
-        query = db.query(MaintenanceRequest).filter(
-            MaintenanceRequest.submitter_id == user_id
+        filters = {
+            model: [model.submitter_id == user_id]
+            for model in MaintenanceRequestService._models(include_archived)
+        }
+
+        return MaintenanceRequestService._get_request_rows(db, filters, skip, limit, fields)
+
+    @staticmethod
+    def iter_export_rows(
+        db: Session,
+        fields: Sequence[str],
+        status_filter: Optional[str] = None,
+        priority_filter: Optional[str] = None,
+        search: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        equipment_id: Optional[int] = None,
+        overdue: bool = False,
+        include_archived: bool = False,
+        batch_size: int = 1000
+    ) -> Iterator[Row]:
+        """
+        Stream every matching request as a projected row
+
+        Uses a server-side cursor (stream_results) fetched in batches of
+        batch_size, so memory does not grow with the number of rows.
+
+        Args:
+            db: Database session (kept busy until the iterator is exhausted)
+            fields: Response fields to select
+            status_filter: Filter by status
+            priority_filter: Filter by priority
+            search: Search term for title, description, equipment
+            created_from: Only requests created at or after this time
+            created_to: Only requests created before this time
+            equipment_id: Only requests for this equipment
+            overdue: Only open requests past their SLA
+            include_archived: Also export archived requests
+            batch_size: Rows fetched per round trip
+
+        Yields:
+            Projected rows, oldest first
+        """
+        queries = []
+        for model in MaintenanceRequestService._models(include_archived and not overdue):
+            filters = MaintenanceRequestService._list_filters(status_filter, priority_filter, search, equipment_id, overdue, model)
+            if created_from:
+                filters.append(model.created_at >= created_from)
+            if created_to:
+                filters.append(model.created_at < created_to)
+
+            query = MaintenanceRequestService._projected_query(db, fields, model)
+            if filters:
+                query = query.filter(and_(*filters))
+            queries.append((model, query))
+
+        if len(queries) == 1:
+            model, query = queries[0]
+            yield from query.order_by(model.created_at, model.id).execution_options(
+                stream_results=True,
+                yield_per=batch_size
+            )
+            return
+
+        combined = union_all(*(
+            query.add_columns(model.created_at.label("sort_created_at")).statement for model, query in queries
+        )).subquery()
+        yield from db.execute(
+            select(combined)
+            .order_by(combined.c.sort_created_at, combined.c.id)
+            .execution_options(stream_results=True, yield_per=batch_size)
         )
 
-        total = query.count()
+    @staticmethod
+    def _list_filters(
+        status_filter: Optional[str] = None,
+        priority_filter: Optional[str] = None,
+        search: Optional[str] = None,
+        equipment_id: Optional[int] = None,
+        overdue: bool = False,
+        model=MaintenanceRequest
+    ) -> list:
+        """Build the status/priority/search/equipment/overdue filters of the list and export endpoints for a request table"""
+        filters = []
+
+        if overdue:
+            filters.append(SlaService.overdue_filter())
+
+        if equipment_id is not None:
+            filters.append(model.equipment_id == equipment_id)
+
+        if status_filter:
+            filters.append(model.status == status_filter)
+
+        if priority_filter:
+            filters.append(model.priority == priority_filter)
 
-        requests = query.order_by(desc(MaintenanceRequest.created_at)).offset(skip).limit(limit).all()
+        if search:
+            search_term = f"%{search}%"
+            filters.append(or_(
+                model.title.ilike(search_term),
+                model.description.ilike(search_term),
+                model.equipment_name.ilike(search_term),
+                model.location.ilike(search_term)
+            ))
 
-        return requests, total
+        return filters
+
+    @staticmethod
+    def _projected_query(db: Session, fields: Sequence[str], model=MaintenanceRequest):
+        """
+        Query selecting only the given response fields
+
+        Each field is labelled with its response name and submitter/completer/
+        assignee names come from outer joins, so a row maps like an ORM object without
+        loading entities or unused text columns. Fields the table lacks are NULL,
+        so the hot and archive queries have the same columns.
+        """
+        submitter = aliased(User)
+        completed_by = aliased(User)
+        assigned_to = aliased(User)
+        joined_columns = {
+            "submitter_email": submitter.email,
+            "submitter_name": submitter.full_name,
+            "completed_by_name": completed_by.full_name,
+            "assigned_to_name": assigned_to.full_name
+        }
+        table_columns = model.__table__.c
+
+        columns = []
+        for name in fields:
+            if name in joined_columns:
+                columns.append(joined_columns[name].label(name))
+            elif name in table_columns:
+                columns.append(table_columns[name].label(name))
+            elif name in ArchivedMaintenanceRequest.__table__.c:
+                columns.append(type_coerce(null(), ArchivedMaintenanceRequest.__table__.c[name].type).label(name))
+            else:
+                columns.append(null().label(name))
+
+        query = db.query(*columns).select_from(model)
+        if "submitter_email" in fields or "submitter_name" in fields:
+            query = query.outerjoin(submitter, model.submitter_id == submitter.id)
+        if "completed_by_name" in fields:
+            query = query.outerjoin(completed_by, model.completed_by_id == completed_by.id)
+        if "assigned_to_name" in fields:
+            query = query.outerjoin(assigned_to, model.assigned_to_id == assigned_to.id)
+
+        return query
+
+    @staticmethod
+    def _get_request_rows(
+        db: Session,
+        filters: Dict[type, list],
+        skip: int,
+        limit: int,
+        fields: Sequence[str]
+    ) -> tuple[List[Row], int]:
+        """
+        Select one page of requests as projected rows, with the total count
+
+        filters maps each request table to read (hot, and archive for
+        history) to its filters; several tables are paged as one UNION ALL.
+        """
+        queries = []
+        total = 0
+        for model, model_filters in filters.items():
+            query = MaintenanceRequestService._projected_query(db, fields, model)
+            if model_filters:
+                query = query.filter(and_(*model_filters))
+            queries.append((model, query))
+
+            # Count without the joins or selected columns
+            count_query = db.query(func.count(model.id))
+            if model_filters:
+                count_query = count_query.filter(and_(*model_filters))
+            total += count_query.scalar()
+
+        if len(queries) == 1:
+            model, query = queries[0]
+            rows = query.order_by(desc(model.created_at)).offset(skip).limit(limit).all()
+        else:
+            combined = union_all(*(
+                query.add_columns(model.created_at.label("sort_created_at")).statement for model, query in queries
+            )).subquery()
+            rows = db.execute(
+                select(combined).order_by(combined.c.sort_created_at.desc(), combined.c.id.desc()).offset(skip).limit(limit)
+            ).all()
+
+        return rows, total
 
     @staticmethod
     def update_request(
         db: Session,
         request_id: int,
         update_data: MaintenanceRequestUpdate,
-        user: User
+        user: Optional[User]
     ) -> MaintenanceRequest:
         """
         Update a maintenance request
@@ -177,15 +468,22 @@ class MaintenanceRequestService:
             db: Database session
             request_id: Request ID to update
             update_data: Updated data
-            user: User performing the update
+            user: User performing the update (None for system changes)
 
         Returns:
             Updated maintenance request
 
         Raises:
-            HTTPException: If request not found
+            HTTPException: If request not found, or if it is being started
+                while claimed by another technician
         """
-        db_request = MaintenanceRequestService.get_request(db, request_id)
+        # Locked until commit, so concurrent updates apply their KPI deltas,
+        # events and completion details one after the other, each from the
+        # state the previous one left (populate_existing: not a copy loaded
+        # earlier in this session)
+        db_request = db.query(MaintenanceRequest).filter(
+            MaintenanceRequest.id == request_id
+        ).populate_existing().with_for_update().first()
 
         if not db_request:
             raise HTTPException(
@@ -193,22 +491,107 @@ class MaintenanceRequestService:
                 detail="Maintenance request not found"
             )
 
+        if update_data.status == RequestStatus.IN_PROGRESS:
+            MaintenanceRequestService._check_claim(db_request, user)
+
         # Update fields that are provided
         update_dict = update_data.model_dump(exclude_unset=True)
 
+        previous_status = db_request.status
+        kpi_before = MaintenanceKpiService.snapshot(db, db_request)
+
+        if "equipment_id" in update_dict or "equipment_name" in update_dict:
+            equipment = None
+            if update_dict.get("equipment_id") is not None or update_dict.get("equipment_name"):
+                equipment = MaintenanceRequestService._resolve_equipment(
+                    db,
+                    update_dict.get("equipment_id"),
+                    update_dict.get("equipment_name"),
+                    update_dict.get("location", db_request.location)
+                )
+            update_dict["equipment_id"] = equipment.id if equipment else None
+            update_dict["equipment_name"] = equipment.name if equipment else None
+            if equipment and not update_dict.get("location", db_request.location):
+                update_dict["location"] = equipment.location_path
+
+        changes = MaintenanceRequestEventService.diff(db_request, update_dict)
+
         for field, value in update_dict.items():
             setattr(db_request, field, value)
 
         # If status is being changed to completed, record completion details
-        if update_data.status == RequestStatus.COMPLETED and db_request.status != RequestStatus.COMPLETED:
+        if update_data.status == RequestStatus.COMPLETED and previous_status != RequestStatus.COMPLETED:
             db_request.completed_at = datetime.now(timezone.utc)
-            db_request.completed_by_id = user.id
+            db_request.completed_by_id = user.id if user else None
+
+        if update_dict.keys() & {"priority", "requested_completion_date"}:
+            SlaService.apply_targets(db_request)
+        if "part_order_list" in changes:
+            MaintenanceRequestPartService.sync_from_text(db, db_request)
+
+        # Starting work claims the request for the user; returning it to pending releases it
+        if db_request.status != previous_status:
+            previous_assignee = db_request.assigned_to_id
+            MaintenanceRequestService._update_claim(db_request, user)
+            if db_request.assigned_to_id != previous_assignee:
+                changes["assigned_to_id"] = [previous_assignee, db_request.assigned_to_id]
+
+        # Keep the equipment's preventive maintenance schedule in step
+        if db_request.status != previous_status:
+            MaintenanceScheduleService.record_outcome(db, db_request)
+        if update_dict.keys() & {"equipment_id", "equipment_name", "location", "maintenance_cycle_days", "last_maintenance_date"}:
+            MaintenanceScheduleService.sync_from_request(db, db_request)
+
+        MaintenanceKpiService.apply_change(db, kpi_before, MaintenanceKpiService.snapshot(db, db_request))
+
+        if db_request.status != previous_status:
+            MaintenanceRequestEventService.record(
+                db, db_request, RequestEventType.STATUS_CHANGED, user, changes,
+                from_status=previous_status, to_status=db_request.status
+            )
+        elif changes:
+            MaintenanceRequestEventService.record(db, db_request, RequestEventType.UPDATED, user, changes)
 
         db.commit()
         db.refresh(db_request)
 
         return db_request
 
+    @staticmethod
+    def _update_claim(db_request: MaintenanceRequest, user: Optional[User]) -> None:
+        """Set or clear the work queue claim after a status change (does not commit)"""
+        now = datetime.utcnow()
+        if db_request.status == RequestStatus.IN_PROGRESS:
+            if user is not None:
+                db_request.assigned_to_id = user.id
+            db_request.claimed_at = now
+            db_request.claim_expires_at = now + timedelta(minutes=settings.WORK_QUEUE_CLAIM_MINUTES)
+        elif db_request.status == RequestStatus.PENDING:
+            db_request.assigned_to_id = None
+            db_request.claimed_at = None
+            db_request.claim_expires_at = None
+        else:
+            # Finished: keep who did the work, nothing left to expire
+            db_request.claim_expires_at = None
+
+    @staticmethod
+    def _check_claim(db_request: MaintenanceRequest, user: Optional[User]) -> None:
+        """
+        Raise 409 if a request that is being started is held by another technician
+
+        The request must be locked, so two technicians starting it queue up
+        and the second one sees the first one's claim.
+        """
+        if (
+            user is not None
+            and db_request.status == RequestStatus.IN_PROGRESS
+            and db_request.assigned_to_id not in (None, user.id)
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Request is already claimed by another technician"
+            )
+
     @staticmethod
     def update_status(
         db: Session,
@@ -219,6 +602,9 @@ class MaintenanceRequestService:
         """
         Update just the status of a request
 
+        Moving a request to in_progress claims it; as with update_request,
+        of two technicians starting the same request one gets a 409.
+
         Args:
             db: Database session
             request_id: Request ID
@@ -227,39 +613,174 @@ class MaintenanceRequestService:
 
         Returns:
             Updated maintenance request
+
+        Raises:
+            HTTPException: If the request is already claimed by someone else
         """
         update_data = MaintenanceRequestUpdate(status=new_status)
         return MaintenanceRequestService.update_request(db, request_id, update_data, user)
 
     @staticmethod
-    def delete_request(db: Session, request_id: int) -> bool:
+    def bulk_update_status(
+        db: Session,
+        request_ids: List[int],
+        new_status: RequestStatus,
+        user: User
+    ) -> List[dict]:
+        """
+        Move many requests to a status in one transaction
+
+        The requests are read and locked with one query and changed with one
+        UPDATE ... WHERE id IN (...), with the completion and claim fields set
+        as update_request would. KPI buckets, PM schedules and the event log
+        are updated in bulk, so live streams get the events as one batch on
+        commit. As for a single status update, starting a request claimed
+        by another technician is a conflict.
+
+        Args:
+            db: Database session
+            request_ids: IDs of the requests
+            new_status: New status
+            user: User performing the update
+
+        Returns:
+            One result per distinct ID, in request order
+        """
+        request_ids = list(dict.fromkeys(request_ids))
+        rows = db.query(
+            MaintenanceRequest.id,
+            MaintenanceRequest.submitter_id,
+            MaintenanceRequest.status,
+            MaintenanceRequest.assigned_to_id,
+            MaintenanceRequest.schedule_id,
+            MaintenanceRequest.scheduled_due_at,
+            MaintenanceRequest.created_at,
+            MaintenanceRequest.completed_at,
+            MaintenanceRequest.priority,
+            MaintenanceRequest.equipment_id,
+            Equipment.location_id
+        ).outerjoin(
+            Equipment, MaintenanceRequest.equipment_id == Equipment.id
+        ).filter(
+            MaintenanceRequest.id.in_(request_ids)
+        ).order_by(
+            # Lock in id order, so overlapping bulk updates queue up instead of deadlocking
+            MaintenanceRequest.id
+        ).with_for_update(of=MaintenanceRequest).all()
+        found = {row.id: row for row in rows}
+
+        results = {}
+        changing = []
+        for request_id in request_ids:
+            row = found.get(request_id)
+            if row is None:
+                results[request_id] = {"id": request_id, "result": "not_found", "detail": "Maintenance request not found"}
+            elif (
+                new_status == RequestStatus.IN_PROGRESS and row.status == RequestStatus.IN_PROGRESS
+                and row.assigned_to_id not in (None, user.id)
+            ):
+                results[request_id] = {
+                    "id": request_id, "result": "conflict", "status": row.status,
+                    "detail": "Request is already claimed by another technician"
+                }
+            elif row.status == new_status:
+                results[request_id] = {"id": request_id, "result": "unchanged", "status": row.status}
+            else:
+                results[request_id] = {"id": request_id, "result": "updated", "status": new_status}
+                changing.append(row)
+
+        if not changing:
+            db.rollback()
+            return [results[request_id] for request_id in request_ids]
+
+        now = datetime.utcnow()
+        values = {"status": new_status}
+        if new_status == RequestStatus.COMPLETED:
+            values.update(completed_at=now, completed_by_id=user.id)
+        # Claim fields as in _update_claim
+        if new_status == RequestStatus.IN_PROGRESS:
+            values.update(
+                assigned_to_id=user.id,
+                claimed_at=now,
+                claim_expires_at=now + timedelta(minutes=settings.WORK_QUEUE_CLAIM_MINUTES)
+            )
+        elif new_status == RequestStatus.PENDING:
+            values.update(assigned_to_id=None, claimed_at=None, claim_expires_at=None)
+        else:
+            values.update(claim_expires_at=None)
+
+        db.execute(
+            update(MaintenanceRequest).where(
+                MaintenanceRequest.id.in_([row.id for row in changing])
+            ).values(**values).execution_options(synchronize_session=False)
+        )
+
+        kpi_changes = []
+        outcomes = []
+        events = defaultdict(list)
+        for row in changing:
+            before = KpiState(
+                naive_utc(row.created_at), naive_utc(row.completed_at), row.status,
+                row.priority or PriorityLevel.MEDIUM, row.equipment_id or 0, row.location_id or 0
+            )
+            completed_at = values.get("completed_at", before.completed_at)
+            kpi_changes.append((before, before._replace(status=new_status, completed_at=completed_at)))
+
+            outcomes.append(SimpleNamespace(
+                id=row.id, schedule_id=row.schedule_id, scheduled_due_at=row.scheduled_due_at,
+                status=new_status, completed_at=completed_at
+            ))
+
+            assignee = values.get("assigned_to_id", row.assigned_to_id)
+            events[(row.status, row.assigned_to_id, assignee)].append((row.id, row.submitter_id))
+
+        MaintenanceKpiService.apply_changes(db, kpi_changes)
+        MaintenanceScheduleService.record_outcomes(db, outcomes)
+        for (from_status, previous_assignee, assignee), changed in events.items():
+            changes = {"status": [from_status.value, new_status.value]}
+            if assignee != previous_assignee:
+                changes["assigned_to_id"] = [previous_assignee, assignee]
+            MaintenanceRequestEventService.record_bulk(
+                db, changed, RequestEventType.STATUS_CHANGED, now,
+                to_status=new_status, changes=changes, actor=user, from_status=from_status
+            )
+
+        db.commit()
+
+        return [results[request_id] for request_id in request_ids]
+
+    @staticmethod
+    def delete_request(db: Session, request_id: int, user: Optional[User] = None) -> bool:
         """
         Delete a maintenance request
 
         Args:
             db: Database session
             request_id: Request ID to delete
+            user: User performing the deletion
 
         Returns:
             True if deleted, False if not found
 
         Note:
-            This also deletes associated attachments
+            Attachment files are not removed here; the deletion event lists
+            them and the upload garbage collector (UploadStorageService)
+            reclaims them once the grace period has passed
         """
         db_request = MaintenanceRequestService.get_request(db, request_id)
 
         if not db_request:
             return False
 
-        # Delete associated files
-        if db_request.attachments:
-            from app.utils.file_upload import delete_multiple_files
-            try:
-                attachments = json.loads(db_request.attachments)
-                delete_multiple_files(attachments)
-            except json.JSONDecodeError:
-                pass
+        changes = {"title": db_request.title}
+        attachments = safe_json_list(db_request.attachments)
+        if attachments:
+            changes["attachments"] = attachments
 
+        MaintenanceKpiService.apply_change(db, MaintenanceKpiService.snapshot(db, db_request), None)
+        MaintenanceRequestEventService.record(
+            db, db_request, RequestEventType.DELETED, user, changes, from_status=db_request.status
+        )
         db.delete(db_request)
         db.commit()
 
@@ -269,7 +790,8 @@ class MaintenanceRequestService:
     def add_attachments(
         db: Session,
         request_id: int,
-        new_filenames: List[str]
+        new_filenames: List[str],
+        user: Optional[User] = None
     ) -> MaintenanceRequest:
         """
         Add attachments to a request
@@ -278,6 +800,7 @@ class MaintenanceRequestService:
             db: Database session
             request_id: Request ID
             new_filenames: List of new filenames to add
+            user: User adding the attachments
 
         Returns:
             Updated maintenance request
@@ -290,6 +813,25 @@ class MaintenanceRequestService:
                 detail="Maintenance request not found"
             )
 
+        MaintenanceRequestService.append_attachments(db_request, new_filenames)
+        MaintenanceRequestEventService.record(
+            db, db_request, RequestEventType.ATTACHMENTS_ADDED, user, {"filenames": new_filenames}
+        )
+
+        db.commit()
+        db.refresh(db_request)
+
+        return db_request
+
+    @staticmethod
+    def append_attachments(db_request: MaintenanceRequest, new_filenames: List[str]) -> None:
+        """
+        Append filenames to a request's attachment list without committing
+
+        Args:
+            db_request: Request to update
+            new_filenames: List of new filenames to add
+        """
         # Get existing attachments
         existing_attachments = json.loads(db_request.attachments) if db_request.attachments else []
 
@@ -299,11 +841,6 @@ class MaintenanceRequestService:
         # Update
         db_request.attachments = json.dumps(existing_attachments)
 
-        db.commit()
-        db.refresh(db_request)
-
-        return db_request
-
     @staticmethod
     def can_view_request(user: User, request: MaintenanceRequest) -> bool:
         """
@@ -374,11 +911,17 @@ class MaintenanceRequestService:
             MaintenanceRequest.priority == "urgent",
             MaintenanceRequest.status != RequestStatus.COMPLETED
         ).count()
+        overdue = db.query(MaintenanceRequest).filter(SlaService.overdue_filter()).count()
+
+        # Archived requests are closed; their counts are kept as counters by the mover
+        archived = MaintenanceArchiveService.archived_counts(db)
 
         return {
-            "total": total,
+            "total": total + sum(archived.values()),
             "pending": pending,
             "in_progress": in_progress,
-            "completed": completed,
-            "urgent": urgent
+            "completed": completed + archived[RequestStatus.COMPLETED.value],
+            "urgent": urgent,
+            "overdue": overdue,
+            "archived": sum(archived.values())
         }
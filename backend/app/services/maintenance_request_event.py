@@ -0,0 +1,347 @@
+"""
+Maintenance Request Event Service
+Append-only event log of maintenance request changes
+"""
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import and_, event as sa_event, func, insert, text, tuple_
+from sqlalchemy.orm import Session, aliased
+from datetime import date, datetime
+import enum
+import json
+import logging
+
+from app.core.event_bus import maintenance_event_bus
+from app.models.maintenance_request import MaintenanceRequest, RequestStatus
+from app.models.maintenance_request_archive import ArchivedMaintenanceRequest
+from app.models.maintenance_request_event import MaintenanceRequestEvent, RequestEventType
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Session.info keys: events added but not yet flushed, and flushed events awaiting commit
+_UNFLUSHED_KEY = "unflushed_request_events"
+_UNPUBLISHED_KEY = "unpublished_request_events"
+
+
+def _jsonable(value: Any) -> Any:
+    """Convert a column value for the changes document"""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class MaintenanceRequestEventService:
+    """Service for the maintenance request event log"""
+
+    @staticmethod
+    def record(
+        db: Session,
+        request: MaintenanceRequest,
+        event_type: RequestEventType,
+        actor: Optional[User] = None,
+        changes: Optional[Dict[str, Any]] = None,
+        from_status: Optional[RequestStatus] = None,
+        to_status: Optional[RequestStatus] = None
+    ) -> MaintenanceRequestEvent:
+        """
+        Append an event for a request
+
+        Does not commit, so the event is written in the caller's transaction
+        together with the change it describes; live streams receive it once
+        that transaction commits.
+
+        Args:
+            db: Database session
+            request: Changed request (must have an id)
+            event_type: Kind of change
+            actor: User who made the change (None for system changes)
+            changes: {field: [old, new]} or event details
+            from_status: Status before a status change
+            to_status: Status after the change
+
+        Returns:
+            Event
+        """
+        event = MaintenanceRequestEvent(
+            request_id=request.id,
+            event_type=event_type.value,
+            actor_id=actor.id if actor else None,
+            from_status=from_status,
+            to_status=to_status,
+            changes=json.dumps(changes) if changes else None,
+            at=datetime.utcnow()
+        )
+        db.add(event)
+        db.info.setdefault(_UNFLUSHED_KEY, []).append((event, request.submitter_id, actor.full_name if actor else None))
+        return event
+
+    @staticmethod
+    def record_bulk(
+        db: Session,
+        requests: List[tuple],
+        event_type: RequestEventType,
+        at: Optional[datetime] = None,
+        to_status: Optional[RequestStatus] = None,
+        changes: Optional[Dict[str, Any]] = None,
+        actor: Optional[User] = None,
+        from_status: Optional[RequestStatus] = None
+    ) -> None:
+        """
+        Append one event per request for changes made in bulk
+
+        Args:
+            db: Database session
+            requests: (request id, submitter id) of the changed requests
+            event_type: Kind of change
+            at: Event time (defaults to now)
+            to_status: Status after the change
+            changes: Event details, the same for every request
+            actor: User who made the change (None for system changes)
+            from_status: Status before the change, the same for every request
+        """
+        if not requests:
+            return
+        at = at or datetime.utcnow()
+        submitters = dict(requests)
+        events = db.execute(insert(MaintenanceRequestEvent).returning(MaintenanceRequestEvent), [{
+            "request_id": request_id,
+            "event_type": event_type.value,
+            "actor_id": actor.id if actor else None,
+            "from_status": from_status,
+            "to_status": to_status,
+            "changes": json.dumps(changes) if changes else None,
+            "at": at
+        } for request_id in submitters]).scalars().all()
+        actor_name = actor.full_name if actor else None
+        db.info.setdefault(_UNPUBLISHED_KEY, []).extend(
+            _stream_payload(event, submitters[event.request_id], actor_name) for event in events
+        )
+
+    @staticmethod
+    def diff(request: MaintenanceRequest, update_dict: Dict[str, Any]) -> Dict[str, list]:
+        """
+        Changes an update would make, before it is applied
+
+        Args:
+            request: Request before the update
+            update_dict: Field values about to be set
+
+        Returns:
+            {field: [old, new]} for fields whose value changes
+        """
+        changes = {}
+        for field, value in update_dict.items():
+            old = getattr(request, field, None)
+            if old != value:
+                changes[field] = [_jsonable(old), _jsonable(value)]
+        return changes
+
+    @staticmethod
+    def serialize(event: MaintenanceRequestEvent, actor_name: Optional[str] = None) -> dict:
+        """Map an event to its response fields"""
+        try:
+            changes = json.loads(event.changes) if event.changes else None
+        except (json.JSONDecodeError, TypeError, ValueError):
+            changes = None
+        return {
+            "id": event.id,
+            "request_id": event.request_id,
+            "event_type": event.event_type,
+            "actor_id": event.actor_id,
+            "actor_name": actor_name,
+            "from_status": event.from_status,
+            "to_status": event.to_status,
+            "changes": changes,
+            "at": event.at
+        }
+
+    @staticmethod
+    def get_timeline(db: Session, request_id: int) -> List[tuple]:
+        """
+        Get the events of one request, oldest first
+
+        Args:
+            db: Database session
+            request_id: Request ID
+
+        Returns:
+            (event, actor name) pairs
+        """
+        return db.query(MaintenanceRequestEvent, User.full_name).outerjoin(
+            User, MaintenanceRequestEvent.actor_id == User.id
+        ).filter(
+            MaintenanceRequestEvent.request_id == request_id
+        ).order_by(MaintenanceRequestEvent.at, MaintenanceRequestEvent.id).all()
+
+    @staticmethod
+    def time_in_status(events: List[MaintenanceRequestEvent], now: Optional[datetime] = None) -> Dict[str, float]:
+        """
+        Seconds a request spent in each status, from its events
+
+        The current status counts up to now, unless the request was deleted.
+
+        Args:
+            events: Events of one request, oldest first
+            now: End of the current status (defaults to now)
+
+        Returns:
+            {status: seconds}
+        """
+        totals = defaultdict(float)
+        current, since, end = None, None, None
+        for event in events:
+            if event.event_type == RequestEventType.DELETED.value:
+                end = event.at
+                break
+            if event.to_status is not None and event.to_status != current:
+                if current is not None:
+                    totals[current.value] += (event.at - since).total_seconds()
+                current, since = event.to_status, event.at
+
+        if current is not None:
+            end = end or now or datetime.utcnow()
+            totals[current.value] += max(0.0, (end - since).total_seconds())
+
+        return dict(totals)
+
+    @staticmethod
+    def read_since(db: Session, cursor: Optional[str] = None, limit: int = 500) -> Tuple[List[MaintenanceRequestEvent], str]:
+        """
+        Read events after a high-water mark
+
+        Event ids are assigned when a transaction inserts them, not when it
+        commits, so a slow transaction can commit an id below one already
+        read. On Postgres events are therefore paged in (txid, id) order and
+        only events of transactions older than the oldest one still running
+        are returned: every event that becomes visible later belongs to a
+        transaction at or past that horizon, so it sorts after the cursor and
+        a consumer that stores the cursor never skips one. A long-running
+        transaction delays the feed until it ends. Other databases serialize
+        writers, so there ids follow commit order.
+
+        Args:
+            db: Database session
+            cursor: next_cursor of the previous page (None: from the start)
+            limit: Maximum number of events
+
+        Returns:
+            Events in commit order and the cursor to continue from
+        """
+        after_txid, after_id = MaintenanceRequestEventService._parse_cursor(cursor)
+        query = db.query(MaintenanceRequestEvent)
+
+        if db.get_bind().dialect.name == "postgresql":
+            horizon = db.execute(text("SELECT txid_snapshot_xmin(txid_current_snapshot())")).scalar()
+            query = query.filter(
+                tuple_(MaintenanceRequestEvent.txid, MaintenanceRequestEvent.id) > (after_txid, after_id),
+                MaintenanceRequestEvent.txid < horizon
+            ).order_by(MaintenanceRequestEvent.txid, MaintenanceRequestEvent.id)
+        else:
+            query = query.filter(MaintenanceRequestEvent.id > after_id).order_by(MaintenanceRequestEvent.id)
+
+        events = query.limit(limit).all()
+        if events:
+            after_txid, after_id = events[-1].txid or 0, events[-1].id
+        return events, f"{after_txid}.{after_id}"
+
+    @staticmethod
+    def _parse_cursor(cursor: Optional[str]) -> Tuple[int, int]:
+        """Split a feed cursor into (txid, id)"""
+        if not cursor:
+            return 0, 0
+        try:
+            txid, event_id = (int(part) for part in cursor.split("."))
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        return txid, event_id
+
+    @staticmethod
+    def replay(db: Session, after_id: int, submitter_id: Optional[int], limit: int) -> List[dict]:
+        """
+        Stream payloads of committed events after an id, for reconnecting streams
+
+        Unlike read_since this pages by id and holds nothing back: a live
+        stream dedupes what it already received by id.
+
+        Args:
+            db: Database session
+            after_id: Last event id the stream received
+            submitter_id: Only events of this user's requests (None for all)
+            limit: Maximum number of events
+
+        Returns:
+            Payloads in id order
+        """
+        # The owner of an archived request is in the archive; a deleted
+        # request has neither row left, but its creator is in the log
+        created = aliased(MaintenanceRequestEvent)
+        owner_id = func.coalesce(
+            MaintenanceRequest.submitter_id, ArchivedMaintenanceRequest.submitter_id, created.actor_id
+        )
+        query = db.query(MaintenanceRequestEvent, owner_id, User.full_name).outerjoin(
+            MaintenanceRequest, MaintenanceRequestEvent.request_id == MaintenanceRequest.id
+        ).outerjoin(
+            ArchivedMaintenanceRequest, MaintenanceRequestEvent.request_id == ArchivedMaintenanceRequest.id
+        ).outerjoin(
+            created, and_(
+                created.request_id == MaintenanceRequestEvent.request_id,
+                created.event_type == RequestEventType.CREATED
+            )
+        ).outerjoin(
+            User, MaintenanceRequestEvent.actor_id == User.id
+        ).filter(MaintenanceRequestEvent.id > after_id)
+        if submitter_id is not None:
+            query = query.filter(owner_id == submitter_id)
+
+        rows = query.order_by(MaintenanceRequestEvent.id).limit(limit).all()
+        return [_stream_payload(event, owner_id, actor_name) for event, owner_id, actor_name in rows]
+
+    @staticmethod
+    def latest_id(db: Session) -> int:
+        """Id of the newest event (0 if there is none)"""
+        return db.query(func.max(MaintenanceRequestEvent.id)).scalar() or 0
+
+
+def _stream_payload(event: MaintenanceRequestEvent, submitter_id: Optional[int], actor_name: Optional[str] = None) -> dict:
+    """Event as sent to live streams, with the owner used for visibility"""
+    payload = MaintenanceRequestEventService.serialize(event, actor_name)
+    payload["submitter_id"] = submitter_id
+    return payload
+
+
+@sa_event.listens_for(Session, "after_flush_postexec")
+def _collect_flushed_events(session: Session, flush_context) -> None:
+    """Serialize recorded events once the flush has assigned their ids"""
+    pending = session.info.get(_UNFLUSHED_KEY)
+    if not pending:
+        return
+    flushed = [entry for entry in pending if entry[0].id is not None]
+    session.info[_UNFLUSHED_KEY] = [entry for entry in pending if entry[0].id is None]
+    session.info.setdefault(_UNPUBLISHED_KEY, []).extend(
+        _stream_payload(event, submitter_id, actor_name) for event, submitter_id, actor_name in flushed
+    )
+
+
+@sa_event.listens_for(Session, "after_commit")
+def _publish_committed_events(session: Session) -> None:
+    """Publish the events of a committed transaction to live streams"""
+    payloads = session.info.pop(_UNPUBLISHED_KEY, None)
+    if payloads:
+        try:
+            maintenance_event_bus.publish(payloads)
+        except Exception as e:
+            logger.error(f"Publishing request events failed: {e}", exc_info=True)
+
+
+@sa_event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_events(session: Session) -> None:
+    """Forget events of a rolled back transaction"""
+    session.info.pop(_UNFLUSHED_KEY, None)
+    session.info.pop(_UNPUBLISHED_KEY, None)
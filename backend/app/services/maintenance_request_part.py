@@ -0,0 +1,173 @@
+"""
+Maintenance Request Part Service
+Structured parts lists and the outstanding demand they add up to
+"""
+from typing import List, Optional
+from sqlalchemy import case, distinct, func
+from sqlalchemy.orm import Session
+from datetime import datetime
+
+from app.models.maintenance_request import MaintenanceRequest
+from app.models.maintenance_request_event import RequestEventType
+from app.models.maintenance_request_part import DEMAND_STATUSES, MaintenanceRequestPart, PartStatus
+from app.models.user import User
+from app.schemas.maintenance_request_part import MaintenanceRequestPartBase
+from app.services.maintenance_request_event import MaintenanceRequestEventService
+from app.services.sla import OPEN_STATUSES
+from app.utils.parts_parser import ParsedPart, format_part_list, parse_part_list, part_key
+
+
+def _line_summary(part: MaintenanceRequestPart) -> str:
+    """Compact description of a line for the event log"""
+    return f"{part.quantity}x {part.part_number} ({part.status.value})"
+
+
+class MaintenanceRequestPartService:
+    """Service for maintenance request parts"""
+
+    @staticmethod
+    def sync_from_text(db: Session, request: MaintenanceRequest) -> None:
+        """
+        Re-parse a request's part_order_list into its part lines
+
+        A part that was already listed keeps its status, and its vendor
+        unless the text names one, so editing the text does not reset
+        parts that were ordered. Does not commit.
+
+        Args:
+            db: Database session
+            request: Request whose part_order_list was set
+        """
+        previous = {}
+        for line in request.parts:
+            previous.setdefault(line.part_key, []).append(line)
+
+        lines = []
+        for part in parse_part_list(request.part_order_list):
+            matches = previous.get(part_key(part.part_number))
+            match = matches.pop(0) if matches else None
+            lines.append({
+                "part_number": part.part_number,
+                "description": part.description,
+                "quantity": part.quantity,
+                "vendor": part.vendor or (match.vendor if match else None),
+                "status": match.status if match else PartStatus.NEEDED
+            })
+        MaintenanceRequestPartService._set_lines(request, lines)
+
+    @staticmethod
+    def replace_parts(
+        db: Session,
+        request: MaintenanceRequest,
+        parts: List[MaintenanceRequestPartBase],
+        user: Optional[User]
+    ) -> MaintenanceRequest:
+        """
+        Replace a request's parts list with structured lines
+
+        part_order_list is rewritten from the lines so both stay in step.
+
+        Args:
+            db: Database session
+            request: Request to update
+            parts: New lines in order
+            user: User making the change
+
+        Returns:
+            Updated request
+        """
+        before = [_line_summary(line) for line in request.parts]
+        previous_text = request.part_order_list
+
+        MaintenanceRequestPartService._set_lines(request, [part.model_dump() for part in parts])
+        request.part_order_list = format_part_list([
+            ParsedPart(part.part_number, part.quantity, part.vendor, part.description) for part in parts
+        ]) or None
+
+        after = [_line_summary(line) for line in request.parts]
+        changes = {}
+        if previous_text != request.part_order_list:
+            changes["part_order_list"] = [previous_text, request.part_order_list]
+        if before != after:
+            changes["parts"] = [before, after]
+        if changes:
+            MaintenanceRequestEventService.record(db, request, RequestEventType.UPDATED, user, changes)
+
+        db.commit()
+        db.refresh(request)
+        return request
+
+    @staticmethod
+    def _set_lines(request: MaintenanceRequest, lines: List[dict]) -> None:
+        """Write lines onto the request's part rows, reusing rows in place (does not commit)"""
+        rows = list(request.parts)
+        now = datetime.utcnow()
+        for line_no, values in enumerate(lines, start=1):
+            values = dict(values, part_key=part_key(values["part_number"]), line_no=line_no)
+            if line_no <= len(rows):
+                row = rows[line_no - 1]
+                if any(getattr(row, field) != value for field, value in values.items()):
+                    for field, value in values.items():
+                        setattr(row, field, value)
+                    row.updated_at = now
+            else:
+                request.parts.append(MaintenanceRequestPart(updated_at=now, **values))
+
+        # Lines beyond the new list are removed (delete-orphan)
+        del request.parts[len(lines):]
+
+    @staticmethod
+    def get_demand(
+        db: Session,
+        search: Optional[str] = None,
+        part_status: Optional[PartStatus] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> tuple[List[dict], int]:
+        """
+        Outstanding demand per part across open requests
+
+        Counts lines still needed or on order of pending and in-progress
+        requests, grouped by normalized part number, largest demand first.
+        Reads ix_maintenance_request_parts_demand.
+
+        Args:
+            db: Database session
+            search: Part number prefix
+            part_status: Only lines in this status (needed or ordered)
+            skip: Number of parts to skip
+            limit: Maximum number of parts
+
+        Returns:
+            Tuple of (demand rows, total number of parts)
+        """
+        statuses = [part_status] if part_status in DEMAND_STATUSES else list(DEMAND_STATUSES)
+        quantity = func.sum(MaintenanceRequestPart.quantity)
+
+        query = db.query(
+            MaintenanceRequestPart.part_key,
+            func.min(MaintenanceRequestPart.part_number).label("part_number"),
+            func.sum(case(
+                (MaintenanceRequestPart.status == PartStatus.NEEDED, MaintenanceRequestPart.quantity), else_=0
+            )).label("needed_quantity"),
+            func.sum(case(
+                (MaintenanceRequestPart.status == PartStatus.ORDERED, MaintenanceRequestPart.quantity), else_=0
+            )).label("ordered_quantity"),
+            func.count(distinct(MaintenanceRequestPart.request_id)).label("request_count"),
+            func.min(MaintenanceRequest.created_at).label("oldest_request_at")
+        ).join(
+            MaintenanceRequest, MaintenanceRequest.id == MaintenanceRequestPart.request_id
+        ).filter(
+            MaintenanceRequestPart.status.in_(statuses),
+            MaintenanceRequest.status.in_(OPEN_STATUSES)
+        )
+
+        key_prefix = part_key(search)
+        if key_prefix:
+            query = query.filter(MaintenanceRequestPart.part_key.startswith(key_prefix, autoescape=True))
+
+        query = query.group_by(MaintenanceRequestPart.part_key)
+        total = query.order_by(None).count()
+        rows = query.order_by(quantity.desc(), MaintenanceRequestPart.part_key).offset(skip).limit(limit).all()
+
+        return [row._asdict() for row in rows], total
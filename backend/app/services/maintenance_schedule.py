@@ -0,0 +1,256 @@
+"""
+Maintenance Schedule Service
+Preventive maintenance scheduling from maintenance cycles
+"""
+from typing import List, Optional, Tuple
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+import logging
+
+from app.core.config import settings
+from app.models.equipment import Equipment
+from app.models.maintenance_request import MaintenanceRequest, PriorityLevel, RequestStatus, WarrantyStatus
+from app.models.maintenance_schedule import MaintenanceSchedule
+from app.schemas.maintenance_request import MaintenanceRequestCreate
+from app.utils.dates import naive_utc
+
+logger = logging.getLogger(__name__)
+
+
+class MaintenanceScheduleService:
+    """Service for preventive maintenance schedules"""
+
+    @staticmethod
+    def sync_from_request(db: Session, request: MaintenanceRequest) -> Optional[MaintenanceSchedule]:
+        """
+        Create or update the schedule of a request's equipment
+
+        A request for registered equipment with a maintenance cycle defines
+        that equipment's schedule, whatever name the equipment goes by. The next due date is recomputed from the latest
+        known maintenance unless a generated PM request is still open.
+        Does not commit.
+
+        Args:
+            db: Database session
+            request: Maintenance request that was created or updated
+
+        Returns:
+            The schedule, or None if the request does not define one
+        """
+        if request.schedule_id is not None or request.equipment_id is None or not request.maintenance_cycle_days:
+            return None
+
+        last_maintenance = naive_utc(request.last_maintenance_date)
+        schedule = db.query(MaintenanceSchedule).filter(
+            MaintenanceSchedule.equipment_id == request.equipment_id
+        ).first()
+
+        if not schedule:
+            schedule = MaintenanceSchedule(
+                equipment_id=request.equipment_id,
+                owner_id=request.submitter_id
+            )
+            db.add(schedule)
+        elif schedule.last_maintenance_date and (not last_maintenance or last_maintenance < schedule.last_maintenance_date):
+            last_maintenance = schedule.last_maintenance_date
+
+        # The registry's name, not the spelling an older request was filed under
+        schedule.equipment_name = db.query(Equipment.name).filter(Equipment.id == request.equipment_id).scalar()
+        schedule.location = request.location or schedule.location
+        schedule.cycle_days = request.maintenance_cycle_days
+        schedule.last_maintenance_date = last_maintenance
+        schedule.is_active = True
+        schedule.updated_at = datetime.utcnow()
+        if schedule.open_request_id is None:
+            base = last_maintenance or naive_utc(request.created_at) or datetime.utcnow()
+            schedule.next_due_at = base + timedelta(days=schedule.cycle_days)
+
+        return schedule
+
+    @staticmethod
+    def record_outcome(db: Session, request: MaintenanceRequest) -> None:
+        """
+        Advance a schedule when its generated PM request is closed
+
+        A completed PM restarts the cycle from its completion time; a
+        cancelled one skips to the following cycle. Does not commit.
+
+        Args:
+            db: Database session
+            request: Generated PM request that was completed or cancelled
+        """
+        if request.schedule_id is None or request.status not in (RequestStatus.COMPLETED, RequestStatus.CANCELLED):
+            return
+
+        schedule = db.query(MaintenanceSchedule).filter(MaintenanceSchedule.id == request.schedule_id).first()
+        if schedule:
+            MaintenanceScheduleService._advance(schedule, request)
+
+    @staticmethod
+    def record_outcomes(db: Session, requests: list) -> None:
+        """
+        Advance the schedules of many closed PM requests (for bulk status changes)
+
+        Like record_outcome, with the schedules loaded in one query. Does not commit.
+
+        Args:
+            db: Database session
+            requests: Requests or rows with id, schedule_id, status, completed_at and scheduled_due_at
+        """
+        requests = [
+            request for request in requests
+            if request.schedule_id is not None and request.status in (RequestStatus.COMPLETED, RequestStatus.CANCELLED)
+        ]
+        if not requests:
+            return
+
+        schedules = {schedule.id: schedule for schedule in db.query(MaintenanceSchedule).filter(
+            MaintenanceSchedule.id.in_({request.schedule_id for request in requests})
+        )}
+        for request in requests:
+            schedule = schedules.get(request.schedule_id)
+            if schedule:
+                MaintenanceScheduleService._advance(schedule, request)
+
+    @staticmethod
+    def _advance(schedule: MaintenanceSchedule, request) -> None:
+        """Move a schedule past its closed PM request"""
+        if request.status == RequestStatus.COMPLETED:
+            schedule.last_maintenance_date = naive_utc(request.completed_at) or datetime.utcnow()
+            schedule.next_due_at = schedule.last_maintenance_date + timedelta(days=schedule.cycle_days)
+        elif request.scheduled_due_at and schedule.next_due_at <= request.scheduled_due_at:
+            schedule.next_due_at = request.scheduled_due_at + timedelta(days=schedule.cycle_days)
+
+        if schedule.open_request_id == request.id:
+            schedule.open_request_id = None
+        schedule.updated_at = datetime.utcnow()
+
+    @staticmethod
+    def generate_due_requests(
+        db: Session,
+        lookahead_days: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        max_batches: Optional[int] = None
+    ) -> dict:
+        """
+        Generate PM requests for schedules due within the lookahead window
+
+        Each batch reads only the due slice through the partial index on
+        next_due_at and creates one request per schedule and due date through
+        MaintenanceRequestService, so generated requests get the same
+        equipment, SLA, KPI and event handling as submitted ones. Linking the
+        requests back takes the schedules out of the slice; a request already
+        generated for a due date (unique schedule_id/scheduled_due_at) is
+        linked instead of created again. Every batch is committed on its own.
+
+        Args:
+            db: Database session
+            lookahead_days: Generate requests due up to this many days ahead (defaults to settings)
+            batch_size: Schedules per batch (defaults to settings)
+            max_batches: Batches per run (defaults to settings)
+
+        Returns:
+            Summary of the run
+        """
+        # Imported here: the request service imports this module
+        from app.services.maintenance_request import MaintenanceRequestService
+
+        lookahead_days = settings.PM_LOOKAHEAD_DAYS if lookahead_days is None else lookahead_days
+        batch_size = batch_size or settings.PM_BATCH_SIZE
+        max_batches = max_batches or settings.PM_MAX_BATCHES_PER_RUN
+
+        now = datetime.utcnow()
+        horizon = now + timedelta(days=lookahead_days)
+
+        generated = 0
+        batches = 0
+        while batches < max_batches:
+            due = db.query(MaintenanceSchedule).filter(
+                MaintenanceSchedule.is_active == True,
+                MaintenanceSchedule.open_request_id.is_(None),
+                MaintenanceSchedule.next_due_at <= horizon
+            ).order_by(MaintenanceSchedule.next_due_at).limit(batch_size).all()
+
+            if not due:
+                break
+
+            existing = {
+                (schedule_id, scheduled_due_at): request_id
+                for schedule_id, scheduled_due_at, request_id in db.query(
+                    MaintenanceRequest.schedule_id, MaintenanceRequest.scheduled_due_at, MaintenanceRequest.id
+                ).filter(
+                    tuple_(MaintenanceRequest.schedule_id, MaintenanceRequest.scheduled_due_at).in_(
+                        [(schedule.id, schedule.next_due_at) for schedule in due]
+                    )
+                )
+            }
+
+            for schedule in due:
+                request_id = existing.get((schedule.id, schedule.next_due_at))
+                if request_id is None:
+                    request_data = MaintenanceRequestCreate(
+                        title=f"Preventive maintenance: {schedule.equipment_name}"[:255],
+                        description=(
+                            f"Scheduled preventive maintenance (every {schedule.cycle_days} days) "
+                            f"due {schedule.next_due_at:%Y-%m-%d}."
+                        ),
+                        priority=PriorityLevel.MEDIUM,
+                        equipment_id=schedule.equipment_id,
+                        equipment_name=schedule.equipment_name,
+                        location=schedule.location,
+                        requested_completion_date=schedule.next_due_at,
+                        last_maintenance_date=schedule.last_maintenance_date,
+                        maintenance_cycle_days=schedule.cycle_days,
+                        warranty_status=WarrantyStatus.NOT_APPLICABLE
+                    )
+                    request_id = MaintenanceRequestService.add_request(
+                        db, request_data, schedule.owner_id, None,
+                        schedule_id=schedule.id, scheduled_due_at=schedule.next_due_at
+                    ).id
+                    generated += 1
+                schedule.open_request_id = request_id
+                schedule.updated_at = now
+
+            db.commit()
+            batches += 1
+
+            if len(due) < batch_size:
+                break
+
+        if generated:
+            logger.info(f"Generated {generated} preventive maintenance requests")
+
+        return {"generated": generated, "batches": batches, "horizon": horizon.isoformat()}
+
+    @staticmethod
+    def rename_equipment(db: Session, equipment_id: int, name: str) -> None:
+        """Carry an equipment rename over to its schedule (does not commit)"""
+        db.query(MaintenanceSchedule).filter(
+            MaintenanceSchedule.equipment_id == equipment_id
+        ).update({"equipment_name": name, "updated_at": datetime.utcnow()}, synchronize_session=False)
+
+    @staticmethod
+    def get_due(db: Session, start: Optional[datetime], end: datetime, limit: int = 1000) -> Tuple[List[MaintenanceSchedule], int]:
+        """
+        Get active schedules due in a window
+
+        Args:
+            db: Database session
+            start: Earliest due date (None includes everything overdue)
+            end: Latest due date (exclusive)
+            limit: Maximum number of schedules
+
+        Returns:
+            Schedules ordered by due date, and the number due in the window
+        """
+        query = db.query(MaintenanceSchedule).filter(
+            MaintenanceSchedule.is_active == True,
+            MaintenanceSchedule.next_due_at < end
+        )
+        if start is not None:
+            query = query.filter(MaintenanceSchedule.next_due_at >= start)
+
+        total = query.count()
+        schedules = query.order_by(MaintenanceSchedule.next_due_at, MaintenanceSchedule.id).limit(limit).all()
+        return schedules, total
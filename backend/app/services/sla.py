@@ -0,0 +1,199 @@
+"""
+SLA Service
+Response and resolution targets per priority, breach detection and escalation
+"""
+from typing import Optional, Tuple
+from sqlalchemy import and_, or_, update
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+import logging
+
+from app.core.config import settings
+from app.models.maintenance_request import MaintenanceRequest, PriorityLevel, RequestStatus
+from app.models.maintenance_request_event import RequestEventType
+from app.models.role import Role
+from app.models.user import User
+from app.services.email import email_service
+from app.services.maintenance_request_event import MaintenanceRequestEventService
+from app.utils.dates import naive_utc
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = (RequestStatus.PENDING, RequestStatus.IN_PROGRESS)
+
+
+class SlaService:
+    """Service for maintenance SLAs"""
+
+    @staticmethod
+    def due_dates(
+        priority: Optional[PriorityLevel],
+        created_at: Optional[datetime],
+        requested_completion_date: Optional[datetime] = None
+    ) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """
+        Response and resolution due times of a request
+
+        Args:
+            priority: Request priority
+            created_at: Creation time
+            requested_completion_date: Completion date the submitter asked for
+
+        Returns:
+            (response due, resolution due); None where the priority has no target
+        """
+        created_at = naive_utc(created_at) or datetime.utcnow()
+        key = (priority or PriorityLevel.MEDIUM).value
+
+        response_hours = settings.sla_response_hours.get(key)
+        resolution_hours = settings.sla_resolution_hours.get(key)
+        response_due = created_at + timedelta(hours=response_hours) if response_hours is not None else None
+        resolution_due = created_at + timedelta(hours=resolution_hours) if resolution_hours is not None else None
+
+        requested = naive_utc(requested_completion_date)
+        if requested and (resolution_due is None or requested < resolution_due):
+            resolution_due = max(requested, created_at)
+
+        return response_due, resolution_due
+
+    @staticmethod
+    def apply_targets(request: MaintenanceRequest) -> None:
+        """
+        Set a request's due times from its priority and requested date
+
+        A breach that the new targets no longer cover is cleared, so the
+        evaluator judges the request again. Does not commit.
+
+        Args:
+            request: Request (created_at may still be unset)
+        """
+        request.response_due_at, request.resolution_due_at = SlaService.due_dates(
+            request.priority, request.created_at, request.requested_completion_date
+        )
+
+        if request.sla_breached_at is not None:
+            now = datetime.utcnow()
+            due = request.response_due_at if request.sla_breach == "response" else request.resolution_due_at
+            if due is None or due > now:
+                request.sla_breached_at = None
+                request.sla_breach = None
+                request.sla_notified_at = None
+
+    @staticmethod
+    def evaluate(db: Session) -> dict:
+        """
+        Mark newly breached open requests and send the escalation digest (background job)
+
+        Two set-based UPDATEs, each reading only its partial index: pending
+        requests past their response time, then open requests past their
+        resolution time. A resolution breach supersedes a response breach
+        (and is escalated again), since once work has started only the
+        resolution target still applies. sla_breached_at records when the
+        target was missed, not when it was noticed. Each breach is logged
+        as an event.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Summary of the run
+        """
+        now = datetime.utcnow()
+        table = MaintenanceRequest.__table__
+        breached = 0
+
+        for kind, due_column, statuses, supersedes in (
+            ("response", table.c.response_due_at, (RequestStatus.PENDING,), table.c.sla_breached_at.is_(None)),
+            ("resolution", table.c.resolution_due_at, OPEN_STATUSES, or_(
+                table.c.sla_breached_at.is_(None), table.c.sla_breach == "response"
+            )),
+        ):
+            rows = db.execute(
+                update(table)
+                .where(
+                    table.c.status.in_(statuses),
+                    supersedes,
+                    due_column <= now
+                )
+                .values(sla_breached_at=due_column, sla_breach=kind, sla_notified_at=None)
+                .returning(table.c.id, table.c.submitter_id)
+            ).all()
+            MaintenanceRequestEventService.record_bulk(
+                db, rows, RequestEventType.SLA_BREACHED, now, changes={"sla_breach": kind}
+            )
+            breached += len(rows)
+        db.commit()
+
+        if breached:
+            logger.info(f"{breached} maintenance requests breached their SLA")
+
+        return {"breached": breached, "notified": SlaService.send_digest(db)}
+
+    @staticmethod
+    def send_digest(db: Session) -> int:
+        """
+        Email one digest of breaches not escalated yet to maintenance staff
+
+        Breaches are marked notified only after the digest went out, so a
+        failed send is retried on the next run. Requests closed in the
+        meantime, or started after missing only their response time, are
+        skipped.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of breaches in the digest
+        """
+        breaches = db.query(MaintenanceRequest).filter(
+            SlaService.overdue_filter(),
+            MaintenanceRequest.sla_notified_at.is_(None)
+        ).order_by(MaintenanceRequest.sla_breached_at).limit(settings.SLA_DIGEST_MAX_ITEMS).all()
+        if not breaches:
+            return 0
+
+        recipients = [email for (email,) in db.query(User.email).filter(
+            User.is_active == True,
+            User.roles.any(Role.name.in_(["superuser", "maintenance"]))
+        ).all() if email]
+        if not recipients:
+            return 0
+
+        items = [{
+            "id": request.id,
+            "title": request.title,
+            "priority": request.priority.value,
+            "status": request.status.value,
+            "sla_breach": request.sla_breach,
+            "due_at": request.sla_breached_at.strftime("%Y-%m-%d %H:%M"),
+            "assigned_to_name": request.assigned_to_name,
+            "equipment_name": request.equipment_name
+        } for request in breaches]
+
+        if not email_service.send_sla_breach_digest(recipients, items):
+            logger.warning(f"SLA digest of {len(items)} breaches could not be sent, retrying next run")
+            db.rollback()
+            return 0
+
+        now = datetime.utcnow()
+        db.execute(
+            update(MaintenanceRequest)
+            .where(MaintenanceRequest.id.in_([request.id for request in breaches]))
+            .values(sla_notified_at=now)
+        )
+        db.commit()
+        return len(items)
+
+    @staticmethod
+    def overdue_filter():
+        """
+        Filter for open requests that missed a target that still applies (served by ix_maintenance_requests_sla_open)
+
+        The response target applies while a request is pending; once work
+        has started only a resolution breach makes it overdue.
+        """
+        return and_(
+            MaintenanceRequest.status.in_(OPEN_STATUSES),
+            MaintenanceRequest.sla_breached_at.isnot(None),
+            or_(MaintenanceRequest.status == RequestStatus.PENDING, MaintenanceRequest.sla_breach == "resolution")
+        )
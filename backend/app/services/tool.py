@@ -6,6 +6,7 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from app.models.tool import Tool
 from app.schemas.tool import ToolCreate, ToolUpdate
+from app.services.tool_catalog import tool_catalog
 
 class ToolService:
     """Tool management service"""
@@ -33,7 +34,9 @@ class ToolService:
         """Create new tool"""
         db_tool = Tool(**tool_data.dict())
         db.add(db_tool)
+        tool_catalog.bump_version(db)
         db.commit()
+        tool_catalog.invalidate()
         db.refresh(db_tool)
         return db_tool
     
@@ -48,7 +51,9 @@ class ToolService:
         for field, value in update_data.items():
             setattr(db_tool, field, value)
         
+        tool_catalog.bump_version(db)
         db.commit()
+        tool_catalog.invalidate()
         db.refresh(db_tool)
         return db_tool
     
@@ -60,5 +65,7 @@ class ToolService:
             return False
         
         db.delete(db_tool)
+        tool_catalog.bump_version(db)
         db.commit()
+        tool_catalog.invalidate()
         return True
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+Tool catalog
+In-memory, versioned snapshot of the tools table shared by all requests
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.tool import Tool
+from app.schemas.tool import Tool as ToolSchema
+from app.services.app_state import AppStateService
+
+# Key of the catalog version in app_state
+CATALOG_VERSION_KEY = "tool_catalog_version"
+
+class ToolCatalog:
+    """
+    Cached tool catalog
+
+    Tool changes bump a version counter in app_state in the same transaction,
+    so every worker notices within TOOL_CATALOG_CHECK_SECONDS and reloads;
+    between checks, lookups do not touch the database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._tools: Dict[int, ToolSchema] = {}
+        self._active: List[ToolSchema] = []
+
+    @staticmethod
+    def bump_version(db: Session) -> int:
+        """Mark the catalog as changed (caller commits with the tool change)"""
+        return AppStateService.increment_counter(db, CATALOG_VERSION_KEY)
+
+    def invalidate(self) -> None:
+        """Force a version check on the next lookup in this worker"""
+        with self._lock:
+            self._checked_at = 0.0
+
+    def refresh(self, db: Session) -> int:
+        """
+        Reload the catalog if its version changed
+
+        Args:
+            db: Database session
+
+        Returns:
+            Current catalog version
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._version is not None and now - self._checked_at < settings.TOOL_CATALOG_CHECK_SECONDS:
+                return self._version
+
+            version = AppStateService.get_value(db, CATALOG_VERSION_KEY, 0)
+            if version != self._version:
+                tools = [ToolSchema.model_validate(tool) for tool in db.query(Tool).order_by(Tool.id).all()]
+                self._tools = {tool.id: tool for tool in tools}
+                self._active = [tool for tool in tools if tool.is_active]
+                self._version = version
+
+            self._checked_at = now
+            return self._version
+
+    def active_tools(self, db: Session) -> List[ToolSchema]:
+        """Get all active tools"""
+        self.refresh(db)
+        return list(self._active)
+
+    def resolve(self, db: Session, tool_ids: List[int]) -> List[ToolSchema]:
+        """Get the active tools among the given IDs, in the given order"""
+        self.refresh(db)
+        tools = self._tools
+        return [tools[tool_id] for tool_id in tool_ids if tool_id in tools and tools[tool_id].is_active]
+
+tool_catalog = ToolCatalog()
@@ -0,0 +1,284 @@
+"""
+Upload Session Service
+Business logic for resumable (chunked) attachment uploads
+"""
+from typing import Optional
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from datetime import datetime, timedelta
+import io
+import uuid
+from pathlib import Path
+
+from app.models.maintenance_request import MaintenanceRequest
+from app.models.maintenance_request_event import RequestEventType
+from app.models.upload_session import UploadSession, UploadSessionStatus
+from app.models.user import User
+from app.schemas.upload_session import UploadSessionCreate, UploadSessionResponse
+from app.services.maintenance_request import MaintenanceRequestService
+from app.services.maintenance_request_event import MaintenanceRequestEventService
+from app.utils.file_upload import (
+    MAX_RESUMABLE_FILE_SIZE,
+    append_upload_chunk,
+    build_upload_file,
+    create_partial_upload,
+    get_partial_upload_path,
+    store_completed_upload,
+    delete_partial_upload,
+    delete_file,
+    validate_file
+)
+
+# Sessions that see no progress for this long can no longer be resumed
+UPLOAD_SESSION_TTL = timedelta(hours=24)
+
+
+class UploadSessionService:
+    """Service for resumable upload sessions"""
+
+    @staticmethod
+    def create_session(
+        db: Session,
+        request: MaintenanceRequest,
+        user: User,
+        session_data: UploadSessionCreate
+    ) -> UploadSession:
+        """
+        Start a resumable upload for a maintenance request
+
+        Args:
+            db: Database session
+            request: Request the file will be attached to
+            user: User starting the upload
+            session_data: Declared file metadata
+
+        Returns:
+            Created upload session
+
+        Raises:
+            HTTPException: If the declared file is not acceptable
+        """
+        # Reject disallowed types before any bytes are sent
+        validate_file(build_upload_file(io.BytesIO(), session_data.filename, session_data.content_type))
+
+        if session_data.size > MAX_RESUMABLE_FILE_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File too large. Maximum size: {MAX_RESUMABLE_FILE_SIZE / (1024 * 1024)}MB"
+            )
+
+        now = datetime.utcnow()
+        upload_session = UploadSession(
+            token=str(uuid.uuid4()),
+            request_id=request.id,
+            user_id=user.id,
+            original_filename=session_data.filename,
+            content_type=session_data.content_type,
+            total_size=session_data.size,
+            bytes_received=0,
+            status=UploadSessionStatus.ACTIVE,
+            updated_at=now,
+            expires_at=now + UPLOAD_SESSION_TTL
+        )
+
+        create_partial_upload(upload_session.token)
+
+        db.add(upload_session)
+        db.commit()
+        db.refresh(upload_session)
+
+        return upload_session
+
+    @staticmethod
+    def get_session(db: Session, request_id: int, token: str) -> Optional[UploadSession]:
+        """
+        Get an upload session by token
+
+        Args:
+            db: Database session
+            request_id: Request the session belongs to
+            token: Upload session token
+
+        Returns:
+            Upload session or None
+        """
+        return db.query(UploadSession).filter(
+            UploadSession.token == token,
+            UploadSession.request_id == request_id
+        ).first()
+
+    @staticmethod
+    def ensure_active(upload_session: UploadSession) -> None:
+        """
+        Check that an upload session can still receive data
+
+        Args:
+            upload_session: Session to check
+
+        Raises:
+            HTTPException: If the session is completed, aborted or expired
+        """
+        if upload_session.status == UploadSessionStatus.COMPLETED:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Upload already completed"
+            )
+
+        if upload_session.status == UploadSessionStatus.ABORTED or upload_session.expires_at < datetime.utcnow():
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Upload session is no longer available"
+            )
+
+    @staticmethod
+    def record_progress(
+        db: Session,
+        upload_session: UploadSession,
+        expected_offset: int,
+        chunk_path: Path,
+        bytes_written: int
+    ) -> bool:
+        """
+        Append a buffered chunk to an upload session and advance its offset
+
+        The session row is locked before the offset is checked, and the
+        chunk is only copied into the partial file while the lock is held,
+        so two concurrent PATCHes at the same offset cannot both write.
+        If the copy fails the transaction rolls back and the offset stays
+        where it was; bytes past it are overwritten by the next chunk.
+
+        Args:
+            db: Database session
+            upload_session: Session being written to
+            expected_offset: Offset the client sent the chunk for
+            chunk_path: Buffer file holding the chunk
+            bytes_written: Number of bytes in the chunk
+
+        Returns:
+            True if the chunk was appended and the offset advanced
+        """
+        locked = db.query(UploadSession).filter(
+            UploadSession.id == upload_session.id
+        ).populate_existing().with_for_update().first()
+
+        if (
+            locked is None
+            or locked.status != UploadSessionStatus.ACTIVE
+            or locked.bytes_received != expected_offset
+        ):
+            db.rollback()
+            return False
+
+        try:
+            if bytes_written:
+                append_upload_chunk(get_partial_upload_path(locked.token), expected_offset, chunk_path)
+        except Exception:
+            db.rollback()
+            raise
+
+        now = datetime.utcnow()
+        locked.bytes_received = expected_offset + bytes_written
+        locked.updated_at = now
+        locked.expires_at = now + UPLOAD_SESSION_TTL
+
+        db.commit()
+        db.refresh(upload_session)
+
+        return True
+
+    @staticmethod
+    def complete_session(db: Session, upload_session: UploadSession) -> UploadSession:
+        """
+        Validate a fully received upload and attach it to its request
+
+        The attachment list and the session state are committed together;
+        if that commit fails the stored file is removed again.
+
+        Args:
+            db: Database session
+            upload_session: Session whose bytes are all received
+
+        Returns:
+            Completed upload session
+
+        Raises:
+            HTTPException: If the file fails validation
+        """
+        part_path = get_partial_upload_path(upload_session.token)
+
+        try:
+            with open(part_path, "rb") as part_file:
+                validate_file(build_upload_file(part_file, upload_session.original_filename, upload_session.content_type))
+        except HTTPException:
+            UploadSessionService.abort_session(db, upload_session)
+            raise
+
+        filename = store_completed_upload(part_path, upload_session.original_filename)
+
+        try:
+            db_request = db.query(MaintenanceRequest).filter(
+                MaintenanceRequest.id == upload_session.request_id
+            ).with_for_update().first()
+
+            if not db_request:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Maintenance request not found"
+                )
+
+            MaintenanceRequestService.append_attachments(db_request, [filename])
+            MaintenanceRequestEventService.record(
+                db, db_request, RequestEventType.ATTACHMENTS_ADDED,
+                db.get(User, upload_session.user_id), {"filenames": [filename]}
+            )
+
+            upload_session.status = UploadSessionStatus.COMPLETED
+            upload_session.stored_filename = filename
+            upload_session.updated_at = datetime.utcnow()
+
+            db.commit()
+        except Exception:
+            db.rollback()
+            delete_file(filename)
+            raise
+
+        db.refresh(upload_session)
+        return upload_session
+
+    @staticmethod
+    def abort_session(db: Session, upload_session: UploadSession) -> None:
+        """
+        Abort an upload session and discard its partial file
+
+        Args:
+            db: Database session
+            upload_session: Session to abort
+        """
+        upload_session.status = UploadSessionStatus.ABORTED
+        upload_session.updated_at = datetime.utcnow()
+        db.commit()
+
+        delete_partial_upload(upload_session.token)
+
+    @staticmethod
+    def to_response(upload_session: UploadSession) -> UploadSessionResponse:
+        """
+        Build the API representation of an upload session
+
+        Args:
+            upload_session: Session to represent
+
+        Returns:
+            Upload session response
+        """
+        return UploadSessionResponse(
+            upload_id=upload_session.token,
+            request_id=upload_session.request_id,
+            filename=upload_session.original_filename,
+            content_type=upload_session.content_type,
+            size=upload_session.total_size,
+            offset=upload_session.bytes_received,
+            status=upload_session.status,
+            expires_at=upload_session.expires_at,
+            attachment=upload_session.stored_filename
+        )
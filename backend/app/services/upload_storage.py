@@ -0,0 +1,413 @@
+"""
+Upload Storage Service
+Reconciles the upload store with the database and tracks storage usage
+"""
+from typing import Dict, List, Optional, Set, Tuple
+from fastapi import HTTPException
+from sqlalchemy import func, insert, or_, select
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from itertools import chain
+import json
+import logging
+import os
+import time
+
+from app.core.config import settings
+from app.db.upsert import conflict_insert
+from app.models.maintenance_request import MaintenanceRequest
+from app.models.maintenance_request_archive import ArchivedMaintenanceRequest
+from app.models.maintenance_request_event import RequestEventType
+from app.models.upload_gc import UploadGcReference, UploadOrphan
+from app.models.upload_session import UploadSession, UploadSessionStatus
+from app.services.app_state import AppStateService
+from app.services.maintenance_request_event import MaintenanceRequestEventService
+from app.utils.file_upload import (
+    UPLOAD_DIR,
+    SHARD_NAMES,
+    get_shard_name,
+    get_storage_path,
+    get_file_path,
+    delete_partial_upload
+)
+from app.utils.request_serializer import safe_json_list
+
+logger = logging.getLogger(__name__)
+
+# Key of the garbage collector cursor in app_state
+GC_STATE_KEY = "upload_gc"
+
+# Flat (pre-sharding) files moved into shard directories per run
+LEGACY_MIGRATION_BATCH = 500
+
+# Expired resumable upload sessions cleaned up per run
+EXPIRED_SESSION_BATCH = 500
+
+# Event log pages read per run for attachments of deleted requests
+DELETION_EVENT_PAGE = 1000
+DELETION_EVENT_PAGES_PER_RUN = 20
+
+# Orphaned files deleted per run, and names re-checked against the database per query
+ORPHAN_DELETE_BATCH = 500
+REFERENCE_CHECK_BATCH = 100
+
+# Rows per INSERT into the orphan and reference snapshot tables
+GC_WRITE_BATCH = 1000
+
+
+class UploadStorageService:
+    """Service for upload garbage collection and storage accounting"""
+
+    @staticmethod
+    def run_gc_pass(db: Session, shard_count: Optional[int] = None, grace_hours: Optional[float] = None) -> dict:
+        """
+        Reclaim orphaned uploads
+
+        Every pass reads the deletions recorded in the event log since the
+        last pass and notes when each deleted request's attachments were
+        orphaned. Uploads that were never referenced (their database commit
+        failed) are found by a reconciliation sweep over the shard
+        directories, which runs every UPLOAD_GC_SWEEP_HOURS and is spread
+        over several passes, a few shards each, continuing from the cursor
+        stored in app_state. The first pass of a sweep snapshots the
+        referenced filenames with one scan of the request tables; files
+        written after the snapshot are left to the next sweep. An orphaned
+        file is deleted once the grace period has passed since it was
+        orphaned (or since the sweep first found it), after checking that
+        no request references it again.
+
+        Args:
+            db: Database session
+            shard_count: Number of shards to scan per sweep pass (defaults to settings)
+            grace_hours: Time a file stays orphaned before deletion (defaults to settings)
+
+        Returns:
+            Summary of the pass
+        """
+        shard_count = shard_count or settings.UPLOAD_GC_SHARDS_PER_RUN
+        grace_hours = settings.UPLOAD_GC_GRACE_HOURS if grace_hours is None else grace_hours
+        now = datetime.utcnow()
+
+        state = AppStateService.get_value(db, GC_STATE_KEY, {})
+        next_shard = state.get("next_shard", 0)
+        shard_usage: Dict[str, List[int]] = state.get("shard_usage", {})
+        # Epoch seconds, compared with file modification times
+        references_taken_at: Optional[float] = state.get("references_taken_at")
+
+        event_cursor = UploadStorageService._collect_deleted_attachments(db, state.get("event_cursor"))
+
+        last_sweep = state.get("last_cycle_completed_at")
+        sweeping = next_shard != 0 or not last_sweep or (
+            now - datetime.fromisoformat(last_sweep) >= timedelta(hours=settings.UPLOAD_GC_SWEEP_HOURS)
+        )
+        shards = []
+        migrated = 0
+        if sweeping:
+            if next_shard == 0 or references_taken_at is None:
+                next_shard = 0
+                references_taken_at = UploadStorageService._snapshot_references(db)
+            shards = [SHARD_NAMES[(next_shard + i) % len(SHARD_NAMES)] for i in range(min(shard_count, len(SHARD_NAMES)))]
+            migrated = UploadStorageService._migrate_legacy_files()
+            referenced = UploadStorageService._referenced_filenames(db, set(shards))
+            unreferenced = []
+            for shard in shards:
+                files = 0
+                size = 0
+                shard_dir = UPLOAD_DIR / shard
+                if shard_dir.is_dir():
+                    with os.scandir(shard_dir) as entries:
+                        for entry in entries:
+                            if not entry.is_file():
+                                continue
+                            stat = entry.stat()
+                            # A newer file may belong to a commit the snapshot missed
+                            if entry.name not in referenced and stat.st_mtime < references_taken_at:
+                                unreferenced.append(entry.name)
+                            files += 1
+                            size += stat.st_size
+                shard_usage[shard] = [files, size]
+            UploadStorageService._add_orphans(db, [(filename, now) for filename in unreferenced])
+
+        deleted_files, deleted_bytes = UploadStorageService._delete_orphans(
+            db, now - timedelta(hours=grace_hours), shard_usage
+        )
+
+        expired_sessions = UploadStorageService._expire_upload_sessions(db)
+
+        timestamp = now.isoformat()
+        cycle_completed = bool(shards) and next_shard + len(shards) >= len(SHARD_NAMES)
+        AppStateService.set_value(db, GC_STATE_KEY, {
+            "next_shard": (next_shard + len(shards)) % len(SHARD_NAMES),
+            "shard_usage": shard_usage,
+            "references_taken_at": references_taken_at,
+            "event_cursor": event_cursor,
+            "last_run_at": timestamp,
+            "last_cycle_completed_at": timestamp if cycle_completed else last_sweep
+        })
+        db.commit()
+
+        return {
+            "shards_scanned": shards,
+            "deleted_files": deleted_files,
+            "deleted_bytes": deleted_bytes,
+            "pending_orphans": db.query(func.count(UploadOrphan.id)).scalar(),
+            "legacy_files_migrated": migrated,
+            "expired_upload_sessions": expired_sessions
+        }
+
+    @staticmethod
+    def _collect_deleted_attachments(db: Session, cursor: Optional[str]) -> Optional[str]:
+        """
+        Note the attachments of requests deleted since the cursor as orphaned at their deletion time
+
+        Returns:
+            Event log cursor to continue from
+        """
+        for _ in range(DELETION_EVENT_PAGES_PER_RUN):
+            events, cursor = MaintenanceRequestEventService.read_since(db, cursor, DELETION_EVENT_PAGE)
+            orphaned = []
+            for event in events:
+                if event.event_type != RequestEventType.DELETED.value or not event.changes:
+                    continue
+                try:
+                    filenames = json.loads(event.changes).get("attachments") or []
+                except (json.JSONDecodeError, TypeError, ValueError, AttributeError):
+                    continue
+                orphaned.extend((filename, event.at) for filename in filenames if isinstance(filename, str))
+            UploadStorageService._add_orphans(db, orphaned)
+            if len(events) < DELETION_EVENT_PAGE:
+                break
+        return cursor
+
+    @staticmethod
+    def _add_orphans(db: Session, orphans: List[Tuple[str, datetime]]) -> None:
+        """Record (filename, orphaned_at) pairs; files already recorded keep their time"""
+        table = UploadOrphan.__table__
+        for i in range(0, len(orphans), GC_WRITE_BATCH):
+            rows = [
+                {"filename": filename, "orphaned_at": orphaned_at}
+                for filename, orphaned_at in orphans[i:i + GC_WRITE_BATCH]
+            ]
+            db.execute(conflict_insert(db, table).values(rows).on_conflict_do_nothing(index_elements=["filename"]))
+
+    @staticmethod
+    def _delete_orphans(db: Session, cutoff: datetime, shard_usage: Dict[str, List[int]]) -> tuple:
+        """
+        Delete files orphaned before the cutoff that are still unreferenced
+
+        Returns:
+            (files deleted, bytes deleted)
+        """
+        due = [
+            filename for (filename,) in db.query(UploadOrphan.filename).filter(
+                UploadOrphan.orphaned_at <= cutoff
+            ).order_by(UploadOrphan.orphaned_at).limit(ORPHAN_DELETE_BATCH)
+        ]
+        if not due:
+            return 0, 0
+
+        referenced = UploadStorageService._referenced_among(db, due)
+
+        resolved = []
+        deleted_files = 0
+        deleted_bytes = 0
+        for filename in due:
+            if filename in referenced:
+                resolved.append(filename)
+                continue
+            try:
+                file_path = get_file_path(filename)
+            except HTTPException:
+                # Already gone
+                resolved.append(filename)
+                continue
+            try:
+                size = file_path.stat().st_size
+                os.unlink(file_path)
+            except OSError as e:
+                logger.warning(f"Could not delete orphaned upload {filename}: {e}")
+                continue
+            resolved.append(filename)
+            deleted_files += 1
+            deleted_bytes += size
+            usage = shard_usage.get(get_shard_name(filename))
+            if usage:
+                usage[0] = max(0, usage[0] - 1)
+                usage[1] = max(0, usage[1] - size)
+            logger.info(f"Deleted orphaned upload {filename}")
+
+        if resolved:
+            db.query(UploadOrphan).filter(
+                UploadOrphan.filename.in_(resolved)
+            ).delete(synchronize_session=False)
+
+        return deleted_files, deleted_bytes
+
+    @staticmethod
+    def _referenced_among(db: Session, filenames: List[str]) -> Set[str]:
+        """Those of the given filenames that a request (hot or archived) references"""
+        wanted = set(filenames)
+        referenced = set()
+        for i in range(0, len(filenames), REFERENCE_CHECK_BATCH):
+            # Match the names as they are encoded in the attachments JSON
+            patterns = [json.dumps(filename) for filename in filenames[i:i + REFERENCE_CHECK_BATCH]]
+            for model in (MaintenanceRequest, ArchivedMaintenanceRequest):
+                rows = db.query(model.attachments).filter(
+                    or_(*[model.attachments.contains(pattern, autoescape=True) for pattern in patterns])
+                )
+                for (attachments,) in rows:
+                    referenced.update(
+                        filename for filename in safe_json_list(attachments)
+                        if isinstance(filename, str) and filename in wanted
+                    )
+        return referenced
+
+    @staticmethod
+    def _snapshot_references(db: Session) -> float:
+        """
+        Replace the reference snapshot with the attachments requests hold now
+
+        Streams only the attachments column of the hot and archive tables,
+        once per sweep. Recorded orphans that turn out to be referenced are
+        dropped.
+
+        Returns:
+            Time (epoch seconds) the snapshot was started
+        """
+        taken_at = time.time()
+        db.query(UploadGcReference).delete(synchronize_session=False)
+
+        table = UploadGcReference.__table__
+        # Archived requests keep their attachments
+        rows = chain.from_iterable(
+            db.query(model.attachments).filter(
+                model.attachments.isnot(None),
+                model.attachments != "[]"
+            ).execution_options(yield_per=1000)
+            for model in (MaintenanceRequest, ArchivedMaintenanceRequest)
+        )
+        batch = []
+        for (attachments,) in rows:
+            batch.extend(
+                {"filename": filename, "shard": get_shard_name(filename)}
+                for filename in safe_json_list(attachments) if isinstance(filename, str)
+            )
+            if len(batch) >= GC_WRITE_BATCH:
+                db.execute(insert(table), batch)
+                batch = []
+        if batch:
+            db.execute(insert(table), batch)
+
+        db.query(UploadOrphan).filter(
+            UploadOrphan.filename.in_(select(UploadGcReference.filename))
+        ).delete(synchronize_session=False)
+
+        return taken_at
+
+    @staticmethod
+    def _referenced_filenames(db: Session, shards: Set[str]) -> Set[str]:
+        """Attachment filenames in the given shards, from the sweep's reference snapshot"""
+        rows = db.query(UploadGcReference.filename).filter(UploadGcReference.shard.in_(shards))
+        return {filename for (filename,) in rows}
+
+    @staticmethod
+    def _migrate_legacy_files() -> int:
+        """
+        Move a batch of files saved before sharding into their shard directory
+
+        The flat directory shrinks with every run, so restarting the scan
+        from the top each time still makes progress without a cursor.
+        """
+        if not UPLOAD_DIR.is_dir():
+            return 0
+
+        moved = 0
+        with os.scandir(UPLOAD_DIR) as entries:
+            for entry in entries:
+                if moved >= LEGACY_MIGRATION_BATCH:
+                    break
+                if not entry.is_file() or get_shard_name(entry.name) not in SHARD_NAMES:
+                    continue
+                target = get_storage_path(entry.name)
+                try:
+                    target.parent.mkdir(exist_ok=True)
+                    os.replace(entry.path, target)
+                    moved += 1
+                except OSError as e:
+                    logger.warning(f"Could not move legacy upload {entry.name} into its shard: {e}")
+
+        return moved
+
+    @staticmethod
+    def _expire_upload_sessions(db: Session) -> int:
+        """Abort resumable upload sessions past their expiry and delete their partial files"""
+        expired = db.query(UploadSession).filter(
+            UploadSession.status == UploadSessionStatus.ACTIVE,
+            UploadSession.expires_at < datetime.utcnow()
+        ).limit(EXPIRED_SESSION_BATCH).all()
+
+        for upload_session in expired:
+            upload_session.status = UploadSessionStatus.ABORTED
+            upload_session.updated_at = datetime.utcnow()
+            delete_partial_upload(upload_session.token)
+
+        return len(expired)
+
+    @staticmethod
+    def get_storage_usage(db: Session) -> dict:
+        """
+        Get total upload storage usage
+
+        Totals come from the per-shard figures recorded by the garbage
+        collector's sweeps, less the files it deleted since, so new uploads
+        are counted with up to UPLOAD_GC_SWEEP_HOURS delay.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Dictionary with storage usage
+        """
+        state = AppStateService.get_value(db, GC_STATE_KEY, {})
+        shard_usage = state.get("shard_usage", {})
+
+        return {
+            "total_files": sum(files for files, _ in shard_usage.values()),
+            "total_bytes": sum(size for _, size in shard_usage.values()),
+            "shards_scanned": len(shard_usage),
+            "shards_total": len(SHARD_NAMES),
+            "last_run_at": state.get("last_run_at"),
+            "last_cycle_completed_at": state.get("last_cycle_completed_at")
+        }
+
+    @staticmethod
+    def get_request_storage(request: MaintenanceRequest) -> dict:
+        """
+        Get storage usage of a single request's attachments
+
+        Args:
+            request: Maintenance request
+
+        Returns:
+            Dictionary with per-file sizes and the total
+        """
+        try:
+            filenames = json.loads(request.attachments) if request.attachments else []
+        except (json.JSONDecodeError, TypeError, ValueError):
+            filenames = []
+
+        files = []
+        for filename in filenames:
+            try:
+                size = get_file_path(filename).stat().st_size
+            except Exception:
+                size = None
+            files.append({"filename": filename, "size": size})
+
+        return {
+            "request_id": request.id,
+            "total_files": len(files),
+            "total_bytes": sum(f["size"] for f in files if f["size"] is not None),
+            "missing_files": sum(1 for f in files if f["size"] is None),
+            "files": files
+        }
@@ -2,14 +2,19 @@
 User service
 """
 
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session, selectinload
+import base64
+import json
 from fastapi import HTTPException, status
 from app.core.security import get_password_hash
-from app.models.user import User
+from app.models.user import User, user_roles
 from app.models.role import Role
 from app.models.tool import Tool
 from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.tool import Tool as ToolSchema
+from app.services.tool_catalog import tool_catalog
 
 class UserService:
     """User management service"""
@@ -30,9 +35,134 @@ class UserService:
         return db.query(User).filter(User.email == email.lower()).first()
     
     @staticmethod
-    def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
-        """Get all users with pagination"""
-        return db.query(User).offset(skip).limit(limit).all()
+    def get_users(db: Session, skip: int = 0, limit: Optional[int] = 100) -> List[User]:
+        """Get all users with pagination (limit=None returns every user)"""
+        query = db.query(User).options(selectinload(User.roles), selectinload(User.tools)).order_by(User.id)
+        if limit is None:
+            return query.offset(skip).all()
+        return query.offset(skip).limit(limit).all()
+
+    @staticmethod
+    def _directory_filters(
+        search: Optional[str] = None,
+        tool: Optional[str] = None,
+        is_active: Optional[bool] = None
+    ) -> list:
+        """Build user directory filters (the role filter is added separately so it can be faceted)"""
+        filters = []
+
+        if search:
+            # Prefix match on lowercased columns, served by the lower(...) indexes
+            pattern = search.strip().lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            filters.append(or_(
+                func.lower(User.username).like(pattern, escape="\\"),
+                func.lower(User.full_name).like(pattern, escape="\\"),
+                func.lower(User.email).like(pattern, escape="\\")
+            ))
+
+        if tool:
+            filters.append(User.tools.any(Tool.name == tool))
+
+        if is_active is not None:
+            filters.append(User.is_active == is_active)
+
+        return filters
+
+    @staticmethod
+    def _encode_cursor(username: str) -> str:
+        """Encode the keyset position after a user"""
+        return base64.urlsafe_b64encode(json.dumps({"u": username}).encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> str:
+        """Decode a directory cursor into the last username seen"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            return json.loads(base64.urlsafe_b64decode(padded.encode()))["u"]
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+
+    @staticmethod
+    def search_directory(
+        db: Session,
+        search: Optional[str] = None,
+        role: Optional[str] = None,
+        tool: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[User], Optional[str]]:
+        """
+        Get one page of the user directory
+
+        Pages are ordered by username and continue after the cursor (keyset
+        pagination), so deep pages cost the same as the first one.
+
+        Args:
+            db: Database session
+            search: Prefix of username, full name or email
+            role: Role name the users must have
+            tool: Tool name the users must be assigned
+            is_active: Filter by active status
+            cursor: Cursor returned with the previous page
+            limit: Page size
+
+        Returns:
+            Tuple of (users, cursor of the next page or None)
+        """
+        filters = UserService._directory_filters(search, tool, is_active)
+        if role:
+            filters.append(User.roles.any(Role.name == role))
+        if cursor:
+            filters.append(User.username > UserService._decode_cursor(cursor))
+
+        # selectinload keeps the page query free of the role x tool join
+        users = db.query(User).options(
+            selectinload(User.roles),
+            selectinload(User.tools)
+        ).filter(*filters).order_by(User.username).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = UserService._encode_cursor(users[-1].username)
+
+        return users, next_cursor
+
+    @staticmethod
+    def count_directory(
+        db: Session,
+        search: Optional[str] = None,
+        role: Optional[str] = None,
+        tool: Optional[str] = None,
+        is_active: Optional[bool] = None
+    ) -> Tuple[int, Dict[str, int]]:
+        """
+        Count directory matches, in total and per role
+
+        Role counts ignore the role filter so the UI can show how many users
+        each role option would return.
+
+        Returns:
+            Tuple of (total matching users, users per role name)
+        """
+        filters = UserService._directory_filters(search, tool, is_active)
+
+        total_filters = list(filters)
+        if role:
+            total_filters.append(User.roles.any(Role.name == role))
+        total = db.query(func.count(User.id)).filter(*total_filters).scalar()
+
+        matching = select(User.id).where(*filters)
+        rows = db.query(Role.name, func.count(user_roles.c.user_id)).select_from(Role).outerjoin(
+            user_roles,
+            and_(user_roles.c.role_id == Role.id, user_roles.c.user_id.in_(matching))
+        ).group_by(Role.id, Role.name).order_by(Role.name).all()
+
+        return total, {name: count for name, count in rows}
     
     @staticmethod
     def create_user(db: Session, user_data: UserCreate) -> User:
@@ -158,11 +288,11 @@ class UserService:
         return any(tool.name == tool_name for tool in user.tools)
     
     @staticmethod
-    def get_user_tools(user: User, db: Session) -> List[Tool]:
-        """Get all tools accessible to user"""
+    def get_user_tools(user: User, db: Session) -> List[ToolSchema]:
+        """Get all tools accessible to user, resolved from the cached tool catalog"""
         if UserService.has_role(user, "superuser"):
             # Superusers get all active tools
-            return db.query(Tool).filter(Tool.is_active == True).all()
+            return tool_catalog.active_tools(db)
         else:
             # Regular users get assigned tools
-            return [tool for tool in user.tools if tool.is_active]
\ No newline at end of file
+            return tool_catalog.resolve(db, [tool.id for tool in user.tools])
\ No newline at end of file
@@ -0,0 +1,393 @@
+"""
+User Import Service
+Validates and imports users in bulk from CSV, XLSX or JSON files
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import insert, update, or_
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+import csv
+import io
+import json
+import logging
+import multiprocessing
+import os
+import threading
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.db.upsert import conflict_insert
+from app.models.user import User, user_roles, user_tools
+from app.models.role import Role
+from app.models.tool import Tool
+from app.schemas.user import UserCreate
+from app.schemas.user_import import UserImportReport, UserImportRowError
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT/UPDATE statement
+BATCH_SIZE = 500
+
+# Below this many passwords a process pool costs more than it saves
+INLINE_HASH_LIMIT = 8
+
+TRUE_VALUES = {"", "1", "true", "yes", "y", "active"}
+FALSE_VALUES = {"0", "false", "no", "n", "inactive"}
+
+
+_hash_pool: Optional[ProcessPoolExecutor] = None
+_hash_pool_lock = threading.Lock()
+
+
+def _hash_workers() -> int:
+    """Size of the hashing pool"""
+    return settings.USER_IMPORT_HASH_WORKERS or os.cpu_count() or 1
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    """
+    Process pool shared by every import in this process, started on first use
+
+    Workers are spawned rather than forked: forking a multithreaded server
+    process would copy its held locks, database connections and event loop.
+    """
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool = ProcessPoolExecutor(max_workers=_hash_workers(), mp_context=multiprocessing.get_context("spawn"))
+        return _hash_pool
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """
+    Hash passwords with bcrypt across a process pool
+
+    bcrypt is CPU bound, so separate processes scale with cores.
+
+    Args:
+        passwords: Plain passwords
+
+    Returns:
+        Hashes in the same order
+    """
+    global _hash_pool
+    if len(passwords) <= INLINE_HASH_LIMIT:
+        return [get_password_hash(password) for password in passwords]
+
+    pool = _get_hash_pool()
+    chunksize = max(1, len(passwords) // (_hash_workers() * 4))
+    try:
+        return list(pool.map(get_password_hash, passwords, chunksize=chunksize))
+    except BrokenProcessPool:
+        # A worker died; start a new pool on the next import
+        with _hash_pool_lock:
+            if _hash_pool is pool:
+                _hash_pool = None
+        raise
+
+
+def _split_names(value) -> List[str]:
+    """Split a roles/tools cell ("a, b; c" or a JSON list) into names"""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(name).strip() for name in value if str(name).strip()]
+    normalized = str(value).replace(";", ",").replace("|", ",")
+    return [name.strip() for name in normalized.split(",") if name.strip()]
+
+
+def _cell(value) -> str:
+    """Normalize a cell value to a stripped string"""
+    return "" if value is None else str(value).strip()
+
+
+class UserImportService:
+    """Service for bulk user imports"""
+
+    @staticmethod
+    def parse_file(content: bytes, filename: str) -> List[dict]:
+        """
+        Parse an import file into row dictionaries
+
+        Args:
+            content: File content
+            filename: Original filename (its extension selects the format)
+
+        Returns:
+            List of rows keyed by lowercased column name
+
+        Raises:
+            HTTPException: If the format is unsupported or the file cannot be read
+        """
+        extension = os.path.splitext(filename or "")[1].lower()
+
+        try:
+            if extension == ".csv":
+                rows = UserImportService._parse_csv(content)
+            elif extension == ".xlsx":
+                rows = UserImportService._parse_xlsx(content)
+            elif extension == ".json":
+                rows = UserImportService._parse_json(content)
+            else:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Unsupported file type. Use .csv, .xlsx or .json"
+                )
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Could not read import file: {e}"
+            )
+
+        if len(rows) > settings.USER_IMPORT_MAX_ROWS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Too many rows. Maximum: {settings.USER_IMPORT_MAX_ROWS}"
+            )
+
+        return rows
+
+    @staticmethod
+    def _parse_csv(content: bytes) -> List[dict]:
+        """Parse CSV (UTF-8, optional BOM) with a header row"""
+        reader = csv.DictReader(io.StringIO(content.decode("utf-8-sig")))
+        return [{(key or "").strip().lower(): value for key, value in row.items()} for row in reader]
+
+    @staticmethod
+    def _parse_xlsx(content: bytes) -> List[dict]:
+        """Parse the first worksheet of an XLSX workbook with a header row"""
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="XLSX import requires the openpyxl package"
+            )
+
+        workbook = load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = [_cell(value).lower() for value in next(rows, ())]
+            return [
+                dict(zip(header, values))
+                for values in rows
+                if any(value is not None and _cell(value) for value in values)
+            ]
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _parse_json(content: bytes) -> List[dict]:
+        """Parse a JSON array of user objects (or {"users": [...]})"""
+        data = json.loads(content)
+        if isinstance(data, dict):
+            data = data.get("users")
+        if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+            raise ValueError("expected a list of user objects")
+        return [{str(key).strip().lower(): value for key, value in row.items()} for row in data]
+
+    @staticmethod
+    def run_import(
+        db: Session,
+        rows: List[dict],
+        dry_run: bool = True,
+        update_existing: bool = True,
+        update_passwords: bool = False
+    ) -> UserImportReport:
+        """
+        Validate and import user rows
+
+        Rows are validated with the UserCreate rules. Valid rows are written
+        in batches inside one transaction, and invalid rows are reported and
+        skipped. Role and tool links are added (never removed) with
+        INSERT ... ON CONFLICT DO NOTHING.
+
+        Args:
+            db: Database session
+            rows: Parsed rows (full_name, username, email, password, is_active, roles, tools)
+            dry_run: Only validate and report what would change
+            update_existing: Update users whose username already exists instead of failing the row
+            update_passwords: Also reset passwords of existing users
+
+        Returns:
+            Import report
+        """
+        errors: List[UserImportRowError] = []
+        valid: List[Tuple[int, UserCreate, List[int], List[int]]] = []
+
+        role_ids_by_name = {name.lower(): role_id for role_id, name in db.query(Role.id, Role.name).all()}
+        tool_ids_by_name = {name.lower(): tool_id for tool_id, name in db.query(Tool.id, Tool.name).all()}
+        superuser_role_id = role_ids_by_name.get("superuser")
+
+        seen_usernames: Dict[str, int] = {}
+        seen_emails: Dict[str, int] = {}
+
+        for number, row in enumerate(rows, start=1):
+            row_errors = []
+            username = _cell(row.get("username")) or None
+
+            is_active_cell = _cell(row.get("is_active")).lower()
+            if is_active_cell not in TRUE_VALUES | FALSE_VALUES:
+                row_errors.append(f"is_active: unrecognised value '{is_active_cell}'")
+
+            role_names = _split_names(row.get("roles"))
+            tool_names = _split_names(row.get("tools"))
+            unknown_roles = [name for name in role_names if name.lower() not in role_ids_by_name]
+            unknown_tools = [name for name in tool_names if name.lower() not in tool_ids_by_name]
+            if unknown_roles:
+                row_errors.append(f"roles: unknown role(s) {', '.join(unknown_roles)}")
+            if unknown_tools:
+                row_errors.append(f"tools: unknown tool(s) {', '.join(unknown_tools)}")
+
+            role_ids = sorted({role_ids_by_name[name.lower()] for name in role_names if name.lower() in role_ids_by_name})
+            tool_ids = sorted({tool_ids_by_name[name.lower()] for name in tool_names if name.lower() in tool_ids_by_name})
+            if superuser_role_id in role_ids:
+                tool_ids = []  # Superusers get all tools automatically
+
+            user_data = None
+            try:
+                user_data = UserCreate(
+                    full_name=_cell(row.get("full_name")),
+                    username=_cell(row.get("username")),
+                    email=_cell(row.get("email")),
+                    password=_cell(row.get("password")),
+                    is_active=is_active_cell not in FALSE_VALUES,
+                    role_ids=role_ids,
+                    tool_ids=tool_ids
+                )
+            except ValidationError as e:
+                for error in e.errors():
+                    field = ".".join(str(part) for part in error["loc"]) or "row"
+                    row_errors.append(f"{field}: {error['msg']}")
+
+            if user_data:
+                username = user_data.username
+                email = user_data.email.lower()
+                if username in seen_usernames:
+                    row_errors.append(f"username: duplicate of row {seen_usernames[username]}")
+                if email in seen_emails:
+                    row_errors.append(f"email: duplicate of row {seen_emails[email]}")
+                seen_usernames.setdefault(username, number)
+                seen_emails.setdefault(email, number)
+
+            if row_errors:
+                errors.append(UserImportRowError(row=number, username=username, errors=row_errors))
+            else:
+                valid.append((number, user_data, role_ids, tool_ids))
+
+        # Match against existing users in batches
+        existing_by_username: Dict[str, int] = {}
+        existing_by_email: Dict[str, int] = {}
+        for start in range(0, len(valid), BATCH_SIZE):
+            batch = valid[start:start + BATCH_SIZE]
+            usernames = [user_data.username for _, user_data, _, _ in batch]
+            emails = [user_data.email.lower() for _, user_data, _, _ in batch]
+            for user_id, username, email in db.query(User.id, User.username, User.email).filter(
+                or_(User.username.in_(usernames), User.email.in_(emails))
+            ):
+                existing_by_username[username] = user_id
+                existing_by_email[email.lower()] = user_id
+
+        to_create = []
+        to_update = []
+        for number, user_data, role_ids, tool_ids in valid:
+            existing_id = existing_by_username.get(user_data.username)
+            email_owner = existing_by_email.get(user_data.email.lower())
+
+            row_errors = []
+            if existing_id and not update_existing:
+                row_errors.append("username: already registered")
+            if email_owner and email_owner != existing_id:
+                row_errors.append("email: already registered to another user")
+            if row_errors:
+                errors.append(UserImportRowError(row=number, username=user_data.username, errors=row_errors))
+                continue
+
+            if existing_id:
+                to_update.append((existing_id, user_data, role_ids, tool_ids))
+            else:
+                to_create.append((user_data, role_ids, tool_ids))
+
+        errors.sort(key=lambda error: error.row)
+        report = UserImportReport(
+            dry_run=dry_run,
+            total_rows=len(rows),
+            valid_rows=len(to_create) + len(to_update),
+            created=len(to_create),
+            updated=len(to_update),
+            failed=len(errors),
+            errors=errors
+        )
+
+        if dry_run or not (to_create or to_update):
+            return report
+
+        # Hash everything up front, in parallel
+        passwords = [user_data.password for user_data, _, _ in to_create]
+        if update_passwords:
+            passwords += [user_data.password for _, user_data, _, _ in to_update]
+        hashes = hash_passwords(passwords)
+        create_hashes = hashes[:len(to_create)]
+        update_hashes = hashes[len(to_create):]
+
+        try:
+            role_links = []
+            tool_links = []
+
+            for start in range(0, len(to_create), BATCH_SIZE):
+                batch = to_create[start:start + BATCH_SIZE]
+                params = [{
+                    "full_name": user_data.full_name,
+                    "username": user_data.username,
+                    "email": user_data.email.lower(),
+                    "password_hash": password_hash,
+                    "is_active": user_data.is_active
+                } for (user_data, _, _), password_hash in zip(batch, create_hashes[start:start + BATCH_SIZE])]
+                created_ids = dict(db.execute(insert(User).returning(User.username, User.id), params).all())
+
+                for user_data, role_ids, tool_ids in batch:
+                    user_id = created_ids[user_data.username]
+                    role_links += [{"user_id": user_id, "role_id": role_id} for role_id in role_ids]
+                    tool_links += [{"user_id": user_id, "tool_id": tool_id} for tool_id in tool_ids]
+
+            for start in range(0, len(to_update), BATCH_SIZE):
+                batch = to_update[start:start + BATCH_SIZE]
+                params = []
+                for index, (user_id, user_data, role_ids, tool_ids) in enumerate(batch, start=start):
+                    values = {
+                        "id": user_id,
+                        "full_name": user_data.full_name,
+                        "email": user_data.email.lower(),
+                        "is_active": user_data.is_active
+                    }
+                    if update_passwords:
+                        values["password_hash"] = update_hashes[index]
+                    params.append(values)
+                    role_links += [{"user_id": user_id, "role_id": role_id} for role_id in role_ids]
+                    tool_links += [{"user_id": user_id, "tool_id": tool_id} for tool_id in tool_ids]
+                db.execute(update(User), params)
+
+            for start in range(0, len(role_links), BATCH_SIZE):
+                result = db.execute(conflict_insert(db, user_roles).values(
+                    role_links[start:start + BATCH_SIZE]
+                ).on_conflict_do_nothing())
+                report.role_links_added += result.rowcount
+
+            for start in range(0, len(tool_links), BATCH_SIZE):
+                result = db.execute(conflict_insert(db, user_tools).values(
+                    tool_links[start:start + BATCH_SIZE]
+                ).on_conflict_do_nothing())
+                report.tool_links_added += result.rowcount
+
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        logger.info(f"User import: {report.created} created, {report.updated} updated, {report.failed} failed")
+        return report
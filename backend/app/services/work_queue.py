@@ -0,0 +1,202 @@
+"""
+Work Queue Service
+Technicians claim the next open maintenance request instead of picking from the list
+"""
+from typing import Optional
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from datetime import datetime, timedelta
+import logging
+
+from app.core.config import settings
+from app.models.maintenance_request import MaintenanceRequest, PriorityLevel, RequestStatus
+from app.models.user import User
+from app.schemas.maintenance_request import MaintenanceRequestUpdate
+from app.services.maintenance_request import MaintenanceRequestService
+
+logger = logging.getLogger(__name__)
+
+
+def _claim_order(db: Session) -> list:
+    """Most urgent first, then earliest requested completion, then oldest"""
+    if db.get_bind().dialect.name == "postgresql":
+        # Enum order, as in ix_maintenance_requests_claim_queue
+        priority = MaintenanceRequest.priority.desc()
+    else:
+        # Enums are stored as names elsewhere, which do not sort by urgency
+        priority = case(
+            {PriorityLevel.URGENT.name: 0, PriorityLevel.HIGH.name: 1, PriorityLevel.MEDIUM.name: 2},
+            value=MaintenanceRequest.priority,
+            else_=3
+        )
+    return [
+        priority,
+        MaintenanceRequest.requested_completion_date.asc().nulls_last(),
+        MaintenanceRequest.created_at,
+        MaintenanceRequest.id
+    ]
+
+
+class WorkQueueService:
+    """Service for claiming maintenance requests"""
+
+    @staticmethod
+    def claim_next(db: Session, user: User) -> Optional[MaintenanceRequest]:
+        """
+        Claim the next open request for a technician
+
+        The top unclaimed pending request is locked with FOR UPDATE SKIP
+        LOCKED, so concurrent claims each take a different row without
+        waiting on each other, and moved to in_progress for the user.
+
+        Args:
+            db: Database session
+            user: Technician claiming work
+
+        Returns:
+            Claimed request, or None if the queue is empty
+
+        Raises:
+            HTTPException: If the user already holds the maximum number of claims
+        """
+        active_claims = db.query(func.count(MaintenanceRequest.id)).filter(
+            MaintenanceRequest.assigned_to_id == user.id,
+            MaintenanceRequest.status == RequestStatus.IN_PROGRESS
+        ).scalar()
+        if active_claims >= settings.WORK_QUEUE_MAX_CLAIMS_PER_USER:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"You already have {active_claims} claimed requests; finish or release one first"
+            )
+
+        request_id = db.query(MaintenanceRequest.id).filter(
+            MaintenanceRequest.status == RequestStatus.PENDING,
+            MaintenanceRequest.assigned_to_id.is_(None)
+        ).order_by(*_claim_order(db)).limit(1).with_for_update(skip_locked=True).scalar()
+
+        if request_id is None:
+            db.rollback()
+            return None
+
+        return MaintenanceRequestService.update_request(
+            db, request_id, MaintenanceRequestUpdate(status=RequestStatus.IN_PROGRESS), user
+        )
+
+    @staticmethod
+    def renew_claim(db: Session, request_id: int, user: User) -> MaintenanceRequest:
+        """
+        Extend the user's claim on a request by the claim duration
+
+        Args:
+            db: Database session
+            request_id: Request ID
+            user: Technician holding the claim
+
+        Returns:
+            Request with the new expiry
+
+        Raises:
+            HTTPException: If the request does not exist or is not claimed by the user
+        """
+        db_request = WorkQueueService._get_claimed(db, request_id)
+        if db_request.assigned_to_id != user.id:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Request is not claimed by you"
+            )
+
+        db_request.claim_expires_at = datetime.utcnow() + timedelta(minutes=settings.WORK_QUEUE_CLAIM_MINUTES)
+        db.commit()
+        db.refresh(db_request)
+        return db_request
+
+    @staticmethod
+    def release_claim(db: Session, request_id: int, user: User) -> MaintenanceRequest:
+        """
+        Return a claimed request to the queue
+
+        Args:
+            db: Database session
+            request_id: Request ID
+            user: Claim holder or superuser
+
+        Returns:
+            Request, pending and unassigned again
+
+        Raises:
+            HTTPException: If the request is not claimed or the user may not release it
+        """
+        db_request = WorkQueueService._get_claimed(db, request_id)
+        is_superuser = any(role.name == "superuser" for role in user.roles)
+        if db_request.assigned_to_id not in (None, user.id) and not is_superuser:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only the technician holding the claim can release it"
+            )
+
+        return MaintenanceRequestService.update_request(
+            db, request_id, MaintenanceRequestUpdate(status=RequestStatus.PENDING), user
+        )
+
+    @staticmethod
+    def release_expired_claims(db: Session, batch_size: int = 500) -> dict:
+        """
+        Return abandoned claims to the queue (background job)
+
+        Each request is re-checked under a row lock, so a claim renewed
+        after it was selected is left alone.
+
+        Args:
+            db: Database session
+            batch_size: Claims handled per run
+
+        Returns:
+            Summary of the run
+        """
+        now = datetime.utcnow()
+        expired_ids = db.query(MaintenanceRequest.id).filter(
+            MaintenanceRequest.status == RequestStatus.IN_PROGRESS,
+            MaintenanceRequest.claim_expires_at < now
+        ).order_by(MaintenanceRequest.claim_expires_at).limit(batch_size).all()
+        db.rollback()
+
+        released = 0
+        for (request_id,) in expired_ids:
+            still_expired = db.query(MaintenanceRequest.id).filter(
+                MaintenanceRequest.id == request_id,
+                MaintenanceRequest.status == RequestStatus.IN_PROGRESS,
+                MaintenanceRequest.claim_expires_at < now
+            ).with_for_update(skip_locked=True).scalar()
+            if still_expired is None:
+                db.rollback()
+                continue
+
+            MaintenanceRequestService.update_request(
+                db, request_id, MaintenanceRequestUpdate(status=RequestStatus.PENDING), None
+            )
+            released += 1
+
+        if released:
+            logger.info(f"Released {released} expired work queue claims")
+
+        return {"released": released}
+
+    @staticmethod
+    def _get_claimed(db: Session, request_id: int) -> MaintenanceRequest:
+        """Lock a request that is in progress, or raise 404/409"""
+        db_request = db.query(MaintenanceRequest).filter(
+            MaintenanceRequest.id == request_id
+        ).with_for_update().first()
+
+        if not db_request:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Maintenance request not found"
+            )
+        if db_request.status != RequestStatus.IN_PROGRESS:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Request is not claimed"
+            )
+        return db_request
@@ -0,0 +1,93 @@
+"""
+Equipment and location name normalization
+Maps free-text spellings of the same asset or place to one canonical key
+"""
+import re
+from collections import Counter
+from typing import List, Optional
+
+_TOKEN = re.compile(r"[a-z]+|\d+")
+
+# Separators between levels of a free-text location ("Building A - Line 3", "Building A / Line 3")
+_LOCATION_LEVEL_SEPARATOR = re.compile(r"\s*(?:/|>|\||,|;|\s-\s)\s*")
+
+
+def equipment_key(name: Optional[str]) -> str:
+    """
+    Canonical search key of an equipment name
+
+    Lowercases, drops punctuation and leading zeros, so "CNC-01",
+    "cnc 1" and "CNC #1" share the key "cnc 1". Autocomplete matches
+    prefixes of this key.
+
+    Args:
+        name: Free-text name
+
+    Returns:
+        Key (empty if the name has no letters or digits)
+    """
+    if not name:
+        return ""
+    return " ".join(str(int(token)) if token.isdigit() else token for token in _TOKEN.findall(name.lower()))
+
+
+def equipment_key_prefix(query: Optional[str]) -> str:
+    """
+    Search key prefix of a partially typed equipment name
+
+    Like equipment_key, but a number still being typed keeps its leading
+    zeros dropped without turning into "0", so "CNC-0" is the prefix "cnc "
+    and still finds "CNC-01".
+
+    Args:
+        query: Typed text
+
+    Returns:
+        Key prefix (empty if the query has no letters or digits)
+    """
+    tokens = _TOKEN.findall((query or "").lower())
+    if not tokens:
+        return ""
+
+    still_typing = query[-1].isalnum()
+    if still_typing and tokens[-1].isdigit():
+        head = equipment_key(" ".join(tokens[:-1]))
+        digits = tokens[-1].lstrip("0")
+        if digits:
+            return f"{head} {digits}" if head else digits
+        return f"{head} " if head else ""
+
+    # A trailing separator means the next token starts a new word
+    key = equipment_key(query)
+    return key if still_typing else key + " "
+
+
+def location_levels(location: Optional[str]) -> List[str]:
+    """
+    Split a free-text location into hierarchy levels, outermost first
+
+    Args:
+        location: Free-text location such as "Building A - Line 3"
+
+    Returns:
+        Cleaned level names (empty if there is no location)
+    """
+    if not location:
+        return []
+    levels = [" ".join(level.split()) for level in _LOCATION_LEVEL_SEPARATOR.split(location.strip())]
+    return [level for level in levels if equipment_key(level)]
+
+
+def location_key(levels: List[str]) -> str:
+    """Canonical key of a location path"""
+    return " / ".join(equipment_key(level) for level in levels)
+
+
+def pick_canonical(spellings: Counter) -> str:
+    """
+    Choose the display name of a cluster of spellings
+
+    The most used spelling wins; ties go to the one with the most
+    capitals and then alphabetically, so the choice is deterministic.
+    """
+    return min(spellings, key=lambda name: (-spellings[name], -sum(c.isupper() for c in name), name))
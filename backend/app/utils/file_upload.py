@@ -6,14 +6,22 @@ import os
 import uuid
 import shutil
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, AsyncIterator, Tuple, BinaryIO
 from fastapi import UploadFile, HTTPException, status
+from starlette.datastructures import Headers
+from starlette.requests import ClientDisconnect
 import mimetypes
 
 
 # Configuration
 UPLOAD_DIR = Path("uploads/maintenance_requests")
+PARTIAL_UPLOAD_DIR = UPLOAD_DIR / ".partial"  # In-flight resumable uploads
+# Files are spread over 256 shard directories named after the first two hex
+# characters of their UUID prefix, so no single directory grows unbounded.
+# Files saved before sharding still live directly in UPLOAD_DIR.
+SHARD_NAMES = [f"{i:02x}" for i in range(256)]
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_RESUMABLE_FILE_SIZE = 200 * 1024 * 1024  # 200MB for resumable (chunked) uploads
 ALLOWED_EXTENSIONS = {
     # Images
     ".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp",
@@ -21,6 +29,8 @@ ALLOWED_EXTENSIONS = {
     ".pdf", ".doc", ".docx", ".txt", ".rtf",
     # Spreadsheets
     ".xls", ".xlsx", ".csv",
+    # Video
+    ".mp4", ".mov",
     # Other
     ".zip", ".rar"
 }
@@ -37,6 +47,8 @@ ALLOWED_MIME_TYPES = {
     "application/vnd.ms-excel",
     "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     "text/csv",
+    # Video
+    "video/mp4", "video/quicktime",
     # Archives
     "application/zip", "application/x-rar-compressed"
 }
@@ -90,6 +102,40 @@ def validate_file(file: UploadFile) -> None:
         )
 
 
+def get_shard_name(filename: str) -> str:
+    """
+    Get the shard directory name for a stored filename
+
+    Args:
+        filename: Stored (UUID-prefixed) filename
+
+    Returns:
+        Two character shard name
+    """
+    return filename[:2].lower()
+
+
+def get_storage_path(filename: str) -> Path:
+    """
+    Get the sharded storage path for a stored filename
+
+    Args:
+        filename: Stored (UUID-prefixed) filename
+
+    Returns:
+        Path inside the filename's shard directory
+    """
+    return UPLOAD_DIR / get_shard_name(filename) / filename
+
+
+def _find_stored_file(filename: str) -> Optional[Path]:
+    """Locate a stored file in its shard or, for older uploads, the flat upload directory"""
+    for file_path in (get_storage_path(filename), UPLOAD_DIR / filename):
+        if file_path.exists() and file_path.is_file():
+            return file_path
+    return None
+
+
 def generate_unique_filename(original_filename: str) -> str:
     """
     Generate unique filename to prevent collisions
@@ -130,7 +176,7 @@ async def save_upload_file(file: UploadFile) -> str:
 
     # Generate unique filename
     filename = generate_unique_filename(file.filename)
-    file_path = UPLOAD_DIR / filename
+    file_path = get_storage_path(filename)
 
     try:
         # Check file size
@@ -145,6 +191,7 @@ async def save_upload_file(file: UploadFile) -> str:
             )
 
         # Save file
+        file_path.parent.mkdir(exist_ok=True)
         with open(file_path, "wb") as buffer:
             shutil.copyfileobj(file.file, buffer)
 
@@ -197,8 +244,8 @@ def delete_file(filename: str) -> bool:
         True if successful, False otherwise
     """
     try:
-        file_path = UPLOAD_DIR / filename
-        if file_path.exists() and file_path.is_file():
+        file_path = _find_stored_file(filename)
+        if file_path:
             file_path.unlink()
             return True
         return False
@@ -244,9 +291,9 @@ def get_file_path(filename: str) -> Path:
             detail="Invalid filename"
         )
 
-    file_path = UPLOAD_DIR / filename
+    file_path = _find_stored_file(filename)
 
-    if not file_path.exists() or not file_path.is_file():
+    if not file_path:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found"
@@ -275,3 +322,193 @@ def get_file_info(filename: str) -> dict:
         "modified": stat.st_mtime,
         "mime_type": mimetypes.guess_type(filename)[0]
     }
+
+
+
+def build_upload_file(file: BinaryIO, filename: str, content_type: str) -> UploadFile:
+    """
+    Wrap a file object as an UploadFile so it can go through validate_file
+
+    Args:
+        file: Open binary file object
+        filename: Original filename reported by the client
+        content_type: MIME type reported by the client
+
+    Returns:
+        UploadFile instance
+    """
+    return UploadFile(file=file, filename=filename, headers=Headers({"content-type": content_type}))
+
+
+def get_partial_upload_path(token: str) -> Path:
+    """
+    Get path of the partial file backing a resumable upload session
+
+    Args:
+        token: Upload session token
+
+    Returns:
+        Path inside the partial upload directory
+    """
+    # Tokens are generated server side, but never trust a path component
+    if not token or ".." in token or "/" in token or "\\" in token:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid upload id"
+        )
+
+    return PARTIAL_UPLOAD_DIR / f"{token}.part"
+
+
+def create_partial_upload(token: str) -> Path:
+    """
+    Create the empty partial file for a new resumable upload session
+
+    Args:
+        token: Upload session token
+
+    Returns:
+        Path of the created file
+    """
+    PARTIAL_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    part_path = get_partial_upload_path(token)
+    part_path.touch(exist_ok=True)
+    return part_path
+
+
+def get_chunk_upload_path(token: str) -> Path:
+    """
+    Get a fresh path for buffering one chunk of a resumable upload session
+
+    Every call returns a different path, so concurrent requests for the
+    same session never write to the same file.
+
+    Args:
+        token: Upload session token
+
+    Returns:
+        Path inside the partial upload directory
+    """
+    part_path = get_partial_upload_path(token)
+    PARTIAL_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    return part_path.with_name(f"{token}.{uuid.uuid4().hex}.chunk")
+
+
+async def write_upload_chunk(
+    chunk_path: Path,
+    stream: AsyncIterator[bytes],
+    max_bytes: int
+) -> Tuple[int, bool]:
+    """
+    Write a streamed chunk into its own buffer file
+
+    Bytes received before a client disconnect are kept so the upload can
+    resume from where the connection dropped. The chunk only reaches the
+    partial file through append_upload_chunk, once its offset is confirmed.
+
+    Args:
+        chunk_path: Chunk buffer path, from get_chunk_upload_path
+        stream: Async iterator over the request body
+        max_bytes: Maximum number of bytes this chunk may contain
+
+    Returns:
+        Tuple of (bytes written, whether the client disconnected)
+
+    Raises:
+        HTTPException: If the chunk exceeds max_bytes
+    """
+    written = 0
+    disconnected = False
+
+    with open(chunk_path, "wb") as buffer:
+        try:
+            async for data in stream:
+                if not data:
+                    continue
+                if written + len(data) > max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail="Chunk exceeds the declared upload length"
+                    )
+                buffer.write(data)
+                written += len(data)
+        except ClientDisconnect:
+            disconnected = True
+
+    return written, disconnected
+
+
+def append_upload_chunk(part_path: Path, offset: int, chunk_path: Path) -> None:
+    """
+    Copy a buffered chunk into a partial upload file at the given offset
+
+    The caller must hold the upload session row lock, so only one chunk
+    is copied at a given offset.
+
+    Args:
+        part_path: Partial file path
+        offset: Byte offset to start writing at
+        chunk_path: Chunk buffer path
+    """
+    with open(chunk_path, "rb") as source, open(part_path, "r+b") as buffer:
+        buffer.seek(offset)
+        shutil.copyfileobj(source, buffer)
+        buffer.flush()
+        os.fsync(buffer.fileno())
+
+
+def delete_chunk_upload(chunk_path: Path) -> None:
+    """
+    Delete a chunk buffer file, if it exists
+
+    Args:
+        chunk_path: Chunk buffer path
+    """
+    try:
+        chunk_path.unlink(missing_ok=True)
+    except Exception as e:
+        print(f"Error deleting upload chunk {chunk_path.name}: {e}")
+
+
+def store_completed_upload(part_path: Path, original_filename: str) -> str:
+    """
+    Move a fully received partial upload into the uploads directory
+
+    Args:
+        part_path: Partial file path
+        original_filename: Original filename reported by the client
+
+    Returns:
+        Unique filename of the stored file
+    """
+    filename = generate_unique_filename(original_filename)
+    file_path = get_storage_path(filename)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(part_path, file_path)
+    return filename
+
+
+def delete_partial_upload(token: str) -> bool:
+    """
+    Delete the partial file of a resumable upload session
+
+    Chunk buffers left behind by a worker that died mid-request are
+    removed along with it.
+
+    Args:
+        token: Upload session token
+
+    Returns:
+        True if a file was deleted
+    """
+    try:
+        part_path = get_partial_upload_path(token)
+        for chunk_path in PARTIAL_UPLOAD_DIR.glob(f"{token}.*.chunk"):
+            chunk_path.unlink(missing_ok=True)
+        if part_path.exists():
+            part_path.unlink()
+            return True
+        return False
+    except Exception as e:
+        print(f"Error deleting partial upload {token}: {e}")
+        return False
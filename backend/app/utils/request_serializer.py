@@ -0,0 +1,99 @@
+"""
+Maintenance Request Serialization
+Maps ORM objects or projected rows straight to JSON responses without re-validation
+"""
+import json
+from typing import Any, Iterable, Optional, Sequence, Tuple
+from fastapi import HTTPException, status
+
+from app.core.responses import FastJSONResponse
+from app.schemas.maintenance_request import MaintenanceRequestResponse
+
+# Response fields in schema order
+REQUEST_FIELDS: Tuple[str, ...] = tuple(MaintenanceRequestResponse.model_fields)
+
+# Large text columns a table view can leave out with ?fields=
+HEAVY_FIELDS = frozenset({"description", "part_order_list", "attachments"})
+
+
+def safe_json_list(json_str: Optional[str]) -> list:
+    """Safely parse a JSON array string, returning empty list on error"""
+    if not json_str:
+        return []
+    try:
+        result = json.loads(json_str)
+        return result if isinstance(result, list) else []
+    except (json.JSONDecodeError, TypeError, ValueError):
+        return []
+
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """
+    Parse a ?fields= sparse fieldset
+
+    Args:
+        fields: Comma-separated field names, or None for all fields
+
+    Returns:
+        Requested fields in schema order, always including id
+
+    Raises:
+        HTTPException: If an unknown field is requested
+    """
+    if not fields:
+        return REQUEST_FIELDS
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(REQUEST_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+
+    requested.add("id")
+    return tuple(name for name in REQUEST_FIELDS if name in requested)
+
+
+def map_request(source: Any, fields: Sequence[str] = REQUEST_FIELDS) -> dict:
+    """
+    Map a maintenance request to its response dictionary
+
+    Works on ORM objects and on rows from MaintenanceRequestService.get_request_rows,
+    which expose the same attribute names.
+
+    Args:
+        source: MaintenanceRequest or projected row
+        fields: Fields to include
+
+    Returns:
+        Response dictionary ready for orjson
+    """
+    data = {}
+    for name in fields:
+        value = getattr(source, name, None)
+        if name == "attachments":
+            value = safe_json_list(value)
+        data[name] = value
+    return data
+
+
+def request_response(source: Any, status_code: int = status.HTTP_200_OK) -> FastJSONResponse:
+    """Build the JSON response for a single maintenance request"""
+    return FastJSONResponse(content=map_request(source), status_code=status_code)
+
+
+def request_list_response(
+    rows: Iterable[Any],
+    total: int,
+    page: int,
+    page_size: int,
+    fields: Sequence[str] = REQUEST_FIELDS
+) -> FastJSONResponse:
+    """Build the JSON response for a page of maintenance requests"""
+    return FastJSONResponse(content={
+        "requests": [map_request(row, fields) for row in rows],
+        "total": total,
+        "page": page,
+        "page_size": page_size
+    })
@@ -0,0 +1,115 @@
+"""
+Streaming ZIP Utilities
+Builds ZIP archives chunk by chunk without temp files or buffering whole files
+"""
+import logging
+import time
+import zipfile
+from pathlib import Path
+from typing import Iterable, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Formats that are already compressed; deflating them again only costs CPU
+STORED_EXTENSIONS = {
+    ".jpg", ".jpeg", ".png", ".gif", ".webp",
+    ".pdf", ".docx", ".xlsx",
+    ".mp4", ".mov",
+    ".zip", ".rar"
+}
+
+READ_CHUNK_SIZE = 64 * 1024  # 64KB
+
+
+class _ChunkSink:
+    """
+    Write-only file object that hands written bytes back to the generator.
+    zipfile falls back to data descriptors because the sink is not seekable.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _zip_info(arcname: str, file_path: Path) -> zipfile.ZipInfo:
+    """
+    Build the ZIP entry header for a file on disk
+
+    Args:
+        arcname: Name of the entry inside the archive
+        file_path: Path of the source file
+
+    Returns:
+        ZipInfo with size, timestamp and compression method set
+    """
+    stat = file_path.stat()
+    date_time = time.localtime(max(stat.st_mtime, 315532800))[:6]  # ZIP cannot store dates before 1980
+
+    zip_info = zipfile.ZipInfo(arcname, date_time=date_time)
+    zip_info.file_size = stat.st_size  # Lets zipfile decide on ZIP64 up front
+    if file_path.suffix.lower() in STORED_EXTENSIONS:
+        zip_info.compress_type = zipfile.ZIP_STORED
+    else:
+        zip_info.compress_type = zipfile.ZIP_DEFLATED
+    return zip_info
+
+
+def stream_zip(entries: Iterable[Tuple[str, Path]]) -> Iterator[bytes]:
+    """
+    Stream a ZIP archive of the given files
+
+    Memory use is bounded by the read chunk size regardless of file sizes.
+    Files that disappear before they are read are skipped.
+
+    Args:
+        entries: Iterable of (archive name, file path) pairs
+
+    Yields:
+        Chunks of the ZIP archive
+    """
+    sink = _ChunkSink()
+
+    with zipfile.ZipFile(sink, mode="w") as archive:
+        for arcname, file_path in entries:
+            try:
+                zip_info = _zip_info(arcname, file_path)
+                source = open(file_path, "rb")
+            except OSError as e:
+                logger.warning(f"Skipping attachment {arcname} in ZIP bundle: {e}")
+                continue
+
+            with source, archive.open(zip_info, mode="w") as entry:
+                while True:
+                    data = source.read(READ_CHUNK_SIZE)
+                    if not data:
+                        break
+                    entry.write(data)
+                    chunk = sink.drain()
+                    if chunk:
+                        yield chunk
+
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+
+    # Central directory
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
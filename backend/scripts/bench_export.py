@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming maintenance request export
+
+Seeds synthetic requests with scripts/synthetic_data.py, streams the whole
+table through the CSV (or XLSX) exporter into a byte counter and checks
+that peak RSS stays under a fixed ceiling, i.e. that memory does not grow
+with the size of the export.
+
+Usage:
+    python scripts/bench_export.py [--rows 1000000] [--format csv] [--max-rss-mb 256]
+
+Seeds a temporary SQLite file unless BENCH_DATABASE_URL is set (the table
+is then expected to be seeded already, e.g. with --seed-only on a test
+database). Seeding runs in a child process so it does not count towards
+the measured RSS.
+
+Exits with status 1 if peak RSS exceeds the ceiling.
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401 - registers all tables
+from app.services.maintenance_request import MaintenanceRequestService
+from app.utils.request_export import EXPORT_FIELDS, stream_csv, stream_xlsx
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (ru_maxrss is KB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Requests to seed")
+    parser.add_argument("--format", choices=["csv", "xlsx"], default="csv", help="Export format")
+    parser.add_argument("--max-rss-mb", type=float, default=256, help="Peak RSS ceiling")
+    parser.add_argument("--seed-only", metavar="URL", help="Seed URL and exit (used by the child process)")
+    args = parser.parse_args()
+
+    if args.seed_only:
+        from synthetic_data import generate
+        generate(create_engine(args.seed_only), users=500, requests=args.rows, seed=1)
+        return
+
+    url = os.getenv("BENCH_DATABASE_URL")
+    temp_dir = None
+    if not url:
+        temp_dir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{temp_dir.name}/bench_export.db"
+        start = time.perf_counter()
+        subprocess.run([sys.executable, __file__, "--rows", str(args.rows), "--seed-only", url], check=True)
+        print(f"seeded {args.rows:,} rows in {time.perf_counter() - start:.1f} s")
+
+    db = sessionmaker(bind=create_engine(url))()
+    baseline = peak_rss_mb()
+
+    writer = stream_xlsx if args.format == "xlsx" else stream_csv
+    rows = MaintenanceRequestService.iter_export_rows(db, EXPORT_FIELDS)
+    exported = 0
+    start = time.perf_counter()
+    for chunk in writer(rows, EXPORT_FIELDS):
+        exported += len(chunk)
+    elapsed = time.perf_counter() - start
+    db.close()
+
+    peak = peak_rss_mb()
+    print(f"exported {exported / 1024 / 1024:,.1f} MB of {args.format} in {elapsed:.1f} s")
+    print(f"RSS before export {baseline:.0f} MB, peak {peak:.0f} MB (ceiling {args.max_rss_mb:.0f} MB)")
+
+    if temp_dir:
+        temp_dir.cleanup()
+    if peak > args.max_rss_mb:
+        print("FAIL: peak RSS above ceiling")
+        sys.exit(1)
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark maintenance request list serialization
+
+Compares the old list path (full ORM entities, hand-built Pydantic models,
+re-validation and JSON encoding as FastAPI does for response_model) with the
+projected row mapper emitting orjson, for one 100-row page.
+
+Usage:
+    python scripts/bench_maintenance_serialization.py [--rows 100] [--repeat 200]
+
+Runs against an in-memory SQLite database unless BENCH_DATABASE_URL is set.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, desc
+from sqlalchemy.orm import sessionmaker, joinedload
+from sqlalchemy.pool import StaticPool
+from pydantic import TypeAdapter
+
+from app.models.base import BaseModel
+from app.models.user import User
+from app.models.maintenance_request import MaintenanceRequest, PriorityLevel, RequestStatus
+import app.models  # noqa: F401 - registers all tables
+from app.schemas.maintenance_request import MaintenanceRequestResponse, MaintenanceRequestListResponse
+from app.services.maintenance_request import MaintenanceRequestService
+from app.utils.request_serializer import parse_fields, request_list_response, safe_json_list
+
+
+def create_session(row_count: int):
+    """Create a database with row_count requests"""
+    url = os.getenv("BENCH_DATABASE_URL", "sqlite://")
+    if url == "sqlite://":
+        engine = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    else:
+        engine = create_engine(url)
+    BaseModel.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    submitter = User(full_name="Bench Submitter", username="bench_submitter", email="submitter@example.com", password_hash="x")
+    completer = User(full_name="Bench Technician", username="bench_technician", email="tech@example.com", password_hash="x")
+    db.add_all([submitter, completer])
+    db.flush()
+
+    now = datetime.utcnow()
+    for i in range(row_count):
+        completed = i % 3 == 0
+        db.add(MaintenanceRequest(
+            title=f"Request {i}",
+            description="Spindle vibration above threshold during night shift. " * 40,
+            priority=list(PriorityLevel)[i % 4],
+            status=RequestStatus.COMPLETED if completed else RequestStatus.PENDING,
+            equipment_name=f"CNC-{i % 20}",
+            location=f"Building {i % 3}",
+            requested_completion_date=now + timedelta(days=i),
+            part_order_list="\n".join(f"PN-{i}-{j} x{j + 1}" for j in range(30)),
+            attachments=json.dumps([f"{i:02x}-photo.jpg", f"{i:02x}-report.pdf"]),
+            submitter_id=submitter.id,
+            completed_at=now if completed else None,
+            completed_by_id=completer.id if completed else None,
+            created_at=now - timedelta(minutes=i)
+        ))
+    db.commit()
+    return db
+
+
+def legacy_page(db, limit: int) -> bytes:
+    """List page as built before the projected mapper"""
+    requests = db.query(MaintenanceRequest).options(
+        joinedload(MaintenanceRequest.submitter)
+    ).order_by(desc(MaintenanceRequest.created_at)).limit(limit).all()
+    total = db.query(MaintenanceRequest).count()
+
+    formatted = [MaintenanceRequestResponse(
+        id=req.id,
+        title=req.title,
+        description=req.description,
+        priority=req.priority,
+        status=req.status,
+        equipment_name=req.equipment_name,
+        location=req.location,
+        requested_completion_date=req.requested_completion_date,
+        last_maintenance_date=req.last_maintenance_date,
+        maintenance_cycle_days=req.maintenance_cycle_days,
+        warranty_status=req.warranty_status,
+        warranty_expiry_date=req.warranty_expiry_date,
+        part_order_list=req.part_order_list,
+        attachments=safe_json_list(req.attachments),
+        submitter_id=req.submitter_id,
+        submitter_email=req.submitter.email if req.submitter else None,
+        submitter_name=req.submitter.full_name if req.submitter else None,
+        created_at=req.created_at,
+        updated_at=None,
+        completed_at=req.completed_at,
+        completed_by_id=req.completed_by_id,
+        completed_by_name=req.completed_by.full_name if req.completed_by else None
+    ) for req in requests]
+    content = MaintenanceRequestListResponse(requests=formatted, total=total, page=1, page_size=limit)
+
+    # What FastAPI does with a response_model: validate again, dump, encode
+    adapter = LIST_ADAPTER
+    validated = adapter.validate_python(content, from_attributes=True)
+    return json.dumps(adapter.dump_python(validated, mode="json"), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def projected_page(db, limit: int, fields: str = None) -> bytes:
+    """List page through the projected row mapper"""
+    selected_fields = parse_fields(fields)
+    rows, total = MaintenanceRequestService.get_all_requests(db, skip=0, limit=limit, fields=selected_fields)
+    return request_list_response(rows, total, 1, limit, selected_fields).body
+
+
+LIST_ADAPTER = TypeAdapter(MaintenanceRequestListResponse)
+
+
+def bench(label: str, func, repeat: int, db) -> float:
+    """Time func and print the per-page figure"""
+    db.expire_all()
+    body = func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        db.expire_all()
+        func()
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    print(f"{label:<34} {elapsed:8.2f} ms/page  {len(body):>9,} bytes")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="Rows per page")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed iterations")
+    args = parser.parse_args()
+
+    db = create_session(args.rows)
+
+    # Same payload either way
+    legacy = json.loads(legacy_page(db, args.rows))
+    projected = json.loads(projected_page(db, args.rows))
+    for item in legacy["requests"]:
+        item.pop("company")  # Never populated by the old hand-built responses
+        item.pop("team")
+    for item in projected["requests"]:
+        item.pop("company")
+        item.pop("team")
+    assert legacy == projected, "projected payload differs from the legacy payload"
+
+    print(f"{args.rows}-row page, {args.repeat} iterations")
+    before = bench("before: ORM + Pydantic", lambda: legacy_page(db, args.rows), args.repeat, db)
+    after = bench("after: projected rows + orjson", lambda: projected_page(db, args.rows), args.repeat, db)
+    sparse = bench("after: ?fields=id,title,status,...", lambda: projected_page(
+        db, args.rows, "id,title,status,priority,equipment_name,location,submitter_name,created_at"
+    ), args.repeat, db)
+    print(f"speedup: {before / after:.1f}x full, {before / sparse:.1f}x sparse")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+JSON encoder conformance check
+
+Byte-compares the orjson-backed responses against what the stdlib
+JSONResponse produced for the same content:
+
+- FastJSONResponse vs JSONResponse on jsonable_encoder output (default path)
+- Cached TypeAdapter responses vs FastAPI's response_model serialization
+- The maintenance request mapper vs the Pydantic response models
+
+Floats in exponent notation are the one known spelling difference
+(1e-07 vs 1e-7); they are compared by value.
+
+Usage:
+    python scripts/check_json_conformance.py
+
+Exits with status 1 if any case differs.
+"""
+import enum
+import json
+import sys
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import List, Optional
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel as PydanticModel, TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.responses import FastJSONResponse, adapter_response
+from app.models.base import BaseModel
+from app.models.role import Role
+from app.models.tool import Tool
+from app.models.user import User
+from app.models.maintenance_request import MaintenanceRequest, PriorityLevel, RequestStatus
+import app.models  # noqa: F401 - registers all tables
+from app.schemas.user import User as UserSchema, USER_LIST_ADAPTER
+from app.schemas.role import ROLE_LIST_ADAPTER
+from app.schemas.tool import TOOL_LIST_ADAPTER
+from app.schemas.maintenance_request import MaintenanceRequestResponse, MaintenanceRequestListResponse
+from app.services.maintenance_request import MaintenanceRequestService
+from app.utils.request_serializer import request_list_response, request_response, safe_json_list
+
+failures = 0
+
+
+def check(label: str, expected: bytes, actual: bytes) -> None:
+    """Compare two encodings and report the first difference"""
+    global failures
+    if expected == actual:
+        print(f"PASS  {label} ({len(actual):,} bytes)")
+        return
+    failures += 1
+    index = next((i for i, (a, b) in enumerate(zip(expected, actual)) if a != b), min(len(expected), len(actual)))
+    print(f"FAIL  {label} at byte {index}")
+    print(f"      expected: {expected[max(0, index - 40):index + 40]!r}")
+    print(f"      actual:   {actual[max(0, index - 40):index + 40]!r}")
+
+
+def check_equivalent(label: str, expected: bytes, actual: bytes) -> None:
+    """Compare two encodings by decoded value"""
+    global failures
+    if json.loads(expected) == json.loads(actual):
+        print(f"PASS  {label} (value-equal)")
+        return
+    failures += 1
+    print(f"FAIL  {label}: {expected!r} != {actual!r}")
+
+
+def legacy_model_body(adapter: TypeAdapter, value) -> bytes:
+    """What FastAPI produced for a response_model with the stdlib JSONResponse"""
+    validated = adapter.validate_python(value, from_attributes=True)
+    return JSONResponse(content=adapter.dump_python(validated, mode="json")).body
+
+
+def create_session():
+    """In-memory database with users, roles, tools and requests"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    BaseModel.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    roles = [Role(name="superuser", description="Full access"), Role(name="operator", description=None)]
+    tools = [
+        Tool(name="compare", display_name="Compare Tool", description="BOM “compare” — ünïcode", route="/compare", icon="git-compare"),
+        Tool(name="aci_chat", display_name="ACI Chat", route="/chat", is_active=False)
+    ]
+    users = [
+        User(full_name="José Müller", username="jose", email="jose@example.com", password_hash="x", roles=roles, tools=tools),
+        User(full_name="李雷", username="lilei", email="lilei@example.com", password_hash="x", roles=[roles[1]], tools=[tools[0]], is_active=False)
+    ]
+    db.add_all(roles + tools + users)
+    db.flush()
+
+    now = datetime(2026, 10, 19, 8, 30, 15, 123456)
+    for i in range(5):
+        db.add(MaintenanceRequest(
+            title=f"Réparation {i} \"quoted\" \\ slash",
+            description="Line one\nLine two\t✓ emoji 🔧",
+            priority=list(PriorityLevel)[i % 4],
+            status=list(RequestStatus)[i % 4],
+            equipment_name=None if i % 2 else f"CNC-{i}",
+            requested_completion_date=now + timedelta(days=i),
+            maintenance_cycle_days=30 if i % 2 else None,
+            attachments=json.dumps([f"{i:02x}_photo.jpg"]) if i % 2 else "not json",
+            submitter_id=users[i % 2].id,
+            completed_at=now.replace(microsecond=0) if i == 2 else None,
+            completed_by_id=users[0].id if i == 2 else None,
+            created_at=now - timedelta(minutes=i)
+        ))
+    db.commit()
+    return db
+
+
+class Shade(str, enum.Enum):
+    LIGHT = "light"
+
+
+class Sample(PydanticModel):
+    at: datetime
+    on: Optional[date] = None
+    ratio: float
+    shade: Shade
+    tags: List[str]
+
+
+def main():
+    db = create_session()
+
+    # Default response class on jsonable_encoder output
+    payloads = {
+        "statistics": {"total": 12, "pending": 3, "in_progress": 0, "completed": 9, "urgent": 1},
+        "unicode": {"name": "José Müller", "cjk": "李雷", "emoji": "🔧", "escapes": "\"\\\n\t\u0001 "},
+        "numbers": {"int": 2 ** 53 + 1, "neg": -7, "floats": [0.1, 1.5, 123456.789, 0.0, -2.5]},
+        "nested": {"users": [{"id": 1, "roles": [{"id": 1, "name": "superuser"}], "tools": []}], "empty": {}},
+        "encoded types": {
+            "naive": datetime(2026, 1, 2, 3, 4, 5, 6),
+            "aware": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            "date": date(2026, 1, 2),
+            "enum": RequestStatus.IN_PROGRESS,
+            "uuid": uuid.UUID(int=1),
+            "decimal": Decimal("1.25"),
+            "model": Sample(at=datetime(2026, 1, 2, tzinfo=timezone(timedelta(hours=-5))), ratio=0.5, shade=Shade.LIGHT, tags=["a"])
+        },
+        "int keys": {1: "a", 2: "b"},
+        "list root": [1, "two", None, True, False]
+    }
+    for label, payload in payloads.items():
+        content = jsonable_encoder(payload)
+        check(f"default: {label}", JSONResponse(content=content).body, FastJSONResponse(content=content).body)
+
+    # Exponent floats are spelled differently (1e-07 vs 1e-7) but decode to the
+    # same value; no endpoint returns them today
+    exponents = jsonable_encoder({"floats": [1e-7, 1e16, 2.5e-300]})
+    check_equivalent("default: exponent floats", JSONResponse(content=exponents).body, FastJSONResponse(content=exponents).body)
+
+    # Cached TypeAdapters vs response_model serialization
+    users = db.query(User).all()
+    user_schemas = []
+    for user in users:
+        user_schema = UserSchema.model_validate(user)
+        user_schema.tools = [tool for tool in user.tools if tool.is_active]
+        user_schemas.append(user_schema)
+    check("adapter: admin users", legacy_model_body(USER_LIST_ADAPTER, user_schemas), adapter_response(USER_LIST_ADAPTER, user_schemas).body)
+
+    roles = db.query(Role).all()
+    check("adapter: roles", legacy_model_body(ROLE_LIST_ADAPTER, roles),
+          adapter_response(ROLE_LIST_ADAPTER, ROLE_LIST_ADAPTER.validate_python(roles, from_attributes=True)).body)
+
+    tools = db.query(Tool).all()
+    check("adapter: tools", legacy_model_body(TOOL_LIST_ADAPTER, tools),
+          adapter_response(TOOL_LIST_ADAPTER, TOOL_LIST_ADAPTER.validate_python(tools, from_attributes=True)).body)
+
+    # Maintenance request mapper vs Pydantic response models
+    requests = db.query(MaintenanceRequest).order_by(MaintenanceRequest.created_at.desc()).all()
+    legacy = [MaintenanceRequestResponse(
+        id=req.id,
+        title=req.title,
+        description=req.description,
+        priority=req.priority,
+        status=req.status,
+        equipment_name=req.equipment_name,
+        location=req.location,
+        requested_completion_date=req.requested_completion_date,
+        last_maintenance_date=req.last_maintenance_date,
+        maintenance_cycle_days=req.maintenance_cycle_days,
+        warranty_status=req.warranty_status,
+        warranty_expiry_date=req.warranty_expiry_date,
+        part_order_list=req.part_order_list,
+        attachments=safe_json_list(req.attachments),
+        submitter_id=req.submitter_id,
+        submitter_email=req.submitter.email if req.submitter else None,
+        submitter_name=req.submitter.full_name if req.submitter else None,
+        created_at=req.created_at,
+        updated_at=None,
+        completed_at=req.completed_at,
+        completed_by_id=req.completed_by_id,
+        completed_by_name=req.completed_by.full_name if req.completed_by else None
+    ) for req in requests]
+    list_adapter = TypeAdapter(MaintenanceRequestListResponse)
+    legacy_list = MaintenanceRequestListResponse(requests=legacy, total=len(legacy), page=1, page_size=100)
+
+    rows, total = MaintenanceRequestService.get_all_requests(db, skip=0, limit=100)
+    check("mapper: request list", legacy_model_body(list_adapter, legacy_list), request_list_response(rows, total, 1, 100).body)
+    check("mapper: single request", legacy_model_body(TypeAdapter(MaintenanceRequestResponse), legacy[0]), request_response(requests[0]).body)
+
+    if failures:
+        print(f"\n{failures} case(s) differ")
+        sys.exit(1)
+    print("\nAll encodings match")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Bulk user import
+Validates and imports users from a CSV, XLSX or JSON file
+
+Columns: full_name, username, email, password, is_active, roles, tools
+(role and tool names separated by commas)
+
+Usage:
+    python scripts/import_users.py users.csv            # dry run
+    python scripts/import_users.py users.xlsx --apply   # write changes
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fastapi import HTTPException
+from app.db.base import SessionLocal
+from app.services.user_import import UserImportService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import users from a CSV, XLSX or JSON file")
+    parser.add_argument("file", help="Import file")
+    parser.add_argument("--apply", action="store_true", help="Write changes (default is a dry run)")
+    parser.add_argument("--no-update", action="store_true", help="Fail rows whose username already exists")
+    parser.add_argument("--update-passwords", action="store_true", help="Reset passwords of existing users")
+    args = parser.parse_args()
+
+    path = Path(args.file)
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        rows = UserImportService.parse_file(path.read_bytes(), path.name)
+        report = UserImportService.run_import(
+            db,
+            rows,
+            dry_run=not args.apply,
+            update_existing=not args.no_update,
+            update_passwords=args.update_passwords
+        )
+    except HTTPException as e:
+        print(f"Import failed: {e.detail}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    for error in report.errors:
+        print(f"Row {error.row} ({error.username or '?'}): {'; '.join(error.errors)}")
+
+    mode = "Dry run" if report.dry_run else "Imported"
+    print(f"{mode}: {report.total_rows} rows, {report.created} to create, {report.updated} to update, "
+          f"{report.failed} failed ({time.perf_counter() - started:.1f}s)")
+    if not report.dry_run:
+        print(f"Links added: {report.role_links_added} role, {report.tool_links_added} tool")
+
+    sys.exit(1 if report.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Run a registered background job once
+Useful from cron when BACKGROUND_JOBS_ENABLED=false, or to force a run
+
+Usage:
+    python scripts/run_background_job.py upload_gc
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+import app.jobs  # noqa: F401 - registers the jobs
+from app.core.background import get_jobs, run_job_once
+
+
+def main():
+    """Run the job named on the command line"""
+    jobs = get_jobs()
+
+    if len(sys.argv) != 2 or sys.argv[1] not in jobs:
+        print(f"Usage: {sys.argv[0]} <job>")
+        print(f"Available jobs: {', '.join(sorted(jobs))}")
+        sys.exit(1)
+
+    result = run_job_once(jobs[sys.argv[1]])
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
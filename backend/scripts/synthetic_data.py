@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Synthetic data generator for large-scale benchmarking
+
+Creates N users with realistic role/tool distributions and M maintenance
+requests spread over several years, with status/priority mixes, registered
+equipment and locations, completion times and attachment metadata. Output is fully
+determined by the seed (and the fixed end date), so runs are reproducible.
+
+Rows are bulk-loaded with COPY on PostgreSQL and executemany elsewhere.
+Benchmark scripts use generate() as their fixture:
+
+    from synthetic_data import generate
+    generate(engine, users=2000, requests=1_000_000, seed=7)
+
+Usage:
+    python scripts/synthetic_data.py --database-url URL [--users 1000] [--requests 100000]
+                                     [--seed 42] [--years 3]
+
+Targets --database-url or BENCH_DATABASE_URL; one of them is required, and
+the application's configured DATABASE_URL is refused so fake users never
+land in a real database. All synthetic users share the password "Synthetic1!".
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.engine import Engine, make_url
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.models.base import BaseModel
+from app.models.role import Role
+from app.models.tool import Tool
+from app.models.user import User, user_roles, user_tools
+from app.models.maintenance_request import MaintenanceRequest, PriorityLevel, RequestStatus, WarrantyStatus
+from app.models.equipment import Equipment, Location
+import app.models  # noqa: F401 - registers all tables
+from app.utils.equipment_names import equipment_key, location_key, location_levels
+
+SYNTHETIC_PASSWORD = "Synthetic1!"
+
+# Rows generated and loaded per round trip
+LOAD_BATCH = 10000
+
+# Requests are spread over the years before this date (fixed for determinism)
+DEFAULT_END = datetime(2026, 1, 1)
+
+# (role, share of users); every user gets exactly one of these
+ROLE_MIX = [
+    ("superuser", 0.01),
+    ("manager", 0.05),
+    ("maintenance", 0.10),
+    ("operator", 0.50),
+    ("user", 0.34),
+]
+
+# Extra role some users hold on top of their main one
+ITAR_SHARE = 0.03
+
+# (name, display name, route, popularity weight)
+TOOLS = [
+    ("compare_tool", "Compare Tool", "/dashboard/tools/compare", 40),
+    ("aci_chat", "ACI Chat", "/dashboard/tools/chat", 30),
+    ("suitemaster", "SuiteMaster", "/dashboard/tools/suitemaster", 15),
+    ("nexus", "NEXUS", "/dashboard/tools/nexus", 12),
+    ("bom_validator", "BOM Validator", "/dashboard/tools/bom-validator", 8),
+    ("label_printer", "Label Printer", "/dashboard/tools/labels", 6),
+    ("inventory", "Inventory", "/dashboard/tools/inventory", 5),
+    ("quality_reports", "Quality Reports", "/dashboard/tools/quality", 3),
+]
+
+PRIORITY_MIX = [
+    (PriorityLevel.LOW, 0.40),
+    (PriorityLevel.MEDIUM, 0.35),
+    (PriorityLevel.HIGH, 0.18),
+    (PriorityLevel.URGENT, 0.07),
+]
+
+# Median hours to completion per priority (completion times are log-normal)
+COMPLETION_MEDIAN_HOURS = {
+    PriorityLevel.LOW: 120,
+    PriorityLevel.MEDIUM: 48,
+    PriorityLevel.HIGH: 16,
+    PriorityLevel.URGENT: 4,
+}
+
+EQUIPMENT_TYPES = [
+    "CNC Mill", "Pick-and-Place", "Reflow Oven", "Wave Solder", "AOI Station",
+    "Stencil Printer", "X-Ray Inspection", "Conformal Coater", "Air Compressor",
+    "HVAC Unit", "Forklift", "Depaneling Router", "ICT Fixture", "Wash System",
+]
+BUILDINGS = ["Building A", "Building B", "Building C", "Warehouse"]
+
+ISSUES = [
+    "Unusual vibration during operation",
+    "Temperature readings drifting out of tolerance",
+    "Conveyor belt slipping",
+    "Intermittent fault alarm",
+    "Scheduled preventive maintenance",
+    "Nozzle clogging on line changeover",
+    "Calibration overdue",
+    "Hydraulic pressure dropping",
+    "Sensor not responding",
+    "Excessive noise from drive motor",
+]
+ATTACHMENT_NAMES = ["photo.jpg", "alarm_screen.png", "inspection_report.pdf", "vibration_log.csv", "manual_page.pdf"]
+
+
+def _weighted(rng: random.Random, mix: Sequence) -> object:
+    """Pick a value from a list of (value, weight) pairs"""
+    values, weights = zip(*mix)
+    return rng.choices(values, weights)[0]
+
+
+def _get_or_create(db_conn, model, rows: List[dict]) -> Dict[str, int]:
+    """Insert missing reference rows by name and return name -> id"""
+    existing = dict(db_conn.execute(select(model.name, model.id)).all())
+    missing = [row for row in rows if row["name"] not in existing]
+    if missing:
+        db_conn.execute(insert(model), missing)
+        existing = dict(db_conn.execute(select(model.name, model.id)).all())
+    return existing
+
+
+def _next_id(db_conn, model) -> int:
+    """First id after the current maximum"""
+    return (db_conn.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def _copy_value(value):
+    """Value as PostgreSQL CSV COPY expects it (enum names, as SQLAlchemy stores them)"""
+    if value is None:
+        return None
+    if isinstance(value, (PriorityLevel, RequestStatus, WarrantyStatus)):
+        return value.name
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return value
+
+
+def bulk_load(db_conn, table, rows: List[dict]) -> None:
+    """
+    Load rows into a table
+
+    Uses COPY on PostgreSQL and executemany on other dialects. Rows must
+    all have the same keys and contain no empty strings (they would load
+    as NULL through COPY).
+
+    Args:
+        db_conn: SQLAlchemy connection
+        table: Table to load into
+        rows: Rows as column -> value dictionaries
+    """
+    if not rows:
+        return
+    if db_conn.dialect.name != "postgresql":
+        db_conn.execute(insert(table), rows)
+        return
+
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(row[column]) for column in columns])
+    buffer.seek(0)
+
+    cursor = db_conn.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+
+def _reset_sequence(db_conn, table) -> None:
+    """Move the id sequence past explicitly loaded ids (PostgreSQL only)"""
+    if db_conn.dialect.name == "postgresql":
+        db_conn.exec_driver_sql(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), (SELECT MAX(id) FROM {table.name}))"
+        )
+
+
+def _register_equipment(db_conn, equipment: List[tuple], now: datetime) -> List[tuple]:
+    """
+    Get or create registry rows for (name, location) pairs
+
+    Returns:
+        (equipment id, name, location path) per pair
+    """
+    location_ids = dict(db_conn.execute(select(Location.path_key, Location.id)).all())
+    equipment_ids = dict(db_conn.execute(select(Equipment.search_key, Equipment.id)).all())
+
+    registered = []
+    for name, location in equipment:
+        levels = location_levels(location)
+        parent_id = None
+        for depth in range(1, len(levels) + 1):
+            path_key = location_key(levels[:depth])
+            if path_key not in location_ids:
+                location_ids[path_key] = db_conn.execute(insert(Location).values(
+                    name=levels[depth - 1], parent_id=parent_id, path=" / ".join(levels[:depth]), path_key=path_key, created_at=now
+                )).inserted_primary_key[0]
+            parent_id = location_ids[path_key]
+
+        key = equipment_key(name)
+        if key not in equipment_ids:
+            equipment_id = db_conn.execute(insert(Equipment).values(
+                name=name, search_key=key, location_id=parent_id, warranty_status=WarrantyStatus.NOT_APPLICABLE,
+                is_active=True, updated_at=now, created_at=now
+            )).inserted_primary_key[0]
+            db_conn.execute(Equipment.__table__.update().where(Equipment.id == equipment_id).values(asset_tag=f"EQ-{equipment_id:06d}"))
+            equipment_ids[key] = equipment_id
+        registered.append((equipment_ids[key], name, " / ".join(levels)))
+
+    return registered
+
+
+def _batches(rows: Iterator[dict], size: int = LOAD_BATCH) -> Iterator[List[dict]]:
+    """Group rows into lists of size"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _user_rows(rng, first_id: int, count: int, prefix: str, password_hash: str, created_start: datetime, span: timedelta):
+    """Generate (user row, role names, tool names) tuples"""
+    tool_names = [name for name, _, _, _ in TOOLS]
+    tool_weights = [weight for _, _, _, weight in TOOLS]
+
+    for i in range(count):
+        user_id = first_id + i
+        username = f"{prefix}{user_id:07d}"
+        role = _weighted(rng, ROLE_MIX)
+        roles = [role] + (["itar"] if rng.random() < ITAR_SHARE else [])
+        if role == "superuser":
+            tools = []  # Superusers get every tool implicitly
+        else:
+            tools = sorted(set(rng.choices(tool_names, tool_weights, k=rng.randint(1, 4))))
+        row = {
+            "id": user_id,
+            "full_name": f"Synthetic User {user_id}",
+            "username": username,
+            "email": f"{username}@synthetic.example.com",
+            "password_hash": password_hash,
+            "is_active": rng.random() >= 0.05,
+            "created_at": created_start + span * (i / max(count, 1))
+        }
+        yield row, roles, tools
+
+
+def _request_rows(rng, first_id: int, count: int, submitter_ids: List[int], technician_ids: List[int],
+                  equipment: List[tuple], start: datetime, end: datetime):
+    """Generate maintenance request rows in created_at order, for (id, name, location) equipment"""
+    span_seconds = (end - start).total_seconds()
+
+    created = []
+    for _ in range(count):
+        created_at = start + timedelta(seconds=rng.random() * span_seconds)
+        # Fewer requests at weekends: move most of them to the next Monday
+        if created_at.weekday() >= 5 and rng.random() < 0.7:
+            created_at = min(created_at + timedelta(days=7 - created_at.weekday()), end - timedelta(seconds=1))
+        created.append(created_at)
+    # Ids and created_at increase together, as in production
+    created.sort()
+
+    for i, created_at in enumerate(created):
+        priority = _weighted(rng, PRIORITY_MIX)
+        equipment_id, equipment_name, location = rng.choice(equipment)
+        age_days = (end - created_at).days
+
+        # Older requests are almost all closed; recent ones are still open
+        if age_days > 30:
+            status = _weighted(rng, [(RequestStatus.COMPLETED, 0.92), (RequestStatus.CANCELLED, 0.05), (RequestStatus.PENDING, 0.02), (RequestStatus.IN_PROGRESS, 0.01)])
+        elif age_days > 3:
+            status = _weighted(rng, [(RequestStatus.COMPLETED, 0.6), (RequestStatus.IN_PROGRESS, 0.2), (RequestStatus.PENDING, 0.15), (RequestStatus.CANCELLED, 0.05)])
+        else:
+            status = _weighted(rng, [(RequestStatus.PENDING, 0.6), (RequestStatus.IN_PROGRESS, 0.3), (RequestStatus.COMPLETED, 0.1)])
+
+        completed_at = None
+        completed_by_id = None
+        if status == RequestStatus.COMPLETED:
+            hours = rng.lognormvariate(0, 0.8) * COMPLETION_MEDIAN_HOURS[priority]
+            completed_at = min(created_at + timedelta(hours=hours), end)
+            completed_by_id = rng.choice(technician_ids)
+
+        attachments = [
+            f"{uuid.UUID(int=rng.getrandbits(128), version=4)}_{rng.choice(ATTACHMENT_NAMES)}"
+            for _ in range(_weighted(rng, [(0, 0.55), (1, 0.3), (2, 0.1), (3, 0.05)]))
+        ]
+        warranty = _weighted(rng, [(WarrantyStatus.NOT_APPLICABLE, 0.6), (WarrantyStatus.ACTIVE, 0.25), (WarrantyStatus.EXPIRED, 0.15)])
+        cycle_days = rng.choice([None, None, 30, 90, 180, 365])
+
+        yield {
+            "id": first_id + i,
+            "title": f"{equipment_name}: {rng.choice(ISSUES)}",
+            "description": f"{rng.choice(ISSUES)}. Reported on {created_at:%Y-%m-%d}; see attached notes for details.",
+            "company": "American Circuits, Inc.",
+            "team": "Internal Maintenance",
+            "priority": priority,
+            "status": status,
+            "equipment_id": equipment_id,
+            "equipment_name": equipment_name,
+            "location": location,
+            "requested_completion_date": created_at + timedelta(days=rng.choice([1, 3, 7, 14, 30])),
+            "last_maintenance_date": created_at - timedelta(days=cycle_days) if cycle_days else None,
+            "maintenance_cycle_days": cycle_days,
+            "warranty_status": warranty,
+            "warranty_expiry_date": created_at + timedelta(days=rng.randint(30, 900)) if warranty == WarrantyStatus.ACTIVE else None,
+            "part_order_list": ", ".join(f"PN-{rng.randint(1000, 9999)} x{rng.randint(1, 5)}" for _ in range(rng.randint(1, 3))) if rng.random() < 0.3 else None,
+            "attachments": json.dumps(attachments),
+            "submitter_id": rng.choice(submitter_ids),
+            "completed_at": completed_at,
+            "completed_by_id": completed_by_id,
+            "created_at": created_at
+        }
+
+
+def generate(
+    engine: Engine,
+    users: int = 1000,
+    requests: int = 100000,
+    seed: int = 42,
+    years: float = 3,
+    end: datetime = DEFAULT_END,
+    username_prefix: str = "synth",
+    verbose: bool = False
+) -> dict:
+    """
+    Generate synthetic users and maintenance requests
+
+    Creates the tables if needed and reuses existing roles and tools by
+    name. Users get explicit ids after the current maximum, so the data can
+    be added to a database that already has rows.
+
+    Args:
+        engine: Target database engine
+        users: Number of users to create
+        requests: Number of maintenance requests to create
+        seed: Random seed
+        years: Years of history before end to spread requests over
+        end: Newest possible created_at
+        username_prefix: Prefix of generated usernames
+        verbose: Print progress
+
+    Returns:
+        Counts of created rows
+    """
+    rng = random.Random(seed)
+    start = end - timedelta(days=365 * years)
+    BaseModel.metadata.create_all(bind=engine)
+
+    with engine.begin() as db_conn:
+        role_ids = _get_or_create(db_conn, Role, [
+            {"name": name, "description": f"{name.title()} role"} for name, _ in ROLE_MIX + [("itar", 0)]
+        ])
+        tool_ids = _get_or_create(db_conn, Tool, [
+            {"name": name, "display_name": display_name, "route": route, "icon": "tool", "is_active": True}
+            for name, display_name, route, _ in TOOLS
+        ])
+
+        password_hash = get_password_hash(SYNTHETIC_PASSWORD)
+        first_user_id = _next_id(db_conn, User)
+        submitter_ids = []
+        technician_ids = []
+        link_count = 0
+        for batch in _batches(_user_rows(rng, first_user_id, users, username_prefix, password_hash, start, end - start)):
+            bulk_load(db_conn, User.__table__, [row for row, _, _ in batch])
+            role_links = []
+            tool_links = []
+            for row, roles, tools in batch:
+                role_links += [{"user_id": row["id"], "role_id": role_ids[role]} for role in roles]
+                tool_links += [{"user_id": row["id"], "tool_id": tool_ids[tool]} for tool in tools]
+                submitter_ids.append(row["id"])
+                if roles[0] in ("maintenance", "superuser"):
+                    technician_ids.append(row["id"])
+            bulk_load(db_conn, user_roles, role_links)
+            bulk_load(db_conn, user_tools, tool_links)
+            link_count += len(role_links) + len(tool_links)
+        _reset_sequence(db_conn, User.__table__)
+        if verbose:
+            print(f"  users: {users:,} ({link_count:,} role/tool links)")
+
+    if not technician_ids:
+        technician_ids = submitter_ids
+
+    equipment = [
+        (f"{equipment_type} {number}", f"{rng.choice(BUILDINGS)} - Line {rng.randint(1, 8)}")
+        for equipment_type in EQUIPMENT_TYPES
+        for number in range(1, rng.randint(4, 16))
+    ]
+
+    loaded = 0
+    with engine.begin() as db_conn:
+        equipment = _register_equipment(db_conn, equipment, start)
+        first_request_id = _next_id(db_conn, MaintenanceRequest)
+        rows = _request_rows(rng, first_request_id, requests, submitter_ids, technician_ids, equipment, start, end)
+        for batch in _batches(rows):
+            bulk_load(db_conn, MaintenanceRequest.__table__, batch)
+            loaded += len(batch)
+            if verbose and loaded % (LOAD_BATCH * 10) == 0:
+                print(f"  requests: {loaded:,}/{requests:,}")
+        _reset_sequence(db_conn, MaintenanceRequest.__table__)
+
+    return {
+        "users": users,
+        "role_tool_links": link_count,
+        "equipment": len(equipment),
+        "maintenance_requests": loaded
+    }
+
+
+def _same_database(url: str, other: str) -> bool:
+    """Whether two URLs point at the same database, whatever the driver or credentials (in-memory ones never do)"""
+    first, second = make_url(url), make_url(other)
+    return bool(first.database) and (first.get_backend_name(), first.host, first.port, first.database) == \
+        (second.get_backend_name(), second.host, second.port, second.database)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000, help="Users to create")
+    parser.add_argument("--requests", type=int, default=100000, help="Maintenance requests to create")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--years", type=float, default=3, help="Years of request history")
+    parser.add_argument("--prefix", default="synth", help="Username prefix")
+    parser.add_argument("--database-url", help="Target scratch database (defaults to BENCH_DATABASE_URL)")
+    args = parser.parse_args()
+
+    url = args.database_url or os.getenv("BENCH_DATABASE_URL")
+    if not url:
+        parser.error("pass --database-url or set BENCH_DATABASE_URL to a scratch database")
+    if _same_database(url, settings.DATABASE_URL):
+        parser.error("refusing to generate synthetic data in the application database (DATABASE_URL)")
+
+    start = time.perf_counter()
+    counts = generate(create_engine(url), args.users, args.requests, args.seed, args.years, username_prefix=args.prefix, verbose=True)
+    print(f"Generated {counts} in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()